@@ -0,0 +1,162 @@
+import asyncio
+import re
+from collections import deque
+from dataclasses import dataclass, field
+
+from api.v1.metrics import REGISTRY, Counter, Gauge
+
+ADMISSION_REJECTED = REGISTRY.register(
+    Counter(
+        "http_requests_rejected_total",
+        "Requests turned away by admission control",
+        ("request_class", "reason"),
+    )
+)
+ADMISSION_QUEUED = REGISTRY.register(
+    Gauge(
+        "http_requests_queued",
+        "Requests waiting for admission",
+        ("request_class",),
+    )
+)
+ADMISSION_RUNNING = REGISTRY.register(
+    Gauge(
+        "http_requests_admitted",
+        "Admitted requests still being handled",
+        ("request_class",),
+    )
+)
+
+
+@dataclass
+class RequestClass:
+    """Requests that share a concurrency limit and a queue
+
+    Args:
+        name (str): Metric label and env var suffix, such as "ingest"
+        priority (int): Lower is admitted first when a slot frees
+        max_concurrent (int): Most requests of the class handled at once
+        max_queued (int): Most requests waiting before new ones are rejected
+        max_wait_s (float): Seconds a request waits before it's rejected
+        methods (frozenset[str] | None, optional): Methods of the class. Defaults to None, any.
+        paths (str | None, optional): Regex searched in the path. Defaults to None, any.
+    """
+
+    name: str
+    priority: int
+    max_concurrent: int
+    max_queued: int
+    max_wait_s: float
+    methods: frozenset[str] | None = None
+    paths: str | None = None
+    running: int = field(default=0, init=False)
+    waiting: deque = field(default_factory=deque, init=False)
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.methods is not None and method not in self.methods:
+            return False
+        return self.paths is None or re.search(self.paths, path) is not None
+
+
+class AdmissionController:
+    """Caps concurrent requests per class and overall, admitting higher priorities first
+
+    A request runs straight away if its class and the overall limit have room
+    and nothing of its class is waiting, otherwise it queues. Whenever a request finishes, waiting requests are admitted in
+    priority order. Full queues and long waits are rejected, so requests don't
+    pile up until the database pool times out.
+
+    Args:
+        classes (list[RequestClass]): Tried in order, the first whose methods and paths match is used
+        max_concurrent (int): Most admitted requests across every class, size it to the database pool
+        exempt (str | None, optional): Regex of paths never held back, such as metrics. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        classes: list[RequestClass],
+        max_concurrent: int,
+        exempt: str | None = None,
+    ) -> None:
+        self.classes = classes
+        self.max_concurrent = max_concurrent
+        self.exempt = exempt
+        self.running = 0
+        self._by_priority = sorted(
+            classes, key=lambda request_class: request_class.priority
+        )
+
+    def classify(self, method: str, path: str) -> RequestClass | None:
+        """The class of a request, None if it's exempt or matches no class"""
+        if self.exempt is not None and re.search(self.exempt, path):
+            return None
+        for request_class in self.classes:
+            if request_class.matches(method, path):
+                return request_class
+        return None
+
+    def _has_room(self, request_class: RequestClass) -> bool:
+        return (
+            self.running < self.max_concurrent
+            and request_class.running < request_class.max_concurrent
+        )
+
+    def _admit(self, request_class: RequestClass) -> None:
+        self.running += 1
+        request_class.running += 1
+        ADMISSION_RUNNING.inc(request_class.name)
+
+    def _dispatch(self) -> None:
+        """Admits waiting requests, highest priority first, while there's room"""
+        for request_class in self._by_priority:
+            while request_class.waiting and self._has_room(request_class):
+                waiter = request_class.waiting.popleft()
+                ADMISSION_QUEUED.dec(request_class.name)
+                if not waiter.done():
+                    self._admit(request_class)
+                    waiter.set_result(None)
+
+    async def acquire(self, request_class: RequestClass) -> bool:
+        """Waits for a slot in a class
+
+        Args:
+            request_class (RequestClass): The request's class
+
+        Returns:
+            bool: Whether the request was admitted, release it afterwards if so
+        """
+        # Releases dispatch straight away, so while there's room overall any
+        # higher priority waiters are held by their own class limit
+        if not request_class.waiting and self._has_room(request_class):
+            self._admit(request_class)
+            return True
+        if len(request_class.waiting) >= request_class.max_queued:
+            ADMISSION_REJECTED.inc(request_class.name, "queue_full")
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        request_class.waiting.append(waiter)
+        ADMISSION_QUEUED.inc(request_class.name)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), request_class.max_wait_s)
+            return True
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done():
+                # Admitted just as the wait ended
+                if isinstance(e, asyncio.CancelledError):
+                    self.release(request_class)
+                    raise
+                return True
+            waiter.cancel()
+            request_class.waiting.remove(waiter)
+            ADMISSION_QUEUED.dec(request_class.name)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            ADMISSION_REJECTED.inc(request_class.name, "wait_timeout")
+            return False
+
+    def release(self, request_class: RequestClass) -> None:
+        self.running -= 1
+        request_class.running -= 1
+        ADMISSION_RUNNING.dec(request_class.name)
+        self._dispatch()
@@ -0,0 +1,42 @@
+from fastapi import HTTPException, status
+
+from api.v1.schemas.batch import BatchItemResult, BatchResponse
+from database.crud.base import CRUDRepository
+
+
+def create_batch(
+    repo: CRUDRepository, rows: list[dict], errors: dict[int, str], atomic: bool
+) -> BatchResponse:
+    """Creates the rows of a batch that passed validation, in one transaction
+
+    Args:
+        repo (CRUDRepository): Repository of the model being created
+        rows (list[dict]): Column values of every item, in request order
+        errors (dict[int, str]): Why each rejected item, by index, can't be created
+        atomic (bool): Create nothing if any item was rejected
+
+    Raises:
+        HTTPException_422: Atomic batch with rejected items, the detail lists them
+
+    Returns:
+        BatchResponse: Every item's ID or error
+    """
+    if atomic and errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=[
+                {"index": index, "error": error}
+                for index, error in sorted(errors.items())
+            ],
+        )
+
+    valid = [index for index in range(len(rows)) if index not in errors]
+    ids = dict(zip(valid, repo.create_many([rows[index] for index in valid])))
+    return BatchResponse(
+        created=len(ids),
+        failed=len(errors),
+        items=[
+            BatchItemResult(index=index, id=ids.get(index), error=errors.get(index))
+            for index in range(len(rows))
+        ],
+    )
@@ -0,0 +1,181 @@
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+import brotli
+import zstandard
+
+from api.v1.metrics import REGISTRY, Counter, Histogram
+
+RATIO_BUCKETS = (1, 1.5, 2, 3, 5, 10, 20, 50)
+
+COMPRESSION_RATIO = REGISTRY.register(
+    Histogram(
+        "http_response_compression_ratio",
+        "Uncompressed over compressed size of compressed responses",
+        ("route", "encoding"),
+        buckets=RATIO_BUCKETS,
+    )
+)
+UNCOMPRESSED_BYTES = REGISTRY.register(
+    Counter(
+        "http_response_uncompressed_bytes_total",
+        "Size of compressed responses before compression",
+        ("route", "encoding"),
+    )
+)
+COMPRESSED_BYTES = REGISTRY.register(
+    Counter(
+        "http_response_compressed_bytes_total",
+        "Size of compressed responses as sent",
+        ("route", "encoding"),
+    )
+)
+
+
+class _Gzip:
+    def __init__(self) -> None:
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compresses a chunk, flushing so the client can decode it straight away"""
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _Brotli:
+    def __init__(self) -> None:
+        self._compressor = brotli.Compressor(quality=5)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _Zstd:
+    def __init__(self) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=3).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# Preferred first
+CODECS = {"zstd": _Zstd, "br": _Brotli, "gzip": _Gzip}
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """The preferred CODECS encoding an Accept-Encoding header allows, None for none
+
+    Encodings the client gives a q of 0 are refused, "*" allows any other.
+    """
+    allowed = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            allowed[name] = q
+
+    wildcard = allowed.get("*", 0.0)
+    for encoding in CODECS:
+        if allowed.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def compressor(encoding: str):
+    """New streaming compressor for a CODECS encoding, with compress and finish methods"""
+    return CODECS[encoding]()
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) or "+json" in content_type
+
+
+def record_compression(route: str, encoding: str, before: int, after: int) -> None:
+    UNCOMPRESSED_BYTES.inc(route, encoding, amount=before)
+    COMPRESSED_BYTES.inc(route, encoding, amount=after)
+    if after:
+        COMPRESSION_RATIO.observe(before / after, route, encoding)
+
+
+class PrecompressedCache:
+    """Compressed bodies of responses with an ETag, so they're only compressed once
+
+    Keyed by path, query string, encoding and ETag. Entries expire with the
+    response's max-age and the least recently used are evicted past max_bytes.
+
+    Args:
+        max_bytes (int, optional): Total compressed bytes kept. Defaults to 64 MiB.
+    """
+
+    def __init__(self, max_bytes: int = 64 << 20) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[tuple, tuple[float, list, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> tuple[list, bytes] | None:
+        """Headers and body of a cached response, None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, headers, body = entry
+            if time.monotonic() > expires:
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return headers, body
+
+    def put(self, key: tuple, headers: list, body: bytes, ttl_s: float) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl_s, headers, body)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, path_prefix: str = "") -> None:
+        """Drops the responses of paths starting with a prefix, every response by default"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0].startswith(path_prefix)]:
+                self._drop(key)
+
+    def _drop(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[2])
+
+
+precompressed_cache = PrecompressedCache()
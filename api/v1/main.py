@@ -1,18 +1,47 @@
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from api.v1.admission import AdmissionController, RequestClass
+from api.v1.compression import precompressed_cache
+from api.v1.middleware.admission import AdmissionMiddleware
+from api.v1.middleware.compression import CompressionMiddleware
+from api.v1.middleware.metrics import MetricsMiddleware
+from api.v1.middleware.query_budget import QueryBudgetMiddleware
+from api.v1.middleware.read_your_writes import ReadYourWritesMiddleware
+from database.db import compute_pool, dispose_db, init_db
+from database.query_budget import DEFAULT_MAX_REPEATS
+
 from api.v1.routes import (
     competitions,
     match,
     organisations,
     teams,
+    players,
     set,
     elimination_event,
     throw_event,
     catch_event,
+    leaderboards,
+    rosters,
+    analytics,
+    jobs,
+    metrics,
+    internal,
 )
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Connections are opened before traffic arrives rather than on import
+    init_db(warm_up=int(os.getenv("DATABASE_POOL_WARM_UP", "5")))
+    yield
+    compute_pool.shutdown()
+    dispose_db()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # RESTRICT THIS IN DEV TODO
 
@@ -24,11 +53,77 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Staging and test environments can opt in to N+1 detection with "warn" or "raise"
+query_budget_mode = os.getenv("QUERY_BUDGET_MODE", "off")
+if query_budget_mode != "off":
+    app.add_middleware(
+        QueryBudgetMiddleware,
+        mode=query_budget_mode,
+        max_repeats=int(os.getenv("QUERY_BUDGET_MAX_REPEATS", DEFAULT_MAX_REPEATS)),
+    )
+
+
+def _request_class(
+    name: str, priority: int, concurrent: int, queued: int, wait_s: float, **match
+) -> RequestClass:
+    prefix = f"ADMISSION_{name.upper()}"
+    return RequestClass(
+        name=name,
+        priority=priority,
+        max_concurrent=int(os.getenv(f"{prefix}_CONCURRENT", concurrent)),
+        max_queued=int(os.getenv(f"{prefix}_QUEUED", queued)),
+        max_wait_s=float(os.getenv(f"{prefix}_WAIT_S", wait_s)),
+        **match,
+    )
+
+
+# Scorers' writes go first, dashboards polling reads and analytics wait behind them.
+# The overall cap defaults to the database pool's 5 connections plus 10 overflow.
+admission = AdmissionController(
+    classes=[
+        _request_class(
+            "ingest",
+            0,
+            10,
+            100,
+            10.0,
+            methods=frozenset({"POST", "PUT", "PATCH", "DELETE"}),
+            # A lookup sent as a POST for its body, it's read like any other
+            paths=r"^(?!/rosters/resolve$)",
+        ),
+        _request_class("export", 3, 2, 4, 1.0, paths=r"/replay$"),
+        _request_class("analytics", 2, 4, 8, 2.0, paths=r"/analytics/|^/leaderboards/"),
+        _request_class("read", 1, 10, 50, 2.0),
+    ],
+    max_concurrent=int(os.getenv("ADMISSION_MAX_CONCURRENT", "15")),
+    exempt=r"^/(metrics|internal|docs|redoc|openapi\.json)",
+)
+app.add_middleware(AdmissionMiddleware, controller=admission)
+
+# Reuses compressed bodies by ETag, the app still answers each request through the queues
+precompressed_cache.max_bytes = int(os.getenv("COMPRESSION_CACHE_BYTES", 64 << 20))
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+    cache=precompressed_cache,
+)
+
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(organisations.router)
 app.include_router(competitions.router)
 app.include_router(teams.router)
+app.include_router(players.router)
 app.include_router(match.router)
 app.include_router(set.router)
 app.include_router(elimination_event.router)
 app.include_router(throw_event.router)
 app.include_router(catch_event.router)
+app.include_router(leaderboards.router)
+app.include_router(rosters.router)
+app.include_router(analytics.router)
+app.include_router(jobs.router)
+app.include_router(metrics.router)
+app.include_router(internal.router)
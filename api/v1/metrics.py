@@ -0,0 +1,226 @@
+import bisect
+import functools
+import inspect
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from fastapi.routing import APIRoute
+
+from database.instrumentation import current_query_stats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+
+
+def _format_labels(
+    names: tuple[str, ...], values: tuple[str, ...], extra: str = ""
+) -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(
+        self, name: str, description: str, labels: tuple[str, ...] = ()
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.label_names = labels
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        for labels, value in sorted(self._values.items()):
+            lines.append(
+                f"{self.name}{_format_labels(self.label_names, labels)} {value}"
+            )
+        return lines
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name, description, labels=(), buckets=LATENCY_BUCKETS) -> None:
+        super().__init__(name, description, labels)
+        self.buckets = tuple(buckets)
+        # Per label set: counts per bucket, sum, count
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            series = self._series.setdefault(labels, [[0] * len(self.buckets), 0.0, 0])
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        for labels, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = _format_labels(self.label_names, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _format_labels(self.label_names, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {count}")
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {total}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+class Registry:
+    """Holds every metric of the process and renders the Prometheus text format"""
+
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUEST_LATENCY = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Time from receiving a request to the end of its response",
+        ("method", "route", "status"),
+    )
+)
+REQUESTS_IN_FLIGHT = REGISTRY.register(
+    Gauge("http_requests_in_flight", "Requests currently being handled")
+)
+RESPONSE_SIZE = REGISTRY.register(
+    Histogram(
+        "http_response_size_bytes",
+        "Size of response bodies",
+        ("method", "route"),
+        buckets=SIZE_BUCKETS,
+    )
+)
+REQUEST_STATEMENTS = REGISTRY.register(
+    Histogram(
+        "db_statements_per_request",
+        "SQL statements executed per request",
+        ("method", "route"),
+        buckets=STATEMENT_BUCKETS,
+    )
+)
+REQUEST_DB_TIME = REGISTRY.register(
+    Histogram(
+        "db_time_per_request_seconds",
+        "Time spent executing SQL per request",
+        ("method", "route"),
+    )
+)
+
+
+@dataclass
+class RequestTiming:
+    """Handler timings for the current request, filled in by TimedRoute"""
+
+    handler_start: float | None = None
+    handler_end: float | None = None
+    handler_db_time_s: float = 0.0
+
+
+current_request_timing: ContextVar[RequestTiming | None] = ContextVar(
+    "current_request_timing", default=None
+)
+
+
+def _timed_endpoint(endpoint, path: str):
+    """Wraps an endpoint so the handler's own duration is recorded"""
+
+    def start() -> tuple[RequestTiming | None, float]:
+        timing = current_request_timing.get()
+        stats = current_query_stats.get()
+        if stats is not None:
+            # Attribute the request's statements to the route template
+            stats.route = path
+        if timing is not None:
+            timing.handler_start = time.perf_counter()
+        return timing, stats.db_time_s if stats else 0.0
+
+    def finish(timing: RequestTiming | None, db_before: float) -> None:
+        if timing is None:
+            return
+        stats = current_query_stats.get()
+        timing.handler_end = time.perf_counter()
+        timing.handler_db_time_s = (stats.db_time_s if stats else 0.0) - db_before
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            timing, db_before = start()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                finish(timing, db_before)
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        timing, db_before = start()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            finish(timing, db_before)
+
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that records how long the endpoint function itself takes
+
+    Everything between the handler returning and the response starting is
+    response validation and serialisation, which the metrics middleware reports
+    separately in the Server-Timing header.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs) -> None:
+        super().__init__(path, _timed_endpoint(endpoint, path), **kwargs)
@@ -0,0 +1,54 @@
+import json
+import math
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from api.v1.admission import AdmissionController
+
+
+class AdmissionMiddleware:
+    """Holds requests back, or rejects them with a 503, when their class is at capacity
+
+    Args:
+        app (ASGIApp): The wrapped app
+        controller (AdmissionController): Limits and queues per request class
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController) -> None:
+        self.app = app
+        self.controller = controller
+
+    async def _reject(self, send: Send, name: str, retry_after_s: float) -> None:
+        body = json.dumps({"detail": f"Too many {name} requests, retry later"}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(math.ceil(retry_after_s)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_class = self.controller.classify(scope["method"], scope["path"])
+        if request_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.controller.acquire(request_class):
+            await self._reject(
+                send, request_class.name, max(request_class.max_wait_s, 1.0)
+            )
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(request_class)
@@ -0,0 +1,196 @@
+import re
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.v1.compression import (
+    PrecompressedCache,
+    compressor,
+    is_compressible,
+    negotiate,
+    record_compression,
+)
+from api.v1.middleware.metrics import route_label
+
+DEFAULT_CACHE_TTL_S = 3600.0
+
+
+def _cache_ttl(cache_control: str) -> float | None:
+    """Seconds a response may be kept compressed, None if it mustn't be stored"""
+    cache_control = cache_control.lower()
+    if "no-store" in cache_control or "private" in cache_control:
+        return None
+    max_age = re.search(r"max-age=(\d+)", cache_control)
+    return float(max_age.group(1)) if max_age else DEFAULT_CACHE_TTL_S
+
+
+class CompressionMiddleware:
+    """Compresses responses with the best encoding the client accepts
+
+    Bodies under minimum_size are sent as they are. Streamed responses are
+    compressed chunk by chunk and flushed as they go, so clients can decode
+    each chunk on arrival. Complete GET responses with an ETag are kept
+    compressed in a cache keyed by it, and sent from there whenever the app
+    answers with the same ETag again, so they're only compressed once.
+
+    Args:
+        app (ASGIApp): The wrapped app
+        minimum_size (int, optional): Smallest body compressed, in bytes. Defaults to 1024.
+        cache (PrecompressedCache | None, optional): Cache of responses with an ETag. Defaults to None, no caching.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        cache: PrecompressedCache | None = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = (scope["path"], scope["query_string"], encoding)
+        cacheable = self.cache is not None and scope["method"] == "GET"
+        responder = _CompressingResponder(self, scope, send, encoding, key, cacheable)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    """Send wrapper of one response, deciding on its first body chunk whether to compress"""
+
+    def __init__(
+        self,
+        middleware: CompressionMiddleware,
+        scope: Scope,
+        send: Send,
+        encoding: str,
+        key: tuple,
+        cacheable: bool,
+    ) -> None:
+        self.middleware = middleware
+        self.scope = scope
+        self._send = send
+        self.encoding = encoding
+        self.key = key
+        self.cacheable = cacheable
+        self.start: Message | None = None
+        self.compressor = None
+        self.passthrough = False
+        # The app's body is dropped once a cached copy has been sent instead
+        self.sent_cached = False
+        self.before = 0
+        self.after = 0
+
+    def _should_compress(self, message: Message) -> bool:
+        headers = Headers(raw=message["headers"])
+        if message["status"] < 200 or message["status"] in (204, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        if not is_compressible(headers.get("content-type", "")):
+            return False
+        length = headers.get("content-length")
+        return length is None or int(length) >= self.middleware.minimum_size
+
+    def _start_compressed(self) -> MutableHeaders:
+        headers = MutableHeaders(scope=self.start)
+        del headers["content-length"]
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        return headers
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            self.passthrough = not self._should_compress(message)
+            if self.passthrough:
+                await self._send(message)
+            elif await self._send_cached():
+                self.sent_cached = True
+            return
+        if self.sent_cached:
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is None:
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self._send(self.start)
+                await self._send(message)
+                return
+            self.compressor = compressor(self.encoding)
+            headers = self._start_compressed()
+            if not more_body:
+                compressed = self.compressor.compress(body) + self.compressor.finish()
+                headers["content-length"] = str(len(compressed))
+                self._record(len(body), len(compressed))
+                self._store(compressed)
+                await self._send(self.start)
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+            await self._send(self.start)
+
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.finish()
+        self.before += len(body)
+        self.after += len(chunk)
+        if not more_body:
+            self._record(self.before, self.after)
+        await self._send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
+
+    def _record(self, before: int, after: int) -> None:
+        record_compression(route_label(self.scope), self.encoding, before, after)
+
+    def _cache_key(self) -> tuple | None:
+        """Cache key of the response, None if it can't be cached
+
+        The ETag is part of the key, so a new version of a resource never
+        matches the compressed body of an old one, in this process or another.
+        """
+        if not self.cacheable or self.start["status"] != 200:
+            return None
+        etag = Headers(raw=self.start["headers"]).get("etag")
+        return None if etag is None else (*self.key, etag)
+
+    async def _send_cached(self) -> bool:
+        """Sends the cached compressed copy of the response, if there is one
+
+        Only the body comes from the cache. The headers are the ones the app
+        just sent, as CORS and read-your-writes headers differ per request.
+        """
+        key = self._cache_key()
+        cached = None if key is None else self.middleware.cache.get(key)
+        if cached is None:
+            return False
+        _, body = cached
+        headers = self._start_compressed()
+        headers["content-length"] = str(len(body))
+        await self._send(self.start)
+        await self._send({"type": "http.response.body", "body": body})
+        return True
+
+    def _store(self, body: bytes) -> None:
+        key = self._cache_key()
+        if key is None:
+            return
+        headers = Headers(raw=self.start["headers"])
+        ttl_s = _cache_ttl(headers.get("cache-control", ""))
+        if ttl_s is not None:
+            self.middleware.cache.put(key, self.start["headers"], body, ttl_s)
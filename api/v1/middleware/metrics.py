@@ -0,0 +1,87 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.v1.metrics import (
+    REQUEST_DB_TIME,
+    REQUEST_LATENCY,
+    REQUEST_STATEMENTS,
+    REQUESTS_IN_FLIGHT,
+    RESPONSE_SIZE,
+    RequestTiming,
+    current_request_timing,
+)
+from database.instrumentation import track_queries
+
+
+def route_label(scope: Scope) -> str:
+    """Route template such as '/sets/{set_id}', keeps metric label cardinality bounded"""
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+def server_timing(timing: RequestTiming, db_time_s: float, now: float) -> str:
+    """Builds a Server-Timing header splitting db, handler and serialisation time
+
+    Args:
+        timing (RequestTiming): Handler timings recorded by TimedRoute
+        db_time_s (float): Total SQL time of the request so far
+        now (float): perf_counter value when the response started
+
+    Returns:
+        str: Header value with durations in milliseconds
+    """
+    parts = [f"db;dur={db_time_s * 1000:.2f}"]
+    if timing.handler_start is not None and timing.handler_end is not None:
+        handler = timing.handler_end - timing.handler_start - timing.handler_db_time_s
+        parts.append(f"handler;dur={max(handler, 0.0) * 1000:.2f}")
+        parts.append(f"serialise;dur={(now - timing.handler_end) * 1000:.2f}")
+    return ", ".join(parts)
+
+
+class MetricsMiddleware:
+    """Records per route latency, response size and SQL accounting for every request"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        timing = RequestTiming()
+        timing_token = current_request_timing.set(timing)
+        status = 500
+        body_size = 0
+
+        with track_queries(route=scope["path"]) as stats:
+
+            async def send_wrapper(message: Message) -> None:
+                nonlocal status, body_size
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    header = server_timing(timing, stats.db_time_s, time.perf_counter())
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [
+                        (b"server-timing", header.encode("latin-1"))
+                    ]
+                elif message["type"] == "http.response.body":
+                    body_size += len(message.get("body", b""))
+                await send(message)
+
+            REQUESTS_IN_FLIGHT.inc()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                REQUESTS_IN_FLIGHT.dec()
+                current_request_timing.reset(timing_token)
+                method = scope["method"]
+                route = route_label(scope)
+                REQUEST_LATENCY.observe(
+                    time.perf_counter() - started, method, route, str(status)
+                )
+                RESPONSE_SIZE.observe(body_size, method, route)
+                REQUEST_STATEMENTS.observe(stats.statements, method, route)
+                REQUEST_DB_TIME.observe(stats.db_time_s, method, route)
@@ -0,0 +1,82 @@
+import json
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.v1.middleware.metrics import route_label
+from database.query_budget import DEFAULT_MAX_REPEATS, QueryBudget
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetMiddleware:
+    """Checks every request against its route's declared query budget
+
+    Meant for tests and staging. In "warn" mode violations are logged, in "raise"
+    mode the response is replaced by a 500 describing the violation.
+
+    Args:
+        app (ASGIApp): The wrapped app
+        mode (str, optional): "warn" or "raise". Defaults to "warn".
+        max_repeats (int, optional): Repeat limit for routes without a declared budget. Defaults to DEFAULT_MAX_REPEATS.
+    """
+
+    def __init__(
+        self, app: ASGIApp, mode: str = "warn", max_repeats: int = DEFAULT_MAX_REPEATS
+    ) -> None:
+        if mode not in ("warn", "raise"):
+            raise ValueError(f"Unknown query budget mode '{mode}'")
+        self.app = app
+        self.mode = mode
+        self.max_repeats = max_repeats
+
+    def _apply_route_budget(self, scope: Scope, budget: QueryBudget) -> None:
+        endpoint = getattr(scope.get("route"), "endpoint", None)
+        declared = getattr(endpoint, "__query_budget__", None)
+        if declared:
+            budget.max_statements, budget.max_repeats = declared
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        budget = QueryBudget(max_repeats=self.max_repeats, raise_on_exit=False)
+        replaced = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal replaced
+            if replaced:
+                # Drop the original body, the violation response was already sent
+                return
+            if message["type"] == "http.response.start":
+                self._apply_route_budget(scope, budget)
+                problems = budget.violations()
+                if problems:
+                    logger.warning(
+                        "Query budget exceeded for %s %s: %s",
+                        scope["method"],
+                        route_label(scope),
+                        "; ".join(problems),
+                    )
+                    if self.mode == "raise":
+                        replaced = True
+                        body = json.dumps(
+                            {"detail": "Query budget exceeded", "violations": problems}
+                        ).encode()
+                        await send(
+                            {
+                                "type": "http.response.start",
+                                "status": 500,
+                                "headers": [
+                                    (b"content-type", b"application/json"),
+                                    (b"content-length", str(len(body)).encode()),
+                                ],
+                            }
+                        )
+                        await send({"type": "http.response.body", "body": body})
+                        return
+            await send(message)
+
+        with budget:
+            await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,65 @@
+from http.cookies import SimpleCookie
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from database.routing import format_lsn, parse_lsn, read_consistency
+
+LSN_HEADER = "x-last-write-lsn"
+LSN_COOKIE = "last_write_lsn"
+
+
+def _client_lsn(scope: Scope) -> int | None:
+    """Newest write LSN the client has seen, from the header or the cookie"""
+    headers = dict(scope.get("headers") or [])
+    value = headers.get(LSN_HEADER.encode())
+    if value is None and b"cookie" in headers:
+        cookie = SimpleCookie(headers[b"cookie"].decode("latin-1")).get(LSN_COOKIE)
+        value = cookie.value.encode() if cookie else None
+    if not value:
+        return None
+    try:
+        return parse_lsn(value.decode("latin-1"))
+    except ValueError:
+        return None
+
+
+class ReadYourWritesMiddleware:
+    """Lets a client read its own writes when reads are served by a replica
+
+    Responses to requests that committed a write carry the primary's WAL position
+    in an X-Last-Write-LSN header and cookie. Later requests send it back and
+    their read sessions only use the replica once it has replayed that far.
+
+    Args:
+        app (ASGIApp): The wrapped app
+        cookie_max_age_s (int, optional): How long the cookie is kept. Defaults to 60.
+    """
+
+    def __init__(self, app: ASGIApp, cookie_max_age_s: int = 60) -> None:
+        self.app = app
+        self.cookie_max_age_s = cookie_max_age_s
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with read_consistency(min_lsn=_client_lsn(scope)) as consistency:
+
+            async def send_wrapper(message: Message) -> None:
+                if (
+                    message["type"] == "http.response.start"
+                    and consistency.last_write_lsn is not None
+                ):
+                    lsn = format_lsn(consistency.last_write_lsn)
+                    headers = MutableHeaders(scope=message)
+                    headers.append(LSN_HEADER, lsn)
+                    headers.append(
+                        "set-cookie",
+                        f"{LSN_COOKIE}={lsn}; Max-Age={self.cookie_max_age_s}; "
+                        "Path=/; HttpOnly; SameSite=Lax",
+                    )
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,221 @@
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+from api.v1.metrics import TimedRoute
+from database.archive import archived_at
+from database.analytics import AnalyticsUnavailable, EventFrame, throw_heatmap
+from database.compute import ComputeBusy, ComputeTimeout, ResultTooLarge
+from database.db import (
+    analytics_cache,
+    compute_pool,
+    get_db_session,
+    get_read_db_session,
+)
+from database.query_budget import declare_query_budget
+from api.v1.schemas.analytics import (
+    CauseAnalyticsResponse,
+    CourtSideResponse,
+    DistanceBandResponse,
+    HeatmapResponse,
+    PlayerAnalyticsResponse,
+    TeamAnalyticsResponse,
+)
+
+# Archiving is reversible, so archived responses are only reused this long
+ARCHIVED_MAX_AGE_S = int(os.getenv("ARCHIVED_ANALYTICS_MAX_AGE_S", "60"))
+
+router = APIRouter(
+    prefix="/competitions/{competition_id}/analytics",
+    tags=["analytics"],
+    route_class=TimedRoute,
+)
+
+
+def get_event_frame(
+    competition_id: int,
+    response: Response,
+    session: Session = Depends(get_read_db_session),
+    primary: Session = Depends(get_db_session),
+) -> EventFrame:
+    """A competition's events from the in-memory analytics cache
+
+    Misses load from the primary, as a lagging replica would cache a frame
+    without the events that invalidated it for the cache's whole TTL.
+
+    Responses about an archived competition can be cached for a while and
+    carry an ETag of the archive's generation, read from the database on every
+    request. The precompressed cache is keyed on it, so a restore, from any
+    process, stops old bodies being sent.
+
+    Args:
+        competition_id (int): The competition's ID
+        response (Response): The response, to set its Cache-Control header
+        session (Session, optional): sqlalchemy Session, reads the archive generation. Defaults to Depends(get_read_db_session).
+        primary (Session, optional): sqlalchemy Session on the primary, only used on a cache miss. Defaults to Depends(get_db_session).
+
+    Raises:
+        HTTPException_404: Competition not found from ID
+
+    Returns:
+        EventFrame: The competition's events
+    """
+    try:
+        frame = analytics_cache.frame(primary, competition_id)
+    except AnalyticsUnavailable as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    generation = archived_at(session, competition_id)
+    if generation is not None:
+        response.headers["Cache-Control"] = f"public, max-age={ARCHIVED_MAX_AGE_S}"
+        response.headers["ETag"] = (
+            f'W/"archived-{competition_id}-{generation.timestamp():.6f}"'
+        )
+    return frame
+
+
+# A cache miss reads the sets, a possible 404 check, then throws, catches and
+# eliminations, and every request reads the archive generation
+@router.get("/players", response_model=list[PlayerAnalyticsResponse])
+@declare_query_budget(max_statements=6)
+def get_player_analytics(
+    set_id: int | None = None,
+    frame: EventFrame = Depends(get_event_frame),
+) -> list[PlayerAnalyticsResponse]:
+    """Gets every player's totals in a competition
+
+    Args:
+        set_id (int | None, optional): Only events in this set. Defaults to None.
+        frame (EventFrame, optional): The competition's events. Defaults to Depends(get_event_frame).
+
+    Returns:
+        list[PlayerAnalyticsResponse]: One row per player with any events
+    """
+    return frame.player_summary(set_id=set_id)
+
+
+@router.get("/teams", response_model=list[TeamAnalyticsResponse])
+@declare_query_budget(max_statements=6)
+def get_team_analytics(
+    set_id: int | None = None,
+    frame: EventFrame = Depends(get_event_frame),
+) -> list[TeamAnalyticsResponse]:
+    """Gets every team's totals in a competition
+
+    Args:
+        set_id (int | None, optional): Only events in this set. Defaults to None.
+        frame (EventFrame, optional): The competition's events. Defaults to Depends(get_event_frame).
+
+    Returns:
+        list[TeamAnalyticsResponse]: One row per team with any events
+    """
+    return frame.team_summary(set_id=set_id)
+
+
+@router.get("/eliminations", response_model=list[CauseAnalyticsResponse])
+@declare_query_budget(max_statements=6)
+def get_elimination_analytics(
+    team_id: int | None = None,
+    player_id: int | None = None,
+    frame: EventFrame = Depends(get_event_frame),
+) -> list[CauseAnalyticsResponse]:
+    """Gets how players went out in a competition
+
+    Args:
+        team_id (int | None, optional): Only players of this team going out. Defaults to None.
+        player_id (int | None, optional): Only this player going out. Defaults to None.
+        frame (EventFrame, optional): The competition's events. Defaults to Depends(get_event_frame).
+
+    Returns:
+        list[CauseAnalyticsResponse]: Eliminations per cause, most common first
+    """
+    return frame.cause_counts(team_id=team_id, player_id=player_id)
+
+
+@router.get("/distance-bands", response_model=list[DistanceBandResponse])
+@declare_query_budget(max_statements=6)
+def get_distance_band_analytics(
+    team_id: int | None = None,
+    player_id: int | None = None,
+    frame: EventFrame = Depends(get_event_frame),
+) -> list[DistanceBandResponse]:
+    """Gets the hit rate of a competition's throws by how far they were thrown
+
+    Distances come from the throw geometry derived as throws are written.
+
+    Args:
+        team_id (int | None, optional): Only this team's throws. Defaults to None.
+        player_id (int | None, optional): Only this player's throws. Defaults to None.
+        frame (EventFrame, optional): The competition's events. Defaults to Depends(get_event_frame).
+
+    Returns:
+        list[DistanceBandResponse]: One row per band, nearest first
+    """
+    return frame.distance_bands(team_id=team_id, player_id=player_id)
+
+
+@router.get("/court-sides", response_model=list[CourtSideResponse])
+@declare_query_budget(max_statements=6)
+def get_court_side_analytics(
+    team_id: int | None = None,
+    player_id: int | None = None,
+    frame: EventFrame = Depends(get_event_frame),
+) -> list[CourtSideResponse]:
+    """Gets the hit rate of a competition's throws by the side of the court thrown from
+
+    Args:
+        team_id (int | None, optional): Only this team's throws. Defaults to None.
+        player_id (int | None, optional): Only this player's throws. Defaults to None.
+        frame (EventFrame, optional): The competition's events. Defaults to Depends(get_event_frame).
+
+    Returns:
+        list[CourtSideResponse]: One row per court side, right to left
+    """
+    return frame.court_sides(team_id=team_id, player_id=player_id)
+
+
+@router.get("/heatmap", response_model=HeatmapResponse)
+@declare_query_budget(max_statements=6)
+def get_throw_heatmap(
+    team_id: int | None = None,
+    player_id: int | None = None,
+    target: bool = False,
+    bins_x: int = Query(18, ge=1, le=180),
+    bins_y: int = Query(9, ge=1, le=90),
+    frame: EventFrame = Depends(get_event_frame),
+) -> HeatmapResponse:
+    """Gets where a competition's throws came from, or were aimed, and how often they hit
+
+    The grid is computed in the compute pool, so large competitions don't hold
+    up other requests.
+
+    Args:
+        team_id (int | None, optional): Only this team's throws. Defaults to None.
+        player_id (int | None, optional): Only this player's throws. Defaults to None.
+        target (bool, optional): Bin target locations instead of throw origins. Defaults to False.
+        bins_x (int, optional): Cells along the court. Defaults to Query(18, ge=1, le=180).
+        bins_y (int, optional): Cells across the court. Defaults to Query(9, ge=1, le=90).
+        frame (EventFrame, optional): The competition's events. Defaults to Depends(get_event_frame).
+
+    Raises:
+        HTTPException_503: Too many computations already pending
+        HTTPException_504: The heatmap took too long to compute
+        HTTPException_413: The heatmap is too large to return
+
+    Returns:
+        HeatmapResponse: Throws, hits and hit rate per cell
+    """
+    locations = frame.throw_locations(team_id, player_id, target)
+    try:
+        return compute_pool.run(throw_heatmap, *locations, bins_x, bins_y)
+    except ComputeBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+    except ComputeTimeout as e:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
+    except ResultTooLarge as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e)
+        )
@@ -1,17 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from database.repositories.catch_event import CatchEventRepository, get_catch_event_repo
+from api.v1.metrics import TimedRoute
+from database.query_budget import declare_query_budget
+from database.repositories.catch_event import (
+    CatchEventRepository,
+    get_catch_event_repo,
+    get_catch_event_read_repo,
+)
 from api.v1.schemas.catch_event import (
     CatchEventResponse,
     CatchEventCreate,
     CatchEventUpdate,
 )
 
-router = APIRouter(prefix="/catch-events", tags=["catch-events"])
+router = APIRouter(
+    prefix="/catch-events", tags=["catch-events"], route_class=TimedRoute
+)
 
 
 @router.get("/", response_model=list[CatchEventResponse])
+@declare_query_budget(max_statements=1)
 def read_all(
-    repo: CatchEventRepository = Depends(get_catch_event_repo),
+    repo: CatchEventRepository = Depends(get_catch_event_read_repo),
 ) -> list[CatchEventResponse]:
     """Gets all catch events
 
@@ -21,14 +30,14 @@ def read_all(
     Returns:
         list[CatchEventResponse]: A list of all catch events in db
     """
-    all_catches = repo.get_all()
+    all_catches = repo.get_all(include_archive=True)
     return all_catches
 
 
 @router.get("/{catch_id}", response_model=CatchEventResponse)
 def get_catch_event(
     catch_id: int,
-    repo: CatchEventRepository = Depends(get_catch_event_repo),
+    repo: CatchEventRepository = Depends(get_catch_event_read_repo),
 ) -> CatchEventResponse:
     """Gets one catch event based on id
 
@@ -42,7 +51,7 @@ def get_catch_event(
     Returns:
         CatchEventResponse: A catch event
     """
-    catch_event = repo.get_one(id=catch_id)
+    catch_event = repo.get_one(id=catch_id, include_archive=True)
     if not catch_event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -52,9 +61,10 @@ def get_catch_event(
 
 
 @router.get("/set/{set_id}", response_model=list[CatchEventResponse])
+@declare_query_budget(max_statements=1)
 def get_catches_by_set(
     set_id: int,
-    repo: CatchEventRepository = Depends(get_catch_event_repo),
+    repo: CatchEventRepository = Depends(get_catch_event_read_repo),
 ) -> list[CatchEventResponse]:
     """Gets all catch events for a specific set
 
@@ -65,7 +75,7 @@ def get_catches_by_set(
     Returns:
         list[CatchEventResponse]: A list of catch events for the specified set
     """
-    catches = repo.get_all(set_id=set_id)
+    catches = repo.get_all(set_id=set_id, include_archive=True)
     return catches
 
 
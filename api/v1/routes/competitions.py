@@ -1,29 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from api.v1.batch import create_batch
+from api.v1.metrics import TimedRoute
+from database.archive import ArchiveError, archive_competition, restore_competition
+from database.db import standings_cache
+from database.fixtures import round_robin, slot_fixtures
+from database.models.competition import CompetitionFormat
+from database.models.match import MatchStatus
+from database.query_budget import declare_query_budget
 from database.repositories.competition import (
     CompetitionRepository,
     get_competition_repo,
+    get_competition_read_repo,
 )
+from database.repositories.competition_standing import (
+    CompetitionStandingRepository,
+    get_competition_standing_repo,
+)
+from database.repositories.match import MatchRepository, get_match_repo
 from database.repositories.organisation import (
     OrganisationRepository,
     get_organisation_repo,
 )
+from database.repositories.team import TeamRepository, get_team_repo
+from database.repositories.team_competition import (
+    TeamCompetitionRepository,
+    get_team_competition_repo,
+)
+from api.v1.schemas.batch import BatchResponse
 from api.v1.schemas.competition import (
     CompetitionResponse,
     CompetitionCreate,
     CompetitionUpdate,
 )
+from api.v1.schemas.archive import ArchivedCompetitionResponse
+from api.v1.schemas.competition_standing import CompetitionStandingResponse
+from api.v1.schemas.fixture import (
+    FixtureGenerate,
+    FixtureListResponse,
+    FixtureResponse,
+)
+from api.v1.schemas.team_competition import TeamEntryBatchCreate
 
-router = APIRouter(prefix="/competitions", tags=["competitions"])
+router = APIRouter(
+    prefix="/competitions", tags=["competitions"], route_class=TimedRoute
+)
 
 
 @router.get("/", response_model=list[CompetitionResponse])
+@declare_query_budget(max_statements=1)
 def read_all(
-    repo: CompetitionRepository = Depends(get_competition_repo),
+    repo: CompetitionRepository = Depends(get_competition_read_repo),
 ) -> list[CompetitionResponse]:
     """Gets all competitions
 
     Args:
-        repo (CompetitionRepository, optional): A object of the CompetitionRepo that handles DB actions. Defaults to Depends(get_competition_repo).
+        repo (CompetitionRepository, optional): A object of the CompetitionRepo that handles DB actions. Defaults to Depends(get_competition_read_repo).
 
     Returns:
         list[CompetitionResponse]: A list of all competitions in db
@@ -35,13 +66,13 @@ def read_all(
 @router.get("/{competition_id}", response_model=CompetitionResponse)
 def get_competition(
     competition_id: int,
-    repo: CompetitionRepository = Depends(get_competition_repo),
+    repo: CompetitionRepository = Depends(get_competition_read_repo),
 ) -> CompetitionResponse:
     """Gets one competition based on id
 
     Args:
         competition_id (int): The competition's ID
-        repo (CompetitionRepository, optional): A object of the CompetitionRepo that handles DB actions. Defaults to Depends(get_competition_repo).
+        repo (CompetitionRepository, optional): A object of the CompetitionRepo that handles DB actions. Defaults to Depends(get_competition_read_repo).
 
     Raises:
         HTTPException_404: Competition not found from ID
@@ -58,6 +89,64 @@ def get_competition(
     return competition
 
 
+@router.get(
+    "/{competition_id}/standings", response_model=list[CompetitionStandingResponse]
+)
+@declare_query_budget(max_statements=2)
+def get_standings(
+    competition_id: int,
+    repo: CompetitionRepository = Depends(get_competition_repo),
+    standing_repo: CompetitionStandingRepository = Depends(
+        get_competition_standing_repo
+    ),
+) -> list[CompetitionStandingResponse]:
+    """Gets a league's standings table
+
+    The table is maintained as results are written and cached in memory until
+    the next result in the competition, so most reads don't touch the database.
+    Misses read the primary, a lagging replica would cache a table without
+    the result that invalidated it.
+
+    Args:
+        competition_id (int): The competition's ID
+        repo (CompetitionRepository, optional): A object of the CompetitionRepo that handles DB actions. Defaults to Depends(get_competition_repo).
+        standing_repo (CompetitionStandingRepository, optional): A object of the CompetitionStandingRepo that handles DB actions. Defaults to Depends(get_competition_standing_repo).
+
+    Raises:
+        HTTPException_404: Competition not found from ID
+        HTTPException_400: Competition is not a league
+
+    Returns:
+        list[CompetitionStandingResponse]: The teams in table order
+    """
+    cached = standings_cache.get(competition_id)
+    if cached is not None:
+        return cached
+    generation = standings_cache.generation(competition_id)
+
+    competition = repo.get_one(id=competition_id)
+    if not competition:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Competition with ID {competition_id} not found",
+        )
+    if competition.competition_format != CompetitionFormat.LEAGUE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Competition with ID {competition_id} is not a league",
+        )
+
+    columns = CompetitionStandingResponse.model_fields.keys() - {"position"}
+    table = [
+        CompetitionStandingResponse(
+            position=position, **{name: getattr(row, name) for name in columns}
+        )
+        for position, row in enumerate(standing_repo.get_table(competition_id), 1)
+    ]
+    standings_cache.put(competition_id, table, generation)
+    return table
+
+
 @router.post(
     "/", response_model=CompetitionResponse, status_code=status.HTTP_201_CREATED
 )
@@ -209,3 +298,223 @@ def delete_competition(
         )
 
     return
+
+
+@router.post(
+    "/{competition_id}/archive",
+    response_model=ArchivedCompetitionResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def archive(
+    competition_id: int,
+    repo: CompetitionRepository = Depends(get_competition_repo),
+) -> ArchivedCompetitionResponse:
+    """Moves a finished competition's events to the archive tables
+
+    Archived events are still returned by the event routes but can no longer be
+    updated or deleted until the competition is restored.
+
+    Args:
+        competition_id (int): The competition's ID
+        repo (CompetitionRepository, optional): A object of the CompetitionRepo that handles DB actions. Defaults to Depends(get_competition_repo).
+
+    Raises:
+        HTTPException_404: Competition not found
+        HTTPException_409: Competition already archived or still has live or scheduled matches
+
+    Returns:
+        ArchivedCompetitionResponse: The archive record with the moved row counts
+    """
+    if not repo.get_one(id=competition_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Competition with ID {competition_id} not found",
+        )
+
+    try:
+        return archive_competition(repo.db_session, competition_id)
+    except ArchiveError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.delete("/{competition_id}/archive", response_model=ArchivedCompetitionResponse)
+def restore(
+    competition_id: int,
+    repo: CompetitionRepository = Depends(get_competition_repo),
+) -> ArchivedCompetitionResponse:
+    """Moves an archived competition's events back to the hot tables
+
+    Args:
+        competition_id (int): The competition's ID
+        repo (CompetitionRepository, optional): A object of the CompetitionRepo that handles DB actions. Defaults to Depends(get_competition_repo).
+
+    Raises:
+        HTTPException_404: Competition not found or not archived
+
+    Returns:
+        ArchivedCompetitionResponse: The removed archive record
+    """
+    try:
+        record = restore_competition(repo.db_session, competition_id)
+    except ArchiveError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return record
+
+
+@router.post(
+    "/{competition_id}/teams:batch",
+    response_model=BatchResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def enter_teams(
+    competition_id: int,
+    batch: TeamEntryBatchCreate,
+    repo: CompetitionRepository = Depends(get_competition_repo),
+    team_repo: TeamRepository = Depends(get_team_repo),
+    entry_repo: TeamCompetitionRepository = Depends(get_team_competition_repo),
+) -> BatchResponse:
+    """Enters many teams into a competition in one transaction
+
+    Teams and existing entries are each checked in one query. Rejected entries
+    are reported and the rest created, unless the batch is atomic.
+
+    Args:
+        competition_id (int): The competition's ID
+        batch (TeamEntryBatchCreate): The teams and whether the batch is atomic
+        repo (CompetitionRepository, optional): A object of the CompetitionRepo that handles DB actions. Defaults to Depends(get_competition_repo).
+        team_repo (TeamRepository, optional): A object of the TeamRepo to validate teams exist. Defaults to Depends(get_team_repo).
+        entry_repo (TeamCompetitionRepository, optional): A object of the TeamCompetitionRepo that handles DB actions. Defaults to Depends(get_team_competition_repo).
+
+    Raises:
+        HTTPException_404: Competition not found from ID
+        HTTPException_422: Atomic batch with rejected entries
+
+    Returns:
+        BatchResponse: Every entry's ID or error, in request order
+    """
+    if not repo.get_one(id=competition_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Competition with ID {competition_id} not found",
+        )
+
+    team_ids = [item.team_id for item in batch.items]
+    teams = team_repo.existing_ids(team_ids)
+    entered = entry_repo.entered_team_ids(competition_id, team_ids)
+
+    errors = {}
+    for index, item in enumerate(batch.items):
+        if item.team_id not in teams:
+            errors[index] = f"Team with ID {item.team_id} not found"
+        elif item.team_id in entered:
+            errors[index] = (
+                f"Team with ID {item.team_id} already entered in the competition"
+            )
+        entered.add(item.team_id)
+
+    rows = [
+        {
+            "competition_id": competition_id,
+            **item.model_dump(exclude_none=True),
+        }
+        for item in batch.items
+    ]
+    return create_batch(entry_repo, rows, errors, batch.atomic)
+
+
+@router.post(
+    "/{competition_id}/fixtures",
+    response_model=FixtureListResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def generate_fixtures(
+    competition_id: int,
+    options: FixtureGenerate,
+    response: Response,
+    repo: CompetitionRepository = Depends(get_competition_repo),
+    entry_repo: TeamCompetitionRepository = Depends(get_team_competition_repo),
+    match_repo: MatchRepository = Depends(get_match_repo),
+) -> FixtureListResponse:
+    """Creates a league's round robin fixtures from the teams entered in it
+
+    The entered teams are read in one query and every match is inserted in one
+    transaction, with the competition locked from the check for existing
+    matches to the insert. A dry run returns the fixtures without creating them.
+
+    Args:
+        competition_id (int): The competition's ID
+        options (FixtureGenerate): Schedule shape, start and whether it's a dry run
+        response (Response): Set to 200 for a dry run
+        repo (CompetitionRepository, optional): A object of the CompetitionRepo that handles DB actions. Defaults to Depends(get_competition_repo).
+        entry_repo (TeamCompetitionRepository, optional): A object of the TeamCompetitionRepo to read the entered teams. Defaults to Depends(get_team_competition_repo).
+        match_repo (MatchRepository, optional): A object of the MatchRepo that handles DB actions. Defaults to Depends(get_match_repo).
+
+    Raises:
+        HTTPException_404: Competition not found from ID
+        HTTPException_400: Competition is not a league or has fewer than two teams
+        HTTPException_409: Competition already has matches
+
+    Returns:
+        FixtureListResponse: Every fixture in round and slot order
+    """
+    competition = repo.get_one(id=competition_id)
+    if not competition:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Competition with ID {competition_id} not found",
+        )
+    if competition.competition_format != CompetitionFormat.LEAGUE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Competition with ID {competition_id} is not a league",
+        )
+
+    team_ids = entry_repo.team_ids(competition_id)
+    if len(team_ids) < 2:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Competition with ID {competition_id} has fewer than two teams entered",
+        )
+
+    rounds = round_robin(team_ids, double=options.double_round_robin)
+    fixtures = slot_fixtures(
+        rounds,
+        options.start,
+        days_between_rounds=options.days_between_rounds,
+        courts=options.courts,
+        match_minutes=options.match_minutes,
+    )
+    results = [FixtureResponse.model_validate(fixture) for fixture in fixtures]
+
+    if options.dry_run:
+        response.status_code = status.HTTP_200_OK
+    else:
+        # Generating twice would schedule every pairing again, the lock makes a
+        # concurrent request wait and then see this one's matches
+        repo.lock(competition_id)
+        if match_repo.has_matches(competition_id):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Competition with ID {competition_id} already has matches",
+            )
+        ids = match_repo.create_many(
+            [
+                {
+                    "competition_id": competition_id,
+                    "team1_id": fixture.team1_id,
+                    "team2_id": fixture.team2_id,
+                    "match_date": fixture.match_date,
+                    "status": MatchStatus.SCHEDULED,
+                }
+                for fixture in fixtures
+            ]
+        )
+        for result, match_id in zip(results, ids):
+            result.id = match_id
+
+    return FixtureListResponse(
+        competition_id=competition_id,
+        dry_run=options.dry_run,
+        rounds=len(rounds),
+        fixtures=results,
+    )
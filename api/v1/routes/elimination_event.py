@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from api.v1.metrics import TimedRoute
+from database.query_budget import declare_query_budget
 from database.repositories.elimination_event import (
     EliminationEventRepository,
     get_elimination_event_repo,
+    get_elimination_event_read_repo,
 )
 from api.v1.schemas.elimination_event import (
     EliminationEventResponse,
@@ -9,12 +12,15 @@ from api.v1.schemas.elimination_event import (
     EliminationEventUpdate,
 )
 
-router = APIRouter(prefix="/elimination-events", tags=["elimination-events"])
+router = APIRouter(
+    prefix="/elimination-events", tags=["elimination-events"], route_class=TimedRoute
+)
 
 
 @router.get("/", response_model=list[EliminationEventResponse])
+@declare_query_budget(max_statements=1)
 def read_all(
-    repo: EliminationEventRepository = Depends(get_elimination_event_repo),
+    repo: EliminationEventRepository = Depends(get_elimination_event_read_repo),
 ) -> list[EliminationEventResponse]:
     """Gets all elimination events
 
@@ -24,14 +30,14 @@ def read_all(
     Returns:
         list[EliminationEventResponse]: A list of all elimination events in db
     """
-    all_eliminations = repo.get_all()
+    all_eliminations = repo.get_all(include_archive=True)
     return all_eliminations
 
 
 @router.get("/{elimination_id}", response_model=EliminationEventResponse)
 def get_elimination_event(
     elimination_id: int,
-    repo: EliminationEventRepository = Depends(get_elimination_event_repo),
+    repo: EliminationEventRepository = Depends(get_elimination_event_read_repo),
 ) -> EliminationEventResponse:
     """Gets one elimination event based on id
 
@@ -45,7 +51,7 @@ def get_elimination_event(
     Returns:
         EliminationEventResponse: An elimination event
     """
-    elimination = repo.get_one(id=elimination_id)
+    elimination = repo.get_one(id=elimination_id, include_archive=True)
     if not elimination:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
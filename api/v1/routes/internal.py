@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Response, status
+from api.v1.metrics import TimedRoute
+from api.v1.schemas.health import ReadinessResponse
+from api.v1.schemas.slow_query import SlowQueryResponse
+from database.db import pool_health, slow_query_recorder
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    route_class=TimedRoute,
+    include_in_schema=False,
+)
+
+
+@router.get("/slow-queries", response_model=list[SlowQueryResponse])
+def read_slow_queries() -> list[SlowQueryResponse]:
+    """Gets the most recent slow queries of this worker process
+
+    Returns:
+        list[SlowQueryResponse]: Slow queries, newest first
+    """
+    return slow_query_recorder.records()
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def clear_slow_queries() -> None:
+    """Empties the slow query ring buffer"""
+    slow_query_recorder.clear()
+
+
+@router.get("/live", status_code=status.HTTP_204_NO_CONTENT)
+def live() -> None:
+    """Liveness probe, answers whenever the process can handle requests
+
+    The database isn't checked, restarting the process wouldn't fix it.
+    """
+
+
+@router.get("/ready", response_model=ReadinessResponse)
+def ready(response: Response) -> ReadinessResponse:
+    """Readiness probe, checks the connection pools are started and answering
+
+    Only the primary decides readiness, reads fall back to it when the replica
+    is down.
+
+    Args:
+        response (Response): The response, to set a 503 when not ready
+
+    Returns:
+        ReadinessResponse: Usage and health of each pool
+    """
+    pools = pool_health()
+    is_ready = pools["primary"] is not None and pools["primary"]["ok"]
+    if not is_ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"ready": is_ready, **pools}
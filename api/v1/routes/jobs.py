@@ -0,0 +1,89 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from api.v1.metrics import TimedRoute
+from database.jobs import JobError
+from database.models.job import JobKind, JobStatus
+from database.query_budget import declare_query_budget
+from database.repositories.job import JobRepository, get_job_read_repo, get_job_repo
+from api.v1.schemas.job import JobCreate, JobResponse
+
+router = APIRouter(prefix="/jobs", tags=["jobs"], route_class=TimedRoute)
+
+
+@router.post("/", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def enqueue_job(
+    job_data: JobCreate,
+    repo: JobRepository = Depends(get_job_repo),
+) -> JobResponse:
+    """Queues heavy work for the background workers
+
+    Identical jobs still waiting to run are not queued twice, the existing job
+    is returned, keeping the higher priority.
+
+    Args:
+        job_data (JobCreate): The kind of job and its arguments
+        repo (JobRepository, optional): A object of the JobRepo that handles DB actions. Defaults to Depends(get_job_repo).
+
+    Raises:
+        HTTPException_400: Arguments the kind of job doesn't take
+
+    Returns:
+        JobResponse: The queued job, poll GET /jobs/{job_id} for its status
+    """
+    try:
+        return repo.enqueue(
+            job_data.kind,
+            job_data.arguments,
+            priority=job_data.priority,
+            max_attempts=job_data.max_attempts,
+        )
+    except JobError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/", response_model=list[JobResponse])
+@declare_query_budget(max_statements=1)
+def read_recent(
+    kind: JobKind | None = None,
+    job_status: JobStatus | None = Query(None, alias="status"),
+    limit: int = Query(50, ge=1, le=500),
+    repo: JobRepository = Depends(get_job_read_repo),
+) -> list[JobResponse]:
+    """Gets the newest jobs
+
+    Args:
+        kind (JobKind | None, optional): Only this kind of job. Defaults to None.
+        job_status (JobStatus | None, optional): Only jobs in this status. Defaults to None.
+        limit (int, optional): Most jobs returned, at most 500. Defaults to 50.
+        repo (JobRepository, optional): A object of the JobRepo that handles DB actions. Defaults to Depends(get_job_read_repo).
+
+    Returns:
+        list[JobResponse]: Jobs, newest first
+    """
+    return repo.get_recent(kind=kind, status=job_status, limit=limit)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+@declare_query_budget(max_statements=1)
+def get_job(
+    job_id: int,
+    repo: JobRepository = Depends(get_job_read_repo),
+) -> JobResponse:
+    """Gets a job's status
+
+    Args:
+        job_id (int): The job's ID
+        repo (JobRepository, optional): A object of the JobRepo that handles DB actions. Defaults to Depends(get_job_read_repo).
+
+    Raises:
+        HTTPException_404: Job not found from ID
+
+    Returns:
+        JobResponse: The job
+    """
+    job = repo.get_one(id=job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with ID {job_id} not found",
+        )
+    return job
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, Query
+from api.v1.metrics import TimedRoute
+from database.models.competition import AgeCategory, CourtSize
+from database.models.player_competition_stats import LeaderboardMetric
+from database.query_budget import declare_query_budget
+from database.repositories.player_competition_stats import (
+    PlayerCompetitionStatsRepository,
+    get_player_competition_stats_read_repo,
+)
+from api.v1.schemas.leaderboard import LeaderboardEntryResponse
+
+router = APIRouter(
+    prefix="/leaderboards", tags=["leaderboards"], route_class=TimedRoute
+)
+
+
+@router.get("/{metric}", response_model=list[LeaderboardEntryResponse])
+@declare_query_budget(max_statements=1)
+def get_leaderboard(
+    metric: LeaderboardMetric,
+    competition_id: int | None = None,
+    age_category: AgeCategory | None = None,
+    court_size: CourtSize | None = None,
+    min_attempts: int = Query(10, ge=1),
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    repo: PlayerCompetitionStatsRepository = Depends(
+        get_player_competition_stats_read_repo
+    ),
+) -> list[LeaderboardEntryResponse]:
+    """Gets the top players by eliminations, catches, hit rate or rebound catches
+
+    Served from the player stats maintained on every event write, never from
+    the raw events. Filters combine, with none every competition is ranked.
+
+    Args:
+        metric (LeaderboardMetric): The stat to rank by
+        competition_id (int | None, optional): Only this competition. Defaults to None.
+        age_category (AgeCategory | None, optional): Only competitions in this age category. Defaults to None.
+        court_size (CourtSize | None, optional): Only competitions on this court size. Defaults to None.
+        min_attempts (int, optional): Fewest valid throws to be ranked by hit rate. Defaults to 10.
+        limit (int, optional): Players per page, at most 100. Defaults to 10.
+        offset (int, optional): Players to skip for later pages. Defaults to 0.
+        repo (PlayerCompetitionStatsRepository, optional): A object of the PlayerCompetitionStatsRepo that handles DB actions. Defaults to Depends(get_player_competition_stats_read_repo).
+
+    Returns:
+        list[LeaderboardEntryResponse]: One page of the leaderboard, best first
+    """
+    return repo.get_leaderboard(
+        metric,
+        competition_id=competition_id,
+        age_category=age_category,
+        court_size=court_size,
+        min_attempts=min_attempts,
+        limit=limit,
+        offset=offset,
+    )
@@ -1,26 +1,39 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from api.v1.batch import create_batch
+from api.v1.metrics import TimedRoute
 from database.repositories.match import (
     MatchRepository,
     get_match_repo,
+    get_match_read_repo,
 )
-from database.repositories.team import get_team_repo, TeamRepository
+from database.repositories.team import (
+    get_team_repo,
+    get_team_read_repo,
+    TeamRepository,
+)
+from database.repositories.competition import (
+    CompetitionRepository,
+    get_competition_repo,
+)
+from api.v1.schemas.batch import BatchResponse
 from api.v1.schemas.match import (
+    MatchBatchCreate,
     MatchResponse,
     MatchCreate,
     MatchUpdate,
 )
 
-router = APIRouter(prefix="/matches", tags=["matches"])
+router = APIRouter(prefix="/matches", tags=["matches"], route_class=TimedRoute)
 
 
 @router.get("/", response_model=list[MatchResponse])
 def read_all(
-    repo: MatchRepository = Depends(get_match_repo),
+    repo: MatchRepository = Depends(get_match_read_repo),
 ) -> list[MatchResponse]:
     """Gets all of the matches
 
     Args:
-        repo (MatchRepository, optional): A object of the MatchRepo that handles DB actions. Defaults to Depends(get_match_repo).
+        repo (MatchRepository, optional): A object of the MatchRepo that handles DB actions. Defaults to Depends(get_match_read_repo).
 
     Returns:
         list[MatchResponse]: A list of all matches in db
@@ -34,13 +47,13 @@ def read_all(
 @router.get("/{match_id}", response_model=MatchResponse)
 def get_match(
     match_id: int,
-    repo: MatchRepository = Depends(get_match_repo),
+    repo: MatchRepository = Depends(get_match_read_repo),
 ) -> MatchResponse:
     """Gets one match based on id
 
     Args:
         match_id (int): The match's ID
-        repo (MatchRepository, optional): A object of the MatchRepo that handles DB actions. Defaults to Depends(get_match_repo).
+        repo (MatchRepository, optional): A object of the MatchRepo that handles DB actions. Defaults to Depends(get_match_read_repo).
 
     Raises:
         HTTPException_404: Match not found from ID
@@ -113,6 +126,57 @@ def create_match(
     return new_match
 
 
+@router.post(
+    ":batch", response_model=BatchResponse, status_code=status.HTTP_201_CREATED
+)
+def create_matches(
+    batch: MatchBatchCreate,
+    repo: MatchRepository = Depends(get_match_repo),
+    team_repo: TeamRepository = Depends(get_team_repo),
+    competition_repo: CompetitionRepository = Depends(get_competition_repo),
+) -> BatchResponse:
+    """Creates many matches in one transaction, such as a competition's fixture list
+
+    Competitions and teams are each checked in one query. Rejected matches are
+    reported and the rest created, unless the batch is atomic.
+
+    Args:
+        batch (MatchBatchCreate): The matches and whether the batch is atomic
+        repo (MatchRepository, optional): A object of the MatchRepo that handles DB actions. Defaults to Depends(get_match_repo).
+        team_repo (TeamRepository, optional): A object of the TeamRepo to validate teams exist. Defaults to Depends(get_team_repo).
+        competition_repo (CompetitionRepository, optional): A object of the CompetitionRepo to validate competitions exist. Defaults to Depends(get_competition_repo).
+
+    Raises:
+        HTTPException_422: Atomic batch with rejected matches
+
+    Returns:
+        BatchResponse: Every match's ID or error, in request order
+    """
+    competitions = competition_repo.existing_ids(
+        item.competition_id for item in batch.items
+    )
+    teams = team_repo.existing_ids(
+        team_id for item in batch.items for team_id in (item.team1_id, item.team2_id)
+    )
+
+    errors = {}
+    for index, item in enumerate(batch.items):
+        missing = [
+            team_id
+            for team_id in (item.team1_id, item.team2_id)
+            if team_id not in teams
+        ]
+        if item.competition_id not in competitions:
+            errors[index] = f"Competition with ID {item.competition_id} not found"
+        elif missing:
+            errors[index] = f"Team with ID {missing[0]} not found"
+        elif item.team1_id == item.team2_id:
+            errors[index] = "A team cannot play against itself"
+
+    rows = [item.model_dump() for item in batch.items]
+    return create_batch(repo, rows, errors, batch.atomic)
+
+
 @router.put("/{match_id}", response_model=MatchResponse)
 def update_match(
     match_id: int,
@@ -223,13 +287,13 @@ def delete_match(
 @router.get("/competition/{competition_id}", response_model=list[MatchResponse])
 def get_matches_by_competition(
     competition_id: int,
-    repo: MatchRepository = Depends(get_match_repo),
+    repo: MatchRepository = Depends(get_match_read_repo),
 ) -> list[MatchResponse]:
     """Gets all matches for a specific competition
 
     Args:
         competition_id (int): The competition's ID
-        repo (MatchRepository, optional): A object of the MatchRepo that handles DB actions. Defaults to Depends(get_match_repo).
+        repo (MatchRepository, optional): A object of the MatchRepo that handles DB actions. Defaults to Depends(get_match_read_repo).
 
     Returns:
         list[MatchResponse]: A list of matches for the competition
@@ -241,15 +305,15 @@ def get_matches_by_competition(
 @router.get("/team/{team_id}", response_model=list[MatchResponse])
 def get_matches_by_team(
     team_id: int,
-    repo: MatchRepository = Depends(get_match_repo),
-    team_repo: TeamRepository = Depends(get_team_repo),
+    repo: MatchRepository = Depends(get_match_read_repo),
+    team_repo: TeamRepository = Depends(get_team_read_repo),
 ) -> list[MatchResponse]:
     """Gets all matches for a specific team
 
     Args:
         team_id (int): The team's ID
-        repo (MatchRepository, optional): A object of the MatchRepo that handles DB actions. Defaults to Depends(get_match_repo).
-        team_repo (TeamRepository, optional): A object of the TeamRepo to validate team exists. Defaults to Depends(get_team_repo).
+        repo (MatchRepository, optional): A object of the MatchRepo that handles DB actions. Defaults to Depends(get_match_read_repo).
+        team_repo (TeamRepository, optional): A object of the TeamRepo to validate team exists. Defaults to Depends(get_team_read_repo).
 
     Raises:
         HTTPException_404: Team not found
@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from api.v1.metrics import REGISTRY, TimedRoute
+
+router = APIRouter(tags=["metrics"], route_class=TimedRoute)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def read_metrics() -> PlainTextResponse:
+    """Exposes request and SQL metrics in the Prometheus text format
+
+    Returns:
+        PlainTextResponse: Metrics of this worker process
+    """
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
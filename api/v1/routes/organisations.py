@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from api.v1.metrics import TimedRoute
+from database.query_budget import declare_query_budget
 from database.repositories.organisation import (
     OrganisationRepository,
     get_organisation_repo,
+    get_organisation_read_repo,
 )
 from api.v1.schemas.organisation import (
     OrganisationResponse,
@@ -9,17 +12,20 @@ from api.v1.schemas.organisation import (
     OrganisationUpdate,
 )
 
-router = APIRouter(prefix="/organisations", tags=["organisations"])
+router = APIRouter(
+    prefix="/organisations", tags=["organisations"], route_class=TimedRoute
+)
 
 
 @router.get("/", response_model=list[OrganisationResponse])
+@declare_query_budget(max_statements=1)
 def read_all(
-    repo: OrganisationRepository = Depends(get_organisation_repo),
+    repo: OrganisationRepository = Depends(get_organisation_read_repo),
 ) -> list[OrganisationResponse]:
     """Gets all of the organisations
 
     Args:
-        repo (OrganisationRepository, optional): A object of the OrganisationRepo that handles DB actions. Defaults to Depends(get_organisation_repo).
+        repo (OrganisationRepository, optional): A object of the OrganisationRepo that handles DB actions. Defaults to Depends(get_organisation_read_repo).
 
     Returns:
         list[OrganisationResponse]: A list of all organisations in db
@@ -33,13 +39,13 @@ def read_all(
 @router.get("/{organisation_id}", response_model=OrganisationResponse)
 def get_organisation(
     organisation_id: int,
-    repo: OrganisationRepository = Depends(get_organisation_repo),
+    repo: OrganisationRepository = Depends(get_organisation_read_repo),
 ) -> OrganisationResponse:
     """Gets one organisation based on id
 
     Args:
         organisation_id (int): The organisation's ID
-        repo (OrganisationRepository, optional): A object of the OrganisationRepo that handles DB actions. Defaults to Depends(get_organisation_repo).
+        repo (OrganisationRepository, optional): A object of the OrganisationRepo that handles DB actions. Defaults to Depends(get_organisation_read_repo).
 
     Raises:
         HTTPException_404: Organisation not found from ID
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, status
+from api.v1.batch import create_batch
+from api.v1.metrics import TimedRoute
+from database.repositories.player import PlayerRepository, get_player_repo
+from api.v1.schemas.batch import BatchResponse
+from api.v1.schemas.player import PlayerBatchCreate
+
+router = APIRouter(prefix="/players", tags=["players"], route_class=TimedRoute)
+
+
+@router.post(
+    ":batch", response_model=BatchResponse, status_code=status.HTTP_201_CREATED
+)
+def create_players(
+    batch: PlayerBatchCreate,
+    repo: PlayerRepository = Depends(get_player_repo),
+) -> BatchResponse:
+    """Creates many players in one transaction
+
+    Args:
+        batch (PlayerBatchCreate): The players and whether the batch is atomic
+        repo (PlayerRepository, optional): A object of the PlayerRepo that handles DB actions. Defaults to Depends(get_player_repo).
+
+    Returns:
+        BatchResponse: Every player's ID, in request order
+    """
+    rows = [item.model_dump() for item in batch.items]
+    return create_batch(repo, rows, {}, batch.atomic)
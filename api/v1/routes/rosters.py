@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends
+from api.v1.metrics import TimedRoute
+from database.query_budget import declare_query_budget
+from database.repositories.player_team_history import (
+    PlayerTeamHistoryRepository,
+    get_player_team_history_read_repo,
+)
+from api.v1.schemas.roster import TeamLookupBatch, TeamLookupResponse
+
+router = APIRouter(prefix="/rosters", tags=["rosters"], route_class=TimedRoute)
+
+
+@router.post("/resolve", response_model=list[TeamLookupResponse])
+@declare_query_budget(max_statements=1)
+def resolve_teams(
+    batch: TeamLookupBatch,
+    repo: PlayerTeamHistoryRepository = Depends(get_player_team_history_read_repo),
+) -> list[TeamLookupResponse]:
+    """Finds which team each player was on at each time
+
+    A read sent as a POST so thousands of pairs fit in the body. All of them are
+    resolved by one query.
+
+    Args:
+        batch (TeamLookupBatch): (player_id, timestamp) pairs
+        repo (PlayerTeamHistoryRepository, optional): A object of the PlayerTeamHistoryRepo that handles DB actions. Defaults to Depends(get_player_team_history_read_repo).
+
+    Returns:
+        list[TeamLookupResponse]: The lookups in request order with their team
+    """
+    team_ids = repo.resolve_teams(
+        [(lookup.player_id, lookup.timestamp) for lookup in batch.lookups]
+    )
+    return [
+        TeamLookupResponse(
+            player_id=lookup.player_id, timestamp=lookup.timestamp, team_id=team_id
+        )
+        for lookup, team_id in zip(batch.lookups, team_ids)
+    ]
@@ -1,25 +1,40 @@
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from api.v1.metrics import TimedRoute
+from database.query_budget import declare_query_budget
 from database.repositories.set import (
     SetRepository,
     get_set_repo,
+    get_set_read_repo,
 )
+from database.repositories.set_team_counters import (
+    SetTeamCountersRepository,
+    get_set_team_counters_read_repo,
+)
+from api.v1.schemas.set_team_counters import SetTeamCountersResponse
+from api.v1.schemas.scoreboard import ScoreboardResponse, ScoreboardTeamResponse
+from api.v1.schemas.replay import ReplayResponse
+from database.db import get_db_session, get_read_db_session, replayer, scoreboards
+from database.replay import ReplayUnavailable
+from database.scoreboard import ScoreboardUnavailable
 from api.v1.schemas.set import (
     SetResponse,
     SetCreate,
     SetUpdate,
 )
 
-router = APIRouter(prefix="/sets", tags=["sets"])
+router = APIRouter(prefix="/sets", tags=["sets"], route_class=TimedRoute)
 
 
 @router.get("/", response_model=list[SetResponse])
 def read_all(
-    repo: SetRepository = Depends(get_set_repo),
+    repo: SetRepository = Depends(get_set_read_repo),
 ) -> list[SetResponse]:
     """Gets all of the sets
 
     Args:
-        repo (SetRepository, optional): A object of the SetRepo that handles DB actions. Defaults to Depends(get_set_repo).
+        repo (SetRepository, optional): A object of the SetRepo that handles DB actions. Defaults to Depends(get_set_read_repo).
 
     Returns:
         list[SetResponse]: A list of all sets in db
@@ -33,13 +48,13 @@ def read_all(
 @router.get("/{set_id}", response_model=SetResponse)
 def get_set(
     set_id: int,
-    repo: SetRepository = Depends(get_set_repo),
+    repo: SetRepository = Depends(get_set_read_repo),
 ) -> SetResponse:
     """Gets one set based on id
 
     Args:
         set_id (int): The set's ID
-        repo (SetRepository, optional): A object of the SetRepo that handles DB actions. Defaults to Depends(get_set_repo).
+        repo (SetRepository, optional): A object of the SetRepo that handles DB actions. Defaults to Depends(get_set_read_repo).
 
     Raises:
         HTTPException_404: Set not found from ID
@@ -60,13 +75,13 @@ def get_set(
 @router.get("/match/{match_id}", response_model=list[SetResponse])
 def get_sets_by_match(
     match_id: int,
-    repo: SetRepository = Depends(get_set_repo),
+    repo: SetRepository = Depends(get_set_read_repo),
 ) -> list[SetResponse]:
     """Gets all sets for a specific match
 
     Args:
         match_id (int): The match's ID
-        repo (SetRepository, optional): A object of the SetRepo that handles DB actions. Defaults to Depends(get_set_repo).
+        repo (SetRepository, optional): A object of the SetRepo that handles DB actions. Defaults to Depends(get_set_read_repo).
 
     Returns:
         list[SetResponse]: A list of sets for the specified match
@@ -76,6 +91,121 @@ def get_sets_by_match(
     return sets
 
 
+@router.get("/{set_id}/counters", response_model=list[SetTeamCountersResponse])
+@declare_query_budget(max_statements=1)
+def get_set_counters(
+    set_id: int,
+    repo: SetTeamCountersRepository = Depends(get_set_team_counters_read_repo),
+) -> list[SetTeamCountersResponse]:
+    """Gets the live throw, catch and elimination counts of both teams in a set
+
+    Args:
+        set_id (int): The set's ID
+        repo (SetTeamCountersRepository, optional): A object of the SetTeamCountersRepo that handles DB actions. Defaults to Depends(get_set_team_counters_read_repo).
+
+    Raises:
+        HTTPException_404: No counters for the set
+
+    Returns:
+        list[SetTeamCountersResponse]: One row per team
+    """
+    counters = repo.get_all(set_id=set_id)
+    if not counters:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Counters for set with ID {set_id} not found",
+        )
+    return counters
+
+
+@router.get("/{set_id}/scoreboard", response_model=ScoreboardResponse)
+def get_set_scoreboard(
+    set_id: int,
+    session: Session = Depends(get_read_db_session),
+) -> ScoreboardResponse:
+    """Gets the live scoreboard of a set in a live match from memory
+
+    The first read after a restart, or after the board goes stale, loads the
+    roster and events from the database.
+
+    Args:
+        set_id (int): The set's ID
+        session (Session, optional): sqlalchemy Session used only to load the board. Defaults to Depends(get_read_db_session).
+
+    Raises:
+        HTTPException_404: Set not found or its match isn't live
+
+    Returns:
+        ScoreboardResponse: Who is alive on each side and the elimination order
+    """
+    try:
+        board = scoreboards.get(session, set_id)
+    except ScoreboardUnavailable as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    return ScoreboardResponse(
+        set_id=board.set_id,
+        match_id=board.match_id,
+        start_time=board.start_time,
+        duration_s=board.duration_s(),
+        finished=board.finished,
+        winning_team_id=board.winning_team_id,
+        teams=[
+            ScoreboardTeamResponse.model_validate(team) for team in board.teams.values()
+        ],
+        eliminations=board.eliminations,
+    )
+
+
+@router.get("/{set_id}/replay", response_model=ReplayResponse)
+def seek_set_replay(
+    set_id: int,
+    at: datetime,
+    session: Session = Depends(get_db_session),
+) -> ReplayResponse:
+    """Gets a set's state at any moment, for video review
+
+    Starts from the nearest stored checkpoint before the moment and applies only
+    the events after it. The first seek into a set stores its checkpoints, so
+    this reads from the primary.
+
+    Args:
+        set_id (int): The set's ID
+        at (datetime): The moment to seek to
+        session (Session, optional): sqlalchemy Session. Defaults to Depends(get_db_session).
+
+    Raises:
+        HTTPException_404: Set not found from ID
+
+    Returns:
+        ReplayResponse: Who was in and out and the running counts at the moment
+    """
+    # Stored times are naive UTC, an offset would fail comparing against them
+    if at.tzinfo is not None:
+        at = at.astimezone(timezone.utc).replace(tzinfo=None)
+    try:
+        state = replayer.seek(session, set_id, at)
+    except ReplayUnavailable as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    board = state.board
+    return ReplayResponse(
+        set_id=board.set_id,
+        match_id=board.match_id,
+        start_time=board.start_time,
+        duration_s=board.duration_s(now=state.at),
+        finished=board.finished,
+        winning_team_id=board.winning_team_id,
+        teams=[
+            ScoreboardTeamResponse.model_validate(team) for team in board.teams.values()
+        ],
+        eliminations=board.eliminations,
+        at=state.at,
+        events_applied=state.events_applied,
+        checkpoint_sequence=state.checkpoint_sequence,
+    )
+
+
 @router.post("/", response_model=SetResponse, status_code=status.HTTP_201_CREATED)
 def create_set(
     set_data: SetCreate,
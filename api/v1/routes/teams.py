@@ -1,25 +1,37 @@
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
+from api.v1.batch import create_batch
+from api.v1.metrics import TimedRoute
+from database.query_budget import declare_query_budget
 from database.repositories.team import (
     TeamRepository,
     get_team_repo,
+    get_team_read_repo,
 )
+from database.repositories.player_team_history import (
+    PlayerTeamHistoryRepository,
+    get_player_team_history_read_repo,
+)
+from api.v1.schemas.batch import BatchResponse
+from api.v1.schemas.roster import RosterPlayerResponse
 from api.v1.schemas.team import (
     TeamResponse,
+    TeamBatchCreate,
     TeamCreate,
     TeamUpdate,
 )
 
-router = APIRouter(prefix="/teams", tags=["teams"])
+router = APIRouter(prefix="/teams", tags=["teams"], route_class=TimedRoute)
 
 
 @router.get("/", response_model=list[TeamResponse])
 def read_all(
-    repo: TeamRepository = Depends(get_team_repo),
+    repo: TeamRepository = Depends(get_team_read_repo),
 ) -> list[TeamResponse]:
     """Gets all of the teams
 
     Args:
-        repo (TeamRepository, optional): A object of the TeamRepo that handles DB actions. Defaults to Depends(get_team_repo).
+        repo (TeamRepository, optional): A object of the TeamRepo that handles DB actions. Defaults to Depends(get_team_read_repo).
 
     Returns:
         list[TeamResponse]: A list of all teams in db
@@ -33,13 +45,13 @@ def read_all(
 @router.get("/{team_id}", response_model=TeamResponse)
 def get_team(
     team_id: int,
-    repo: TeamRepository = Depends(get_team_repo),
+    repo: TeamRepository = Depends(get_team_read_repo),
 ) -> TeamResponse:
     """Gets one team based on id
 
     Args:
         team_id (int): The team's ID
-        repo (TeamRepository, optional): A object of the TeamRepo that handles DB actions. Defaults to Depends(get_team_repo).
+        repo (TeamRepository, optional): A object of the TeamRepo that handles DB actions. Defaults to Depends(get_team_read_repo).
 
     Raises:
         HTTPException_404: Team not found from ID
@@ -57,6 +69,38 @@ def get_team(
     return team
 
 
+@router.get("/{team_id}/roster", response_model=list[RosterPlayerResponse])
+@declare_query_budget(max_statements=2)
+def get_team_roster(
+    team_id: int,
+    as_of: datetime | None = None,
+    repo: TeamRepository = Depends(get_team_read_repo),
+    history_repo: PlayerTeamHistoryRepository = Depends(
+        get_player_team_history_read_repo
+    ),
+) -> list[RosterPlayerResponse]:
+    """Gets the players on a team now, or as of a past date
+
+    Args:
+        team_id (int): The team's ID
+        as_of (datetime | None, optional): When to look at the roster. Defaults to None, the current roster.
+        repo (TeamRepository, optional): A object of the TeamRepo that handles DB actions. Defaults to Depends(get_team_read_repo).
+        history_repo (PlayerTeamHistoryRepository, optional): A object of the PlayerTeamHistoryRepo that handles DB actions. Defaults to Depends(get_player_team_history_read_repo).
+
+    Raises:
+        HTTPException_404: Team not found from ID
+
+    Returns:
+        list[RosterPlayerResponse]: The team's players by player ID
+    """
+    if not repo.get_one(id=team_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Team with ID {team_id} not found",
+        )
+    return history_repo.get_roster(team_id, as_of)
+
+
 @router.post("/", response_model=TeamResponse, status_code=status.HTTP_201_CREATED)
 def create_team(
     team_data: TeamCreate,
@@ -95,6 +139,39 @@ def create_team(
     return new_team
 
 
+@router.post(
+    ":batch", response_model=BatchResponse, status_code=status.HTTP_201_CREATED
+)
+def create_teams(
+    batch: TeamBatchCreate,
+    repo: TeamRepository = Depends(get_team_repo),
+) -> BatchResponse:
+    """Creates many teams in one transaction
+
+    Names taken by existing teams or earlier items are checked in one query.
+    Rejected teams are reported and the rest created, unless the batch is atomic.
+
+    Args:
+        batch (TeamBatchCreate): The teams and whether the batch is atomic
+        repo (TeamRepository, optional): A object of the TeamRepo that handles DB actions. Defaults to Depends(get_team_repo).
+
+    Raises:
+        HTTPException_422: Atomic batch with rejected teams
+
+    Returns:
+        BatchResponse: Every team's ID or error, in request order
+    """
+    taken = repo.existing_names(item.name for item in batch.items)
+    errors = {}
+    for index, item in enumerate(batch.items):
+        if item.name in taken:
+            errors[index] = f"Team with name '{item.name}' already exists"
+        taken.add(item.name)
+
+    rows = [item.model_dump() for item in batch.items]
+    return create_batch(repo, rows, errors, batch.atomic)
+
+
 @router.put("/{team_id}", response_model=TeamResponse)
 def update_team(
     team_id: int,
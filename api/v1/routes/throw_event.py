@@ -1,37 +1,71 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from api.v1.metrics import TimedRoute
+from database.query_budget import declare_query_budget
 from database.repositories.throw_event import (
     ThrowEventRepository,
     get_throw_event_repo,
+    get_throw_event_read_repo,
 )
+from database.models.throw_event import ThrowOutcome
 from api.v1.schemas.throw_event import (
+    ThrowOutcomeCountResponse,
     ThrowEventResponse,
     ThrowEventCreate,
     ThrowEventUpdate,
 )
 
-router = APIRouter(prefix="/throw-events", tags=["throw-events"])
+router = APIRouter(
+    prefix="/throw-events", tags=["throw-events"], route_class=TimedRoute
+)
 
 
 @router.get("/", response_model=list[ThrowEventResponse])
+@declare_query_budget(max_statements=1)
 def read_all(
-    repo: ThrowEventRepository = Depends(get_throw_event_repo),
+    outcome: ThrowOutcome | None = None,
+    repo: ThrowEventRepository = Depends(get_throw_event_read_repo),
 ) -> list[ThrowEventResponse]:
     """Gets all throw events
 
     Args:
+        outcome (ThrowOutcome | None, optional): Only throws with this outcome. Defaults to None.
         repo (ThrowEventRepository): Repository that handles DB actions.
 
     Returns:
         list[ThrowEventResponse]: A list of all throw events in db
     """
-    all_throws = repo.get_all()
+    filters = {} if outcome is None else {"outcome": outcome}
+    all_throws = repo.get_all(include_archive=True, **filters)
     return all_throws
 
 
+@router.get("/outcomes", response_model=list[ThrowOutcomeCountResponse])
+@declare_query_budget(max_statements=1)
+def count_outcomes(
+    set_id: int | None = None,
+    player_id: int | None = None,
+    repo: ThrowEventRepository = Depends(get_throw_event_read_repo),
+) -> list[ThrowOutcomeCountResponse]:
+    """Counts throws by outcome, from the outcome stored on each throw
+
+    Args:
+        set_id (int | None, optional): Only throws in this set. Defaults to None.
+        player_id (int | None, optional): Only throws by this player. Defaults to None.
+        repo (ThrowEventRepository): Repository that handles DB actions.
+
+    Returns:
+        list[ThrowOutcomeCountResponse]: Throws per outcome, most common first
+    """
+    filters = {"set_id": set_id, "player_id": player_id}
+    return repo.count_outcomes(
+        **{key: value for key, value in filters.items() if value is not None}
+    )
+
+
 @router.get("/{throw_id}", response_model=ThrowEventResponse)
 def get_throw_event(
     throw_id: int,
-    repo: ThrowEventRepository = Depends(get_throw_event_repo),
+    repo: ThrowEventRepository = Depends(get_throw_event_read_repo),
 ) -> ThrowEventResponse:
     """Gets one throw event based on id
 
@@ -45,7 +79,7 @@ def get_throw_event(
     Returns:
         ThrowEventResponse: A throw event
     """
-    throw_event = repo.get_one(id=throw_id)
+    throw_event = repo.get_one(id=throw_id, include_archive=True)
     if not throw_event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -55,9 +89,10 @@ def get_throw_event(
 
 
 @router.get("/set/{set_id}", response_model=list[ThrowEventResponse])
+@declare_query_budget(max_statements=1)
 def get_throws_by_set(
     set_id: int,
-    repo: ThrowEventRepository = Depends(get_throw_event_repo),
+    repo: ThrowEventRepository = Depends(get_throw_event_read_repo),
 ) -> list[ThrowEventResponse]:
     """Gets all throw events for a specific set
 
@@ -68,7 +103,7 @@ def get_throws_by_set(
     Returns:
         list[ThrowEventResponse]: A list of throw events for the specified set
     """
-    throws = repo.get_all(set_id=set_id)
+    throws = repo.get_all(set_id=set_id, include_archive=True)
     return throws
 
 
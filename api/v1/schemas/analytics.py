@@ -0,0 +1,93 @@
+from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from database.models.elimination_event import EliminationCause
+from database.models.throw_geometry import CourtSide
+
+
+# Responses
+class PlayerAnalyticsResponse(BaseModel):
+    """A player's totals over a competition's events"""
+
+    player_id: int = Field(..., description="ID of the player")
+    throws: int = Field(..., description="Valid throws made")
+    hits: int = Field(..., description="Valid throws resolved as hits")
+    catches: int = Field(..., description="Throws caught")
+    rebound_catches: int = Field(..., description="Catches of a ball off a teammate")
+    eliminations: int = Field(
+        ..., description="Opponents eliminated by the player's throws and catches"
+    )
+    times_eliminated: int = Field(..., description="Times the player went out")
+    hit_rate: Optional[float] = Field(None, description="Hits per valid throw")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TeamAnalyticsResponse(BaseModel):
+    """A team's totals over a competition's events"""
+
+    team_id: int = Field(..., description="ID of the team")
+    throws: int = Field(..., description="Valid throws made")
+    hits: int = Field(..., description="Valid throws resolved as hits")
+    catches: int = Field(..., description="Throws caught")
+    players_eliminated: int = Field(
+        ..., description="Times a player of the team went out"
+    )
+    hit_rate: Optional[float] = Field(None, description="Hits per valid throw")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CauseAnalyticsResponse(BaseModel):
+    """Number of eliminations with one cause"""
+
+    cause: EliminationCause = Field(..., description="Why the players went out")
+    eliminations: int = Field(..., description="Eliminations with the cause")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DistanceBandResponse(BaseModel):
+    """Hit rate of valid throws over one band of distances"""
+
+    min_distance: float = Field(
+        ..., description="Shortest distance in the band, metres"
+    )
+    max_distance: Optional[float] = Field(
+        None, description="Distance the band stops short of, empty for the last band"
+    )
+    throws: int = Field(..., description="Valid throws in the band")
+    hits: int = Field(..., description="Valid throws in the band resolved as hits")
+    hit_rate: Optional[float] = Field(None, description="Hits per valid throw")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CourtSideResponse(BaseModel):
+    """Hit rate of valid throws from one side of the court"""
+
+    court_side: CourtSide = Field(
+        ..., description="Third of the court width thrown from, as the thrower faces"
+    )
+    throws: int = Field(..., description="Valid throws from the side")
+    hits: int = Field(..., description="Valid throws from the side resolved as hits")
+    hit_rate: Optional[float] = Field(None, description="Hits per valid throw")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class HeatmapResponse(BaseModel):
+    """Throws and hit rate per cell of a grid over the court"""
+
+    cell_length: float = Field(..., description="Cell size along the court, metres")
+    cell_width: float = Field(..., description="Cell size across the court, metres")
+    throws: list[list[int]] = Field(
+        ..., description="Valid throws per cell, indexed [x][y] from the origin corner"
+    )
+    hits: list[list[int]] = Field(
+        ..., description="Valid throws per cell resolved as hits, indexed [x][y]"
+    )
+    hit_rate: list[list[Optional[float]]] = Field(
+        ..., description="Hits per valid throw per cell, empty where there were none"
+    )
+
+    model_config = ConfigDict(from_attributes=True)
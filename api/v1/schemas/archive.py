@@ -0,0 +1,15 @@
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import datetime
+
+
+# Responses
+class ArchivedCompetitionResponse(BaseModel):
+    """Schema for a competition whose events were moved to the archive tables"""
+
+    competition_id: int = Field(..., description="ID of the archived competition")
+    archived_at: datetime = Field(..., description="When the competition was archived")
+    throw_events: int = Field(..., description="Throw events moved to the archive")
+    catch_events: int = Field(..., description="Catch events moved to the archive")
+    eliminations: int = Field(..., description="Eliminations moved to the archive")
+
+    model_config = ConfigDict(from_attributes=True)
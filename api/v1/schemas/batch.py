@@ -0,0 +1,26 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional
+
+# Most items created by one request
+MAX_BATCH_SIZE = 1000
+
+
+# Responses
+class BatchItemResult(BaseModel):
+    """What happened to one item of a batch"""
+
+    index: int = Field(..., description="Position of the item in the request")
+    id: Optional[int] = Field(None, description="ID of the created row")
+    error: Optional[str] = Field(None, description="Why the item wasn't created")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BatchResponse(BaseModel):
+    """Outcome of a batch create"""
+
+    created: int = Field(..., description="Items created")
+    failed: int = Field(..., description="Items rejected")
+    items: list[BatchItemResult] = Field(..., description="Every item in request order")
+
+    model_config = ConfigDict(from_attributes=True)
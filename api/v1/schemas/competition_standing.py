@@ -0,0 +1,19 @@
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# Responses
+class CompetitionStandingResponse(BaseModel):
+    """A team's row in a league table"""
+
+    position: int = Field(..., description="Place in the table, starting at 1")
+    team_id: int = Field(..., description="ID of the team")
+    played: int = Field(..., description="Completed matches played")
+    won: int = Field(..., description="Matches won")
+    drawn: int = Field(..., description="Matches drawn")
+    lost: int = Field(..., description="Matches lost")
+    sets_for: int = Field(..., description="Sets won")
+    sets_against: int = Field(..., description="Sets lost")
+    set_difference: int = Field(..., description="Sets won minus sets lost")
+    points: int = Field(..., description="League points, 3 for a win and 1 for a draw")
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,49 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional
+from datetime import datetime
+
+
+# Requests
+class FixtureGenerate(BaseModel):
+    """Schema for generating a league's fixtures"""
+
+    start: datetime = Field(..., description="Date and time of the first match")
+    double_round_robin: bool = Field(
+        True, description="Whether each pair of teams meets home and away"
+    )
+    days_between_rounds: int = Field(
+        7, ge=0, description="Days from one round to the next"
+    )
+    courts: int = Field(1, ge=1, description="Matches played at the same time")
+    match_minutes: int = Field(
+        60, ge=0, description="Minutes from one match slot to the next"
+    )
+    dry_run: bool = Field(
+        False, description="Preview the fixtures without creating them"
+    )
+
+
+# Responses
+class FixtureResponse(BaseModel):
+    """One generated match"""
+
+    round: int = Field(..., description="Round of the schedule, from 1")
+    team1_id: int = Field(..., description="Home team ID")
+    team2_id: int = Field(..., description="Away team ID")
+    match_date: datetime = Field(..., description="Match date and time")
+    id: Optional[int] = Field(None, description="Created match ID, none in a dry run")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class FixtureListResponse(BaseModel):
+    """A league's generated fixtures"""
+
+    competition_id: int = Field(..., description="Competition ID")
+    dry_run: bool = Field(..., description="Whether the fixtures were only previewed")
+    rounds: int = Field(..., description="Rounds in the schedule")
+    fixtures: list[FixtureResponse] = Field(
+        ..., description="Every match in round and slot order"
+    )
+
+    model_config = ConfigDict(from_attributes=True)
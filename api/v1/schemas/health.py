@@ -0,0 +1,29 @@
+from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# Responses
+class PoolHealthResponse(BaseModel):
+    """Usage of one engine's connection pool"""
+
+    size: int = Field(..., description="Connections the pool keeps")
+    checked_out: int = Field(..., description="Connections in use")
+    overflow: int = Field(..., description="Connections open beyond the pool size")
+    ok: bool = Field(..., description="Whether a pooled connection answered a query")
+    error: Optional[str] = Field(None, description="Why the check failed")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ReadinessResponse(BaseModel):
+    """Whether the process can serve traffic"""
+
+    ready: bool = Field(..., description="Whether the primary's pool is healthy")
+    primary: Optional[PoolHealthResponse] = Field(
+        None, description="The primary's pool, empty before startup"
+    )
+    replica: Optional[PoolHealthResponse] = Field(
+        None, description="The replica's pool, empty when there's no replica"
+    )
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import Any, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from database.models.job import JobKind, JobStatus
+
+
+# Requests
+class JobCreate(BaseModel):
+    """Schema for queueing a background job"""
+
+    kind: JobKind = Field(..., description="What to run")
+    arguments: dict[str, Any] = Field(
+        default_factory=dict,
+        description="Keywords for the job, such as competition_id",
+    )
+    priority: int = Field(0, ge=-100, le=100, description="Higher runs first")
+    max_attempts: int = Field(
+        3, ge=1, le=10, description="Runs before the job is marked failed"
+    )
+
+
+# Responses
+class JobResponse(BaseModel):
+    """A background job and how far it has got"""
+
+    id: int
+    kind: JobKind
+    arguments: dict[str, Any]
+    priority: int
+    status: JobStatus
+    attempts: int = Field(..., description="Runs started so far")
+    max_attempts: int
+    run_after: datetime = Field(..., description="Earliest the next run may start")
+    locked_by: Optional[str] = Field(None, description="Worker running the job")
+    finished_at: Optional[datetime] = None
+    last_error: Optional[str] = Field(None, description="Why the last run failed")
+    result: Optional[dict[str, Any]] = Field(
+        None, description="What the job returned once it succeeded"
+    )
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,23 @@
+from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# Responses
+class LeaderboardEntryResponse(BaseModel):
+    """A player's place on a leaderboard"""
+
+    rank: int = Field(..., description="Place on the leaderboard, shared by ties")
+    player_id: int = Field(..., description="ID of the player")
+    first_name: str = Field(..., description="Player's first name")
+    last_name: str = Field(..., description="Player's last name")
+    value: float = Field(..., description="The player's value of the ranked stat")
+    throws: int = Field(..., description="Valid throws made")
+    hits: int = Field(..., description="Opponents eliminated by the player's throws")
+    eliminations: int = Field(
+        ..., description="Opponents eliminated by the player's throws and catches"
+    )
+    catches: int = Field(..., description="Throws caught")
+    rebound_catches: int = Field(..., description="Catches of a ball off a teammate")
+    hit_rate: Optional[float] = Field(None, description="Hits per valid throw")
+
+    model_config = ConfigDict(from_attributes=True)
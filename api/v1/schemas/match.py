@@ -2,6 +2,7 @@ from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import datetime
 from enum import Enum
+from api.v1.schemas.batch import MAX_BATCH_SIZE
 
 
 class MatchStatus(str, Enum):
@@ -32,6 +33,15 @@ class MatchCreate(MatchBase):
     pass
 
 
+class MatchBatchCreate(BaseModel):
+    """Schema for creating many matches at once, such as a fixture list"""
+
+    items: list[MatchCreate] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_SIZE, description="Matches to create"
+    )
+    atomic: bool = Field(False, description="Create nothing if any match is rejected")
+
+
 class MatchUpdate(BaseModel):
     """Schema for updating matches"""
 
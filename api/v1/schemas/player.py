@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from api.v1.schemas.batch import MAX_BATCH_SIZE
+from database.enums.country_codes import CountryCode
+
+
+class PlayerBase(BaseModel):
+    """Base player schema"""
+
+    first_name: str = Field(
+        ..., min_length=1, max_length=50, description="Player's first name"
+    )
+    last_name: str = Field(
+        ..., min_length=1, max_length=50, description="Player's last name"
+    )
+    nationality: Optional[CountryCode] = Field(
+        None, description="Country the player represents"
+    )
+
+
+# Requests
+class PlayerCreate(PlayerBase):
+    """Schema for creating new players"""
+
+    pass
+
+
+class PlayerBatchCreate(BaseModel):
+    """Schema for creating many players at once"""
+
+    items: list[PlayerCreate] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_SIZE, description="Players to create"
+    )
+    atomic: bool = Field(False, description="Create nothing if any player is rejected")
@@ -0,0 +1,14 @@
+from pydantic import Field
+from datetime import datetime
+from api.v1.schemas.scoreboard import ScoreboardResponse
+
+
+# Responses
+class ReplayResponse(ScoreboardResponse):
+    """A set's state at a moment of its replay"""
+
+    at: datetime = Field(..., description="The moment the state is for")
+    events_applied: int = Field(..., description="Events of the set up to the moment")
+    checkpoint_sequence: int = Field(
+        ..., description="Events covered by the checkpoint the replay started from"
+    )
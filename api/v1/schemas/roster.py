@@ -0,0 +1,45 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional
+from datetime import datetime
+
+# Most lookups resolved by one request
+MAX_TEAM_LOOKUPS = 10_000
+
+
+# Requests
+class TeamLookup(BaseModel):
+    """A player and a time to find their team for"""
+
+    player_id: int = Field(..., description="ID of the player")
+    timestamp: datetime = Field(..., description="When to find the player's team")
+
+
+class TeamLookupBatch(BaseModel):
+    """Schema for resolving many players' teams at once"""
+
+    lookups: list[TeamLookup] = Field(
+        ..., max_length=MAX_TEAM_LOOKUPS, description="Pairs to resolve"
+    )
+
+
+# Responses
+class RosterPlayerResponse(BaseModel):
+    """A player on a team's roster"""
+
+    player_id: int = Field(..., description="ID of the player")
+    first_name: str = Field(..., description="Player's first name")
+    last_name: str = Field(..., description="Player's last name")
+    joined_at: datetime = Field(..., description="When the player joined the team")
+    left_at: Optional[datetime] = Field(
+        None, description="When the player left, empty while still on the team"
+    )
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TeamLookupResponse(TeamLookup):
+    """The team a player was on at a time"""
+
+    team_id: Optional[int] = Field(
+        None, description="ID of the team, empty if the player wasn't on one"
+    )
@@ -0,0 +1,44 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional
+from datetime import datetime
+
+
+# Responses
+class ScoreboardTeamResponse(BaseModel):
+    """One side of a live set"""
+
+    team_id: int = Field(..., description="ID of the team")
+    players_alive: list[int] = Field(..., description="IDs of players not eliminated")
+    players_remaining: int = Field(..., description="Players of the team still in")
+    throws: int = Field(..., description="Throws made by the team")
+    catches: int = Field(..., description="Catches made by the team")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ScoreboardEliminationResponse(BaseModel):
+    """An elimination in the order it happened"""
+
+    player_id: int = Field(..., description="ID of the eliminated player")
+    team_id: int = Field(..., description="ID of the eliminated player's team")
+    cause: str = Field(..., description="Why the player was eliminated")
+    at: datetime = Field(..., description="When the elimination was recorded")
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ScoreboardResponse(BaseModel):
+    """Live scoreboard of a set in a live match"""
+
+    set_id: int = Field(..., description="ID of the set")
+    match_id: int = Field(..., description="ID of the match")
+    start_time: datetime = Field(..., description="When the set started")
+    duration_s: float = Field(
+        ..., description="Seconds since the start, or until the end"
+    )
+    finished: bool = Field(..., description="Whether a side has been eliminated")
+    winning_team_id: Optional[int] = Field(None, description="ID of the winning team")
+    teams: list[ScoreboardTeamResponse] = Field(..., description="Both sides")
+    eliminations: list[ScoreboardEliminationResponse] = Field(
+        ..., description="Eliminations in order"
+    )
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import datetime
+
+
+# Responses
+class SetTeamCountersResponse(BaseModel):
+    """Live counts of one team's events in a set"""
+
+    set_id: int = Field(..., description="ID of the set")
+    team_id: int = Field(..., description="ID of the team")
+    throws: int = Field(..., description="Throws made by the team")
+    catches: int = Field(..., description="Catches made by the team")
+    eliminations: int = Field(..., description="Players of the team eliminated")
+    starting_players: int = Field(..., description="Players the team started with")
+    players_remaining: int = Field(..., description="Players of the team still in")
+    updated_at: datetime = Field(..., description="When the counts last changed")
+
+    model_config = ConfigDict(from_attributes=True)
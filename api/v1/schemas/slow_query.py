@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+from typing import Any, Optional
+from datetime import datetime
+
+
+# Responses
+class SlowQueryResponse(BaseModel):
+    """A statement recorded by the slow query log"""
+
+    sql: str = Field(..., description="Normalised SQL with literals replaced by '?'")
+    parameters: Any = Field(None, description="Types of the bound parameters")
+    duration_ms: float = Field(..., description="Execution time in milliseconds")
+    route: Optional[str] = Field(None, description="Route the statement ran for")
+    recorded_at: datetime = Field(..., description="When the statement finished")
+    plan: Any = Field(
+        None, description="EXPLAIN (ANALYZE, BUFFERS) output when it was sampled"
+    )
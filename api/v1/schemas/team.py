@@ -1,6 +1,7 @@
 from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import datetime
+from api.v1.schemas.batch import MAX_BATCH_SIZE
 
 
 class TeamBase(BaseModel):
@@ -17,6 +18,15 @@ class TeamCreate(TeamBase):
     pass
 
 
+class TeamBatchCreate(BaseModel):
+    """Schema for creating many teams at once"""
+
+    items: list[TeamCreate] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_SIZE, description="Teams to create"
+    )
+    atomic: bool = Field(False, description="Create nothing if any team is rejected")
+
+
 class TeamUpdate(BaseModel):
     """Schema for updating teams"""
 
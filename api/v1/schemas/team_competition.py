@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+from api.v1.schemas.batch import MAX_BATCH_SIZE
+
+
+# Requests
+class TeamEntryCreate(BaseModel):
+    """Schema for entering a team into a competition"""
+
+    team_id: int = Field(..., description="Team ID")
+    joined_date: Optional[datetime] = Field(
+        None, description="When the team joined, defaults to now"
+    )
+
+
+class TeamEntryBatchCreate(BaseModel):
+    """Schema for entering many teams into a competition at once"""
+
+    items: list[TeamEntryCreate] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_SIZE, description="Teams to enter"
+    )
+    atomic: bool = Field(False, description="Enter nothing if any team is rejected")
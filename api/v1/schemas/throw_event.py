@@ -1,6 +1,7 @@
 from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import datetime
+from database.models.throw_event import ThrowOutcome
 
 
 class ThrowEventBase(BaseModel):
@@ -81,7 +82,24 @@ class ThrowEventResponse(ThrowEventBase):
     """Standard throw event response for API"""
 
     id: int
+    outcome: Optional[ThrowOutcome] = Field(
+        None, description="What happened to the throw, resolved from related events"
+    )
+    xhit: Optional[float] = Field(
+        None, description="Expected hit probability, empty until the throw is scored"
+    )
     created_at: datetime
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ThrowOutcomeCountResponse(BaseModel):
+    """Number of throws with one outcome"""
+
+    outcome: Optional[ThrowOutcome] = Field(
+        ..., description="The outcome, empty for throws not yet resolved"
+    )
+    throws: int = Field(..., description="Throws with the outcome")
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,734 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+from sqlalchemy import event, exists, func, inspect, select
+from sqlalchemy.orm import Session
+
+from database.geometry import COURT_SIDES
+from database.models import (
+    ARCHIVE_TABLES,
+    ArchivedCompetition,
+    CatchEvent,
+    Competition,
+    EliminationEvent,
+    Match,
+    PlayerTeamHistory,
+    Set,
+    ThrowEvent,
+    ThrowGeometry,
+)
+from database.models.elimination_event import EliminationCause
+from database.models.throw_event import ThrowOutcome
+from database.models.throw_geometry import COURT_LENGTH, COURT_WIDTH
+from database.player_stats import HIT_CAUSES
+
+# Fixed categories, so a code means the same thing in every competition
+CAUSES = list(EliminationCause)
+OUTCOMES = list(ThrowOutcome)
+
+# Lower edges in metres of the throw distance bands, the last band is open ended
+DISTANCE_BANDS = (0.0, 3.0, 6.0, 9.0, 12.0)
+
+# Player and team columns hold codes into EventFrame.players and .teams, -1 when unknown
+THROW_DTYPE = np.dtype(
+    [
+        ("set_id", np.int64),
+        ("event_id", np.int64),
+        ("at", "datetime64[us]"),
+        ("player", np.int32),
+        ("team", np.int32),
+        ("target", np.int32),
+        ("valid_attempt", np.bool_),
+        ("was_blocked", np.bool_),
+        ("outcome", np.int8),
+        ("location_x", np.float64),
+        ("location_y", np.float64),
+        ("target_location_x", np.float64),
+        ("target_location_y", np.float64),
+        ("distance", np.float64),
+        ("angle", np.float64),
+        ("court_side", np.int8),
+    ]
+)
+CATCH_DTYPE = np.dtype(
+    [
+        ("set_id", np.int64),
+        ("event_id", np.int64),
+        ("at", "datetime64[us]"),
+        ("player", np.int32),
+        ("team", np.int32),
+        ("rebound_catch", np.bool_),
+    ]
+)
+# player is who went out, credited the thrower or catcher who put them out
+ELIMINATION_DTYPE = np.dtype(
+    [
+        ("set_id", np.int64),
+        ("event_id", np.int64),
+        ("at", "datetime64[us]"),
+        ("player", np.int32),
+        ("team", np.int32),
+        ("cause", np.int8),
+        ("credited", np.int32),
+    ]
+)
+
+
+class AnalyticsUnavailable(Exception):
+    """The competition doesn't exist"""
+
+
+def filter_rows(rows: np.ndarray, **equals) -> np.ndarray:
+    """Rows of a structured array whose fields equal the given values
+
+    Args:
+        rows (np.ndarray): Structured array of events
+        **equals: Field values to keep, such as team=2
+
+    Returns:
+        np.ndarray: The matching rows
+    """
+    mask = np.ones(len(rows), dtype=bool)
+    for name, value in equals.items():
+        mask &= rows[name] == value
+    return rows[mask]
+
+
+def group_count(codes: np.ndarray, size: int) -> np.ndarray:
+    """Number of rows per code, ignoring unknown (-1) codes"""
+    return np.bincount(codes[codes >= 0], minlength=size)
+
+
+def group_sum(codes: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    """Sum of values per code, ignoring unknown (-1) codes"""
+    known = codes >= 0
+    return np.bincount(codes[known], weights=values[known], minlength=size)
+
+
+def ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Element-wise ratio, NaN where the denominator is 0"""
+    result = np.full(len(numerator), np.nan)
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return result
+
+
+def throw_heatmap(
+    x: np.ndarray, y: np.ndarray, hit: np.ndarray, bins_x: int, bins_y: int
+) -> dict:
+    """Throws, hits and hit rate per cell of a grid over the court
+
+    A module level function of plain arrays, so it can run in a ComputePool.
+
+    Args:
+        x (np.ndarray): X coordinate of each throw
+        y (np.ndarray): Y coordinate of each throw
+        hit (np.ndarray): Whether each throw hit
+        bins_x (int): Cells along the court's length
+        bins_y (int): Cells across the court's width
+
+    Returns:
+        dict: Cell sizes in metres, and throws, hits and hit_rate grids indexed [x][y]
+    """
+    bounds = [[0.0, COURT_LENGTH], [0.0, COURT_WIDTH]]
+    throws, _, _ = np.histogram2d(x, y, bins=[bins_x, bins_y], range=bounds)
+    hits, _, _ = np.histogram2d(x[hit], y[hit], bins=[bins_x, bins_y], range=bounds)
+    hit_rate = ratio(hits.ravel(), throws.ravel()).reshape(throws.shape)
+    return {
+        "cell_length": COURT_LENGTH / bins_x,
+        "cell_width": COURT_WIDTH / bins_y,
+        "throws": throws.astype(np.int64).tolist(),
+        "hits": hits.astype(np.int64).tolist(),
+        "hit_rate": np.where(np.isnan(hit_rate), None, hit_rate).tolist(),
+    }
+
+
+def _encode(values: Iterable, categories: np.ndarray) -> np.ndarray:
+    """Codes of values in sorted categories, -1 for None"""
+    values = np.array([-1 if value is None else value for value in values], np.int64)
+    codes = np.searchsorted(categories, values).astype(np.int32)
+    codes[values < 0] = -1
+    return codes
+
+
+def _floats(values: Iterable) -> np.ndarray:
+    return np.array([np.nan if value is None else value for value in values], float)
+
+
+def _team(player_id, at):
+    """SQL for the side of the match a player was on at a time"""
+    return (
+        select(PlayerTeamHistory.team_id)
+        .where(
+            PlayerTeamHistory.player_id == player_id,
+            PlayerTeamHistory.active_at(at),
+            PlayerTeamHistory.team_id.in_((Match.team1_id, Match.team2_id)),
+        )
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def _in_competition(sql, table, competition_id: int):
+    return (
+        sql.join(Set, Set.id == table.c.set_id)
+        .join(Match, Match.id == Set.match_id)
+        .where(Match.competition_id == competition_id)
+    )
+
+
+def _event_queries(throws, catches, eliminations, competition_id: int):
+    """One table family's throw, catch and elimination rows of a competition"""
+    throw_rows = select(
+        throws.c.set_id,
+        throws.c.id,
+        throws.c.timestamp,
+        throws.c.player_id,
+        _team(throws.c.player_id, throws.c.timestamp),
+        throws.c.target_player_id,
+        throws.c.valid_attempt,
+        throws.c.was_blocked,
+        throws.c.outcome,
+        throws.c.location_x,
+        throws.c.location_y,
+        throws.c.target_location_x,
+        throws.c.target_location_y,
+        ThrowGeometry.distance,
+        ThrowGeometry.angle,
+        ThrowGeometry.court_side,
+    ).select_from(throws)
+    # Throws whose geometry isn't derived yet load with no distance, angle or side
+    throw_rows = throw_rows.outerjoin(
+        ThrowGeometry,
+        (ThrowGeometry.set_id == throws.c.set_id)
+        & (ThrowGeometry.throw_event_id == throws.c.id),
+    )
+
+    catch_rows = select(
+        catches.c.set_id,
+        catches.c.id,
+        catches.c.timestamp,
+        catches.c.player_id,
+        _team(catches.c.player_id, catches.c.timestamp),
+        catches.c.rebound_catch,
+    ).select_from(catches)
+
+    # Eliminations happen when the throw or catch that caused them does
+    at = func.coalesce(
+        throws.c.timestamp, catches.c.timestamp, eliminations.c.created_at
+    )
+    elimination_rows = (
+        select(
+            eliminations.c.set_id,
+            eliminations.c.id,
+            at,
+            eliminations.c.eliminated_player_id,
+            _team(eliminations.c.eliminated_player_id, at),
+            eliminations.c.cause,
+            throws.c.player_id,
+            catches.c.player_id,
+        )
+        .select_from(eliminations)
+        .outerjoin(
+            throws,
+            (throws.c.set_id == eliminations.c.set_id)
+            & (throws.c.id == eliminations.c.throw_event_id),
+        )
+        .outerjoin(
+            catches,
+            (catches.c.set_id == eliminations.c.set_id)
+            & (catches.c.id == eliminations.c.catch_event_id),
+        )
+    )
+    return (
+        _in_competition(throw_rows, throws, competition_id),
+        _in_competition(catch_rows, catches, competition_id),
+        _in_competition(elimination_rows, eliminations, competition_id),
+    )
+
+
+@dataclass
+class EventFrame:
+    """A competition's hot and archived events as columnar arrays
+
+    Args:
+        competition_id (int): The competition's ID
+        throws (np.ndarray): THROW_DTYPE rows
+        catches (np.ndarray): CATCH_DTYPE rows
+        eliminations (np.ndarray): ELIMINATION_DTYPE rows
+        players (np.ndarray): Player IDs, indexed by player codes
+        teams (np.ndarray): Team IDs, indexed by team codes
+        set_ids (frozenset[int]): Every set of the competition when loaded
+        match_ids (frozenset[int]): Every match of the competition when loaded
+        archived (bool, optional): Whether the competition was archived, so its events can't change. Defaults to False.
+    """
+
+    competition_id: int
+    throws: np.ndarray
+    catches: np.ndarray
+    eliminations: np.ndarray
+    players: np.ndarray
+    teams: np.ndarray
+    set_ids: frozenset[int]
+    match_ids: frozenset[int]
+    archived: bool = False
+
+    def player_code(self, player_id: int) -> int:
+        """Code of a player ID, -1 if they have no events in the competition"""
+        code = int(np.searchsorted(self.players, player_id))
+        if code < len(self.players) and self.players[code] == player_id:
+            return code
+        return -1
+
+    def team_code(self, team_id: int) -> int:
+        """Code of a team ID, -1 if it has no events in the competition"""
+        code = int(np.searchsorted(self.teams, team_id))
+        if code < len(self.teams) and self.teams[code] == team_id:
+            return code
+        return -1
+
+    def _rows(self, set_id: int | None):
+        tables = (self.throws, self.catches, self.eliminations)
+        if set_id is None:
+            return tables
+        return tuple(filter_rows(table, set_id=set_id) for table in tables)
+
+    def player_summary(self, set_id: int | None = None) -> list[dict]:
+        """Per player totals, optionally within one set
+
+        Hits are valid throws resolved as hits, eliminations are the players
+        a thrower hit or a catcher put out.
+
+        Args:
+            set_id (int | None, optional): Only events in this set. Defaults to None.
+
+        Returns:
+            list[dict]: One row per player with any events, by player ID
+        """
+        throws, catches, eliminations = self._rows(set_id)
+        size = len(self.players)
+        valid = throws[throws["valid_attempt"]]
+        hit = OUTCOMES.index(ThrowOutcome.HIT)
+
+        totals = {
+            "throws": group_count(valid["player"], size),
+            "hits": group_count(valid["player"][valid["outcome"] == hit], size),
+            "catches": group_count(catches["player"], size),
+            "rebound_catches": group_sum(
+                catches["player"], catches["rebound_catch"], size
+            ).astype(np.int64),
+            "eliminations": group_count(eliminations["credited"], size),
+            "times_eliminated": group_count(eliminations["player"], size),
+        }
+        hit_rate = ratio(totals["hits"], totals["throws"])
+
+        active = np.flatnonzero(sum(totals.values()))
+        return [
+            {
+                "player_id": int(self.players[code]),
+                **{name: int(column[code]) for name, column in totals.items()},
+                "hit_rate": None if np.isnan(hit_rate[code]) else hit_rate[code],
+            }
+            for code in active
+        ]
+
+    def team_summary(self, set_id: int | None = None) -> list[dict]:
+        """Per team totals, optionally within one set
+
+        Args:
+            set_id (int | None, optional): Only events in this set. Defaults to None.
+
+        Returns:
+            list[dict]: One row per team with any events, by team ID
+        """
+        throws, catches, eliminations = self._rows(set_id)
+        size = len(self.teams)
+        valid = throws[throws["valid_attempt"]]
+        hit = OUTCOMES.index(ThrowOutcome.HIT)
+
+        totals = {
+            "throws": group_count(valid["team"], size),
+            "hits": group_count(valid["team"][valid["outcome"] == hit], size),
+            "catches": group_count(catches["team"], size),
+            "players_eliminated": group_count(eliminations["team"], size),
+        }
+        hit_rate = ratio(totals["hits"], totals["throws"])
+
+        active = np.flatnonzero(sum(totals.values()))
+        return [
+            {
+                "team_id": int(self.teams[code]),
+                **{name: int(column[code]) for name, column in totals.items()},
+                "hit_rate": None if np.isnan(hit_rate[code]) else hit_rate[code],
+            }
+            for code in active
+        ]
+
+    def _code_filters(
+        self, team_id: int | None, player_id: int | None
+    ) -> dict[str, int] | None:
+        """Team and player code filters, None if either ID has no events
+
+        An unknown ID's code is -1, the code of rows whose team or player
+        couldn't be resolved, so filtering on it would return those rows.
+        """
+        filters = {}
+        if team_id is not None:
+            filters["team"] = self.team_code(team_id)
+        if player_id is not None:
+            filters["player"] = self.player_code(player_id)
+        if -1 in filters.values():
+            return None
+        return filters
+
+    def _valid_throws(self, team_id: int | None, player_id: int | None) -> np.ndarray:
+        filters = self._code_filters(team_id, player_id)
+        if filters is None:
+            return self.throws[:0]
+        return filter_rows(self.throws, valid_attempt=True, **filters)
+
+    @staticmethod
+    def _hit_rates(throws: np.ndarray, codes: np.ndarray, size: int) -> list[dict]:
+        """Throws, hits and hit rate per code of some throws"""
+        hit = OUTCOMES.index(ThrowOutcome.HIT)
+        attempts = group_count(codes, size)
+        hits = group_count(codes[throws["outcome"] == hit], size)
+        hit_rate = ratio(hits, attempts)
+        return [
+            {
+                "throws": int(attempts[code]),
+                "hits": int(hits[code]),
+                "hit_rate": None if np.isnan(hit_rate[code]) else hit_rate[code],
+            }
+            for code in range(size)
+        ]
+
+    def distance_bands(
+        self, team_id: int | None = None, player_id: int | None = None
+    ) -> list[dict]:
+        """Valid throws, hits and hit rate per DISTANCE_BANDS band
+
+        Args:
+            team_id (int | None, optional): Only this team's throws. Defaults to None.
+            player_id (int | None, optional): Only this player's throws. Defaults to None.
+
+        Returns:
+            list[dict]: One row per band, nearest first
+        """
+        throws = self._valid_throws(team_id, player_id)
+        throws = throws[~np.isnan(throws["distance"])]
+        bands = np.digitize(throws["distance"], DISTANCE_BANDS[1:])
+
+        upper = (*DISTANCE_BANDS[1:], None)
+        return [
+            {"min_distance": DISTANCE_BANDS[band], "max_distance": upper[band], **row}
+            for band, row in enumerate(
+                self._hit_rates(throws, bands, len(DISTANCE_BANDS))
+            )
+        ]
+
+    def court_sides(
+        self, team_id: int | None = None, player_id: int | None = None
+    ) -> list[dict]:
+        """Valid throws, hits and hit rate per side of the court thrown from
+
+        Args:
+            team_id (int | None, optional): Only this team's throws. Defaults to None.
+            player_id (int | None, optional): Only this player's throws. Defaults to None.
+
+        Returns:
+            list[dict]: One row per court side, right to left
+        """
+        throws = self._valid_throws(team_id, player_id)
+        return [
+            {"court_side": COURT_SIDES[code], **row}
+            for code, row in enumerate(
+                self._hit_rates(throws, throws["court_side"], len(COURT_SIDES))
+            )
+        ]
+
+    def throw_locations(
+        self,
+        team_id: int | None = None,
+        player_id: int | None = None,
+        target: bool = False,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """X, y and hit arrays of the valid throws with a location, for throw_heatmap
+
+        Args:
+            team_id (int | None, optional): Only this team's throws. Defaults to None.
+            player_id (int | None, optional): Only this player's throws. Defaults to None.
+            target (bool, optional): Where throws were aimed rather than thrown from. Defaults to False.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: Contiguous copies, cheap to pickle
+        """
+        throws = self._valid_throws(team_id, player_id)
+        prefix = "target_location" if target else "location"
+        x, y = throws[f"{prefix}_x"], throws[f"{prefix}_y"]
+        known = ~(np.isnan(x) | np.isnan(y))
+        hit = throws["outcome"] == OUTCOMES.index(ThrowOutcome.HIT)
+        return x[known], y[known], hit[known]
+
+    def cause_counts(
+        self, team_id: int | None = None, player_id: int | None = None
+    ) -> list[dict]:
+        """Eliminations per cause, optionally of one team's or player's players
+
+        Args:
+            team_id (int | None, optional): Only players out from this team. Defaults to None.
+            player_id (int | None, optional): Only this player going out. Defaults to None.
+
+        Returns:
+            list[dict]: One row per cause with any eliminations, most common first
+        """
+        filters = self._code_filters(team_id, player_id)
+        if filters is None:
+            return []
+        eliminations = filter_rows(self.eliminations, **filters)
+
+        counts = np.bincount(eliminations["cause"], minlength=len(CAUSES))
+        order = np.argsort(-counts, kind="stable")
+        return [
+            {"cause": CAUSES[code], "eliminations": int(counts[code])}
+            for code in order
+            if counts[code]
+        ]
+
+
+def load_frame(session: Session, competition_id: int) -> EventFrame:
+    """Reads a competition's hot and archived events into an EventFrame
+
+    Args:
+        session (Session): sqlalchemy Session
+        competition_id (int): The competition's ID
+
+    Raises:
+        AnalyticsUnavailable: The competition doesn't exist
+
+    Returns:
+        EventFrame: The competition's events
+    """
+    archived = exists().where(ArchivedCompetition.competition_id == competition_id)
+    sets = session.execute(
+        select(Set.id, Set.match_id, archived)
+        .join(Match, Match.id == Set.match_id)
+        .where(Match.competition_id == competition_id)
+    ).all()
+    if not sets and session.get(Competition, competition_id) is None:
+        raise AnalyticsUnavailable(f"Competition with ID {competition_id} not found")
+
+    hot = _event_queries(
+        ThrowEvent.__table__,
+        CatchEvent.__table__,
+        EliminationEvent.__table__,
+        competition_id,
+    )
+    archived = _event_queries(
+        ARCHIVE_TABLES[ThrowEvent],
+        ARCHIVE_TABLES[CatchEvent],
+        ARCHIVE_TABLES[EliminationEvent],
+        competition_id,
+    )
+    throw_rows, catch_rows, elimination_rows = (
+        list(zip(*session.execute(hot_sql.union_all(archived_sql)).all()))
+        for hot_sql, archived_sql in zip(hot, archived)
+    )
+    throw_rows = throw_rows or [()] * len(THROW_DTYPE)
+    catch_rows = catch_rows or [()] * len(CATCH_DTYPE)
+    elimination_rows = elimination_rows or [()] * (len(ELIMINATION_DTYPE) + 1)
+
+    player_ids = {
+        *throw_rows[3],
+        *throw_rows[5],
+        *catch_rows[3],
+        *elimination_rows[3],
+        *elimination_rows[6],
+        *elimination_rows[7],
+    }
+    team_ids = {*throw_rows[4], *catch_rows[4], *elimination_rows[4]}
+    players = np.array(sorted(player_ids - {None}), np.int64)
+    teams = np.array(sorted(team_ids - {None}), np.int64)
+
+    throws = np.zeros(len(throw_rows[0]), THROW_DTYPE)
+    throws["set_id"] = throw_rows[0]
+    throws["event_id"] = throw_rows[1]
+    throws["at"] = throw_rows[2]
+    throws["player"] = _encode(throw_rows[3], players)
+    throws["team"] = _encode(throw_rows[4], teams)
+    throws["target"] = _encode(throw_rows[5], players)
+    throws["valid_attempt"] = throw_rows[6]
+    throws["was_blocked"] = throw_rows[7]
+    throws["outcome"] = [
+        -1 if outcome is None else OUTCOMES.index(outcome) for outcome in throw_rows[8]
+    ]
+    for index, name in enumerate(THROW_DTYPE.names[9:15], start=9):
+        throws[name] = _floats(throw_rows[index])
+    throws["court_side"] = [
+        -1 if side is None else COURT_SIDES.index(side) for side in throw_rows[15]
+    ]
+
+    catches = np.zeros(len(catch_rows[0]), CATCH_DTYPE)
+    catches["set_id"] = catch_rows[0]
+    catches["event_id"] = catch_rows[1]
+    catches["at"] = catch_rows[2]
+    catches["player"] = _encode(catch_rows[3], players)
+    catches["team"] = _encode(catch_rows[4], teams)
+    catches["rebound_catch"] = catch_rows[5]
+
+    # Hits are credited to the thrower, caught throws to the catcher
+    credited = [
+        (
+            thrower
+            if cause in HIT_CAUSES
+            else catcher if cause == EliminationCause.THROW_CAUGHT else None
+        )
+        for cause, thrower, catcher in zip(*elimination_rows[5:8])
+    ]
+    eliminations = np.zeros(len(elimination_rows[0]), ELIMINATION_DTYPE)
+    eliminations["set_id"] = elimination_rows[0]
+    eliminations["event_id"] = elimination_rows[1]
+    eliminations["at"] = elimination_rows[2]
+    eliminations["player"] = _encode(elimination_rows[3], players)
+    eliminations["team"] = _encode(elimination_rows[4], teams)
+    eliminations["cause"] = [CAUSES.index(cause) for cause in elimination_rows[5]]
+    eliminations["credited"] = _encode(credited, players)
+
+    return EventFrame(
+        competition_id=competition_id,
+        throws=throws,
+        catches=catches,
+        eliminations=eliminations,
+        players=players,
+        teams=teams,
+        set_ids=frozenset(set_id for set_id, _, _ in sets),
+        match_ids=frozenset(match_id for _, match_id, _ in sets),
+        archived=bool(sets) and sets[0][2],
+    )
+
+
+class AnalyticsCache:
+    """Most recently used competitions' EventFrames, dropped when their events change
+
+    Events committed by this process invalidate a competition straight away,
+    the TTL bounds how long events from other processes take to show.
+
+    Args:
+        max_competitions (int, optional): Frames kept before the least recently used is evicted. Defaults to 8.
+        ttl_s (float, optional): Seconds a frame is served for. Defaults to 300.0.
+    """
+
+    def __init__(self, max_competitions: int = 8, ttl_s: float = 300.0) -> None:
+        self.max_competitions = max_competitions
+        self.ttl_s = ttl_s
+        self._frames: OrderedDict[int, tuple[float, EventFrame]] = OrderedDict()
+        # Bumped on invalidation, so a load that raced a write isn't cached
+        self._generations: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def frame(self, session: Session, competition_id: int) -> EventFrame:
+        """Gets a competition's events, loading them on a miss
+
+        Args:
+            session (Session): sqlalchemy Session to load with
+            competition_id (int): The competition's ID
+
+        Raises:
+            AnalyticsUnavailable: The competition doesn't exist
+
+        Returns:
+            EventFrame: The competition's events
+        """
+        with self._lock:
+            entry = self._frames.get(competition_id)
+            if entry is not None and time.monotonic() - entry[0] <= self.ttl_s:
+                self._frames.move_to_end(competition_id)
+                return entry[1]
+            generation = self._generations.get(competition_id, 0)
+
+        frame = load_frame(session, competition_id)
+
+        with self._lock:
+            if self._generations.get(competition_id, 0) == generation:
+                self._frames[competition_id] = (time.monotonic(), frame)
+                self._frames.move_to_end(competition_id)
+                while len(self._frames) > self.max_competitions:
+                    self._frames.popitem(last=False)
+        return frame
+
+    def invalidate(self, competition_ids: Iterable[int] | None = None) -> None:
+        with self._lock:
+            if competition_ids is None:
+                competition_ids = list(self._frames)
+            for competition_id in competition_ids:
+                self._frames.pop(competition_id, None)
+                self._generations[competition_id] = (
+                    self._generations.get(competition_id, 0) + 1
+                )
+
+    def invalidate_changes(
+        self, set_ids: set[int], match_ids: set[int], competition_ids: set[int]
+    ) -> None:
+        """Drops every cached competition a change to these sets, matches or competitions touches"""
+        with self._lock:
+            stale = [
+                competition_id
+                for competition_id, (_, frame) in self._frames.items()
+                if competition_id in competition_ids
+                or not frame.set_ids.isdisjoint(set_ids)
+                or not frame.match_ids.isdisjoint(match_ids)
+            ]
+        self.invalidate(stale + list(competition_ids))
+
+
+def _values(obj, name: str) -> set:
+    """Current and pre-flush values of an attribute"""
+    history = inspect(obj).attrs[name].history
+    return {*history.deleted, getattr(obj, name)} - {None}
+
+
+def _changes(session: Session) -> tuple[set[int], set[int], set[int]]:
+    """Sets, matches and competitions whose events the flushed objects change"""
+    set_ids, match_ids, competition_ids = set(), set(), set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (ThrowEvent, CatchEvent, EliminationEvent)):
+            set_ids.update(_values(obj, "set_id"))
+        elif isinstance(obj, Set):
+            # A cached frame doesn't know about sets added to its matches
+            match_ids.update(_values(obj, "match_id"))
+        elif isinstance(obj, (Match, ArchivedCompetition)):
+            # Archiving moves events with Core statements, the record marks the change
+            competition_ids.update(_values(obj, "competition_id"))
+    return set_ids, match_ids, competition_ids
+
+
+def maintain_analytics(session_class: type[Session], cache: AnalyticsCache) -> None:
+    """Invalidates cached competitions once a change to their events commits
+
+    Args:
+        session_class (type[Session]): Session class to listen on
+        cache (AnalyticsCache): Cache to invalidate
+    """
+
+    @event.listens_for(session_class, "after_flush")
+    def _collect(session: Session, flush_context) -> None:
+        changes = _changes(session)
+        if any(changes):
+            pending = session.info.setdefault(
+                "analytics_changed", (set(), set(), set())
+            )
+            for collected, changed in zip(pending, changes):
+                collected.update(changed)
+
+    @event.listens_for(session_class, "after_commit")
+    def _invalidate(session: Session) -> None:
+        changed = session.info.pop("analytics_changed", None)
+        if changed:
+            cache.invalidate_changes(*changed)
+
+    @event.listens_for(session_class, "after_rollback")
+    def _discard(session: Session) -> None:
+        session.info.pop("analytics_changed", None)
@@ -0,0 +1,155 @@
+from datetime import datetime
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from database.models import (
+    ARCHIVE_TABLES,
+    ArchivedCompetition,
+    Competition,
+    Match,
+    Set,
+)
+from database.models.match import MatchStatus
+
+# Matches in these states can still receive events, so their competition stays hot
+_ACTIVE_STATUSES = (MatchStatus.LIVE, MatchStatus.SCHEDULED)
+
+
+class ArchiveError(Exception):
+    """A competition could not be archived or restored"""
+
+
+def competition_set_ids(competition_id: int):
+    """Subquery of the IDs of every set played in a competition"""
+    return (
+        select(Set.id)
+        .join(Match, Match.id == Set.match_id)
+        .where(Match.competition_id == competition_id)
+        .scalar_subquery()
+    )
+
+
+def archived_at(session: Session, competition_id: int) -> datetime | None:
+    """When a competition was archived, None if it isn't, read from the database every time"""
+    return session.scalar(
+        select(ArchivedCompetition.archived_at).where(
+            ArchivedCompetition.competition_id == competition_id
+        )
+    )
+
+
+def _move_events(session: Session, tables, set_ids) -> dict[str, int]:
+    """Moves the rows of some sets from each source table to its target
+
+    Each table is moved by one DELETE ... RETURNING feeding an INSERT, so a
+    row committed while it runs is either moved or left where it was, never
+    deleted without being copied.
+
+    Args:
+        session (Session): sqlalchemy Session
+        tables: (source, target) Table pairs, in an order the foreign keys allow
+        set_ids: Subquery of the IDs of the sets whose rows move
+
+    Returns:
+        dict[str, int]: Rows moved by source table name
+    """
+    counts = {}
+    for source, target in tables:
+        moved = (
+            delete(source)
+            .where(source.c.set_id.in_(set_ids))
+            .returning(*source.c)
+            .cte(f"moved_{source.name}")
+        )
+        columns = [column.name for column in target.columns]
+        counts[source.name] = session.execute(
+            insert(target).from_select(
+                columns, select(*(moved.c[column] for column in columns))
+            )
+        ).rowcount
+    return counts
+
+
+def archive_competition(session: Session, competition_id: int) -> ArchivedCompetition:
+    """Moves the events of a finished competition into the archive tables
+
+    The competition's matches and sets stay where they are, only the event rows
+    move. Reads through the event repositories with include_archive=True see
+    both, so the event routes keep returning archived events.
+
+    Args:
+        session (Session): sqlalchemy Session, committed on success
+        competition_id (int): The competition's ID
+
+    Raises:
+        ArchiveError: The competition doesn't exist, is already archived or still has live or scheduled matches
+
+    Returns:
+        ArchivedCompetition: Record of the archive with the moved row counts
+    """
+    if session.get(Competition, competition_id) is None:
+        raise ArchiveError(f"Competition with ID {competition_id} not found")
+    if session.get(ArchivedCompetition, competition_id) is not None:
+        raise ArchiveError(f"Competition with ID {competition_id} is already archived")
+
+    active = session.execute(
+        select(func.count(Match.id)).where(
+            Match.competition_id == competition_id,
+            Match.status.in_(_ACTIVE_STATUSES),
+        )
+    ).scalar()
+    if active:
+        raise ArchiveError(
+            f"Competition with ID {competition_id} has {active} live or scheduled matches"
+        )
+
+    # Referencing tables first, the hot tables' foreign keys still apply
+    counts = _move_events(
+        session,
+        [
+            (model.__table__, archive)
+            for model, archive in reversed(ARCHIVE_TABLES.items())
+        ],
+        competition_set_ids(competition_id),
+    )
+
+    record = ArchivedCompetition(
+        competition_id=competition_id,
+        throw_events=counts["throw_events"],
+        catch_events=counts["catch_events"],
+        eliminations=counts["eliminations"],
+    )
+    session.add(record)
+    session.commit()
+    session.refresh(record)
+    return record
+
+
+def restore_competition(session: Session, competition_id: int) -> ArchivedCompetition:
+    """Moves an archived competition's events back into the hot tables
+
+    Args:
+        session (Session): sqlalchemy Session, committed on success
+        competition_id (int): The competition's ID
+
+    Raises:
+        ArchiveError: The competition isn't archived
+
+    Returns:
+        ArchivedCompetition: The removed archive record
+    """
+    record = session.get(ArchivedCompetition, competition_id)
+    if record is None:
+        raise ArchiveError(f"Competition with ID {competition_id} is not archived")
+
+    # Referenced tables first, so restored rows find what they point to
+    _move_events(
+        session,
+        [(archive, model.__table__) for model, archive in ARCHIVE_TABLES.items()],
+        competition_set_ids(competition_id),
+    )
+
+    session.delete(record)
+    session.commit()
+    return record
@@ -0,0 +1,112 @@
+import multiprocessing
+import pickle
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable
+
+
+class ComputeError(Exception):
+    """CPU-bound work couldn't be run in the process pool"""
+
+
+class ComputeBusy(ComputeError):
+    """Too much work is already queued for the pool"""
+
+
+class ComputeTimeout(ComputeError):
+    """The work didn't finish in time"""
+
+
+class ResultTooLarge(ComputeError):
+    """The work's result is bigger than the pool sends back"""
+
+
+def _run(fn: Callable, args: tuple, kwargs: dict, max_result_bytes: int) -> bytes:
+    """Runs in a pool process, pickling the result there so its size can be checked"""
+    result = pickle.dumps(fn(*args, **kwargs), protocol=pickle.HIGHEST_PROTOCOL)
+    if len(result) > max_result_bytes:
+        raise ResultTooLarge(
+            f"Result of {len(result)} bytes is over the {max_result_bytes} byte limit"
+        )
+    return result
+
+
+class ComputePool:
+    """Runs CPU-bound work in other processes, so it doesn't hold the GIL request threads need
+
+    The processes are started on first use, with spawn so they don't inherit
+    the parent's database connections. Work and arguments must be picklable,
+    send the arrays the work needs rather than whole cached objects.
+
+    Args:
+        max_workers (int, optional): Processes in the pool. Defaults to 2.
+        max_pending (int, optional): Most calls queued or running before new ones are refused. Defaults to 8.
+        timeout_s (float, optional): Seconds a caller waits for its result. Defaults to 10.0.
+        max_result_bytes (int, optional): Largest pickled result sent back. Defaults to 1 MiB.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_pending: int = 8,
+        timeout_s: float = 10.0,
+        max_result_bytes: int = 1 << 20,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout_s = timeout_s
+        self.max_result_bytes = max_result_bytes
+        self._executor: ProcessPoolExecutor | None = None
+        # Released when the work finishes, not when its caller gives up waiting
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Runs a module level function in the pool and waits for its result
+
+        Args:
+            fn (Callable): Picklable function to call
+            *args: Picklable positional arguments
+            **kwargs: Picklable keyword arguments
+
+        Raises:
+            ComputeBusy: max_pending calls are already queued or running
+            ComputeTimeout: No result within timeout_s, the work carries on to completion
+            ResultTooLarge: The pickled result is over max_result_bytes
+
+        Returns:
+            Any: What fn returned
+        """
+        if not self._slots.acquire(blocking=False):
+            raise ComputeBusy(f"{self.max_pending} computations already pending")
+        try:
+            future: Future = self._pool().submit(
+                _run, fn, args, kwargs, self.max_result_bytes
+            )
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            result = future.result(timeout=self.timeout_s)
+        except FutureTimeoutError:
+            future.cancel()
+            raise ComputeTimeout(f"No result within {self.timeout_s}s")
+        return pickle.loads(result)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,289 @@
+from typing import Iterable
+
+from sqlalchemy import Select, delete, event, exists, func, inspect, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from database.models import (
+    ARCHIVE_TABLES,
+    CatchEvent,
+    EliminationEvent,
+    Match,
+    PlayerTeamHistory,
+    Set,
+    SetTeamCounters,
+    ThrowEvent,
+)
+from database.models.set_team_counters import STARTING_PLAYERS
+
+# Event model to the counter it feeds and the column of the player it counts for
+EVENT_COUNTERS = {
+    ThrowEvent: ("throws", "player_id"),
+    CatchEvent: ("catches", "player_id"),
+    EliminationEvent: ("eliminations", "eliminated_player_id"),
+}
+
+_counters = SetTeamCounters.__table__
+
+
+def _sides(*where) -> Select:
+    """Both (set_id, team_id, start_time) of every set matching the filters"""
+    sides = []
+    for team_column in (Match.team1_id, Match.team2_id):
+        sides.append(
+            select(
+                Set.id.label("set_id"),
+                team_column.label("team_id"),
+                Set.start_time.label("start_time"),
+            )
+            .join(Match, Match.id == Set.match_id)
+            .where(*where)
+        )
+    return sides[0].union_all(sides[1])
+
+
+def _starting_players(sides):
+    """Players a side starts its set with, its roster at the start capped at STARTING_PLAYERS
+
+    Matches the scoreboard, so short-handed teams aren't counted six players.
+    """
+    roster = (
+        select(func.count())
+        .where(
+            PlayerTeamHistory.team_id == sides.c.team_id,
+            PlayerTeamHistory.active_at(sides.c.start_time),
+        )
+        .correlate_except(PlayerTeamHistory)
+        .scalar_subquery()
+    )
+    return func.least(roster, STARTING_PLAYERS).label("starting_players")
+
+
+def _plays_for(player_id, team_id, at):
+    """Whether a player was on a team at a time, so players who moved count for one side"""
+    return (
+        exists()
+        .where(
+            PlayerTeamHistory.player_id == player_id,
+            PlayerTeamHistory.team_id == team_id,
+            PlayerTeamHistory.active_at(at),
+        )
+        .correlate_except(PlayerTeamHistory)
+    )
+
+
+def _elimination_time(
+    throws, catches, set_id, throw_event_id, catch_event_id, created_at
+):
+    """When an elimination happened, at the throw or catch that caused it if any"""
+    throw_at = (
+        select(throws.c.timestamp)
+        .where(throws.c.set_id == set_id, throws.c.id == throw_event_id)
+        .correlate_except(throws)
+        .scalar_subquery()
+    )
+    catch_at = (
+        select(catches.c.timestamp)
+        .where(catches.c.set_id == set_id, catches.c.id == catch_event_id)
+        .correlate_except(catches)
+        .scalar_subquery()
+    )
+    return func.coalesce(throw_at, catch_at, created_at)
+
+
+def _event_time(obj, old: bool = False):
+    """When an event flushed by the ORM happened, its value before the flush if old"""
+    if isinstance(obj, EliminationEvent):
+        # Not loaded on new rows, stored from now() as a timestamp, which localtimestamp is
+        created_at = inspect(obj).dict.get("created_at")
+        return _elimination_time(
+            ThrowEvent.__table__,
+            CatchEvent.__table__,
+            obj.set_id,
+            obj.throw_event_id,
+            obj.catch_event_id,
+            func.localtimestamp() if created_at is None else created_at,
+        )
+    before, after = _changed(obj, "timestamp")
+    return before if old else after
+
+
+def init_counters(conn: Connection, set_ids: Iterable[int]) -> None:
+    """Creates zeroed counter rows for both teams of new sets
+
+    Args:
+        conn (Connection): sqlalchemy Connection
+        set_ids (Iterable[int]): The new sets' IDs
+    """
+    sides = _sides(Set.id.in_(list(set_ids))).subquery()
+    conn.execute(
+        insert(SetTeamCounters)
+        .from_select(
+            ["set_id", "team_id", "starting_players"],
+            select(sides.c.set_id, sides.c.team_id, _starting_players(sides)),
+        )
+        .on_conflict_do_nothing()
+    )
+
+
+def apply_event(
+    conn: Connection, counter: str, set_id: int, player_id: int, delta: int, at
+) -> None:
+    """Adds delta to one counter of the team a player is on in a set
+
+    The team is whichever side of the set's match the player was on when the
+    event happened. Runs as a single upsert so concurrent writes to one set
+    don't lose updates.
+
+    Args:
+        conn (Connection): sqlalchemy Connection
+        counter (str): "throws", "catches" or "eliminations"
+        set_id (int): The event's set
+        player_id (int): The player the event counts for
+        delta (int): 1 for a new event, -1 for a removed one
+        at: When the event happened, a datetime or SQL expression
+    """
+    sides = _sides(Set.id == set_id).subquery()
+    team = (
+        select(
+            sides.c.set_id,
+            sides.c.team_id,
+            _starting_players(sides),
+            literal(delta),
+        )
+        .where(_plays_for(player_id, sides.c.team_id, at))
+        .limit(1)
+    )
+    stmt = insert(SetTeamCounters).from_select(
+        ["set_id", "team_id", "starting_players", counter], team
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["set_id", "team_id"],
+        set_={
+            counter: _counters.c[counter] + stmt.excluded[counter],
+            "updated_at": func.now(),
+        },
+    )
+    conn.execute(stmt)
+
+
+def _changed(obj, name: str) -> tuple:
+    """Old and new value of an attribute within the current flush"""
+    history = inspect(obj).attrs[name].history
+    new = getattr(obj, name)
+    old = history.deleted[0] if history.deleted else new
+    return old, new
+
+
+def _update_counters(session: Session, flush_context) -> None:
+    conn = session.connection()
+
+    new_sets = [obj.id for obj in session.new if isinstance(obj, Set)]
+    if new_sets:
+        init_counters(conn, new_sets)
+
+    for obj in session.new:
+        if type(obj) in EVENT_COUNTERS:
+            counter, player = EVENT_COUNTERS[type(obj)]
+            apply_event(
+                conn, counter, obj.set_id, getattr(obj, player), 1, _event_time(obj)
+            )
+
+    for obj in session.deleted:
+        if type(obj) in EVENT_COUNTERS:
+            counter, player = EVENT_COUNTERS[type(obj)]
+            apply_event(
+                conn, counter, obj.set_id, getattr(obj, player), -1, _event_time(obj)
+            )
+
+    for obj in session.dirty:
+        if type(obj) in EVENT_COUNTERS:
+            counter, player = EVENT_COUNTERS[type(obj)]
+            old_set, new_set = _changed(obj, "set_id")
+            old_player, new_player = _changed(obj, player)
+            old_at, new_at = _event_time(obj, old=True), _event_time(obj)
+            if isinstance(obj, EliminationEvent):
+                moved = (old_set, old_player) != (new_set, new_player)
+            else:
+                moved = (old_set, old_player, old_at) != (new_set, new_player, new_at)
+            if moved:
+                apply_event(conn, counter, old_set, old_player, -1, old_at)
+                apply_event(conn, counter, new_set, new_player, 1, new_at)
+
+
+def maintain_counters(session_class: type[Session]) -> None:
+    """Updates counters in the same transaction as every event flushed by a session class
+
+    Args:
+        session_class (type[Session]): Session class to listen on
+    """
+    if not event.contains(session_class, "after_flush", _update_counters):
+        event.listen(session_class, "after_flush", _update_counters)
+
+
+def _event_count(model, sides) -> Select:
+    """Events of a side in a set, hot and archived, as a correlated subquery"""
+    counter, player = EVENT_COUNTERS[model]
+    total = None
+    for archived in (False, True):
+        table, throws, catches = (
+            ARCHIVE_TABLES[m] if archived else m.__table__
+            for m in (model, ThrowEvent, CatchEvent)
+        )
+        if model is EliminationEvent:
+            at = _elimination_time(
+                throws,
+                catches,
+                table.c.set_id,
+                table.c.throw_event_id,
+                table.c.catch_event_id,
+                table.c.created_at,
+            )
+        else:
+            at = table.c.timestamp
+        count = (
+            select(func.count())
+            .select_from(table)
+            .where(
+                table.c.set_id == sides.c.set_id,
+                _plays_for(table.c[player], sides.c.team_id, at),
+            )
+            .scalar_subquery()
+        )
+        total = count if total is None else total + count
+    return total.label(counter)
+
+
+def rebuild_counters(conn: Connection, set_ids=None) -> int:
+    """Recomputes counters from the raw hot and archived events
+
+    Needed after bulk loads that bypass the ORM, such as the synthetic
+    generator, or if counters are ever suspected to have drifted.
+
+    Args:
+        conn (Connection): sqlalchemy Connection
+        set_ids (optional): IDs or a subquery of IDs of the sets to rebuild. Defaults to None, every set.
+
+    Returns:
+        int: Number of counter rows written
+    """
+    where = [] if set_ids is None else [Set.id.in_(set_ids)]
+    sides = _sides(*where).subquery()
+
+    if set_ids is None:
+        conn.execute(delete(SetTeamCounters))
+    else:
+        conn.execute(delete(SetTeamCounters).where(_counters.c.set_id.in_(set_ids)))
+
+    columns = [
+        _starting_players(sides),
+        *(_event_count(model, sides) for model in EVENT_COUNTERS),
+    ]
+    result = conn.execute(
+        insert(SetTeamCounters).from_select(
+            ["set_id", "team_id", *(column.name for column in columns)],
+            select(sides.c.set_id, sides.c.team_id, *columns),
+        )
+    )
+    return result.rowcount
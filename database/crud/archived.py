@@ -0,0 +1,77 @@
+from typing import Type
+from sqlalchemy import Select, Table, select, union_all
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.util import ClauseAdapter
+from database.crud.base import CRUDRepository, ORMModel
+from database.models import ARCHIVE_TABLES
+
+
+class ArchivedEventRepository(CRUDRepository[ORMModel]):
+    """Repository for an event table whose cold rows live in an archive table
+
+    Writes only ever touch the hot table. Reads with include_archive=True run a
+    single UNION ALL over both tables, with the filters applied to each side so
+    the hot side still prunes to one partition.
+    """
+
+    def __init__(self, model: Type[ORMModel], db_session: Session) -> None:
+        super().__init__(model, db_session)
+        self.archive: Table = ARCHIVE_TABLES[model]
+
+    def _archived_select(self, *args, **kwargs) -> Select:
+        hot = self.model.__table__
+        adapter = ClauseAdapter(self.archive, adapt_on_names=True)
+
+        hot_sql = select(hot)
+        archive_sql = select(*(self.archive.c[column.name] for column in hot.columns))
+
+        # Condtional filter
+        if args:
+            hot_sql = hot_sql.where(*args)
+            archive_sql = archive_sql.where(*(adapter.traverse(arg) for arg in args))
+
+        # Equalility filters
+        for key, value in kwargs.items():
+            if key in hot.c:
+                hot_sql = hot_sql.where(hot.c[key] == value)
+                archive_sql = archive_sql.where(self.archive.c[key] == value)
+
+        return select(self.model).from_statement(union_all(hot_sql, archive_sql))
+
+    def get_one(
+        self, *args, include_archive: bool = False, **kwargs
+    ) -> ORMModel | None:
+        """Gets a model instance based on filters
+
+        Args:
+            self.db_session (Session): sqlalchemy Session
+            *args: Filter expression such as Event.location_x > 0.5
+            include_archive (bool, optional): Also search archived rows, which are read only. Defaults to False.
+            **kwargs: Equalility expresion such as name="david"
+
+        Returns:
+            ORMModel | None: The matching model instance
+        """
+        if not include_archive:
+            return super().get_one(*args, **kwargs)
+
+        result = self.db_session.execute(self._archived_select(*args, **kwargs))
+        return result.scalar_one_or_none()
+
+    def get_all(self, *args, include_archive: bool = False, **kwargs) -> list[ORMModel]:
+        """Gets model instances based on filters
+
+        Args:
+            self.db_session (Session): sqlalchemy Session
+            *args: Filter expression such as Event.location_x > 0.5
+            include_archive (bool, optional): Also return archived rows, which are read only. Defaults to False.
+            **kwargs: Equalility expresion such as name="david"
+
+        Returns:
+            list[ORMModel]: List of model instances
+        """
+        if not include_archive:
+            return super().get_all(*args, **kwargs)
+
+        result = self.db_session.execute(self._archived_select(*args, **kwargs))
+        return list(result.scalars().all())
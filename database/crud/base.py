@@ -27,6 +27,40 @@ class CRUDRepository(Generic[ORMModel]):
         self.db_session.refresh(model_obj)
         return model_obj
 
+    def create_many(self, rows: list[dict]) -> list[int]:
+        """Creates rows in one transaction, flushed as multi-row INSERTs
+
+        Args:
+            self.db_session (Session): sqlalchemy Session
+            rows (list[dict]): Column values of each row
+
+        Returns:
+            list[int]: IDs of the created rows, in the order given
+        """
+        model_objs = [self.model(**row) for row in rows]
+        self.db_session.add_all(model_objs)
+        self.db_session.flush()
+        # Read before the commit expires them
+        ids = [model_obj.id for model_obj in model_objs]
+        self.db_session.commit()
+        return ids
+
+    def existing_ids(self, ids) -> set[int]:
+        """Which of some IDs have rows, in one query
+
+        Args:
+            self.db_session (Session): sqlalchemy Session
+            ids: IDs to look for
+
+        Returns:
+            set[int]: The IDs found
+        """
+        ids = set(ids)
+        if not ids:
+            return set()
+        sql = select(self.model.id).where(self.model.id.in_(ids))
+        return set(self.db_session.execute(sql).scalars())
+
     def get_one(self, *args, **kwargs) -> ORMModel | None:
         """Gets model instances based on filters
 
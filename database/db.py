@@ -1,13 +1,21 @@
 from contextlib import contextmanager
+import logging
 import os
+import threading
+from pathlib import Path
 from typing import Generator
-from dotenv import load_dotenv, find_dotenv
-from sqlalchemy import create_engine
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
 from database.models import Base
-from sqlalchemy_utils import database_exists, create_database
+from database.instrumentation import add_query_observer, instrument_engine
+from database.routing import ReplicaMonitor, RoutingSession
 
-load_dotenv(find_dotenv())
+logger = logging.getLogger(__name__)
+
+# The repo root's .env, without searching the filesystem for one
+load_dotenv(Path(__file__).resolve().parent.parent / ".env")
 
 username = os.getenv("DATABASE_USERNAME")
 password = os.getenv("DATABASE_PASSWORD")
@@ -19,21 +27,282 @@ DATABASE_URL = (
     f"postgresql://{username}:{password}@{database_host}:{port}/{database_name}"
 )
 
-engine = create_engine(DATABASE_URL, echo=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Optional streaming replica for reads, everything uses the primary when unset
+replica_host = os.getenv("DATABASE_REPLICA_HOST")
+replica_port = os.getenv("DATABASE_REPLICA_PORT", port)
+
+# Created by init_db, on app startup or the first use of engine, not on import
+_engines: dict[str, Engine | ReplicaMonitor | None] = {}
+_engines_lock = threading.Lock()
+
+# Process wide caches and pools, built on first use so importing this module stays cheap
+_services: dict[str, object] = {}
+_services_lock = threading.RLock()
+_listeners_registered = False
+
+
+def _create_engine(url: str) -> Engine:
+    engine = create_engine(
+        url,
+        echo=os.getenv("DATABASE_ECHO", "false").lower() == "true",
+        pool_size=int(os.getenv("DATABASE_POOL_SIZE", "5")),
+        max_overflow=int(os.getenv("DATABASE_MAX_OVERFLOW", "10")),
+    )
+    instrument_engine(engine)
+    return engine
+
+
+def warm_up_pool(engine: Engine, connections: int) -> int:
+    """Opens pool connections ahead of traffic, so the first requests don't pay for them
+
+    Args:
+        engine (Engine): Engine whose pool to fill
+        connections (int): Connections to open, capped at the pool size
+
+    Returns:
+        int: Connections opened, fewer than asked if the database refused some
+    """
+    opened = []
+    for _ in range(min(connections, engine.pool.size())):
+        try:
+            opened.append(engine.connect())
+        except Exception:
+            logger.warning(
+                "Pool warm-up stopped after %d connections", len(opened), exc_info=True
+            )
+            break
+    # Closing returns them to the pool, still connected
+    for conn in opened:
+        conn.close()
+    return len(opened)
+
+
+def init_db(warm_up: int = 0) -> Engine:
+    """Creates the engines and binds SessionLocal to them, does nothing if already done
+
+    Args:
+        warm_up (int, optional): Connections to open in each pool straight away. Defaults to 0.
+
+    Returns:
+        Engine: The primary's engine
+    """
+    register_listeners()
+    with _engines_lock:
+        if not _engines:
+            engine = _create_engine(DATABASE_URL)
+            replica_engine = None
+            replica_monitor = None
+            if replica_host:
+                replica_engine = _create_engine(
+                    f"postgresql://{username}:{password}@{replica_host}:{replica_port}/{database_name}"
+                )
+                replica_monitor = ReplicaMonitor(
+                    replica_engine,
+                    max_lag_s=float(os.getenv("REPLICA_MAX_LAG_S", "5")),
+                    interval_s=float(os.getenv("REPLICA_CHECK_INTERVAL_S", "1")),
+                )
+            SessionLocal.configure(
+                bind=engine, replica=replica_engine, monitor=replica_monitor
+            )
+            _engines.update(
+                engine=engine,
+                replica_engine=replica_engine,
+                replica_monitor=replica_monitor,
+            )
+            if warm_up:
+                for pool_engine in (engine, replica_engine):
+                    if pool_engine is not None:
+                        warm_up_pool(pool_engine, warm_up)
+        return _engines["engine"]
+
+
+def dispose_db() -> None:
+    """Stops the replica monitor and closes every pooled connection"""
+    with _engines_lock:
+        if not _engines:
+            return
+        if _engines["replica_monitor"] is not None:
+            _engines["replica_monitor"].stop()
+        for name in ("engine", "replica_engine"):
+            if _engines[name] is not None:
+                _engines[name].dispose()
+        _engines.clear()
+        SessionLocal.configure(bind=None, replica=None, monitor=None)
+
+
+def _pool_health(engine: Engine) -> dict:
+    pool = engine.pool
+    health = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "ok": False,
+        "error": None,
+    }
+    # Waiting on an exhausted pool would hang the probe for the pool timeout
+    if health["checked_out"] >= pool.size() + pool._max_overflow:
+        health["error"] = "Pool exhausted"
+        return health
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        health["ok"] = True
+    except Exception as e:
+        health["error"] = f"{type(e).__name__}: {e}"
+    return health
+
+
+def pool_health() -> dict:
+    """Usage of the primary's and replica's pools, and whether each answers a query
+
+    Returns:
+        dict: "primary" and "replica" entries, None when not started or no replica
+    """
+    return {
+        name: None if _engines.get(key) is None else _pool_health(_engines[key])
+        for name, key in (("primary", "engine"), ("replica", "replica_engine"))
+    }
+
+
+def _slow_query_recorder():
+    from database.slow_query import SlowQueryRecorder
+
+    recorder = SlowQueryRecorder(
+        threshold_ms=float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200")),
+        explain_sample_rate=float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0")),
+        buffer_size=int(os.getenv("SLOW_QUERY_BUFFER_SIZE", "100")),
+    )
+    add_query_observer(recorder)
+    return recorder
+
+
+def _scoreboards():
+    from database.scoreboard import ScoreboardEngine
+
+    return ScoreboardEngine(resync_s=float(os.getenv("SCOREBOARD_RESYNC_S", "5")))
+
+
+def _standings_cache():
+    from database.standings import StandingsCache
+
+    return StandingsCache(ttl_s=float(os.getenv("STANDINGS_CACHE_TTL_S", "30")))
+
+
+def _replayer():
+    from database.replay import SetReplayer
+
+    return SetReplayer(checkpoint_every=int(os.getenv("REPLAY_CHECKPOINT_EVERY", "50")))
+
+
+def _analytics_cache():
+    from database.analytics import AnalyticsCache
+
+    return AnalyticsCache(
+        max_competitions=int(os.getenv("ANALYTICS_CACHE_COMPETITIONS", "8")),
+        ttl_s=float(os.getenv("ANALYTICS_CACHE_TTL_S", "300")),
+    )
+
+
+def _compute_pool():
+    from database.compute import ComputePool
+
+    # Heavy analytics run in other processes so they don't stall ingestion and simple reads
+    return ComputePool(
+        max_workers=int(os.getenv("COMPUTE_POOL_WORKERS", "2")),
+        max_pending=int(os.getenv("COMPUTE_POOL_MAX_PENDING", "8")),
+        timeout_s=float(os.getenv("COMPUTE_POOL_TIMEOUT_S", "10")),
+        max_result_bytes=int(os.getenv("COMPUTE_POOL_MAX_RESULT_BYTES", "1048576")),
+    )
+
+
+_SERVICES = {
+    "slow_query_recorder": _slow_query_recorder,
+    "scoreboards": _scoreboards,
+    "standings_cache": _standings_cache,
+    "replayer": _replayer,
+    "analytics_cache": _analytics_cache,
+    "compute_pool": _compute_pool,
+}
+
+
+def _service(name: str):
+    with _services_lock:
+        if name not in _services:
+            _services[name] = _SERVICES[name]()
+        return _services[name]
+
+
+def register_listeners() -> None:
+    """Hooks the derived tables, scoreboards and caches onto RoutingSession, once
+
+    Called by init_db, so sessions made without it, such as in tests, only
+    maintain what they register themselves.
+    """
+    global _listeners_registered
+    from database.analytics import maintain_analytics
+    from database.counters import maintain_counters
+    from database.geometry import maintain_throw_geometry
+    from database.outcomes import maintain_outcomes
+    from database.partitions import maintain_partitions
+    from database.player_stats import maintain_player_stats
+    from database.replay import maintain_checkpoints
+    from database.scoreboard import track_scoreboards
+    from database.standings import maintain_standings
+    from database.xhit import maintain_xhit
+
+    with _services_lock:
+        if _listeners_registered:
+            return
+        _service("slow_query_recorder")
+        maintain_counters(RoutingSession)
+        maintain_player_stats(RoutingSession)
+        maintain_outcomes(RoutingSession)
+        maintain_throw_geometry(RoutingSession)
+        maintain_xhit(RoutingSession)
+        maintain_partitions(
+            RoutingSession, ahead=int(os.getenv("EVENT_PARTITIONS_AHEAD", "2"))
+        )
+        track_scoreboards(RoutingSession, _service("scoreboards"))
+        maintain_standings(RoutingSession, _service("standings_cache"))
+        maintain_checkpoints(RoutingSession)
+        maintain_analytics(RoutingSession, _service("analytics_cache"))
+        _listeners_registered = True
+
+
+def __getattr__(name: str):
+    # Lets "from database.db import engine" keep working, creating the engine on first use
+    if name in ("engine", "replica_engine", "replica_monitor"):
+        init_db()
+        return _engines[name]
+    # And the services, built without connecting
+    if name in _SERVICES:
+        return _service(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
 
 
 def create_db():
+    from sqlalchemy_utils import database_exists, create_database
+
+    engine = init_db()
     if not database_exists(engine.url):
         create_database(engine.url)
 
 
 def create_schema():
+    from database.partitions import ensure_partitions
+
+    engine = init_db()
     Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        ensure_partitions(conn)
 
 
 # FastAPI dependency
 def get_db_session() -> Generator[Session, None, None]:
+    init_db()
     db = SessionLocal()
     try:
         yield db
@@ -45,8 +314,23 @@ def get_db_session() -> Generator[Session, None, None]:
         db.close()
 
 
+# FastAPI dependency for GET routes, served by the replica when it's caught up
+def get_read_db_session() -> Generator[Session, None, None]:
+    init_db()
+    db = SessionLocal(info={"read_only": True})
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 @contextmanager
 def get_db_context() -> Generator[Session, None, None]:
+    init_db()
     session = SessionLocal()
     try:
         yield session
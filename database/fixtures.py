@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Sequence
+
+
+@dataclass(frozen=True)
+class Fixture:
+    """A scheduled league match, team1 at home"""
+
+    round: int
+    team1_id: int
+    team2_id: int
+    match_date: datetime
+
+
+def round_robin(
+    team_ids: Sequence[int], double: bool = True
+) -> list[list[tuple[int, int]]]:
+    """Pairs every team with every other, one match per team per round
+
+    Uses the circle method: the first team stays put while the rest rotate
+    around it. With an odd number of teams one team sits out each round. In a
+    double round robin the second half repeats the first with home and away
+    swapped.
+
+    Args:
+        team_ids (Sequence[int]): The teams, in seeding order
+        double (bool, optional): Whether each pair meets home and away. Defaults to True.
+
+    Returns:
+        list[list[tuple[int, int]]]: (home, away) team IDs of each round's matches
+    """
+    teams: list[int | None] = list(team_ids)
+    if len(teams) < 2:
+        return []
+    if len(teams) % 2:
+        # Whoever is drawn against the bye sits the round out
+        teams.append(None)
+
+    half = len(teams) // 2
+    rounds = []
+    for round_number in range(len(teams) - 1):
+        matches = []
+        for i in range(half):
+            home, away = teams[i], teams[-1 - i]
+            # The fixed team would otherwise always be at home
+            if i == 0 and round_number % 2:
+                home, away = away, home
+            if home is not None and away is not None:
+                matches.append((home, away))
+        rounds.append(matches)
+        teams.insert(1, teams.pop())
+
+    if double:
+        rounds += [[(away, home) for home, away in matches] for matches in rounds]
+    return rounds
+
+
+def slot_fixtures(
+    rounds: list[list[tuple[int, int]]],
+    start: datetime,
+    days_between_rounds: int = 7,
+    courts: int = 1,
+    match_minutes: int = 60,
+) -> list[Fixture]:
+    """Gives each match of a schedule a date and time
+
+    Each round is played on one day, starting days_between_rounds after the
+    last. Within a round, courts matches are played at once, each slot
+    match_minutes after the previous one.
+
+    Args:
+        rounds (list[list[tuple[int, int]]]): (home, away) of each round's matches, as from round_robin
+        start (datetime): Date and time of the first round's first match
+        days_between_rounds (int, optional): Days from one round to the next. Defaults to 7.
+        courts (int, optional): Matches played at the same time. Defaults to 1.
+        match_minutes (int, optional): Minutes from one slot to the next. Defaults to 60.
+
+    Returns:
+        list[Fixture]: Every match, in round and slot order
+    """
+    fixtures = []
+    for round_number, matches in enumerate(rounds):
+        day = start + timedelta(days=round_number * days_between_rounds)
+        for i, (home, away) in enumerate(matches):
+            slot = day + timedelta(minutes=(i // courts) * match_minutes)
+            fixtures.append(Fixture(round_number + 1, home, away, slot))
+    return fixtures
@@ -0,0 +1,180 @@
+import numpy as np
+from sqlalchemy import delete, event, func, inspect, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from database.archive import competition_set_ids
+from database.models import ARCHIVE_TABLES, ThrowEvent, ThrowGeometry
+from database.models.throw_geometry import COURT_LENGTH, COURT_WIDTH, CourtSide
+
+# Court side codes, by the thrower's distance from the sideline on their right
+COURT_SIDES = (CourtSide.RIGHT, CourtSide.CENTRE, CourtSide.LEFT)
+
+LOCATION_COLUMNS = (
+    "location_x",
+    "location_y",
+    "target_location_x",
+    "target_location_y",
+)
+
+_geometry = ThrowGeometry.__table__
+
+
+def throw_geometry(
+    x: np.ndarray, y: np.ndarray, target_x: np.ndarray, target_y: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Distance, angle and court side of every throw in some arrays of locations
+
+    Missing locations are NaN, and give a NaN distance and angle and a -1 side.
+
+    Args:
+        x (np.ndarray): X coordinate of each throw's origin
+        y (np.ndarray): Y coordinate of each throw's origin
+        target_x (np.ndarray): X coordinate of each throw's target
+        target_y (np.ndarray): Y coordinate of each throw's target
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Distances in metres, angles in degrees, COURT_SIDES codes
+    """
+    # Team A throws towards +x from x < 9, team B towards -x
+    facing = np.where(x < COURT_LENGTH / 2, 1.0, -1.0)
+    forward = (target_x - x) * facing
+    left = (target_y - y) * facing
+
+    distance = np.hypot(forward, left)
+    angle = np.degrees(np.arctan2(left, forward))
+
+    from_right = np.where(facing > 0, y, COURT_WIDTH - y)
+    sides = np.digitize(from_right, [COURT_WIDTH / 3, 2 * COURT_WIDTH / 3])
+    sides[np.isnan(from_right)] = -1
+    return distance, angle, sides
+
+
+def _floats(values) -> np.ndarray:
+    return np.array([np.nan if value is None else value for value in values], float)
+
+
+def _geometry_rows(set_ids, throw_ids, locations: list) -> list[dict]:
+    """Side table rows of a batch of throws, locations being one sequence per LOCATION_COLUMNS"""
+    distance, angle, sides = throw_geometry(*(_floats(column) for column in locations))
+    return [
+        {
+            "set_id": set_id,
+            "throw_event_id": throw_id,
+            "distance": None if np.isnan(distance[index]) else float(distance[index]),
+            "angle": None if np.isnan(angle[index]) else float(angle[index]),
+            "court_side": None if sides[index] < 0 else COURT_SIDES[sides[index]],
+        }
+        for index, (set_id, throw_id) in enumerate(zip(set_ids, throw_ids))
+    ]
+
+
+def store_geometry(conn: Connection, rows: list[dict]) -> None:
+    """Upserts side table rows
+
+    Args:
+        conn (Connection): sqlalchemy Connection
+        rows (list[dict]): Rows from a batch of throws
+    """
+    if not rows:
+        return
+    stmt = insert(ThrowGeometry)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["set_id", "throw_event_id"],
+        set_={
+            "distance": stmt.excluded.distance,
+            "angle": stmt.excluded.angle,
+            "court_side": stmt.excluded.court_side,
+            "updated_at": func.now(),
+        },
+    )
+    conn.execute(stmt, rows)
+
+
+def _moved_throws(session: Session) -> set[tuple[int, int]]:
+    """(set_id, id) keys the flushed throws no longer have"""
+    keys = set()
+    for obj in session.deleted:
+        if isinstance(obj, ThrowEvent):
+            keys.add((obj.set_id, obj.id))
+    for obj in session.dirty:
+        if isinstance(obj, ThrowEvent):
+            keys.update(
+                (set_id, obj.id) for set_id in inspect(obj).attrs.set_id.history.deleted
+            )
+    return keys
+
+
+def _update_geometry(session: Session, flush_context) -> None:
+    throws = [
+        obj
+        for obj in (*session.new, *session.dirty)
+        if isinstance(obj, ThrowEvent) and obj not in session.deleted
+    ]
+    moved = _moved_throws(session)
+    if not throws and not moved:
+        return
+
+    conn = session.connection()
+    if moved:
+        conn.execute(
+            delete(ThrowGeometry).where(
+                tuple_(_geometry.c.set_id, _geometry.c.throw_event_id).in_(moved)
+            )
+        )
+    store_geometry(
+        conn,
+        _geometry_rows(
+            [obj.set_id for obj in throws],
+            [obj.id for obj in throws],
+            [[getattr(obj, name) for obj in throws] for name in LOCATION_COLUMNS],
+        ),
+    )
+
+
+def maintain_throw_geometry(session_class: type[Session]) -> None:
+    """Derives throw geometry in the same transaction as every throw flushed by a session class
+
+    Args:
+        session_class (type[Session]): Session class to listen on
+    """
+    if not event.contains(session_class, "after_flush", _update_geometry):
+        event.listen(session_class, "after_flush", _update_geometry)
+
+
+def rebuild_throw_geometry(
+    conn: Connection, competition_id: int | None = None, batch_size: int = 50_000
+) -> int:
+    """Derives every hot and archived throw's geometry, a batch of throws at a time
+
+    Needed after bulk loads that bypass the ORM, such as the synthetic generator.
+
+    Args:
+        conn (Connection): sqlalchemy Connection
+        competition_id (int | None, optional): The competition to rebuild. Defaults to None, every competition.
+        batch_size (int, optional): Throws read and written at a time. Defaults to 50_000.
+
+    Returns:
+        int: Number of throws derived
+    """
+    stale = delete(ThrowGeometry)
+    if competition_id is not None:
+        stale = stale.where(_geometry.c.set_id.in_(competition_set_ids(competition_id)))
+    conn.execute(stale)
+
+    derived = 0
+    for throws in (ThrowEvent.__table__, ARCHIVE_TABLES[ThrowEvent]):
+        sql = select(
+            throws.c.set_id,
+            throws.c.id,
+            *(throws.c[name] for name in LOCATION_COLUMNS),
+        ).execution_options(yield_per=batch_size)
+        if competition_id is not None:
+            sql = sql.where(throws.c.set_id.in_(competition_set_ids(competition_id)))
+
+        for batch in conn.execute(sql).partitions():
+            set_ids, throw_ids, *locations = zip(*batch)
+            store_geometry(conn, _geometry_rows(set_ids, throw_ids, locations))
+            derived += len(batch)
+    return derived
@@ -0,0 +1,91 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Generator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+# Called after every statement with (connection, statement, parameters, duration_s)
+QueryObserver = Callable[[Connection, str, Any, float], None]
+
+_observers: list[QueryObserver] = []
+
+
+@dataclass
+class QueryStats:
+    """SQL statements executed while tracking is active, usually one request"""
+
+    statements: int = 0
+    db_time_s: float = 0.0
+    route: str | None = None
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_start_time"].pop()
+
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_time_s += duration
+
+    for observer in _observers:
+        observer(conn, statement, parameters, duration)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Times every statement executed on an engine
+
+    Args:
+        engine (Engine): The engine to listen on
+    """
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def add_query_observer(observer: QueryObserver) -> None:
+    """Registers a callback that runs after every timed statement
+
+    Args:
+        observer (QueryObserver): Called with (connection, statement, parameters, duration_s)
+    """
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_query_observer(observer: QueryObserver) -> None:
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+@contextmanager
+def track_queries(route: str | None = None) -> Generator[QueryStats, None, None]:
+    """Collects the statements executed inside the block
+
+    Work started inside the block, including sync routes handed to the threadpool,
+    copies the context and so reports into the same QueryStats.
+
+    Args:
+        route (str | None, optional): What the statements are run for, e.g "/sets/{set_id}"
+
+    Yields:
+        QueryStats: Statement count and DB time, updated as queries run
+    """
+    stats = QueryStats(route=route)
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
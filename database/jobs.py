@@ -0,0 +1,449 @@
+import hashlib
+import inspect
+import json
+import logging
+import os
+import socket
+import threading
+from datetime import timedelta
+from typing import Any, Callable
+
+from sqlalchemy import and_, case, cast, exists, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, aliased
+
+from database import archive, counters, geometry, outcomes, player_stats, standings
+from database import xhit
+from database.models import Job
+from database.models.job import JobKind, JobStatus
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[..., dict[str, Any] | None]
+
+# Kind to the function that runs it, called with a Session and the job's arguments
+JOB_HANDLERS: dict[JobKind, JobHandler] = {}
+
+
+class JobError(Exception):
+    """A job can't be queued, its kind or arguments are wrong"""
+
+
+def job_handler(kind: JobKind) -> Callable[[JobHandler], JobHandler]:
+    """Registers the function that runs a kind of job
+
+    The function takes a Session and the job's arguments as keywords, and
+    returns a JSON result or None. The worker commits the session after it.
+    """
+
+    def decorator(handler: JobHandler) -> JobHandler:
+        JOB_HANDLERS[kind] = handler
+        return handler
+
+    return decorator
+
+
+def dedup_key(kind: JobKind, arguments: dict[str, Any]) -> str:
+    """Identifies identical jobs, whatever order their arguments are in"""
+    canonical = json.dumps(arguments, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{kind.value}:{canonical}".encode()).hexdigest()
+
+
+def check_arguments(kind: JobKind, arguments: dict[str, Any]) -> None:
+    """Raises JobError unless a kind's handler accepts the arguments"""
+    handler = JOB_HANDLERS.get(kind)
+    if handler is None:
+        raise JobError(f"No handler for {kind.value} jobs")
+    try:
+        inspect.signature(handler).bind(None, **arguments)
+    except TypeError as e:
+        raise JobError(f"Bad arguments for {kind.value}: {e}")
+
+
+def enqueue(
+    conn: Connection,
+    kind: JobKind,
+    arguments: dict[str, Any] | None = None,
+    priority: int = 0,
+    max_attempts: int = 3,
+) -> int:
+    """Queues a job, or returns the identical job already waiting to run
+
+    A duplicate keeps the higher of the two priorities.
+
+    Args:
+        conn (Connection): sqlalchemy Connection, the caller commits
+        kind (JobKind): What to run
+        arguments (dict[str, Any] | None, optional): Keywords for the handler. Defaults to None.
+        priority (int, optional): Higher runs first. Defaults to 0.
+        max_attempts (int, optional): Runs before the job is marked failed. Defaults to 3.
+
+    Raises:
+        JobError: Unknown kind or arguments the handler doesn't take
+
+    Returns:
+        int: The job's ID
+    """
+    arguments = arguments or {}
+    check_arguments(kind, arguments)
+    stmt = insert(Job).values(
+        kind=kind,
+        arguments=arguments,
+        dedup_key=dedup_key(kind, arguments),
+        priority=priority,
+        max_attempts=max_attempts,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["dedup_key"],
+        index_where=text("status = 'PENDING'"),
+        set_={"priority": func.greatest(Job.priority, stmt.excluded.priority)},
+    )
+    return conn.execute(stmt.returning(Job.id)).scalar_one()
+
+
+def claim(conn: Connection, worker_id: str):
+    """Takes the next job due to run, skipping jobs other workers hold
+
+    Args:
+        conn (Connection): sqlalchemy Connection, commit straight after
+        worker_id (str): Recorded on the job as locked_by
+
+    Returns:
+        Row | None: id, kind, arguments, attempts and max_attempts, None when nothing is due
+    """
+    due = (
+        select(Job.id)
+        .where(Job.status == JobStatus.PENDING, Job.run_after <= func.now())
+        .order_by(Job.priority.desc(), Job.run_after, Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    return conn.execute(
+        update(Job)
+        .where(Job.id == due)
+        .values(
+            status=JobStatus.RUNNING,
+            attempts=Job.attempts + 1,
+            locked_by=worker_id,
+            locked_at=func.now(),
+        )
+        .returning(Job.id, Job.kind, Job.arguments, Job.attempts, Job.max_attempts)
+    ).one_or_none()
+
+
+def _release(conn: Connection, condition, error: str, backoff_s: float) -> int:
+    """Ends the runs of some jobs without success, queueing retries where possible
+
+    A job is retried unless it's out of attempts or an identical job has been
+    queued since, which would break the uniqueness of pending dedup keys.
+    """
+    other = aliased(Job)
+    duplicate = exists().where(
+        other.dedup_key == Job.dedup_key,
+        other.status == JobStatus.PENDING,
+        other.id != Job.id,
+    )
+    retry = and_(Job.attempts < Job.max_attempts, ~duplicate)
+    # Retries wait backoff_s, doubling with every attempt
+    backoff = func.make_interval(
+        0, 0, 0, 0, 0, 0, backoff_s * func.power(2, Job.attempts - 1)
+    )
+    # Enum columns store member names
+    status = case((retry, JobStatus.PENDING.name), else_=JobStatus.FAILED.name)
+    return conn.execute(
+        update(Job)
+        .where(condition)
+        .values(
+            status=cast(status, Job.status.type),
+            run_after=case((retry, func.now() + backoff), else_=Job.run_after),
+            finished_at=case((retry, None), else_=func.now()),
+            last_error=error,
+            locked_by=None,
+        )
+    ).rowcount
+
+
+def _held_by(job_id: int, worker_id: str):
+    """Condition matching a job only while this worker's run of it holds the lease
+
+    Once a lease expires the job may be running again under another worker,
+    whose run the original worker mustn't overwrite.
+    """
+    return and_(
+        Job.id == job_id,
+        Job.locked_by == worker_id,
+        Job.status == JobStatus.RUNNING,
+    )
+
+
+def renew_lease(conn: Connection, job_id: int, worker_id: str) -> bool:
+    """Restarts a running job's lease, so requeue_expired leaves long runs alone
+
+    Returns:
+        bool: Whether the worker still holds the job
+    """
+    renewed = conn.execute(
+        update(Job).where(_held_by(job_id, worker_id)).values(locked_at=func.now())
+    )
+    return renewed.rowcount > 0
+
+
+def succeed(
+    conn: Connection, job_id: int, worker_id: str, result: dict[str, Any] | None
+) -> bool:
+    """Records a successful run, unless the worker lost the job's lease
+
+    Returns:
+        bool: Whether the run was recorded
+    """
+    succeeded = conn.execute(
+        update(Job)
+        .where(_held_by(job_id, worker_id))
+        .values(
+            status=JobStatus.SUCCEEDED,
+            result=result,
+            finished_at=func.now(),
+            locked_by=None,
+        )
+    )
+    return succeeded.rowcount > 0
+
+
+def fail(
+    conn: Connection,
+    job_id: int,
+    worker_id: str,
+    error: str,
+    backoff_s: float = 30.0,
+) -> bool:
+    """Records a failed run, queueing a retry unless the job is out of attempts
+
+    Nothing is recorded if the worker lost the job's lease.
+
+    Returns:
+        bool: Whether the run was recorded
+    """
+    return _release(conn, _held_by(job_id, worker_id), error, backoff_s) > 0
+
+
+class _LeaseKeeper:
+    """Renews a job's lease from a thread while its handler runs"""
+
+    def __init__(
+        self, engine: Engine, job_id: int, worker_id: str, interval_s: float
+    ) -> None:
+        self.engine = engine
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.interval_s = interval_s
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval_s):
+            try:
+                with self.engine.begin() as conn:
+                    held = renew_lease(conn, self.job_id, self.worker_id)
+            except Exception:
+                logger.exception("Failed to renew the lease of job %d", self.job_id)
+                continue
+            if not held:
+                logger.warning(
+                    "Job %d lost its lease, its result won't be recorded", self.job_id
+                )
+                return
+
+    def __enter__(self) -> "_LeaseKeeper":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+
+def requeue_expired(conn: Connection, lease_s: float, backoff_s: float = 30.0) -> int:
+    """Retries the jobs of workers that died, judged by how long they've been running
+
+    Args:
+        conn (Connection): sqlalchemy Connection
+        lease_s (float): Seconds a job may run before it's presumed abandoned
+        backoff_s (float, optional): Delay before the first retry. Defaults to 30.0.
+
+    Returns:
+        int: Number of jobs released
+    """
+    expired = and_(
+        Job.status == JobStatus.RUNNING,
+        Job.locked_at < func.now() - timedelta(seconds=lease_s),
+    )
+    return _release(conn, expired, "Worker lease expired", backoff_s)
+
+
+class JobWorker:
+    """Claims and runs jobs one at a time until stopped
+
+    Run several, in as many processes as needed, they never take the same job.
+
+    Args:
+        engine (Engine): Engine connected to the primary
+        session_factory (Callable[[], Session]): Makes the session each job runs in
+        worker_id (str | None, optional): Recorded on claimed jobs. Defaults to None, host:pid.
+        poll_s (float, optional): Seconds to wait when no job is due. Defaults to 1.0.
+        lease_s (float, optional): Seconds a job may go without its lease being renewed before another worker retries it. Defaults to 3600.0.
+        backoff_s (float, optional): Delay before the first retry of a failed job. Defaults to 30.0.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        session_factory: Callable[[], Session],
+        worker_id: str | None = None,
+        poll_s: float = 1.0,
+        lease_s: float = 3600.0,
+        backoff_s: float = 30.0,
+    ) -> None:
+        self.engine = engine
+        self.session_factory = session_factory
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_s = poll_s
+        self.lease_s = lease_s
+        self.backoff_s = backoff_s
+        self._stopped = threading.Event()
+
+    def run_once(self) -> bool:
+        """Runs the next due job, if there is one
+
+        Returns:
+            bool: Whether a job was run
+        """
+        with self.engine.begin() as conn:
+            released = requeue_expired(conn, self.lease_s, self.backoff_s)
+            if released:
+                logger.warning("Released %d jobs with expired leases", released)
+            job = claim(conn, self.worker_id)
+        if job is None:
+            return False
+
+        # Renewed well within the lease, so a slow run isn't handed to another worker
+        lease = _LeaseKeeper(self.engine, job.id, self.worker_id, self.lease_s / 3)
+        try:
+            with lease:
+                session = self.session_factory()
+                try:
+                    result = JOB_HANDLERS[job.kind](session, **job.arguments)
+                    session.commit()
+                finally:
+                    session.close()
+        except Exception as e:
+            logger.exception("Job %d (%s) failed", job.id, job.kind.value)
+            with self.engine.begin() as conn:
+                recorded = fail(
+                    conn,
+                    job.id,
+                    self.worker_id,
+                    f"{type(e).__name__}: {e}",
+                    self.backoff_s,
+                )
+        else:
+            with self.engine.begin() as conn:
+                recorded = succeed(conn, job.id, self.worker_id, result)
+        if not recorded:
+            logger.warning(
+                "Job %d finished after its lease passed to another worker", job.id
+            )
+        return True
+
+    def run(self) -> None:
+        """Runs jobs until stop is called"""
+        self._stopped.clear()
+        while not self._stopped.is_set():
+            try:
+                ran = self.run_once()
+            except Exception:
+                logger.exception("Job worker %s failed to claim", self.worker_id)
+                ran = False
+            if not ran:
+                self._stopped.wait(self.poll_s)
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+def _set_ids(competition_id: int | None):
+    return (
+        None if competition_id is None else archive.competition_set_ids(competition_id)
+    )
+
+
+@job_handler(JobKind.SCORE_THROWS)
+def _score_throws(session: Session, batch_size: int = 10_000) -> dict[str, Any]:
+    # Commits per batch on the session's engine rather than in the job's transaction
+    return {"scored": xhit.score_throws(session.get_bind(), batch_size)}
+
+
+@job_handler(JobKind.FIT_XHIT)
+def _fit_xhit(
+    session: Session, iterations: int = 8, batch_size: int = 100_000, l2: float = 1.0
+) -> dict[str, Any]:
+    model = xhit.fit_xhit(session.connection(), iterations, batch_size, l2)
+    return dict(model._mapping)
+
+
+@job_handler(JobKind.REBUILD_COUNTERS)
+def _rebuild_counters(
+    session: Session, competition_id: int | None = None
+) -> dict[str, Any]:
+    rebuilt = counters.rebuild_counters(session.connection(), _set_ids(competition_id))
+    return {"counters": rebuilt}
+
+
+@job_handler(JobKind.REBUILD_STANDINGS)
+def _rebuild_standings(
+    session: Session, competition_id: int | None = None
+) -> dict[str, Any]:
+    rebuilt = standings.rebuild_standings(session.connection(), competition_id)
+    return {"competitions": rebuilt}
+
+
+@job_handler(JobKind.REBUILD_PLAYER_STATS)
+def _rebuild_player_stats(
+    session: Session, competition_id: int | None = None
+) -> dict[str, Any]:
+    rebuilt = player_stats.rebuild_player_stats(session.connection(), competition_id)
+    return {"player_stats": rebuilt}
+
+
+@job_handler(JobKind.RESOLVE_OUTCOMES)
+def _resolve_outcomes(
+    session: Session, competition_id: int | None = None
+) -> dict[str, Any]:
+    resolved = outcomes.rebuild_outcomes(session.connection(), _set_ids(competition_id))
+    return {"throws": resolved}
+
+
+@job_handler(JobKind.REBUILD_THROW_GEOMETRY)
+def _rebuild_throw_geometry(
+    session: Session, competition_id: int | None = None, batch_size: int = 50_000
+) -> dict[str, Any]:
+    derived = geometry.rebuild_throw_geometry(
+        session.connection(), competition_id, batch_size
+    )
+    return {"throws": derived}
+
+
+@job_handler(JobKind.ARCHIVE_COMPETITION)
+def _archive_competition(session: Session, competition_id: int) -> dict[str, Any]:
+    record = archive.archive_competition(session, competition_id)
+    return {
+        "throw_events": record.throw_events,
+        "catch_events": record.catch_events,
+        "eliminations": record.eliminations,
+    }
+
+
+@job_handler(JobKind.RESTORE_COMPETITION)
+def _restore_competition(session: Session, competition_id: int) -> None:
+    archive.restore_competition(session, competition_id)
@@ -0,0 +1,370 @@
+"""Database management commands
+
+Usage:
+    python -m database.main create-schema
+    python -m database.main generate --organisations 4 --teams 12 --workers 8
+    python -m database.main partitions ensure --ahead 2
+    python -m database.main partitions detach --lower 20000
+    python -m database.main archive --competition 3
+    python -m database.main restore --competition 3
+    python -m database.main rebuild-counters --competition 3
+    python -m database.main rebuild-standings --competition 3
+    python -m database.main rebuild-player-stats --competition 3
+    python -m database.main resolve-outcomes --competition 3
+    python -m database.main rebuild-throw-geometry --competition 3
+    python -m database.main fit-xhit --iterations 8
+    python -m database.main score-throws --every 60
+    python -m database.main worker --processes 4
+    python -m database.main enqueue rebuild_player_stats --arguments '{"competition_id": 3}'
+"""
+
+import argparse
+import json
+import multiprocessing
+import time
+
+
+def create_schema_command(args: argparse.Namespace) -> None:
+    from database.db import create_db, create_schema
+
+    create_db()
+    create_schema()
+
+
+def generate_command(args: argparse.Namespace) -> None:
+    from database.db import DATABASE_URL, engine
+    from database.counters import rebuild_counters
+    from database.geometry import rebuild_throw_geometry
+    from database.outcomes import rebuild_outcomes
+    from database.partitions import ensure_partitions
+    from database.player_stats import rebuild_player_stats
+    from database.standings import rebuild_standings
+    from database.synthetic import LeagueSpec, load_league
+
+    spec = LeagueSpec(
+        organisations=args.organisations,
+        competitions_per_organisation=args.competitions,
+        teams_per_competition=args.teams,
+        players_per_team=args.players,
+        sets_per_match=args.sets,
+        seed=args.seed,
+    )
+    # Events must land in range partitions, not the default partition
+    with engine.begin() as conn:
+        ensure_partitions(conn, up_to_set_id=spec.total_sets)
+
+    counts = load_league(DATABASE_URL, spec, workers=args.workers)
+    for table, count in counts.items():
+        print(f"{table}: {count}")
+
+    # COPY bypasses the ORM listeners that maintain the derived tables
+    with engine.begin() as conn:
+        print(f"set_team_counters: {rebuild_counters(conn)}")
+        print(f"player_competition_stats: {rebuild_player_stats(conn)}")
+        print(f"throw outcomes: {rebuild_outcomes(conn)}")
+        print(f"throw_geometry: {rebuild_throw_geometry(conn)}")
+        print(f"competition_standings: {rebuild_standings(conn)} competitions")
+
+
+def partitions_command(args: argparse.Namespace) -> None:
+    from database.db import engine
+    from database import partitions
+
+    with engine.begin() as conn:
+        if args.action == "list":
+            for table in partitions.PARTITIONED_TABLES:
+                for partition in partitions.list_partitions(conn, table):
+                    bounds = (
+                        "DEFAULT"
+                        if partition.is_default
+                        else f"[{partition.lower}, {partition.upper})"
+                    )
+                    print(f"{partition.name}: {bounds}")
+        elif args.action == "ensure":
+            for partition in partitions.ensure_partitions(conn, ahead=args.ahead):
+                print(f"created {partition.name}")
+        elif args.action == "detach":
+            for name in partitions.detach_range(conn, args.lower):
+                print(f"detached {name}")
+        elif args.action == "attach":
+            for name in partitions.attach_range(conn, args.lower):
+                print(f"attached {name}")
+
+
+def archive_command(args: argparse.Namespace) -> None:
+    from database.db import get_db_context
+    from database.archive import archive_competition, restore_competition
+
+    with get_db_context() as session:
+        if args.command == "archive":
+            record = archive_competition(session, args.competition)
+            print(
+                f"archived competition {record.competition_id}: "
+                f"{record.throw_events} throws, {record.catch_events} catches, "
+                f"{record.eliminations} eliminations"
+            )
+        else:
+            restore_competition(session, args.competition)
+            print(f"restored competition {args.competition}")
+
+
+def rebuild_counters_command(args: argparse.Namespace) -> None:
+    from database.db import engine
+    from database.archive import competition_set_ids
+    from database.counters import rebuild_counters
+
+    set_ids = args.set
+    if args.competition is not None:
+        set_ids = competition_set_ids(args.competition)
+
+    with engine.begin() as conn:
+        print(f"rebuilt {rebuild_counters(conn, set_ids)} set team counters")
+
+
+def rebuild_standings_command(args: argparse.Namespace) -> None:
+    from database.db import engine
+    from database.standings import rebuild_standings
+
+    with engine.begin() as conn:
+        count = rebuild_standings(conn, args.competition)
+    print(f"rebuilt standings of {count} competitions")
+
+
+def rebuild_player_stats_command(args: argparse.Namespace) -> None:
+    from database.db import engine
+    from database.player_stats import rebuild_player_stats
+
+    with engine.begin() as conn:
+        count = rebuild_player_stats(conn, args.competition)
+    print(f"rebuilt {count} player competition stats")
+
+
+def resolve_outcomes_command(args: argparse.Namespace) -> None:
+    from database.db import engine
+    from database.archive import competition_set_ids
+    from database.outcomes import rebuild_outcomes
+
+    set_ids = None
+    if args.competition is not None:
+        set_ids = competition_set_ids(args.competition)
+
+    with engine.begin() as conn:
+        print(f"resolved {rebuild_outcomes(conn, set_ids)} throw outcomes")
+
+
+def rebuild_throw_geometry_command(args: argparse.Namespace) -> None:
+    from database.db import engine
+    from database.geometry import rebuild_throw_geometry
+
+    with engine.begin() as conn:
+        count = rebuild_throw_geometry(conn, args.competition, args.batch_size)
+    print(f"derived the geometry of {count} throws")
+
+
+def fit_xhit_command(args: argparse.Namespace) -> None:
+    from database.db import engine
+    from database.xhit import fit_xhit
+
+    with engine.begin() as conn:
+        model = fit_xhit(conn, args.iterations, args.batch_size, args.l2)
+    print(
+        f"fitted xhit model {model.id} on {model.throws} throws: "
+        f"hit rate {model.hit_rate:.3f}, log loss {model.log_loss:.4f}"
+    )
+
+
+def score_throws_command(args: argparse.Namespace) -> None:
+    from database.db import engine
+    from database.xhit import score_throws
+
+    while True:
+        print(f"scored {score_throws(engine, args.batch_size)} throws")
+        if args.every is None:
+            return
+        time.sleep(args.every)
+
+
+def _run_worker(poll_s: float, lease_s: float) -> None:
+    from database.db import SessionLocal, engine
+    from database.jobs import JobWorker
+
+    JobWorker(engine, SessionLocal, poll_s=poll_s, lease_s=lease_s).run()
+
+
+def worker_command(args: argparse.Namespace) -> None:
+    if args.processes == 1:
+        _run_worker(args.poll, args.lease)
+        return
+
+    # Spawned, so no process inherits another's database connections
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=_run_worker, args=(args.poll, args.lease))
+        for _ in range(args.processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def enqueue_command(args: argparse.Namespace) -> None:
+    from database.db import engine
+    from database.jobs import enqueue
+    from database.models.job import JobKind
+
+    with engine.begin() as conn:
+        job_id = enqueue(
+            conn, JobKind(args.kind), json.loads(args.arguments), args.priority
+        )
+    print(f"queued job {job_id}")
+
+
+def _partition_lower(value: str) -> int:
+    from database.partitions import PartitionError, check_lower
+
+    lower = int(value)
+    try:
+        check_lower(lower)
+    except PartitionError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return lower
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m database.main")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    create = commands.add_parser("create-schema", help="Create the database and tables")
+    create.set_defaults(handler=create_schema_command)
+
+    generate = commands.add_parser(
+        "generate", help="Bulk load a synthetic league into an empty schema"
+    )
+    generate.add_argument("--organisations", type=int, default=2)
+    generate.add_argument(
+        "--competitions", type=int, default=2, help="Per organisation"
+    )
+    generate.add_argument("--teams", type=int, default=8, help="Per competition")
+    generate.add_argument("--players", type=int, default=10, help="Per team")
+    generate.add_argument("--sets", type=int, default=3, help="Per match")
+    generate.add_argument("--seed", type=int, default=0)
+    generate.add_argument("--workers", type=int, default=1)
+    generate.set_defaults(handler=generate_command)
+
+    partition = commands.add_parser(
+        "partitions", help="Manage the set_id range partitions of the event tables"
+    )
+    actions = partition.add_subparsers(dest="action", required=True)
+    actions.add_parser("list", help="List every partition and its bounds")
+    ensure = actions.add_parser(
+        "ensure",
+        help="Create missing partitions, moving their rows out of the default partitions",
+    )
+    ensure.add_argument(
+        "--ahead",
+        type=int,
+        default=2,
+        help="Empty partitions to keep past the newest set",
+    )
+    for action, help_text in (
+        ("detach", "Detach a range's partitions from every event table"),
+        ("attach", "Attach a detached range's partitions again"),
+    ):
+        command = actions.add_parser(action, help=help_text)
+        command.add_argument(
+            "--lower",
+            type=_partition_lower,
+            required=True,
+            help="First set id of the range, a multiple of the partition size",
+        )
+    partition.set_defaults(handler=partitions_command)
+
+    for name, help_text in (
+        ("archive", "Move a finished competition's events to the archive tables"),
+        ("restore", "Move an archived competition's events back"),
+    ):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--competition", type=int, required=True)
+        command.set_defaults(handler=archive_command)
+
+    rebuild = commands.add_parser(
+        "rebuild-counters", help="Recompute set team counters from the raw events"
+    )
+    scope = rebuild.add_mutually_exclusive_group()
+    scope.add_argument("--set", type=int, action="append", help="Repeatable")
+    scope.add_argument("--competition", type=int)
+    rebuild.set_defaults(handler=rebuild_counters_command)
+
+    standings = commands.add_parser(
+        "rebuild-standings", help="Recompute league standings from match results"
+    )
+    standings.add_argument("--competition", type=int)
+    standings.set_defaults(handler=rebuild_standings_command)
+
+    player_stats = commands.add_parser(
+        "rebuild-player-stats", help="Recompute leaderboard stats from the raw events"
+    )
+    player_stats.add_argument("--competition", type=int)
+    player_stats.set_defaults(handler=rebuild_player_stats_command)
+
+    outcomes = commands.add_parser(
+        "resolve-outcomes", help="Resolve every throw's outcome from the raw events"
+    )
+    outcomes.add_argument("--competition", type=int)
+    outcomes.set_defaults(handler=resolve_outcomes_command)
+
+    geometry = commands.add_parser(
+        "rebuild-throw-geometry",
+        help="Derive every throw's distance, angle and court side from its locations",
+    )
+    geometry.add_argument("--competition", type=int)
+    geometry.add_argument("--batch-size", type=int, default=50_000)
+    geometry.set_defaults(handler=rebuild_throw_geometry_command)
+
+    fit = commands.add_parser(
+        "fit-xhit", help="Fit an expected hit model on every resolved throw"
+    )
+    fit.add_argument("--iterations", type=int, default=8)
+    fit.add_argument("--batch-size", type=int, default=100_000)
+    fit.add_argument("--l2", type=float, default=1.0)
+    fit.set_defaults(handler=fit_xhit_command)
+
+    score = commands.add_parser(
+        "score-throws", help="Score throws not yet scored by the newest xhit model"
+    )
+    score.add_argument("--batch-size", type=int, default=10_000)
+    score.add_argument(
+        "--every", type=float, help="Keep scoring new throws every this many seconds"
+    )
+    score.set_defaults(handler=score_throws_command)
+
+    worker = commands.add_parser("worker", help="Run background jobs until stopped")
+    worker.add_argument("--processes", type=int, default=1)
+    worker.add_argument(
+        "--poll", type=float, default=1.0, help="Seconds to wait when no job is due"
+    )
+    worker.add_argument(
+        "--lease",
+        type=float,
+        default=3600.0,
+        help="Seconds a job may run before another worker retries it",
+    )
+    worker.set_defaults(handler=worker_command)
+
+    queue = commands.add_parser("enqueue", help="Queue a background job")
+    queue.add_argument("kind", help="Such as score_throws or rebuild_standings")
+    queue.add_argument("--arguments", default="{}", help="JSON keywords for the job")
+    queue.add_argument("--priority", type=int, default=0)
+    queue.set_defaults(handler=enqueue_command)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
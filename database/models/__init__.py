@@ -10,6 +10,20 @@ from .set import Set
 from .throw_event import ThrowEvent
 from .catch_event import CatchEvent
 from .elimination_event import EliminationEvent
+from .archived_competition import ArchivedCompetition
+from .set_team_counters import SetTeamCounters
+from .competition_standing import CompetitionStanding
+from .player_competition_stats import PlayerCompetitionStats
+from .set_replay_checkpoint import SetReplayCheckpoint
+from .throw_geometry import ThrowGeometry
+from .xhit_model import XHitModel
+from .job import Job
+from .archive import (
+    ARCHIVE_TABLES,
+    throw_events_archive,
+    catch_events_archive,
+    eliminations_archive,
+)
 
 __all__ = [
     "BaseModel",
@@ -25,4 +39,16 @@ __all__ = [
     "EliminationEvent",
     "ThrowEvent",
     "CatchEvent",
+    "ArchivedCompetition",
+    "SetTeamCounters",
+    "CompetitionStanding",
+    "PlayerCompetitionStats",
+    "SetReplayCheckpoint",
+    "ThrowGeometry",
+    "XHitModel",
+    "Job",
+    "ARCHIVE_TABLES",
+    "throw_events_archive",
+    "catch_events_archive",
+    "eliminations_archive",
 ]
@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Index, Table
+from .base import Base
+from .throw_event import ThrowEvent
+from .catch_event import CatchEvent
+from .elimination_event import EliminationEvent
+
+
+def _archive_table(model: type[Base]) -> Table:
+    """Builds the cold copy of an event table
+
+    Same columns and primary key as the hot table, but unpartitioned, without
+    foreign keys and with a single set_id index so archived rows stay compact.
+    """
+    source = model.__table__
+    name = f"{source.name}_archive"
+    return Table(
+        name,
+        Base.metadata,
+        *(
+            Column(
+                column.name,
+                column.type,
+                primary_key=column.primary_key,
+                nullable=column.nullable,
+            )
+            for column in source.columns
+        ),
+        Index(f"ix_{name}_set_id", "set_id"),
+    )
+
+
+throw_events_archive = _archive_table(ThrowEvent)
+catch_events_archive = _archive_table(CatchEvent)
+eliminations_archive = _archive_table(EliminationEvent)
+
+# Hot model to cold table, referenced tables first
+ARCHIVE_TABLES = {
+    ThrowEvent: throw_events_archive,
+    CatchEvent: catch_events_archive,
+    EliminationEvent: eliminations_archive,
+}
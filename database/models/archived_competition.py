@@ -0,0 +1,21 @@
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey, func
+from .base import BaseModel
+
+
+class ArchivedCompetition(BaseModel):
+    """A finished competition whose events were moved to the archive tables"""
+
+    __tablename__ = "archived_competitions"
+
+    competition_id: Mapped[int] = mapped_column(
+        ForeignKey("competitions.id"), primary_key=True
+    )
+    archived_at: Mapped[datetime] = mapped_column(default=func.now())
+    throw_events: Mapped[int]
+    catch_events: Mapped[int]
+    eliminations: Mapped[int]
+
+    def __repr__(self) -> str:
+        return f"<ArchivedCompetition(competition_id={self.competition_id}, archived_at={self.archived_at})>"
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, ForeignKeyConstraint, Index
 from .base import BaseModel
 
 if TYPE_CHECKING:
@@ -15,19 +15,29 @@ class CatchEvent(BaseModel):
 
     __tablename__ = "catch_events"
 
-    id: Mapped[int] = mapped_column(primary_key=True)
-    set_id: Mapped[int] = mapped_column(ForeignKey("sets.id"))
+    # Partitioned by set_id, so the partition key is part of the primary key
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    set_id: Mapped[int] = mapped_column(ForeignKey("sets.id"), primary_key=True)
     timestamp: Mapped[datetime]
     player_id: Mapped[int] = mapped_column(ForeignKey("players.id"))
     location_x: Mapped[Optional[float]]
     location_y: Mapped[Optional[float]]
 
-    throw_event_id: Mapped[int] = mapped_column(ForeignKey("throw_events.id"))
+    throw_event_id: Mapped[int]
     rebound_catch: Mapped[bool] = mapped_column(default=False)
 
-    throw_event: Mapped["ThrowEvent"] = relationship()
+    throw_event: Mapped["ThrowEvent"] = relationship(overlaps="set")
     catcher: Mapped["Player"] = relationship(foreign_keys=[player_id])
     set: Mapped["Set"] = relationship()
 
+    __table_args__ = (
+        # A catch is always in the same set, and so the same partition, as its throw
+        ForeignKeyConstraint(
+            ["set_id", "throw_event_id"], ["throw_events.set_id", "throw_events.id"]
+        ),
+        Index("ix_catch_events_set_id_timestamp", "set_id", "timestamp"),
+        {"postgresql_partition_by": "RANGE (set_id)"},
+    )
+
     def __repr__(self) -> str:
         return f"<CatchEvent(id={self.id}, catcher={self.player_id})>"
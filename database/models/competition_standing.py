@@ -0,0 +1,37 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Computed, ForeignKey, Index
+from .base import BaseModel
+
+
+class CompetitionStanding(BaseModel):
+    """A team's row in a competition's standings table, maintained on every result"""
+
+    __tablename__ = "competition_standings"
+
+    competition_id: Mapped[int] = mapped_column(
+        ForeignKey("competitions.id"), primary_key=True
+    )
+    team_id: Mapped[int] = mapped_column(ForeignKey("teams.id"), primary_key=True)
+    played: Mapped[int] = mapped_column(default=0)
+    won: Mapped[int] = mapped_column(default=0)
+    drawn: Mapped[int] = mapped_column(default=0)
+    lost: Mapped[int] = mapped_column(default=0)
+    sets_for: Mapped[int] = mapped_column(default=0)
+    sets_against: Mapped[int] = mapped_column(default=0)
+    set_difference: Mapped[int] = mapped_column(Computed("sets_for - sets_against"))
+    points: Mapped[int] = mapped_column(default=0)
+
+    __table_args__ = (
+        # Serves the standings in table order straight from the index
+        Index(
+            "ix_competition_standings_table_order",
+            "competition_id",
+            points.desc(),
+            set_difference.desc(),
+            sets_for.desc(),
+            "team_id",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<CompetitionStanding(competition_id={self.competition_id}, team_id={self.team_id}, points={self.points})>"
@@ -1,7 +1,7 @@
 from enum import Enum
 from typing import TYPE_CHECKING, Optional
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, ForeignKeyConstraint, Index
 from .base import BaseModel
 
 
@@ -25,17 +25,29 @@ class EliminationEvent(BaseModel):
 
     __tablename__ = "eliminations"
 
-    id: Mapped[int] = mapped_column(primary_key=True)
-    set_id: Mapped[int] = mapped_column(ForeignKey("sets.id"))
+    # Partitioned by set_id, so the partition key is part of the primary key
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    set_id: Mapped[int] = mapped_column(ForeignKey("sets.id"), primary_key=True)
     eliminated_player_id: Mapped[int] = mapped_column(ForeignKey("players.id"))
     cause: Mapped[EliminationCause]
-    throw_event_id: Mapped[Optional[int]] = mapped_column(ForeignKey("throw_events.id"))
-    catch_event_id: Mapped[Optional[int]] = mapped_column(ForeignKey("catch_events.id"))
+    throw_event_id: Mapped[Optional[int]]
+    catch_event_id: Mapped[Optional[int]]
     elimination_location_x: Mapped[Optional[float]]
     elimination_location_y: Mapped[Optional[float]]
 
     eliminated_player: Mapped["Player"] = relationship()
     set: Mapped["Set"] = relationship()
 
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["set_id", "throw_event_id"], ["throw_events.set_id", "throw_events.id"]
+        ),
+        ForeignKeyConstraint(
+            ["set_id", "catch_event_id"], ["catch_events.set_id", "catch_events.id"]
+        ),
+        Index("ix_eliminations_set_id", "set_id"),
+        {"postgresql_partition_by": "RANGE (set_id)"},
+    )
+
     def __repr__(self) -> str:
         return f"<Elimination(id={self.id}, player={self.eliminated_player_id}, cause={self.cause})>"
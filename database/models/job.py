@@ -0,0 +1,76 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Enum as SQLEnum, Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from .base import BaseModel
+
+
+class JobKind(str, Enum):
+    SCORE_THROWS = "score_throws"
+    FIT_XHIT = "fit_xhit"
+    REBUILD_COUNTERS = "rebuild_counters"
+    REBUILD_STANDINGS = "rebuild_standings"
+    REBUILD_PLAYER_STATS = "rebuild_player_stats"
+    RESOLVE_OUTCOMES = "resolve_outcomes"
+    REBUILD_THROW_GEOMETRY = "rebuild_throw_geometry"
+    ARCHIVE_COMPETITION = "archive_competition"
+    RESTORE_COMPETITION = "restore_competition"
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(BaseModel):
+    """A unit of heavy work queued for the background workers"""
+
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[JobKind] = mapped_column(SQLEnum(JobKind))
+    arguments: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict)
+    # Kind and arguments, identical pending jobs share it
+    dedup_key: Mapped[str]
+    # Higher runs first
+    priority: Mapped[int] = mapped_column(default=0)
+    status: Mapped[JobStatus] = mapped_column(
+        SQLEnum(JobStatus), default=JobStatus.PENDING
+    )
+    attempts: Mapped[int] = mapped_column(default=0)
+    max_attempts: Mapped[int] = mapped_column(default=3)
+    run_after: Mapped[datetime] = mapped_column(default=func.now())
+    locked_by: Mapped[Optional[str]]
+    locked_at: Mapped[Optional[datetime]]
+    finished_at: Mapped[Optional[datetime]]
+    last_error: Mapped[Optional[str]]
+    result: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB)
+
+    __table_args__ = (
+        # Workers claim from this, so it only holds the jobs waiting to run
+        Index(
+            "ix_jobs_pending_order",
+            priority.desc(),
+            "run_after",
+            "id",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+        Index(
+            "uq_jobs_pending_dedup_key",
+            "dedup_key",
+            unique=True,
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+        Index(
+            "ix_jobs_running_locked_at",
+            "locked_at",
+            postgresql_where=text("status = 'RUNNING'"),
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<Job(id={self.id}, kind={self.kind}, status={self.status})>"
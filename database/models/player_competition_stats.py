@@ -0,0 +1,93 @@
+from enum import Enum
+from typing import Optional
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Computed, ForeignKey, Index
+from sqlalchemy import Enum as SQLEnum
+from .base import BaseModel
+from .competition import AgeCategory, CourtSize
+
+# Stats carried by every leaderboard index so rankings are index only scans
+_COVERED = ["throws", "hits", "eliminations", "catches", "rebound_catches"]
+
+
+class LeaderboardMetric(str, Enum):
+    ELIMINATIONS = "eliminations"
+    CATCHES = "catches"
+    HIT_RATE = "hit_rate"
+    REBOUND_CATCHES = "rebound_catches"
+
+
+def _covered(*key: str) -> list[str]:
+    return [column for column in _COVERED if column not in key]
+
+
+class PlayerCompetitionStats(BaseModel):
+    """A player's running totals in a competition, maintained on every event write
+
+    The competition's age category and court size are copied in so leaderboards
+    across them don't need to join competitions.
+    """
+
+    __tablename__ = "player_competition_stats"
+
+    competition_id: Mapped[int] = mapped_column(
+        ForeignKey("competitions.id"), primary_key=True
+    )
+    player_id: Mapped[int] = mapped_column(ForeignKey("players.id"), primary_key=True)
+    age_category: Mapped[AgeCategory] = mapped_column(SQLEnum(AgeCategory))
+    court_size: Mapped[CourtSize] = mapped_column(SQLEnum(CourtSize))
+    throws: Mapped[int] = mapped_column(default=0)
+    hits: Mapped[int] = mapped_column(default=0)
+    eliminations: Mapped[int] = mapped_column(default=0)
+    catches: Mapped[int] = mapped_column(default=0)
+    rebound_catches: Mapped[int] = mapped_column(default=0)
+    hit_rate: Mapped[Optional[float]] = mapped_column(
+        Computed("hits::double precision / NULLIF(throws, 0)")
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_player_competition_stats_eliminations",
+            "competition_id",
+            eliminations.desc(),
+            "player_id",
+            postgresql_include=_covered("eliminations"),
+        ),
+        Index(
+            "ix_player_competition_stats_catches",
+            "competition_id",
+            catches.desc(),
+            "player_id",
+            postgresql_include=_covered("catches"),
+        ),
+        Index(
+            "ix_player_competition_stats_rebound_catches",
+            "competition_id",
+            rebound_catches.desc(),
+            "player_id",
+            postgresql_include=_covered("rebound_catches"),
+        ),
+        Index(
+            "ix_player_competition_stats_hit_rate",
+            "competition_id",
+            hit_rate.desc().nulls_last(),
+            "player_id",
+            postgresql_include=_covered(),
+        ),
+        # Leaderboards across competitions sum each player's rows in player order
+        Index(
+            "ix_player_competition_stats_age_category",
+            "age_category",
+            "player_id",
+            postgresql_include=_covered(),
+        ),
+        Index(
+            "ix_player_competition_stats_court_size",
+            "court_size",
+            "player_id",
+            postgresql_include=_covered(),
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return f"<PlayerCompetitionStats(competition_id={self.competition_id}, player_id={self.player_id}, eliminations={self.eliminations})>"
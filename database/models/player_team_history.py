@@ -1,7 +1,8 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey
+from sqlalchemy import DDL, TIMESTAMP, Computed, ForeignKey, Index, cast, event, func
+from sqlalchemy.dialects.postgresql import TSRANGE, Range
 from .base import BaseModel
 
 if TYPE_CHECKING:
@@ -16,5 +17,45 @@ class PlayerTeamHistory(BaseModel):
     team_id: Mapped[int] = mapped_column(ForeignKey("teams.id"))
     joined_at: Mapped[datetime]
     left_at: Mapped[Optional[datetime]]
+    # [joined_at, left_at), unbounded while the player is still on the team
+    tenure: Mapped[Range[datetime]] = mapped_column(
+        TSRANGE, Computed("tsrange(joined_at, left_at, '[)')")
+    )
 
     player: Mapped["Player"] = relationship(back_populates="team_history")
+
+    __table_args__ = (
+        # Resolves which side of a match an event's player is on
+        Index("ix_player_team_history_player_id_team_id", "player_id", "team_id"),
+        # Which team a player was on at a time, and who was on a team at a time
+        Index(
+            "ix_player_team_history_player_id_tenure",
+            "player_id",
+            "tenure",
+            postgresql_using="gist",
+        ),
+        Index(
+            "ix_player_team_history_team_id_tenure",
+            "team_id",
+            "tenure",
+            postgresql_using="gist",
+        ),
+    )
+
+    @classmethod
+    def active_at(cls, at=None):
+        """Filter for tenures covering a time, now when at is None"""
+        if at is None:
+            at = func.localtimestamp()
+        elif isinstance(at, datetime) and at.tzinfo is not None:
+            # There's no tsrange @> timestamptz, convert it as a timestamp column would
+            at = cast(at, TIMESTAMP)
+        return cls.tenure.contains(at)
+
+
+# GiST indexes over an integer and a range need the btree_gist operator classes
+event.listen(
+    PlayerTeamHistory.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
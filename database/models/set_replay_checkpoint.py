@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Any
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB
+from .base import BaseModel
+
+
+class SetReplayCheckpoint(BaseModel):
+    """A set's state after a number of its events, so seeks don't replay from the start
+
+    A set's events are replayed in (at, kind_rank, event_id) order. The state
+    is the set once the first `sequence` events are applied, the last of them
+    having the stored key.
+    """
+
+    __tablename__ = "set_replay_checkpoints"
+
+    set_id: Mapped[int] = mapped_column(ForeignKey("sets.id"), primary_key=True)
+    sequence: Mapped[int] = mapped_column(primary_key=True)
+    at: Mapped[datetime]
+    kind_rank: Mapped[int]
+    event_id: Mapped[int]
+    state: Mapped[dict[str, Any]] = mapped_column(JSONB)
+
+    def __repr__(self) -> str:
+        return f"<SetReplayCheckpoint(set_id={self.set_id}, sequence={self.sequence}, at={self.at})>"
@@ -0,0 +1,25 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Computed, ForeignKey
+from .base import BaseModel
+
+# Players each side starts a set with
+STARTING_PLAYERS = 6
+
+
+class SetTeamCounters(BaseModel):
+    """Running totals of one team's events in a set, maintained on every event write"""
+
+    __tablename__ = "set_team_counters"
+
+    set_id: Mapped[int] = mapped_column(ForeignKey("sets.id"), primary_key=True)
+    team_id: Mapped[int] = mapped_column(ForeignKey("teams.id"), primary_key=True)
+    throws: Mapped[int] = mapped_column(default=0)
+    catches: Mapped[int] = mapped_column(default=0)
+    eliminations: Mapped[int] = mapped_column(default=0)
+    starting_players: Mapped[int] = mapped_column(default=STARTING_PLAYERS)
+    players_remaining: Mapped[int] = mapped_column(
+        Computed("starting_players - eliminations")
+    )
+
+    def __repr__(self) -> str:
+        return f"<SetTeamCounters(set_id={self.set_id}, team_id={self.team_id}, players_remaining={self.players_remaining})>"
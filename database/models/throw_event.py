@@ -1,20 +1,32 @@
 from datetime import datetime
+from enum import Enum
 from typing import TYPE_CHECKING, Optional
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
+from sqlalchemy import Enum as SQLEnum
 from .base import BaseModel
 
 if TYPE_CHECKING:
     from .set import Set
 
 
+class ThrowOutcome(str, Enum):
+    HIT = "hit"
+    CAUGHT = "caught"
+    REBOUND_CAUGHT = "rebound_caught"
+    BLOCKED = "blocked"
+    MISS = "miss"
+    INVALID = "invalid"
+
+
 class ThrowEvent(BaseModel):
     """A throw in a set of dodgeball"""
 
     __tablename__ = "throw_events"
 
-    id: Mapped[int] = mapped_column(primary_key=True)
-    set_id: Mapped[int] = mapped_column(ForeignKey("sets.id"))
+    # Partitioned by set_id, so the partition key is part of the primary key
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    set_id: Mapped[int] = mapped_column(ForeignKey("sets.id"), primary_key=True)
     player_id: Mapped[int] = mapped_column(ForeignKey("players.id"))
     timestamp: Mapped[datetime]
     target_player_id: Mapped[Optional[int]] = mapped_column(ForeignKey("players.id"))
@@ -25,5 +37,16 @@ class ThrowEvent(BaseModel):
     valid_attempt: Mapped[bool] = mapped_column(default=True)
     target_had_ball: Mapped[bool] = mapped_column(default=False)
     was_blocked: Mapped[bool] = mapped_column(default=True)
+    # Resolved from the catches and eliminations that reference the throw
+    outcome: Mapped[Optional[ThrowOutcome]] = mapped_column(SQLEnum(ThrowOutcome))
+    # Expected hit probability, scored in batches by the xhit_model_id model
+    xhit: Mapped[Optional[float]]
+    xhit_model_id: Mapped[Optional[int]]
 
     set: Mapped["Set"] = relationship()
+
+    __table_args__ = (
+        Index("ix_throw_events_set_id_timestamp", "set_id", "timestamp"),
+        Index("ix_throw_events_player_id_outcome", "player_id", "outcome"),
+        {"postgresql_partition_by": "RANGE (set_id)"},
+    )
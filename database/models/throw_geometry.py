@@ -0,0 +1,37 @@
+from enum import Enum
+from typing import Optional
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Enum as SQLEnum, ForeignKey, Index
+from .base import BaseModel
+
+# Court is modelled in metres with team A on x < 9 and team B on x > 9
+COURT_LENGTH = 18.0
+COURT_WIDTH = 9.0
+
+
+class CourtSide(str, Enum):
+    """Third of the court width a throw is made from, as the thrower faces the opponents"""
+
+    LEFT = "left"
+    CENTRE = "centre"
+    RIGHT = "right"
+
+
+class ThrowGeometry(BaseModel):
+    """Distance, angle and court side of a throw, derived from its locations in batches"""
+
+    __tablename__ = "throw_geometry"
+
+    set_id: Mapped[int] = mapped_column(ForeignKey("sets.id"), primary_key=True)
+    # No foreign key, archiving moves the throw to another table
+    throw_event_id: Mapped[int] = mapped_column(primary_key=True)
+    # Metres from the throw's origin to its target
+    distance: Mapped[Optional[float]]
+    # Degrees off straight at the opponents' baseline, positive to the thrower's left
+    angle: Mapped[Optional[float]]
+    court_side: Mapped[Optional[CourtSide]] = mapped_column(SQLEnum(CourtSide))
+
+    __table_args__ = (Index("ix_throw_geometry_distance", "distance"),)
+
+    def __repr__(self) -> str:
+        return f"<ThrowGeometry(set_id={self.set_id}, throw_event_id={self.throw_event_id}, distance={self.distance})>"
@@ -0,0 +1,23 @@
+from typing import Any
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+from .base import BaseModel
+
+
+class XHitModel(BaseModel):
+    """A fitted expected hit (xHit) model, the newest one scores throws"""
+
+    __tablename__ = "xhit_models"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # Valid, resolved throws the model was fitted on
+    throws: Mapped[int]
+    hit_rate: Mapped[float]
+    log_loss: Mapped[float]
+    # Feature names, standardisation and coefficients, see database.xhit
+    parameters: Mapped[dict[str, Any]] = mapped_column(JSONB)
+
+    def __repr__(self) -> str:
+        return (
+            f"<XHitModel(id={self.id}, throws={self.throws}, log_loss={self.log_loss})>"
+        )
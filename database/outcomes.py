@@ -0,0 +1,127 @@
+from typing import Iterable
+
+from sqlalchemy import Table, case, cast, event, exists, inspect, tuple_, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from database.models import ARCHIVE_TABLES, CatchEvent, EliminationEvent, ThrowEvent
+from database.models.throw_event import ThrowOutcome
+from database.player_stats import HIT_CAUSES
+
+
+def outcome_case(throws: Table, catches: Table, eliminations: Table):
+    """SQL resolving the outcome of each row of a throw table
+
+    A catch beats a hit, since catching a deflected ball saves the player hit.
+    Throws that neither hit nor were caught are blocked or missed.
+    """
+    caught = exists().where(
+        catches.c.set_id == throws.c.set_id,
+        catches.c.throw_event_id == throws.c.id,
+    )
+    hit = exists().where(
+        eliminations.c.set_id == throws.c.set_id,
+        eliminations.c.throw_event_id == throws.c.id,
+        eliminations.c.cause.in_(HIT_CAUSES),
+    )
+    # Enum columns store member names
+    outcome = case(
+        (~throws.c.valid_attempt, ThrowOutcome.INVALID.name),
+        (caught.where(catches.c.rebound_catch), ThrowOutcome.REBOUND_CAUGHT.name),
+        (caught, ThrowOutcome.CAUGHT.name),
+        (hit, ThrowOutcome.HIT.name),
+        (throws.c.was_blocked, ThrowOutcome.BLOCKED.name),
+        else_=ThrowOutcome.MISS.name,
+    )
+    return cast(outcome, throws.c.outcome.type)
+
+
+def resolve_outcomes(conn: Connection, throws: Iterable[tuple[int, int]]) -> None:
+    """Recomputes the stored outcome of some throws
+
+    Args:
+        conn (Connection): sqlalchemy Connection
+        throws (Iterable[tuple[int, int]]): (set_id, id) of each throw
+    """
+    throws = list(throws)
+    if not throws:
+        return
+    table = ThrowEvent.__table__
+    conn.execute(
+        update(table)
+        .where(
+            # The plain set_id filter lets the planner prune partitions
+            table.c.set_id.in_({set_id for set_id, _ in throws}),
+            tuple_(table.c.set_id, table.c.id).in_(throws),
+        )
+        .values(
+            outcome=outcome_case(
+                table, CatchEvent.__table__, EliminationEvent.__table__
+            )
+        )
+    )
+
+
+def _values(obj, name: str) -> list:
+    """Current and pre-flush values of an attribute"""
+    return [*inspect(obj).attrs[name].history.deleted, getattr(obj, name)]
+
+
+def _affected_throws(session: Session) -> set[tuple[int, int]]:
+    """Throws whose outcome the flushed objects can change"""
+    throws = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, ThrowEvent) and obj not in session.deleted:
+            throws.add((obj.set_id, obj.id))
+        elif isinstance(obj, (CatchEvent, EliminationEvent)):
+            for set_id in _values(obj, "set_id"):
+                for throw_id in _values(obj, "throw_event_id"):
+                    if set_id is not None and throw_id is not None:
+                        throws.add((set_id, throw_id))
+    return throws
+
+
+def _update_outcomes(session: Session, flush_context) -> None:
+    throws = _affected_throws(session)
+    if throws:
+        resolve_outcomes(session.connection(), throws)
+
+
+def maintain_outcomes(session_class: type[Session]) -> None:
+    """Resolves throw outcomes in the same transaction as every related event write
+
+    Args:
+        session_class (type[Session]): Session class to listen on
+    """
+    if not event.contains(session_class, "after_flush", _update_outcomes):
+        event.listen(session_class, "after_flush", _update_outcomes)
+
+
+def rebuild_outcomes(conn: Connection, set_ids=None) -> int:
+    """Resolves every throw's outcome from the hot and archived events
+
+    Needed after bulk loads that bypass the ORM, such as the synthetic generator.
+
+    Args:
+        conn (Connection): sqlalchemy Connection
+        set_ids (optional): IDs or a subquery of IDs of the sets to resolve. Defaults to None, every set.
+
+    Returns:
+        int: Number of throws resolved
+    """
+    resolved = 0
+    for throws, catches, eliminations in (
+        (ThrowEvent.__table__, CatchEvent.__table__, EliminationEvent.__table__),
+        (
+            ARCHIVE_TABLES[ThrowEvent],
+            ARCHIVE_TABLES[CatchEvent],
+            ARCHIVE_TABLES[EliminationEvent],
+        ),
+    ):
+        stmt = update(throws).values(
+            outcome=outcome_case(throws, catches, eliminations)
+        )
+        if set_ids is not None:
+            stmt = stmt.where(throws.c.set_id.in_(set_ids))
+        resolved += conn.execute(stmt).rowcount
+    return resolved
@@ -0,0 +1,383 @@
+import logging
+import os
+import re
+from dataclasses import dataclass
+
+from sqlalchemy import DDL, event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from database.models import CatchEvent, EliminationEvent, Set, ThrowEvent
+
+logger = logging.getLogger(__name__)
+
+# Referenced tables first. Attach in this order, detach in reverse.
+PARTITIONED_TABLES = ("throw_events", "catch_events", "eliminations")
+
+# Number of set ids covered by each partition
+PARTITION_SIZE = int(os.getenv("EVENT_PARTITION_SIZE", "10000"))
+
+# Serialises partition changes between processes, any constant key works
+_PARTITION_LOCK_KEY = 7_031_001
+
+_RANGE_BOUND = re.compile(r"FROM \('?(\d+)'?\) TO \('?(\d+)'?\)")
+
+
+class PartitionError(Exception):
+    """A partition could not be created, attached or detached"""
+
+
+@dataclass(frozen=True)
+class Partition:
+    table: str
+    name: str
+    lower: int | None
+    upper: int | None
+
+    @property
+    def is_default(self) -> bool:
+        return self.lower is None
+
+
+def check_lower(lower: int) -> None:
+    """Raises PartitionError unless lower starts a partition range"""
+    if lower < 0 or lower % PARTITION_SIZE:
+        raise PartitionError(
+            f"{lower} is not the first set id of a range, use a multiple of {PARTITION_SIZE}"
+        )
+
+
+def partition_name(table: str, lower: int) -> str:
+    return f"{table}_p{lower}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+# Rows outside every range partition land here instead of failing the insert
+for _model in (ThrowEvent, CatchEvent, EliminationEvent):
+    _table = _model.__tablename__
+    event.listen(
+        _model.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TABLE IF NOT EXISTS {default_partition_name(_table)} "
+            f"PARTITION OF {_table} DEFAULT"
+        ).execute_if(dialect="postgresql"),
+    )
+
+
+def list_partitions(conn: Connection, table: str) -> list[Partition]:
+    """Lists the attached partitions of an event table
+
+    Args:
+        conn (Connection): sqlalchemy Connection
+        table (str): One of PARTITIONED_TABLES
+
+    Returns:
+        list[Partition]: Range partitions ordered by lower bound, then the default partition
+    """
+    rows = conn.execute(
+        text(
+            "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+            "FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    ).all()
+
+    partitions = []
+    for name, bound in rows:
+        match = _RANGE_BOUND.search(bound)
+        if match:
+            partitions.append(
+                Partition(table, name, int(match.group(1)), int(match.group(2)))
+            )
+        else:
+            partitions.append(Partition(table, name, None, None))
+
+    return sorted(partitions, key=lambda p: (p.is_default, p.lower or 0))
+
+
+def create_partition(conn: Connection, table: str, lower: int) -> Partition:
+    """Creates the range partition of a table that starts at lower
+
+    Args:
+        conn (Connection): sqlalchemy Connection
+        table (str): One of PARTITIONED_TABLES
+        lower (int): First set id of the partition, a multiple of PARTITION_SIZE
+
+    Raises:
+        PartitionError: The default partition already holds rows for this range
+
+    Returns:
+        Partition: The created partition
+    """
+    upper = lower + PARTITION_SIZE
+    if has_default_rows(conn, table, lower):
+        raise PartitionError(
+            f"{default_partition_name(table)} has rows for set ids {lower}-{upper - 1}, "
+            "move them with move_from_default"
+        )
+
+    name = partition_name(table, lower)
+    conn.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ({lower}) TO ({upper})"
+        )
+    )
+    return Partition(table, name, lower, upper)
+
+
+def has_default_rows(conn: Connection, table: str, lower: int) -> bool:
+    """Whether the default partition of a table holds rows for the range from lower"""
+    return conn.execute(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {default_partition_name(table)} "
+            "WHERE set_id >= :lower AND set_id < :upper)"
+        ),
+        {"lower": lower, "upper": lower + PARTITION_SIZE},
+    ).scalar()
+
+
+def move_from_default(
+    conn: Connection, lower: int, tables: tuple[str, ...] = PARTITIONED_TABLES
+) -> list[Partition]:
+    """Moves the rows of a range out of the default partitions into a new range partition
+
+    The rows are copied into a new table and deleted from the default
+    partition, referencing tables first, then the new tables are attached.
+    Writes to the tables wait until the transaction ends.
+
+    Args:
+        conn (Connection): sqlalchemy Connection
+        lower (int): First set id of the range
+        tables (tuple[str, ...], optional): Tables missing the range's partition. Defaults to PARTITIONED_TABLES.
+
+    Returns:
+        list[Partition]: The partitions that were created
+    """
+    check_lower(lower)
+    upper = lower + PARTITION_SIZE
+    in_range = {"lower": lower, "upper": upper}
+    tables = tuple(table for table in PARTITIONED_TABLES if table in tables)
+
+    for table in tables:
+        name = partition_name(table, lower)
+        conn.execute(
+            text(
+                f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+        )
+        conn.execute(
+            text(
+                f"INSERT INTO {name} SELECT * FROM {default_partition_name(table)} "
+                "WHERE set_id >= :lower AND set_id < :upper"
+            ),
+            in_range,
+        )
+    for table in reversed(tables):
+        conn.execute(
+            text(
+                f"DELETE FROM {default_partition_name(table)} "
+                "WHERE set_id >= :lower AND set_id < :upper"
+            ),
+            in_range,
+        )
+    return [
+        Partition(table, name, lower, upper)
+        for table, name in zip(tables, attach_range(conn, lower, tables))
+    ]
+
+
+def ensure_partitions(
+    conn: Connection,
+    ahead: int = 2,
+    up_to_set_id: int | None = None,
+    move_default: bool = True,
+) -> list[Partition]:
+    """Creates every missing partition up to a number of partitions past the newest set
+
+    Rows of a missing range already in a default partition are moved into the
+    new partition, or the range is skipped with a warning if move_default is off.
+
+    Args:
+        conn (Connection): sqlalchemy Connection
+        ahead (int, optional): Empty partitions to keep beyond the newest set. Defaults to 2.
+        up_to_set_id (int | None, optional): Also cover set ids up to this one, e.g before a bulk load. Defaults to None.
+        move_default (bool, optional): Whether to move rows out of the default partitions. Defaults to True.
+
+    Returns:
+        list[Partition]: The partitions that were created
+    """
+    conn.execute(
+        text("SELECT pg_advisory_xact_lock(:key)"), {"key": _PARTITION_LOCK_KEY}
+    )
+    newest_set = conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM sets")).scalar()
+    newest_set = max(newest_set, up_to_set_id or 0)
+    last_lower = (newest_set // PARTITION_SIZE + ahead) * PARTITION_SIZE
+
+    existing = {
+        table: {p.lower for p in list_partitions(conn, table) if not p.is_default}
+        for table in PARTITIONED_TABLES
+    }
+    created = []
+    for lower in range(0, last_lower + 1, PARTITION_SIZE):
+        missing = tuple(
+            table for table in PARTITIONED_TABLES if lower not in existing[table]
+        )
+        if not missing:
+            continue
+        if any(has_default_rows(conn, table, lower) for table in missing):
+            if not move_default:
+                logger.warning(
+                    "Default partitions hold rows for set ids %d-%d, "
+                    "run partitions ensure to move them",
+                    lower,
+                    lower + PARTITION_SIZE - 1,
+                )
+                continue
+            created += move_from_default(conn, lower, missing)
+        else:
+            created += [create_partition(conn, table, lower) for table in missing]
+    return created
+
+
+def partitions_upper(conn: Connection) -> int:
+    """Set id below which every event table has range partitions, 0 if any has none"""
+    uppers = [
+        max(
+            (p.upper for p in list_partitions(conn, table) if not p.is_default),
+            default=0,
+        )
+        for table in PARTITIONED_TABLES
+    ]
+    return min(uppers)
+
+
+# Committed upper bound of the range partitions, so most flushes skip the catalog
+_known_upper: dict[str, int] = {}
+
+
+def maintain_partitions(session_class: type[Session], ahead: int = 2) -> None:
+    """Creates the next partitions as new sets get within ahead ranges of the last one
+
+    Without this, events of sets past the last partition land in the default
+    partition. Nearing the bound once per range costs a catalog lookup and the
+    creation of the missing partitions, in the flushing transaction.
+
+    Args:
+        session_class (type[Session]): Session class whose flushes to watch
+        ahead (int, optional): Empty partitions to keep beyond the newest set. Defaults to 2.
+    """
+
+    @event.listens_for(session_class, "after_flush")
+    def _ensure_partitions(session: Session, flush_context) -> None:
+        set_ids = [obj.id for obj in session.new if isinstance(obj, Set)]
+        if not set_ids:
+            return
+        needed = (max(set_ids) // PARTITION_SIZE + ahead + 1) * PARTITION_SIZE
+        if _known_upper.get("upper", 0) >= needed:
+            return
+        conn = session.connection()
+        if conn.dialect.name != "postgresql":
+            return
+        if partitions_upper(conn) < needed:
+            ensure_partitions(conn, ahead, max(set_ids), move_default=False)
+        # Only trusted once committed, a rollback also drops created partitions
+        session.info["partitions_upper"] = partitions_upper(conn)
+
+    @event.listens_for(session_class, "after_commit")
+    def _remember_upper(session: Session) -> None:
+        upper = session.info.pop("partitions_upper", None)
+        if upper is not None:
+            _known_upper["upper"] = max(_known_upper.get("upper", 0), upper)
+
+    @event.listens_for(session_class, "after_rollback")
+    def _forget_upper(session: Session) -> None:
+        session.info.pop("partitions_upper", None)
+
+
+def _drop_event_foreign_keys(conn: Connection, name: str) -> None:
+    """Drops a detached table's foreign keys into the event tables and their partitions
+
+    They'd otherwise stop the referenced partition being detached, and are
+    recreated from the parent's constraint when the table is attached again.
+    """
+    constraints = conn.execute(
+        text(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = CAST(:name AS regclass) AND contype = 'f' "
+            "AND confrelid IN ("
+            "SELECT oid FROM pg_class WHERE relname = ANY(:tables) "
+            "UNION SELECT inhrelid FROM pg_inherits JOIN pg_class "
+            "ON pg_class.oid = pg_inherits.inhparent WHERE relname = ANY(:tables))"
+        ),
+        {"name": name, "tables": list(PARTITIONED_TABLES)},
+    ).scalars()
+    for constraint in list(constraints):
+        conn.execute(text(f'ALTER TABLE {name} DROP CONSTRAINT "{constraint}"'))
+
+
+def detach_range(conn: Connection, lower: int) -> list[str]:
+    """Detaches the partitions holding set ids from lower from every event table
+
+    The detached tables keep their rows and can be archived, dropped or attached
+    again with attach_range. Their foreign keys into the other event tables are
+    dropped, so the referenced partitions can be detached after them.
+
+    Args:
+        conn (Connection): sqlalchemy Connection
+        lower (int): First set id of the range
+
+    Raises:
+        PartitionError: lower doesn't start a range
+
+    Returns:
+        list[str]: Names of the detached tables
+    """
+    check_lower(lower)
+    detached = []
+    for table in reversed(PARTITIONED_TABLES):
+        name = partition_name(table, lower)
+        conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        _drop_event_foreign_keys(conn, name)
+        detached.append(name)
+    return detached
+
+
+def attach_range(
+    conn: Connection, lower: int, tables: tuple[str, ...] = PARTITIONED_TABLES
+) -> list[str]:
+    """Attaches previously detached partitions for set ids from lower again
+
+    The parents' foreign keys are recreated on the attached tables and checked.
+
+    Args:
+        conn (Connection): sqlalchemy Connection
+        lower (int): First set id of the range
+        tables (tuple[str, ...], optional): Tables to attach, in PARTITIONED_TABLES order. Defaults to PARTITIONED_TABLES.
+
+    Raises:
+        PartitionError: lower doesn't start a range
+
+    Returns:
+        list[str]: Names of the attached tables
+    """
+    check_lower(lower)
+    upper = lower + PARTITION_SIZE
+    attached = []
+    for table in tables:
+        name = partition_name(table, lower)
+        conn.execute(
+            text(
+                f"ALTER TABLE {table} ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ({lower}) TO ({upper})"
+            )
+        )
+        attached.append(name)
+    return attached
@@ -0,0 +1,294 @@
+from collections import Counter
+from functools import partial
+from typing import Callable
+
+from sqlalchemy import (
+    Integer,
+    cast,
+    delete,
+    event,
+    func,
+    inspect,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from database.models import (
+    ARCHIVE_TABLES,
+    CatchEvent,
+    Competition,
+    EliminationEvent,
+    Match,
+    PlayerCompetitionStats,
+    Set,
+    ThrowEvent,
+)
+from database.archive import competition_set_ids
+from database.models.elimination_event import EliminationCause
+
+STAT_COLUMNS = ("throws", "hits", "eliminations", "catches", "rebound_catches")
+
+# Eliminations credited to the thrower, and counted as hits for their hit rate
+HIT_CAUSES = (EliminationCause.DIRECT_HIT, EliminationCause.DEFLECTION_HIT)
+
+_stats = PlayerCompetitionStats.__table__
+
+
+def _credited_player(kind: str, set_id: int, ref: int):
+    """SQL for the player a contribution counts for
+
+    "player" contributions name the player, eliminations name the throw or
+    catch that caused them and count for whoever made it.
+    """
+    if kind == "player":
+        return literal(ref)
+    model = ThrowEvent if kind == "throw" else CatchEvent
+    return (
+        select(model.player_id)
+        .where(model.set_id == set_id, model.id == ref)
+        .scalar_subquery()
+    )
+
+
+def apply_stats(
+    conn: Connection, set_id: int, kind: str, ref: int, deltas: dict[str, int]
+) -> None:
+    """Adds deltas to a player's stats in the competition a set belongs to
+
+    Runs as a single upsert so concurrent writes don't lose updates.
+
+    Args:
+        conn (Connection): sqlalchemy Connection
+        set_id (int): The event's set
+        kind (str): "player", "throw" or "catch", what ref identifies
+        ref (int): The player's ID, or the ID of the throw or catch they made
+        deltas (dict[str, int]): Amount to add to each stat column
+    """
+    player = _credited_player(kind, set_id, ref)
+    columns = list(deltas)
+    source = (
+        select(
+            Competition.id,
+            player,
+            Competition.age_category,
+            Competition.court_size,
+            *(literal(deltas[column]) for column in columns),
+        )
+        .select_from(Set)
+        .join(Match, Match.id == Set.match_id)
+        .join(Competition, Competition.id == Match.competition_id)
+        .where(Set.id == set_id, player.is_not(None))
+    )
+    stmt = insert(PlayerCompetitionStats).from_select(
+        ["competition_id", "player_id", "age_category", "court_size", *columns],
+        source,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["competition_id", "player_id"],
+        set_={
+            **{column: _stats.c[column] + stmt.excluded[column] for column in columns},
+            "updated_at": func.now(),
+        },
+    )
+    conn.execute(stmt)
+
+
+def _contributions(obj, value: Callable[[str], object]) -> list[tuple]:
+    """(set_id, kind, ref, column) of every stat one event adds to"""
+    set_id = value("set_id")
+    if isinstance(obj, ThrowEvent):
+        if value("valid_attempt"):
+            return [(set_id, "player", value("player_id"), "throws")]
+        return []
+
+    if isinstance(obj, CatchEvent):
+        contributions = [(set_id, "player", value("player_id"), "catches")]
+        if value("rebound_catch"):
+            contributions.append(
+                (set_id, "player", value("player_id"), "rebound_catches")
+            )
+        return contributions
+
+    cause = value("cause")
+    if cause in HIT_CAUSES and value("throw_event_id") is not None:
+        throw = (set_id, "throw", value("throw_event_id"))
+        return [(*throw, "eliminations"), (*throw, "hits")]
+    if cause == EliminationCause.THROW_CAUGHT and value("catch_event_id") is not None:
+        return [(set_id, "catch", value("catch_event_id"), "eliminations")]
+    return []
+
+
+def _old_value(obj) -> Callable[[str], object]:
+    def value(name: str):
+        history = inspect(obj).attrs[name].history
+        return history.deleted[0] if history.deleted else getattr(obj, name)
+
+    return value
+
+
+def _update_stats(session: Session, flush_context) -> None:
+    deltas: Counter[tuple] = Counter()
+    event_types = (ThrowEvent, CatchEvent, EliminationEvent)
+
+    for obj in session.new:
+        if isinstance(obj, event_types):
+            deltas.update(_contributions(obj, partial(getattr, obj)))
+    for obj in session.deleted:
+        if isinstance(obj, event_types):
+            deltas.subtract(_contributions(obj, partial(getattr, obj)))
+    for obj in session.dirty:
+        if isinstance(obj, event_types):
+            deltas.subtract(_contributions(obj, _old_value(obj)))
+            deltas.update(_contributions(obj, partial(getattr, obj)))
+
+    # One upsert per credited player, however many of their stats changed
+    grouped: dict[tuple, dict[str, int]] = {}
+    for (set_id, kind, ref, column), delta in deltas.items():
+        if delta:
+            grouped.setdefault((set_id, kind, ref), {})[column] = delta
+    if not grouped and not session.dirty:
+        return
+
+    conn = session.connection()
+    for (set_id, kind, ref), columns in grouped.items():
+        apply_stats(conn, set_id, kind, ref, columns)
+
+    for obj in session.dirty:
+        if isinstance(obj, Competition) and (
+            inspect(obj).attrs.age_category.history.has_changes()
+            or inspect(obj).attrs.court_size.history.has_changes()
+        ):
+            conn.execute(
+                update(PlayerCompetitionStats)
+                .where(_stats.c.competition_id == obj.id)
+                .values(age_category=obj.age_category, court_size=obj.court_size)
+            )
+
+
+def maintain_player_stats(session_class: type[Session]) -> None:
+    """Updates player stats in the same transaction as every event flushed by a session class
+
+    Args:
+        session_class (type[Session]): Session class to listen on
+    """
+    if not event.contains(session_class, "after_flush", _update_stats):
+        event.listen(session_class, "after_flush", _update_stats)
+
+
+def _contribution_rows(throws, catches, eliminations, set_ids=None) -> list:
+    """Raw events of one table family as (set_id, player_id, *STAT_COLUMNS) rows"""
+
+    def row(set_id, player_id, **stats):
+        return select(
+            set_id.label("set_id"),
+            player_id.label("player_id"),
+            *(stats.get(name, literal(0)).label(name) for name in STAT_COLUMNS),
+        )
+
+    one = literal(1)
+    rows = [
+        row(throws.c.set_id, throws.c.player_id, throws=one).where(
+            throws.c.valid_attempt
+        ),
+        row(
+            catches.c.set_id,
+            catches.c.player_id,
+            catches=one,
+            rebound_catches=cast(catches.c.rebound_catch, Integer),
+        ),
+        row(eliminations.c.set_id, throws.c.player_id, hits=one, eliminations=one)
+        .join(
+            throws,
+            (throws.c.set_id == eliminations.c.set_id)
+            & (throws.c.id == eliminations.c.throw_event_id),
+        )
+        .where(eliminations.c.cause.in_(HIT_CAUSES)),
+        row(eliminations.c.set_id, catches.c.player_id, eliminations=one)
+        .join(
+            catches,
+            (catches.c.set_id == eliminations.c.set_id)
+            & (catches.c.id == eliminations.c.catch_event_id),
+        )
+        .where(eliminations.c.cause == EliminationCause.THROW_CAUGHT),
+    ]
+    if set_ids is not None:
+        # Filter each branch so only the competition's partitions are scanned
+        rows = [
+            branch.where(table.c.set_id.in_(set_ids))
+            for branch, table in zip(
+                rows, (throws, catches, eliminations, eliminations)
+            )
+        ]
+    return rows
+
+
+def rebuild_player_stats(conn: Connection, competition_id: int | None = None) -> int:
+    """Recomputes player stats from the raw hot and archived events
+
+    Needed after bulk loads that bypass the ORM, such as the synthetic
+    generator, or if stats are ever suspected to have drifted.
+
+    Args:
+        conn (Connection): sqlalchemy Connection
+        competition_id (int | None, optional): The competition to rebuild. Defaults to None, every competition.
+
+    Returns:
+        int: Number of stats rows written
+    """
+    set_ids = None
+    if competition_id is not None:
+        set_ids = competition_set_ids(competition_id)
+
+    rows = []
+    for tables in (
+        (ThrowEvent.__table__, CatchEvent.__table__, EliminationEvent.__table__),
+        (
+            ARCHIVE_TABLES[ThrowEvent],
+            ARCHIVE_TABLES[CatchEvent],
+            ARCHIVE_TABLES[EliminationEvent],
+        ),
+    ):
+        rows.extend(_contribution_rows(*tables, set_ids=set_ids))
+
+    events = rows[0].union_all(*rows[1:]).subquery()
+    source = (
+        select(
+            Competition.id,
+            events.c.player_id,
+            Competition.age_category,
+            Competition.court_size,
+            *(func.sum(events.c[name]) for name in STAT_COLUMNS),
+        )
+        .select_from(events)
+        .join(Set, Set.id == events.c.set_id)
+        .join(Match, Match.id == Set.match_id)
+        .join(Competition, Competition.id == Match.competition_id)
+        .group_by(Competition.id, events.c.player_id)
+    )
+
+    if competition_id is None:
+        conn.execute(delete(PlayerCompetitionStats))
+    else:
+        conn.execute(
+            delete(PlayerCompetitionStats).where(
+                _stats.c.competition_id == competition_id
+            )
+        )
+
+    result = conn.execute(
+        insert(PlayerCompetitionStats).from_select(
+            [
+                "competition_id",
+                "player_id",
+                "age_category",
+                "court_size",
+                *STAT_COLUMNS,
+            ],
+            source,
+        )
+    )
+    return result.rowcount
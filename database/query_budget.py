@@ -0,0 +1,120 @@
+import logging
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Callable
+
+from sqlalchemy.engine import Connection
+
+from database.instrumentation import add_query_observer
+from database.slow_query import normalise_sql
+
+logger = logging.getLogger(__name__)
+
+# Same statement shape more often than this in one budget is treated as N+1
+DEFAULT_MAX_REPEATS = 10
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block or route runs more statements than it declared"""
+
+
+class QueryBudget:
+    """Counts the statements run inside a block and checks them against a budget
+
+    Usable directly as a context manager in tests:
+
+        with QueryBudget(max_statements=2):
+            repo.get_all(set_id=1)
+
+    Args:
+        max_statements (int | None, optional): Most statements allowed. Defaults to None.
+        max_repeats (int | None, optional): Most times one statement shape may run. Defaults to DEFAULT_MAX_REPEATS.
+        raise_on_exit (bool, optional): Raise QueryBudgetExceeded when leaving the block. Defaults to True.
+    """
+
+    def __init__(
+        self,
+        max_statements: int | None = None,
+        max_repeats: int | None = DEFAULT_MAX_REPEATS,
+        raise_on_exit: bool = True,
+    ) -> None:
+        self.max_statements = max_statements
+        self.max_repeats = max_repeats
+        self.raise_on_exit = raise_on_exit
+        self.statements = 0
+        self.shapes: Counter[str] = Counter()
+        self._token = None
+
+    def record(self, statement: str) -> None:
+        self.statements += 1
+        self.shapes[normalise_sql(statement)] += 1
+
+    def violations(self) -> list[str]:
+        """Describes every way the budget was exceeded
+
+        Returns:
+            list[str]: Human readable violations, empty when within budget
+        """
+        problems = []
+        if self.max_statements is not None and self.statements > self.max_statements:
+            problems.append(
+                f"{self.statements} statements run, budget is {self.max_statements}"
+            )
+        if self.max_repeats is not None:
+            for shape, count in self.shapes.most_common():
+                if count <= self.max_repeats:
+                    break
+                problems.append(
+                    f"statement repeated {count} times (max {self.max_repeats}): {shape}"
+                )
+        return problems
+
+    def __enter__(self) -> "QueryBudget":
+        self._token = _active_budget.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _active_budget.reset(self._token)
+        if exc_type is None and self.raise_on_exit:
+            problems = self.violations()
+            if problems:
+                raise QueryBudgetExceeded("; ".join(problems))
+
+
+_active_budget: ContextVar[QueryBudget | None] = ContextVar(
+    "active_query_budget", default=None
+)
+
+
+def _record_statement(
+    conn: Connection, statement: str, parameters: Any, duration_s: float
+) -> None:
+    budget = _active_budget.get()
+    if budget is not None:
+        budget.record(statement)
+
+
+add_query_observer(_record_statement)
+
+
+def declare_query_budget(
+    max_statements: int | None = None, max_repeats: int | None = DEFAULT_MAX_REPEATS
+) -> Callable:
+    """Declares the query budget of a route, checked by QueryBudgetMiddleware
+
+    Place it below the router decorator:
+
+        @router.get("/")
+        @declare_query_budget(max_statements=1)
+        def read_all(...):
+
+    Args:
+        max_statements (int | None, optional): Most statements the route may run. Defaults to None.
+        max_repeats (int | None, optional): Most times one statement shape may run. Defaults to DEFAULT_MAX_REPEATS.
+    """
+
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__query_budget__ = (max_statements, max_repeats)
+        return endpoint
+
+    return decorator
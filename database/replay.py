@@ -0,0 +1,374 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterator
+
+from sqlalchemy import (
+    delete,
+    event,
+    func,
+    inspect,
+    literal,
+    null,
+    select,
+    tuple_,
+    type_coerce,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from database.models import (
+    ARCHIVE_TABLES,
+    CatchEvent,
+    EliminationEvent,
+    Match,
+    Set,
+    SetReplayCheckpoint,
+    ThrowEvent,
+)
+from database.scoreboard import (
+    Elimination,
+    SetScoreboard,
+    TeamScore,
+    start_scoreboard,
+)
+
+# Order of events recorded at the same instant: a throw, its catch, then who went out
+KIND_RANKS = {"throw": 0, "catch": 1, "elimination": 2}
+
+
+class ReplayUnavailable(Exception):
+    """The set doesn't exist"""
+
+
+@dataclass(frozen=True)
+class ReplayEvent:
+    at: datetime
+    kind_rank: int
+    event_id: int
+    player_id: int
+    cause: str | None = None
+
+    @property
+    def key(self) -> tuple[datetime, int, int]:
+        return (self.at, self.kind_rank, self.event_id)
+
+
+def _stream(throws, catches, eliminations, set_id: int):
+    """One table family's events of a set as (at, kind_rank, event_id, player_id, cause)"""
+    # Eliminations happen when the throw or catch that caused them does
+    elimination_at = func.coalesce(
+        throws.c.timestamp, catches.c.timestamp, eliminations.c.created_at
+    )
+    no_cause = type_coerce(null(), eliminations.c.cause.type)
+    return [
+        select(
+            throws.c.timestamp.label("at"),
+            literal(KIND_RANKS["throw"]).label("kind_rank"),
+            throws.c.id.label("event_id"),
+            throws.c.player_id.label("player_id"),
+            no_cause.label("cause"),
+        ).where(throws.c.set_id == set_id),
+        select(
+            catches.c.timestamp,
+            literal(KIND_RANKS["catch"]),
+            catches.c.id,
+            catches.c.player_id,
+            no_cause,
+        ).where(catches.c.set_id == set_id),
+        select(
+            elimination_at,
+            literal(KIND_RANKS["elimination"]),
+            eliminations.c.id,
+            eliminations.c.eliminated_player_id,
+            eliminations.c.cause,
+        )
+        .outerjoin(
+            throws,
+            (throws.c.set_id == eliminations.c.set_id)
+            & (throws.c.id == eliminations.c.throw_event_id),
+        )
+        .outerjoin(
+            catches,
+            (catches.c.set_id == eliminations.c.set_id)
+            & (catches.c.id == eliminations.c.catch_event_id),
+        )
+        .where(eliminations.c.set_id == set_id),
+    ]
+
+
+def event_stream(
+    session: Session,
+    set_id: int,
+    after: tuple[datetime, int, int] | None = None,
+    until: datetime | None = None,
+) -> Iterator[ReplayEvent]:
+    """Streams a set's hot and archived events in replay order
+
+    Args:
+        session (Session): sqlalchemy Session
+        set_id (int): The set's ID
+        after (tuple[datetime, int, int] | None, optional): Key of the last event already applied. Defaults to None.
+        until (datetime | None, optional): Latest event time to include. Defaults to None.
+
+    Yields:
+        ReplayEvent: The set's events in (at, kind_rank, event_id) order
+    """
+    branches = _stream(
+        ThrowEvent.__table__, CatchEvent.__table__, EliminationEvent.__table__, set_id
+    ) + _stream(
+        ARCHIVE_TABLES[ThrowEvent],
+        ARCHIVE_TABLES[CatchEvent],
+        ARCHIVE_TABLES[EliminationEvent],
+        set_id,
+    )
+    events = branches[0].union_all(*branches[1:]).subquery()
+
+    sql = select(events).order_by(events.c.at, events.c.kind_rank, events.c.event_id)
+    if after is not None:
+        sql = sql.where(
+            tuple_(events.c.at, events.c.kind_rank, events.c.event_id) > tuple_(*after)
+        )
+    if until is not None:
+        sql = sql.where(events.c.at <= until)
+
+    for at, kind_rank, event_id, player_id, cause in session.execute(sql):
+        cause = cause.value if hasattr(cause, "value") else cause
+        yield ReplayEvent(at, kind_rank, event_id, player_id, cause)
+
+
+def apply_event(board: SetScoreboard, replay_event: ReplayEvent) -> None:
+    """Folds one event into a set's state"""
+    if replay_event.kind_rank == KIND_RANKS["throw"]:
+        board.apply_throw(replay_event.player_id)
+    elif replay_event.kind_rank == KIND_RANKS["catch"]:
+        board.apply_catch(replay_event.player_id)
+    else:
+        board.apply_elimination(
+            replay_event.player_id, replay_event.cause, replay_event.at
+        )
+
+
+def snapshot(board: SetScoreboard) -> dict[str, Any]:
+    """A set's state as JSON for a checkpoint"""
+    return {
+        "set_id": board.set_id,
+        "match_id": board.match_id,
+        "start_time": board.start_time.isoformat(),
+        "end_time": board.end_time.isoformat() if board.end_time else None,
+        "winning_team_id": board.winning_team_id,
+        "teams": [
+            {
+                "team_id": team.team_id,
+                "roster": sorted(team.roster),
+                "starting_players": team.starting_players,
+                "throws": team.throws,
+                "catches": team.catches,
+                "eliminated": team.eliminated,
+            }
+            for team in board.teams.values()
+        ],
+        "eliminations": [
+            {
+                "player_id": elimination.player_id,
+                "team_id": elimination.team_id,
+                "cause": elimination.cause,
+                "at": elimination.at.isoformat(),
+            }
+            for elimination in board.eliminations
+        ],
+    }
+
+
+def restore(state: dict[str, Any]) -> SetScoreboard:
+    """Rebuilds a set's state from a checkpoint's JSON"""
+    teams = {}
+    for team in state["teams"]:
+        teams[team["team_id"]] = TeamScore(
+            team_id=team["team_id"],
+            roster=set(team["roster"]),
+            starting_players=team["starting_players"],
+            throws=team["throws"],
+            catches=team["catches"],
+            eliminated=list(team["eliminated"]),
+        )
+    end_time = state["end_time"]
+    return SetScoreboard(
+        set_id=state["set_id"],
+        match_id=state["match_id"],
+        start_time=datetime.fromisoformat(state["start_time"]),
+        teams=teams,
+        end_time=datetime.fromisoformat(end_time) if end_time else None,
+        winning_team_id=state["winning_team_id"],
+        eliminations=[
+            Elimination(
+                player_id=elimination["player_id"],
+                team_id=elimination["team_id"],
+                cause=elimination["cause"],
+                at=datetime.fromisoformat(elimination["at"]),
+            )
+            for elimination in state["eliminations"]
+        ],
+    )
+
+
+@dataclass
+class ReplayState:
+    """A set as it stood at a point of a replay"""
+
+    board: SetScoreboard
+    at: datetime
+    events_applied: int
+    checkpoint_sequence: int
+
+
+class SetReplayer:
+    """Seeks to any moment of a set by folding its events from the nearest checkpoint
+
+    Checkpoints are written every checkpoint_every events the first time a set
+    is replayed, and dropped whenever one of its events changes.
+
+    Args:
+        checkpoint_every (int, optional): Events between checkpoints. Defaults to 50.
+    """
+
+    def __init__(self, checkpoint_every: int = 50) -> None:
+        self.checkpoint_every = checkpoint_every
+
+    def _start(self, session: Session, set_id: int) -> SetScoreboard:
+        row = session.execute(
+            select(Set, Match)
+            .join(Match, Match.id == Set.match_id)
+            .where(Set.id == set_id)
+        ).one_or_none()
+        if row is None:
+            raise ReplayUnavailable(f"Set with ID {set_id} not found")
+        return start_scoreboard(session, *row)
+
+    def build_checkpoints(self, session: Session, set_id: int) -> int:
+        """Replays a whole set once, storing a checkpoint every checkpoint_every events
+
+        Args:
+            session (Session): sqlalchemy Session on the primary, not committed
+            set_id (int): The set's ID
+
+        Raises:
+            ReplayUnavailable: The set doesn't exist
+
+        Returns:
+            int: Number of checkpoints stored
+        """
+        board = self._start(session, set_id)
+        rows = []
+        for sequence, replay_event in enumerate(event_stream(session, set_id), start=1):
+            apply_event(board, replay_event)
+            if sequence % self.checkpoint_every == 0:
+                at, kind_rank, event_id = replay_event.key
+                rows.append(
+                    {
+                        "set_id": set_id,
+                        "sequence": sequence,
+                        "at": at,
+                        "kind_rank": kind_rank,
+                        "event_id": event_id,
+                        "state": snapshot(board),
+                    }
+                )
+
+        session.execute(
+            delete(SetReplayCheckpoint).where(SetReplayCheckpoint.set_id == set_id)
+        )
+        if rows:
+            session.execute(
+                insert(SetReplayCheckpoint).values(rows).on_conflict_do_nothing()
+            )
+        return len(rows)
+
+    def _checkpoint(
+        self, session: Session, set_id: int, at: datetime
+    ) -> SetReplayCheckpoint | None:
+        """Latest checkpoint at or before a time"""
+        return session.scalars(
+            select(SetReplayCheckpoint)
+            .where(SetReplayCheckpoint.set_id == set_id, SetReplayCheckpoint.at <= at)
+            .order_by(SetReplayCheckpoint.sequence.desc())
+            .limit(1)
+        ).first()
+
+    def seek(self, session: Session, set_id: int, at: datetime) -> ReplayState:
+        """Gets a set's state at a time
+
+        The first seek into a set without checkpoints builds them, so the
+        session must be able to write.
+
+        Args:
+            session (Session): sqlalchemy Session on the primary
+            set_id (int): The set's ID
+            at (datetime): The moment to seek to, events at exactly this time are applied
+
+        Raises:
+            ReplayUnavailable: The set doesn't exist
+
+        Returns:
+            ReplayState: The set's state and how much of the replay it took
+        """
+        checkpoint = self._checkpoint(session, set_id, at)
+        if checkpoint is None and not self.has_checkpoints(session, set_id):
+            if self.build_checkpoints(session, set_id):
+                checkpoint = self._checkpoint(session, set_id, at)
+
+        if checkpoint is None:
+            board = self._start(session, set_id)
+            sequence, after = 0, None
+        else:
+            board = restore(checkpoint.state)
+            sequence = checkpoint.sequence
+            after = (checkpoint.at, checkpoint.kind_rank, checkpoint.event_id)
+
+        applied = sequence
+        for replay_event in event_stream(session, set_id, after=after, until=at):
+            apply_event(board, replay_event)
+            applied += 1
+        return ReplayState(board, at, applied, sequence)
+
+    def has_checkpoints(self, session: Session, set_id: int) -> bool:
+        return (
+            session.scalar(
+                select(SetReplayCheckpoint.sequence)
+                .where(SetReplayCheckpoint.set_id == set_id)
+                .limit(1)
+            )
+            is not None
+        )
+
+
+def _event_sets(session: Session) -> set[int]:
+    """Sets whose event history the flushed objects change"""
+    set_ids = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (ThrowEvent, CatchEvent, EliminationEvent)):
+            history = inspect(obj).attrs.set_id.history
+            set_ids.update(history.deleted)
+            set_ids.add(obj.set_id)
+        elif isinstance(obj, Set) and obj not in session.new:
+            # A new start time changes the rosters replays start from
+            set_ids.add(obj.id)
+    set_ids.discard(None)
+    return set_ids
+
+
+def _drop_checkpoints(session: Session, flush_context) -> None:
+    set_ids = _event_sets(session)
+    if set_ids:
+        session.connection().execute(
+            delete(SetReplayCheckpoint).where(SetReplayCheckpoint.set_id.in_(set_ids))
+        )
+
+
+def maintain_checkpoints(session_class: type[Session]) -> None:
+    """Drops a set's checkpoints in the same transaction as any change to its events
+
+    Args:
+        session_class (type[Session]): Session class to listen on
+    """
+    if not event.contains(session_class, "after_flush", _drop_checkpoints):
+        event.listen(session_class, "after_flush", _drop_checkpoints)
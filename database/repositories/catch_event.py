@@ -1,10 +1,10 @@
 from fastapi import Depends
-from database.crud.base import CRUDRepository
+from database.crud.archived import ArchivedEventRepository
 from database.models.catch_event import CatchEvent
-from database.db import get_db_session
+from database.db import get_db_session, get_read_db_session
 
 
-class CatchEventRepository(CRUDRepository):
+class CatchEventRepository(ArchivedEventRepository):
     def __init__(self, db_session):
         super().__init__(CatchEvent, db_session)
 
@@ -14,3 +14,10 @@ def get_catch_event_repo(
 ) -> CatchEventRepository:
     """Catch event repository dependency"""
     return CatchEventRepository(session)
+
+
+def get_catch_event_read_repo(
+    session=Depends(get_read_db_session),
+) -> CatchEventRepository:
+    """Catch event repository dependency for reads, may be served by a replica"""
+    return CatchEventRepository(session)
@@ -1,16 +1,39 @@
 from fastapi import Depends
+from sqlalchemy import select
 from database.crud.base import CRUDRepository
 from database.models.competition import Competition
-from database.db import get_db_session
+from database.db import get_db_session, get_read_db_session
 
 
 class CompetitionRepository(CRUDRepository):
     def __init__(self, db_session):
         super().__init__(Competition, db_session)
 
+    def lock(self, competition_id: int) -> Competition | None:
+        """Locks a competition's row until the session's transaction ends
+
+        Serialises writes that check then change a competition, such as
+        generating its fixtures.
+
+        Args:
+            competition_id (int): The competition's ID
+
+        Returns:
+            Competition | None: The locked competition, None if it doesn't exist
+        """
+        sql = select(Competition).where(Competition.id == competition_id)
+        return self.db_session.execute(sql.with_for_update()).scalar_one_or_none()
+
 
 def get_competition_repo(
     session=Depends(get_db_session),
 ) -> CompetitionRepository:
     """Competition repository dependency"""
     return CompetitionRepository(session)
+
+
+def get_competition_read_repo(
+    session=Depends(get_read_db_session),
+) -> CompetitionRepository:
+    """Competition repository dependency for reads, may be served by a replica"""
+    return CompetitionRepository(session)
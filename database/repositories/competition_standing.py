@@ -0,0 +1,48 @@
+from fastapi import Depends
+from sqlalchemy import select
+from database.crud.base import CRUDRepository
+from database.models.competition_standing import CompetitionStanding
+from database.db import get_db_session, get_read_db_session
+
+
+class CompetitionStandingRepository(CRUDRepository):
+    def __init__(self, db_session):
+        super().__init__(CompetitionStanding, db_session)
+
+    def get_table(self, competition_id: int) -> list[CompetitionStanding]:
+        """Gets a competition's standings in table order
+
+        Ties on points are split by set difference then sets won, team ID keeps
+        the order stable.
+
+        Args:
+            competition_id (int): The competition's ID
+
+        Returns:
+            list[CompetitionStanding]: One row per team, top of the table first
+        """
+        sql = (
+            select(CompetitionStanding)
+            .where(CompetitionStanding.competition_id == competition_id)
+            .order_by(
+                CompetitionStanding.points.desc(),
+                CompetitionStanding.set_difference.desc(),
+                CompetitionStanding.sets_for.desc(),
+                CompetitionStanding.team_id,
+            )
+        )
+        return list(self.db_session.scalars(sql))
+
+
+def get_competition_standing_repo(
+    session=Depends(get_db_session),
+) -> CompetitionStandingRepository:
+    """Competition standing repository dependency"""
+    return CompetitionStandingRepository(session)
+
+
+def get_competition_standing_read_repo(
+    session=Depends(get_read_db_session),
+) -> CompetitionStandingRepository:
+    """Competition standing repository dependency for reads, may be served by a replica"""
+    return CompetitionStandingRepository(session)
@@ -1,10 +1,10 @@
 from fastapi import Depends
-from database.crud.base import CRUDRepository
+from database.crud.archived import ArchivedEventRepository
 from database.models.elimination_event import EliminationEvent
-from database.db import get_db_session
+from database.db import get_db_session, get_read_db_session
 
 
-class EliminationEventRepository(CRUDRepository):
+class EliminationEventRepository(ArchivedEventRepository):
     def __init__(self, db_session):
         super().__init__(EliminationEvent, db_session)
 
@@ -14,3 +14,10 @@ def get_elimination_event_repo(
 ) -> EliminationEventRepository:
     """Elimination event repository dependency"""
     return EliminationEventRepository(session)
+
+
+def get_elimination_event_read_repo(
+    session=Depends(get_read_db_session),
+) -> EliminationEventRepository:
+    """Elimination event repository dependency for reads, may be served by a replica"""
+    return EliminationEventRepository(session)
@@ -0,0 +1,76 @@
+from typing import Any
+from fastapi import Depends
+from sqlalchemy import select
+from database.crud.base import CRUDRepository
+from database.jobs import enqueue
+from database.models.job import Job, JobKind, JobStatus
+from database.db import get_db_session, get_read_db_session
+
+
+class JobRepository(CRUDRepository):
+    def __init__(self, db_session):
+        super().__init__(Job, db_session)
+
+    def enqueue(
+        self,
+        kind: JobKind,
+        arguments: dict[str, Any],
+        priority: int = 0,
+        max_attempts: int = 3,
+    ) -> Job:
+        """Queues a job, or gets the identical job already waiting to run
+
+        Args:
+            kind (JobKind): What to run
+            arguments (dict[str, Any]): Keywords for the job's handler
+            priority (int, optional): Higher runs first. Defaults to 0.
+            max_attempts (int, optional): Runs before the job is marked failed. Defaults to 3.
+
+        Raises:
+            JobError: Arguments the kind's handler doesn't take
+
+        Returns:
+            Job: The queued job
+        """
+        job_id = enqueue(
+            self.db_session.connection(), kind, arguments, priority, max_attempts
+        )
+        self.db_session.commit()
+        return self.db_session.get(Job, job_id, populate_existing=True)
+
+    def get_recent(
+        self,
+        kind: JobKind | None = None,
+        status: JobStatus | None = None,
+        limit: int = 50,
+    ) -> list[Job]:
+        """Gets the newest jobs
+
+        Args:
+            kind (JobKind | None, optional): Only this kind of job. Defaults to None.
+            status (JobStatus | None, optional): Only jobs in this status. Defaults to None.
+            limit (int, optional): Most jobs returned. Defaults to 50.
+
+        Returns:
+            list[Job]: Jobs, newest first
+        """
+        sql = select(Job).order_by(Job.id.desc()).limit(limit)
+        if kind is not None:
+            sql = sql.where(Job.kind == kind)
+        if status is not None:
+            sql = sql.where(Job.status == status)
+        return list(self.db_session.scalars(sql))
+
+
+def get_job_repo(
+    session=Depends(get_db_session),
+) -> JobRepository:
+    """Job repository dependency"""
+    return JobRepository(session)
+
+
+def get_job_read_repo(
+    session=Depends(get_read_db_session),
+) -> JobRepository:
+    """Job repository dependency for reads, may be served by a replica"""
+    return JobRepository(session)
@@ -1,6 +1,7 @@
 from database.crud.base import CRUDRepository
+from sqlalchemy import exists, select
 from sqlalchemy.orm import Session
-from database.db import get_db_session
+from database.db import get_db_session, get_read_db_session
 from database.models.match import Match
 from fastapi import Depends
 
@@ -11,9 +12,28 @@ class MatchRepository(CRUDRepository):
     def __init__(self, db_session: Session):
         super().__init__(Match, db_session)
 
+    def has_matches(self, competition_id: int) -> bool:
+        """Whether a competition has any matches yet
+
+        Args:
+            competition_id (int): The competition's ID
+
+        Returns:
+            bool: True if at least one match exists
+        """
+        sql = select(exists().where(Match.competition_id == competition_id))
+        return self.db_session.execute(sql).scalar()
+
 
 def get_match_repo(
     session=Depends(get_db_session),
 ) -> MatchRepository:
     """Match repository dependency"""
     return MatchRepository(session)
+
+
+def get_match_read_repo(
+    session=Depends(get_read_db_session),
+) -> MatchRepository:
+    """Match repository dependency for reads, may be served by a replica"""
+    return MatchRepository(session)
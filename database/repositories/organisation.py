@@ -1,7 +1,7 @@
 from fastapi import Depends
 from database.crud.base import CRUDRepository
 from database.models.organisation import Organisation
-from database.db import get_db_session
+from database.db import get_db_session, get_read_db_session
 
 
 class OrganisationRepository(CRUDRepository):
@@ -14,3 +14,10 @@ def get_organisation_repo(
 ) -> OrganisationRepository:
     """Organisation repository dependency"""
     return OrganisationRepository(session)
+
+
+def get_organisation_read_repo(
+    session=Depends(get_read_db_session),
+) -> OrganisationRepository:
+    """Organisation repository dependency for reads, may be served by a replica"""
+    return OrganisationRepository(session)
@@ -0,0 +1,26 @@
+from database.crud.base import CRUDRepository
+from sqlalchemy.orm import Session
+from database.db import get_db_session, get_read_db_session
+from database.models.player import Player
+from fastapi import Depends
+
+
+class PlayerRepository(CRUDRepository):
+    """Repository for Player operations"""
+
+    def __init__(self, db_session: Session):
+        super().__init__(Player, db_session)
+
+
+def get_player_repo(
+    session=Depends(get_db_session),
+) -> PlayerRepository:
+    """Player repository dependency"""
+    return PlayerRepository(session)
+
+
+def get_player_read_repo(
+    session=Depends(get_read_db_session),
+) -> PlayerRepository:
+    """Player repository dependency for reads, may be served by a replica"""
+    return PlayerRepository(session)
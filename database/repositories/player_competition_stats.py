@@ -0,0 +1,112 @@
+from fastapi import Depends
+from sqlalchemy import Float, Row, cast, func, select
+from database.crud.base import CRUDRepository
+from database.models.competition import AgeCategory, CourtSize
+from database.models.player import Player
+from database.models.player_competition_stats import (
+    LeaderboardMetric,
+    PlayerCompetitionStats,
+)
+from database.db import get_db_session, get_read_db_session
+
+_STATS = ("throws", "hits", "eliminations", "catches", "rebound_catches")
+
+
+class PlayerCompetitionStatsRepository(CRUDRepository):
+    def __init__(self, db_session):
+        super().__init__(PlayerCompetitionStats, db_session)
+
+    def get_leaderboard(
+        self,
+        metric: LeaderboardMetric,
+        competition_id: int | None = None,
+        age_category: AgeCategory | None = None,
+        court_size: CourtSize | None = None,
+        min_attempts: int = 1,
+        limit: int = 10,
+        offset: int = 0,
+    ) -> list[Row]:
+        """Gets one page of players ranked by a stat
+
+        Within a competition every player has one stats row, so the ranking
+        walks the metric's index. Across an age category or court size a
+        player's rows in each competition are summed first. Players level on
+        the metric share a rank and are listed by player ID so pages never
+        overlap or skip.
+
+        Args:
+            metric (LeaderboardMetric): The stat to rank by
+            competition_id (int | None, optional): Only this competition. Defaults to None.
+            age_category (AgeCategory | None, optional): Only competitions in this age category. Defaults to None.
+            court_size (CourtSize | None, optional): Only competitions on this court size. Defaults to None.
+            min_attempts (int, optional): Fewest throws to be ranked by hit rate. Defaults to 1.
+            limit (int, optional): Players per page. Defaults to 10.
+            offset (int, optional): Players to skip. Defaults to 0.
+
+        Returns:
+            list[Row]: rank, player_id, first_name, last_name, value and every stat
+        """
+        model = PlayerCompetitionStats
+        filters = []
+        if competition_id is not None:
+            filters.append(model.competition_id == competition_id)
+        if age_category is not None:
+            filters.append(model.age_category == age_category)
+        if court_size is not None:
+            filters.append(model.court_size == court_size)
+
+        if competition_id is not None:
+            # Stored hit rate, so the ranking can use its index
+            stats = [getattr(model, name) for name in _STATS]
+            players = select(model.player_id, *stats, model.hit_rate).where(*filters)
+        else:
+            stats = [func.sum(getattr(model, name)).label(name) for name in _STATS]
+            hit_rate = cast(stats[1], Float) / cast(func.nullif(stats[0], 0), Float)
+            players = (
+                select(model.player_id, *stats, hit_rate.label("hit_rate"))
+                .where(*filters)
+                .group_by(model.player_id)
+            )
+        players = players.subquery()
+
+        value = players.c[metric.value]
+        order = value.desc()
+        if metric == LeaderboardMetric.HIT_RATE:
+            # Same order as the hit rate index
+            order = order.nulls_last()
+
+        ranked = select(
+            func.rank().over(order_by=order).label("rank"),
+            *players.c,
+            value.label("value"),
+        )
+        if metric == LeaderboardMetric.HIT_RATE:
+            ranked = ranked.where(players.c.throws >= max(min_attempts, 1))
+        ranked = (
+            ranked.order_by(order, players.c.player_id)
+            .limit(limit)
+            .offset(offset)
+            .subquery()
+        )
+
+        # Names are only joined onto the page, not the whole ranking
+        sql = (
+            select(ranked, Player.first_name, Player.last_name)
+            .join(Player, Player.id == ranked.c.player_id)
+            .order_by(ranked.c.rank, ranked.c.player_id)
+        )
+        return list(self.db_session.execute(sql))
+
+
+def get_player_competition_stats_repo(
+    session=Depends(get_db_session),
+) -> PlayerCompetitionStatsRepository:
+    """Player competition stats repository dependency"""
+    return PlayerCompetitionStatsRepository(session)
+
+
+def get_player_competition_stats_read_repo(
+    session=Depends(get_read_db_session),
+) -> PlayerCompetitionStatsRepository:
+    """Player competition stats repository dependency for reads, may be served by a replica"""
+    return PlayerCompetitionStatsRepository(session)
@@ -0,0 +1,91 @@
+from datetime import datetime
+from fastapi import Depends
+from sqlalchemy import DateTime, Integer, Row, column, select, values
+from database.crud.base import CRUDRepository
+from database.models.player import Player
+from database.models.player_team_history import PlayerTeamHistory
+from database.db import get_db_session, get_read_db_session
+
+
+class PlayerTeamHistoryRepository(CRUDRepository):
+    def __init__(self, db_session):
+        super().__init__(PlayerTeamHistory, db_session)
+
+    def get_roster(self, team_id: int, as_of: datetime | None = None) -> list[Row]:
+        """Gets the players on a team at a time
+
+        Args:
+            team_id (int): The team's ID
+            as_of (datetime | None, optional): When to look at the roster. Defaults to None, now.
+
+        Returns:
+            list[Row]: player_id, first_name, last_name, joined_at and left_at, by player ID
+        """
+        sql = (
+            select(
+                PlayerTeamHistory.player_id,
+                Player.first_name,
+                Player.last_name,
+                PlayerTeamHistory.joined_at,
+                PlayerTeamHistory.left_at,
+            )
+            .join(Player, Player.id == PlayerTeamHistory.player_id)
+            .where(
+                PlayerTeamHistory.team_id == team_id,
+                PlayerTeamHistory.active_at(as_of),
+            )
+            .order_by(PlayerTeamHistory.player_id)
+        )
+        return list(self.db_session.execute(sql))
+
+    def resolve_teams(self, lookups: list[tuple[int, datetime]]) -> list[int | None]:
+        """Finds the team each player was on at each time, in one query
+
+        Lookups are joined to the history as a VALUES list so every pair is a
+        GiST probe on (player_id, tenure) instead of a range join. A player on
+        more than one team at once resolves to the team they joined last.
+
+        Args:
+            lookups (list[tuple[int, datetime]]): (player_id, timestamp) pairs
+
+        Returns:
+            list[int | None]: Team ID per lookup in the same order, None when the player wasn't on a team
+        """
+        if not lookups:
+            return []
+
+        pairs = values(
+            column("ordinal", Integer),
+            column("player_id", Integer),
+            column("at", DateTime),
+            name="lookups",
+        ).data([(i, player_id, at) for i, (player_id, at) in enumerate(lookups)])
+
+        sql = (
+            select(pairs.c.ordinal, PlayerTeamHistory.team_id)
+            .join(
+                PlayerTeamHistory,
+                (PlayerTeamHistory.player_id == pairs.c.player_id)
+                & PlayerTeamHistory.active_at(pairs.c.at),
+            )
+            .distinct(pairs.c.ordinal)
+            .order_by(pairs.c.ordinal, PlayerTeamHistory.joined_at.desc())
+        )
+        teams: list[int | None] = [None] * len(lookups)
+        for ordinal, team_id in self.db_session.execute(sql):
+            teams[ordinal] = team_id
+        return teams
+
+
+def get_player_team_history_repo(
+    session=Depends(get_db_session),
+) -> PlayerTeamHistoryRepository:
+    """Player team history repository dependency"""
+    return PlayerTeamHistoryRepository(session)
+
+
+def get_player_team_history_read_repo(
+    session=Depends(get_read_db_session),
+) -> PlayerTeamHistoryRepository:
+    """Player team history repository dependency for reads, may be served by a replica"""
+    return PlayerTeamHistoryRepository(session)
@@ -1,7 +1,7 @@
 from fastapi import Depends
 from database.crud.base import CRUDRepository
 from database.models.set import Set
-from database.db import get_db_session
+from database.db import get_db_session, get_read_db_session
 
 
 class SetRepository(CRUDRepository):
@@ -14,3 +14,10 @@ def get_set_repo(
 ) -> SetRepository:
     """Set repository dependency"""
     return SetRepository(session)
+
+
+def get_set_read_repo(
+    session=Depends(get_read_db_session),
+) -> SetRepository:
+    """Set repository dependency for reads, may be served by a replica"""
+    return SetRepository(session)
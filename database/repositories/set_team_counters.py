@@ -0,0 +1,23 @@
+from fastapi import Depends
+from database.crud.base import CRUDRepository
+from database.models.set_team_counters import SetTeamCounters
+from database.db import get_db_session, get_read_db_session
+
+
+class SetTeamCountersRepository(CRUDRepository):
+    def __init__(self, db_session):
+        super().__init__(SetTeamCounters, db_session)
+
+
+def get_set_team_counters_repo(
+    session=Depends(get_db_session),
+) -> SetTeamCountersRepository:
+    """Set team counters repository dependency"""
+    return SetTeamCountersRepository(session)
+
+
+def get_set_team_counters_read_repo(
+    session=Depends(get_read_db_session),
+) -> SetTeamCountersRepository:
+    """Set team counters repository dependency for reads, may be served by a replica"""
+    return SetTeamCountersRepository(session)
@@ -1,6 +1,7 @@
 from database.crud.base import CRUDRepository
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from database.db import get_db_session
+from database.db import get_db_session, get_read_db_session
 from database.models.team import Team
 from fastapi import Depends
 
@@ -11,9 +12,31 @@ class TeamRepository(CRUDRepository):
     def __init__(self, db_session: Session):
         super().__init__(Team, db_session)
 
+    def existing_names(self, names) -> set[str]:
+        """Which of some team names are taken, in one query
+
+        Args:
+            names: Names to check
+
+        Returns:
+            set[str]: The names already in use
+        """
+        names = set(names)
+        if not names:
+            return set()
+        sql = select(Team.name).where(Team.name.in_(names))
+        return set(self.db_session.execute(sql).scalars())
+
 
 def get_team_repo(
     session=Depends(get_db_session),
 ) -> TeamRepository:
     """Team repository dependency"""
     return TeamRepository(session)
+
+
+def get_team_read_repo(
+    session=Depends(get_read_db_session),
+) -> TeamRepository:
+    """Team repository dependency for reads, may be served by a replica"""
+    return TeamRepository(session)
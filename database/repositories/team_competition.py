@@ -0,0 +1,62 @@
+from database.crud.base import CRUDRepository
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from database.db import get_db_session, get_read_db_session
+from database.models.team_competition import TeamCompetition
+from fastapi import Depends
+
+
+class TeamCompetitionRepository(CRUDRepository):
+    """Repository for TeamCompetition operations"""
+
+    def __init__(self, db_session: Session):
+        super().__init__(TeamCompetition, db_session)
+
+    def entered_team_ids(self, competition_id: int, team_ids) -> set[int]:
+        """Which of some teams are already entered in a competition, in one query
+
+        Args:
+            competition_id (int): The competition's ID
+            team_ids: Team IDs to check
+
+        Returns:
+            set[int]: The entered teams' IDs
+        """
+        team_ids = set(team_ids)
+        if not team_ids:
+            return set()
+        sql = select(TeamCompetition.team_id).where(
+            TeamCompetition.competition_id == competition_id,
+            TeamCompetition.team_id.in_(team_ids),
+        )
+        return set(self.db_session.execute(sql).scalars())
+
+    def team_ids(self, competition_id: int) -> list[int]:
+        """The teams entered in a competition, in the order they joined
+
+        Args:
+            competition_id (int): The competition's ID
+
+        Returns:
+            list[int]: The entered teams' IDs
+        """
+        sql = (
+            select(TeamCompetition.team_id)
+            .where(TeamCompetition.competition_id == competition_id)
+            .order_by(TeamCompetition.joined_date, TeamCompetition.id)
+        )
+        return list(self.db_session.execute(sql).scalars())
+
+
+def get_team_competition_repo(
+    session=Depends(get_db_session),
+) -> TeamCompetitionRepository:
+    """TeamCompetition repository dependency"""
+    return TeamCompetitionRepository(session)
+
+
+def get_team_competition_read_repo(
+    session=Depends(get_read_db_session),
+) -> TeamCompetitionRepository:
+    """TeamCompetition repository dependency for reads, may be served by a replica"""
+    return TeamCompetitionRepository(session)
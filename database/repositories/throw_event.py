@@ -1,16 +1,49 @@
 from fastapi import Depends
-from database.crud.base import CRUDRepository
+from sqlalchemy import Row, func, select, union_all
+from database.crud.archived import ArchivedEventRepository
 from database.models.throw_event import ThrowEvent
-from database.db import get_db_session
+from database.db import get_db_session, get_read_db_session
 
 
-class ThrowEventRepository(CRUDRepository):
+class ThrowEventRepository(ArchivedEventRepository):
     def __init__(self, db_session):
         super().__init__(ThrowEvent, db_session)
 
+    def count_outcomes(self, **kwargs) -> list[Row]:
+        """Counts hot and archived throws by their resolved outcome
+
+        Args:
+            **kwargs: Equalility expresion such as player_id=3
+
+        Returns:
+            list[Row]: outcome and throws, most common first
+        """
+        sides = []
+        for table in (self.model.__table__, self.archive):
+            sql = select(table.c.outcome)
+            for key, value in kwargs.items():
+                if key in table.c:
+                    sql = sql.where(table.c[key] == value)
+            sides.append(sql)
+        throws = union_all(*sides).subquery()
+
+        sql = (
+            select(throws.c.outcome, func.count().label("throws"))
+            .group_by(throws.c.outcome)
+            .order_by(func.count().desc(), throws.c.outcome)
+        )
+        return list(self.db_session.execute(sql))
+
 
 def get_throw_event_repo(
     session=Depends(get_db_session),
 ) -> ThrowEventRepository:
     """Throw event repository dependency"""
     return ThrowEventRepository(session)
+
+
+def get_throw_event_read_repo(
+    session=Depends(get_read_db_session),
+) -> ThrowEventRepository:
+    """Throw event repository dependency for reads, may be served by a replica"""
+    return ThrowEventRepository(session)
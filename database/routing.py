@@ -0,0 +1,235 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Generator
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Treat the replica as down if it hasn't answered for this many check intervals
+_STALE_INTERVALS = 3
+
+
+def parse_lsn(lsn: str) -> int:
+    """Converts a Postgres LSN such as '16/B374D848' to a comparable integer"""
+    high, low = lsn.split("/")
+    return (int(high, 16) << 32) | int(low, 16)
+
+
+def format_lsn(lsn: int) -> str:
+    """Converts an integer LSN back to Postgres' 'X/Y' form"""
+    return f"{lsn >> 32:X}/{lsn & 0xFFFFFFFF:X}"
+
+
+@dataclass
+class ReadConsistency:
+    """Read-your-writes state of one request
+
+    min_lsn is the newest write the client has seen, sent back on its next
+    requests. last_write_lsn is the primary's WAL position after this request's
+    own commits.
+    """
+
+    min_lsn: int | None = None
+    last_write_lsn: int | None = None
+
+    def required_lsn(self) -> int | None:
+        lsns = [lsn for lsn in (self.min_lsn, self.last_write_lsn) if lsn is not None]
+        return max(lsns) if lsns else None
+
+
+current_read_consistency: ContextVar[ReadConsistency | None] = ContextVar(
+    "current_read_consistency", default=None
+)
+
+
+@contextmanager
+def read_consistency(
+    min_lsn: int | None = None,
+) -> Generator[ReadConsistency, None, None]:
+    """Tracks the writes made and the minimum replica position needed inside a block
+
+    Args:
+        min_lsn (int | None, optional): Newest write the client has already seen. Defaults to None.
+
+    Yields:
+        ReadConsistency: Updated by every RoutingSession commit inside the block
+    """
+    consistency = ReadConsistency(min_lsn=min_lsn)
+    token = current_read_consistency.set(consistency)
+    try:
+        yield consistency
+    finally:
+        current_read_consistency.reset(token)
+
+
+class ReplicaMonitor:
+    """Polls a streaming replica's replay position and lag on a background thread
+
+    Polling off the request path keeps the check out of per request query counts
+    and budgets.
+
+    Args:
+        engine (Engine): Engine connected to the replica
+        max_lag_s (float): Most replay lag before reads fall back to the primary
+        interval_s (float, optional): Seconds between checks. Defaults to 1.0.
+    """
+
+    def __init__(self, engine: Engine, max_lag_s: float, interval_s: float = 1.0):
+        self.engine = engine
+        self.max_lag_s = max_lag_s
+        self.interval_s = interval_s
+        self.replay_lsn: int | None = None
+        self.lag_s: float | None = None
+        self.checked_at: float | None = None
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def check(self) -> None:
+        """Reads the replica's replay LSN and lag once"""
+        try:
+            with self.engine.connect() as conn:
+                # An idle primary makes the last replay timestamp age, so a fully
+                # replayed replica counts as zero lag
+                replay_lsn, lag_s = conn.execute(
+                    text(
+                        "SELECT pg_last_wal_replay_lsn()::text, "
+                        "CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+                        "THEN 0 ELSE EXTRACT(EPOCH FROM now() - "
+                        "pg_last_xact_replay_timestamp()) END"
+                    )
+                ).one()
+        except Exception:
+            logger.warning("Replica check failed", exc_info=True)
+            with self._lock:
+                self.checked_at = None
+            return
+
+        with self._lock:
+            self.replay_lsn = parse_lsn(replay_lsn) if replay_lsn else None
+            self.lag_s = float(lag_s) if lag_s is not None else None
+            self.checked_at = time.monotonic()
+
+    def can_serve(self, min_lsn: int | None = None) -> bool:
+        """Whether the replica is fresh enough to serve a read
+
+        Args:
+            min_lsn (int | None, optional): Write the read must observe. Defaults to None.
+
+        Returns:
+            bool: False when the replica is down, lagging or behind min_lsn
+        """
+        self.start()
+        with self._lock:
+            if self.checked_at is None or self.lag_s is None:
+                return False
+            if time.monotonic() - self.checked_at > self.interval_s * _STALE_INTERVALS:
+                return False
+            if self.lag_s > self.max_lag_s:
+                return False
+            if min_lsn is not None and (
+                self.replay_lsn is None or self.replay_lsn < min_lsn
+            ):
+                return False
+            return True
+
+    def start(self) -> None:
+        """Starts the polling thread, does nothing if it's already running"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="replica-monitor", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self.check()
+            self._stopped.wait(self.interval_s)
+
+
+class RoutingSession(Session):
+    """Session that sends reads to a replica and everything else to the primary
+
+    Only sessions created with info={"read_only": True} use the replica, and only
+    while the ReplicaMonitor says it has replayed the current ReadConsistency.
+    The choice is made once per session so a request never mixes replica and
+    primary snapshots. A session that flushes reads from the primary until it
+    commits, then chooses again with its own write as the minimum LSN.
+
+    Args:
+        replica (Engine | None, optional): Read engine, None routes everything to the primary. Defaults to None.
+        monitor (ReplicaMonitor | None, optional): Lag monitor for the replica. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        *args,
+        replica: Engine | None = None,
+        monitor: ReplicaMonitor | None = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+        self.monitor = monitor
+        self._read_bind: Engine | None = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        primary = super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if (
+            self.replica is None
+            or self._flushing
+            or self.info.get("wrote")
+            or not self.info.get("read_only")
+        ):
+            return primary
+
+        if self._read_bind is None:
+            consistency = current_read_consistency.get()
+            min_lsn = consistency.required_lsn() if consistency else None
+            if self.monitor is None or self.monitor.can_serve(min_lsn):
+                self._read_bind = self.replica
+            else:
+                self._read_bind = primary
+        return self._read_bind
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_written(session: Session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _record_write_lsn(session: Session) -> None:
+    if not session.info.pop("wrote", False) or session.replica is None:
+        return
+    # Choose again on the next read, against the LSN of this write
+    session._read_bind = None
+    consistency = current_read_consistency.get()
+    if consistency is None:
+        return
+
+    # The session's own connection is gone after commit, so ask the primary
+    # directly. Its WAL position now is at or past this commit.
+    with session.bind.connect() as conn:
+        lsn = parse_lsn(
+            conn.execute(text("SELECT pg_current_wal_lsn()::text")).scalar()
+        )
+    consistency.last_write_lsn = max(consistency.last_write_lsn or 0, lsn)
@@ -0,0 +1,334 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import event, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from database.models import (
+    CatchEvent,
+    EliminationEvent,
+    Match,
+    PlayerTeamHistory,
+    Set,
+    ThrowEvent,
+)
+from database.models.match import MatchStatus
+from database.models.set_team_counters import STARTING_PLAYERS
+
+logger = logging.getLogger(__name__)
+
+
+class ScoreboardUnavailable(Exception):
+    """The set doesn't exist or isn't part of a live match"""
+
+
+@dataclass
+class Elimination:
+    player_id: int
+    team_id: int
+    cause: str
+    at: datetime
+
+
+@dataclass
+class TeamScore:
+    team_id: int
+    roster: set[int]
+    starting_players: int
+    throws: int = 0
+    catches: int = 0
+    eliminated: list[int] = field(default_factory=list)
+
+    @property
+    def players_remaining(self) -> int:
+        return max(self.starting_players - len(self.eliminated), 0)
+
+    @property
+    def players_alive(self) -> list[int]:
+        return sorted(self.roster.difference(self.eliminated))
+
+
+@dataclass
+class SetScoreboard:
+    """Live state of one set, updated event by event"""
+
+    set_id: int
+    match_id: int
+    start_time: datetime
+    teams: dict[int, TeamScore]
+    end_time: datetime | None = None
+    winning_team_id: int | None = None
+    eliminations: list[Elimination] = field(default_factory=list)
+    loaded_at: float = field(default_factory=time.monotonic)
+    _player_teams: dict[int, int] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        for team in self.teams.values():
+            for player_id in team.roster:
+                self._player_teams[player_id] = team.team_id
+
+    @property
+    def finished(self) -> bool:
+        return self.winning_team_id is not None
+
+    def duration_s(self, now: datetime | None = None) -> float:
+        end = self.end_time or now or datetime.now()
+        return max((end - self.start_time).total_seconds(), 0.0)
+
+    def apply_throw(self, player_id: int) -> None:
+        team_id = self._player_teams.get(player_id)
+        if team_id is not None:
+            self.teams[team_id].throws += 1
+
+    def apply_catch(self, player_id: int) -> None:
+        team_id = self._player_teams.get(player_id)
+        if team_id is not None:
+            self.teams[team_id].catches += 1
+
+    def apply_elimination(self, player_id: int, cause: str, at: datetime) -> bool:
+        """Records an elimination
+
+        Returns:
+            bool: True if it eliminated the last player of a side and decided the set
+        """
+        team_id = self._player_teams.get(player_id)
+        if team_id is None or player_id in self.teams[team_id].eliminated:
+            return False
+
+        self.teams[team_id].eliminated.append(player_id)
+        self.eliminations.append(Elimination(player_id, team_id, cause, at))
+
+        if self.finished or self.teams[team_id].players_remaining > 0:
+            return False
+        self.winning_team_id = next(t for t in self.teams if t != team_id)
+        self.end_time = at
+        return True
+
+
+def _roster(session: Session, team_id: int, at: datetime) -> set[int]:
+    rows = session.scalars(
+        select(PlayerTeamHistory.player_id).where(
+            PlayerTeamHistory.team_id == team_id, PlayerTeamHistory.active_at(at)
+        )
+    )
+    return set(rows)
+
+
+def start_scoreboard(session: Session, set_obj: Set, match: Match) -> SetScoreboard:
+    """Builds a set's scoreboard as it stood at the start, before any event
+
+    Args:
+        session (Session): sqlalchemy Session
+        set_obj (Set): The set
+        match (Match): The set's match
+
+    Returns:
+        SetScoreboard: Both full rosters, nothing recorded yet
+    """
+    teams = {}
+    for team_id in (match.team1_id, match.team2_id):
+        roster = _roster(session, team_id, set_obj.start_time)
+        teams[team_id] = TeamScore(
+            team_id, roster, starting_players=min(len(roster), STARTING_PLAYERS)
+        )
+    return SetScoreboard(
+        set_id=set_obj.id,
+        match_id=match.id,
+        start_time=set_obj.start_time,
+        teams=teams,
+    )
+
+
+def load_scoreboard(session: Session, set_id: int) -> SetScoreboard:
+    """Builds a set's scoreboard from its roster and events in the database
+
+    Args:
+        session (Session): sqlalchemy Session
+        set_id (int): The set's ID
+
+    Raises:
+        ScoreboardUnavailable: The set doesn't exist or its match isn't live
+
+    Returns:
+        SetScoreboard: The set's current state
+    """
+    row = session.execute(
+        select(Set, Match).join(Match, Match.id == Set.match_id).where(Set.id == set_id)
+    ).one_or_none()
+    if row is None:
+        raise ScoreboardUnavailable(f"Set with ID {set_id} not found")
+    set_obj, match = row
+    if match.status != MatchStatus.LIVE:
+        raise ScoreboardUnavailable(f"Match with ID {match.id} is not live")
+
+    board = start_scoreboard(session, set_obj, match)
+    for player_id in session.scalars(
+        select(ThrowEvent.player_id).where(ThrowEvent.set_id == set_id)
+    ):
+        board.apply_throw(player_id)
+    for player_id in session.scalars(
+        select(CatchEvent.player_id).where(CatchEvent.set_id == set_id)
+    ):
+        board.apply_catch(player_id)
+    for player_id, cause, created_at in session.execute(
+        select(
+            EliminationEvent.eliminated_player_id,
+            EliminationEvent.cause,
+            EliminationEvent.created_at,
+        )
+        .where(EliminationEvent.set_id == set_id)
+        .order_by(EliminationEvent.id)
+    ):
+        board.apply_elimination(player_id, cause.value, created_at)
+
+    # A result already settled in the database wins over the replayed one
+    if set_obj.winning_team_id is not None:
+        board.winning_team_id = set_obj.winning_team_id
+        board.end_time = set_obj.end_time or board.end_time
+    return board
+
+
+class ScoreboardEngine:
+    """Process local scoreboards for the sets of live matches
+
+    A set is loaded from the database on first read, then kept current by the
+    events this process commits. Events committed by other processes are picked
+    up when the board is reloaded every resync_s seconds.
+
+    Args:
+        resync_s (float, optional): Seconds before a board is reloaded from the database. Defaults to 5.0.
+    """
+
+    def __init__(self, resync_s: float = 5.0) -> None:
+        self.resync_s = resync_s
+        self._boards: dict[int, SetScoreboard] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session: Session, set_id: int) -> SetScoreboard:
+        """Gets a set's scoreboard from memory, loading it if needed
+
+        Args:
+            session (Session): sqlalchemy Session, only used when loading
+            set_id (int): The set's ID
+
+        Raises:
+            ScoreboardUnavailable: The set doesn't exist or its match isn't live
+
+        Returns:
+            SetScoreboard: The set's current state
+        """
+        with self._lock:
+            board = self._boards.get(set_id)
+        if board is not None and time.monotonic() - board.loaded_at < self.resync_s:
+            return board
+
+        board = load_scoreboard(session, set_id)
+        with self._lock:
+            self._boards[set_id] = board
+        return board
+
+    def forget(self, set_id: int | None = None, match_id: int | None = None) -> None:
+        """Drops boards so the next read reloads them"""
+        with self._lock:
+            for board in list(self._boards.values()):
+                if board.set_id == set_id or board.match_id == match_id:
+                    del self._boards[board.set_id]
+
+    def apply(self, changes: list[tuple], bind: Engine | None = None) -> None:
+        """Applies committed event changes to the boards in memory
+
+        Args:
+            changes (list[tuple]): (operation, kind, set_id, player_id, cause, at) from the session listener
+            bind (Engine | None, optional): Where settled set results are written. Defaults to None.
+        """
+        settled = []
+        with self._lock:
+            for operation, kind, set_id, player_id, cause, at in changes:
+                board = self._boards.get(set_id)
+                if board is None:
+                    continue
+                if operation != "insert":
+                    # Updates and deletes can rewrite history, replay from the DB
+                    del self._boards[set_id]
+                elif kind == "throw":
+                    board.apply_throw(player_id)
+                elif kind == "catch":
+                    board.apply_catch(player_id)
+                elif board.apply_elimination(player_id, cause, at):
+                    settled.append(board)
+
+        for board in settled:
+            if bind is not None:
+                self._settle(bind, board)
+
+    def _settle(self, bind: Engine, board: SetScoreboard) -> None:
+        try:
+            with bind.begin() as conn:
+                conn.execute(
+                    update(Set)
+                    .where(Set.id == board.set_id, Set.winning_team_id.is_(None))
+                    .values(
+                        winning_team_id=board.winning_team_id, end_time=board.end_time
+                    )
+                )
+        except Exception:
+            logger.exception("Failed to settle set %s", board.set_id)
+
+
+_EVENT_KINDS = {
+    ThrowEvent: "throw",
+    CatchEvent: "catch",
+    EliminationEvent: "elimination",
+}
+
+
+def _change(operation: str, obj) -> tuple:
+    kind = _EVENT_KINDS[type(obj)]
+    if kind == "elimination":
+        cause = obj.cause.value if hasattr(obj.cause, "value") else obj.cause
+        # The inserted created_at, as load_scoreboard reads it, loaded while flushing
+        at = obj.created_at if operation == "insert" else None
+        return (operation, kind, obj.set_id, obj.eliminated_player_id, cause, at)
+    return (operation, kind, obj.set_id, obj.player_id, None, None)
+
+
+def track_scoreboards(session_class: type[Session], engine: ScoreboardEngine) -> None:
+    """Feeds every event committed through a session class into a ScoreboardEngine
+
+    Args:
+        session_class (type[Session]): Session class to listen on
+        engine (ScoreboardEngine): The engine to update
+    """
+
+    @event.listens_for(session_class, "after_flush")
+    def _collect(session: Session, flush_context) -> None:
+        # Snapshot now, objects are expired once the commit finishes
+        changes = session.info.setdefault("scoreboard_changes", [])
+        for operation, objects in (
+            ("insert", session.new),
+            ("update", session.dirty),
+            ("delete", session.deleted),
+        ):
+            for obj in objects:
+                if type(obj) in _EVENT_KINDS:
+                    changes.append(_change(operation, obj))
+                elif isinstance(obj, Match) and operation != "insert":
+                    changes.append(("match", None, None, obj.id, None, None))
+
+    @event.listens_for(session_class, "after_commit")
+    def _apply(session: Session) -> None:
+        changes = session.info.pop("scoreboard_changes", None)
+        if not changes:
+            return
+        for operation, _, _, match_id, _, _ in changes:
+            if operation == "match":
+                engine.forget(match_id=match_id)
+        engine.apply([c for c in changes if c[0] != "match"], bind=session.bind)
+
+    @event.listens_for(session_class, "after_rollback")
+    def _discard(session: Session) -> None:
+        session.info.pop("scoreboard_changes", None)
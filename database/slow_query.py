@@ -0,0 +1,154 @@
+import json
+import logging
+import random
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy.engine import Connection, Engine
+
+from database.instrumentation import current_query_stats
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_BIND_PARAMETER = re.compile(r"%\(\w+\)s|%s|\$\d+|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalise_sql(statement: str) -> str:
+    """Reduces a statement to its shape so equal queries with different values match
+
+    Literals and bind parameters become '?', IN lists collapse to '(?, ...)' and
+    whitespace is squashed.
+
+    Args:
+        statement (str): SQL as sent to the driver
+
+    Returns:
+        str: The normalised statement
+    """
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _BIND_PARAMETER.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _IN_LIST.sub("(?, ...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """Describes bound parameters by type only so no values end up in logs
+
+    Args:
+        parameters (Any): DBAPI parameters, a mapping, a sequence or a batch of either
+
+    Returns:
+        Any: Type names in the same structure, batches become {"rows": n, "row": shape}
+    """
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return {"rows": len(parameters), "row": parameter_shape(parameters[0])}
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+@dataclass
+class SlowQuery:
+    """A statement that took longer than the slow query threshold"""
+
+    sql: str
+    parameters: Any
+    duration_ms: float
+    route: str | None
+    recorded_at: datetime
+    plan: Any = None
+
+
+class SlowQueryRecorder:
+    """Query observer that logs slow statements and keeps the latest in a ring buffer
+
+    A sample of slow SELECT statements is re-run with EXPLAIN (ANALYZE, BUFFERS) on
+    a background thread, the plan is attached to the buffered record once ready.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = 200.0,
+        explain_sample_rate: float = 0.0,
+        buffer_size: int = 100,
+    ) -> None:
+        self.threshold_s = threshold_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+        self._records: deque[SlowQuery] = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+        self._explain_pool: ThreadPoolExecutor | None = None
+
+    def __call__(
+        self, conn: Connection, statement: str, parameters: Any, duration_s: float
+    ) -> None:
+        if duration_s < self.threshold_s:
+            return
+        if statement.lstrip()[:7].upper() == "EXPLAIN":
+            return
+
+        stats = current_query_stats.get()
+        record = SlowQuery(
+            sql=normalise_sql(statement),
+            parameters=parameter_shape(parameters),
+            duration_ms=round(duration_s * 1000, 3),
+            route=stats.route if stats else None,
+            recorded_at=datetime.now(timezone.utc),
+        )
+        logger.warning(
+            "Slow query %.1fms route=%s sql=%s parameters=%s",
+            record.duration_ms,
+            record.route,
+            record.sql,
+            json.dumps(record.parameters),
+        )
+        with self._lock:
+            self._records.append(record)
+
+        is_select = statement.lstrip()[:6].upper() == "SELECT"
+        if is_select and random.random() < self.explain_sample_rate:
+            self._submit_explain(conn.engine, statement, parameters, record)
+
+    def _submit_explain(
+        self, engine: Engine, statement: str, parameters: Any, record: SlowQuery
+    ) -> None:
+        if self._explain_pool is None:
+            self._explain_pool = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="slow-query-explain"
+            )
+        self._explain_pool.submit(self._explain, engine, statement, parameters, record)
+
+    @staticmethod
+    def _explain(
+        engine: Engine, statement: str, parameters: Any, record: SlowQuery
+    ) -> None:
+        try:
+            with engine.connect() as conn:
+                result = conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters
+                )
+                record.plan = result.scalar()
+                # ANALYZE executes the statement, never keep its effects
+                conn.rollback()
+        except Exception:
+            logger.exception("Failed to capture plan for slow query %s", record.sql)
+
+    def records(self) -> list[dict]:
+        """Returns the buffered slow queries, newest first"""
+        with self._lock:
+            return [asdict(record) for record in reversed(self._records)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
@@ -0,0 +1,265 @@
+import threading
+import time
+from typing import Any, Iterable
+
+from sqlalchemy import delete, event, func, inspect, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from database.models import (
+    Competition,
+    CompetitionStanding,
+    Match,
+    Set,
+    TeamCompetition,
+)
+from database.models.match import MatchStatus
+
+POINTS_FOR_WIN = 3
+POINTS_FOR_DRAW = 1
+POINTS_FOR_LOSS = 0
+
+_standings = CompetitionStanding.__table__
+
+
+def _sets_won(team_column):
+    return func.count(Set.id).filter(Set.winning_team_id == team_column)
+
+
+def refresh_standings(
+    conn: Connection, competition_id: int, team_ids: Iterable[int] | None = None
+) -> None:
+    """Recomputes the standings rows of some teams in a competition
+
+    Only the teams whose results changed are recomputed, from their completed
+    matches in the competition. A match is won by the side that won more sets.
+
+    Args:
+        conn (Connection): sqlalchemy Connection
+        competition_id (int): The competition's ID
+        team_ids (Iterable[int] | None, optional): Teams to recompute. Defaults to None, every team.
+    """
+    team_ids = None if team_ids is None else list(team_ids)
+
+    matches = select(
+        Match.id,
+        Match.team1_id,
+        Match.team2_id,
+        _sets_won(Match.team1_id).label("team1_sets"),
+        _sets_won(Match.team2_id).label("team2_sets"),
+    ).outerjoin(Set, Set.match_id == Match.id)
+    matches = matches.where(
+        Match.competition_id == competition_id,
+        Match.status == MatchStatus.COMPLETED,
+    )
+    if team_ids is not None:
+        matches = matches.where(
+            Match.team1_id.in_(team_ids) | Match.team2_id.in_(team_ids)
+        )
+    matches = matches.group_by(Match.id).subquery()
+
+    sides = (
+        select(
+            matches.c.team1_id.label("team_id"),
+            matches.c.team1_sets.label("sets_for"),
+            matches.c.team2_sets.label("sets_against"),
+        )
+        .union_all(
+            select(matches.c.team2_id, matches.c.team2_sets, matches.c.team1_sets)
+        )
+        .subquery()
+    )
+
+    won = func.count().filter(sides.c.sets_for > sides.c.sets_against)
+    drawn = func.count().filter(sides.c.sets_for == sides.c.sets_against)
+    lost = func.count().filter(sides.c.sets_for < sides.c.sets_against)
+    table = (
+        select(
+            literal(competition_id).label("competition_id"),
+            TeamCompetition.team_id,
+            func.count(sides.c.team_id).label("played"),
+            won.label("won"),
+            drawn.label("drawn"),
+            lost.label("lost"),
+            func.coalesce(func.sum(sides.c.sets_for), 0).label("sets_for"),
+            func.coalesce(func.sum(sides.c.sets_against), 0).label("sets_against"),
+            (
+                won * POINTS_FOR_WIN + drawn * POINTS_FOR_DRAW + lost * POINTS_FOR_LOSS
+            ).label("points"),
+        )
+        .outerjoin(sides, sides.c.team_id == TeamCompetition.team_id)
+        .where(TeamCompetition.competition_id == competition_id)
+        .group_by(TeamCompetition.team_id)
+    )
+    if team_ids is not None:
+        table = table.where(TeamCompetition.team_id.in_(team_ids))
+
+    # Teams that left the competition lose their row
+    stale = delete(CompetitionStanding).where(
+        _standings.c.competition_id == competition_id,
+        _standings.c.team_id.not_in(
+            select(TeamCompetition.team_id).where(
+                TeamCompetition.competition_id == competition_id
+            )
+        ),
+    )
+    if team_ids is not None:
+        stale = stale.where(_standings.c.team_id.in_(team_ids))
+    conn.execute(stale)
+
+    columns = [column.name for column in table.selected_columns]
+    stmt = insert(CompetitionStanding).from_select(columns, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["competition_id", "team_id"],
+        set_={
+            **{name: stmt.excluded[name] for name in columns[2:]},
+            "updated_at": func.now(),
+        },
+    )
+    conn.execute(stmt)
+
+
+def _values(obj, *names: str) -> set:
+    """Current and pre-flush values of some attributes"""
+    values = set()
+    for name in names:
+        history = inspect(obj).attrs[name].history
+        values.update(history.deleted)
+        values.add(getattr(obj, name))
+    values.discard(None)
+    return values
+
+
+def _affected(session: Session) -> dict[int, set[int]]:
+    """Competitions and teams whose standings the flushed objects change"""
+    affected: dict[int, set[int]] = {}
+    match_ids = set()
+
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Match):
+            for competition_id in _values(obj, "competition_id"):
+                affected.setdefault(competition_id, set()).update(
+                    _values(obj, "team1_id", "team2_id")
+                )
+        elif isinstance(obj, Set):
+            match_ids.update(_values(obj, "match_id"))
+        elif isinstance(obj, Competition) and obj not in session.new:
+            # Nothing to recompute, but a cached table may no longer apply
+            affected.setdefault(obj.id, set())
+        elif isinstance(obj, TeamCompetition):
+            for competition_id in _values(obj, "competition_id"):
+                affected.setdefault(competition_id, set()).update(
+                    _values(obj, "team_id")
+                )
+
+    if match_ids:
+        rows = session.connection().execute(
+            select(Match.competition_id, Match.team1_id, Match.team2_id).where(
+                Match.id.in_(match_ids)
+            )
+        )
+        for competition_id, team1_id, team2_id in rows:
+            affected.setdefault(competition_id, set()).update((team1_id, team2_id))
+    return affected
+
+
+class StandingsCache:
+    """Serialised standings per competition, dropped when a result changes
+
+    Results committed by this process invalidate the entry straight away, the
+    TTL bounds how long results from other processes take to show.
+
+    Args:
+        ttl_s (float, optional): Seconds an entry is served for. Defaults to 30.0.
+    """
+
+    def __init__(self, ttl_s: float = 30.0) -> None:
+        self.ttl_s = ttl_s
+        self._entries: dict[int, tuple[float, Any]] = {}
+        # Bumped on invalidation, so a read that raced a result isn't cached
+        self._generations: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, competition_id: int) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(competition_id)
+        if entry is None or time.monotonic() - entry[0] > self.ttl_s:
+            return None
+        return entry[1]
+
+    def generation(self, competition_id: int) -> int:
+        """Current generation of a competition, to pass to put after reading it"""
+        with self._lock:
+            return self._generations.get(competition_id, 0)
+
+    def put(
+        self, competition_id: int, value: Any, generation: int | None = None
+    ) -> None:
+        """Caches a table, unless it was invalidated since generation was read"""
+        with self._lock:
+            if generation is not None and generation != self._generations.get(
+                competition_id, 0
+            ):
+                return
+            self._entries[competition_id] = (time.monotonic(), value)
+
+    def invalidate(self, competition_ids: Iterable[int] | None = None) -> None:
+        with self._lock:
+            if competition_ids is None:
+                competition_ids = list(self._entries)
+            for competition_id in competition_ids:
+                self._entries.pop(competition_id, None)
+                self._generations[competition_id] = (
+                    self._generations.get(competition_id, 0) + 1
+                )
+
+
+def maintain_standings(session_class: type[Session], cache: StandingsCache) -> None:
+    """Refreshes standings in the same transaction as every result change
+
+    Args:
+        session_class (type[Session]): Session class to listen on
+        cache (StandingsCache): Cache to invalidate once the change commits
+    """
+
+    @event.listens_for(session_class, "after_flush")
+    def _refresh(session: Session, flush_context) -> None:
+        affected = _affected(session)
+        for competition_id, team_ids in affected.items():
+            if team_ids:
+                refresh_standings(session.connection(), competition_id, team_ids)
+        session.info.setdefault("standings_changed", set()).update(affected)
+
+    @event.listens_for(session_class, "after_commit")
+    def _invalidate(session: Session) -> None:
+        changed = session.info.pop("standings_changed", None)
+        if changed:
+            cache.invalidate(changed)
+
+    @event.listens_for(session_class, "after_rollback")
+    def _discard(session: Session) -> None:
+        session.info.pop("standings_changed", None)
+
+
+def rebuild_standings(conn: Connection, competition_id: int | None = None) -> int:
+    """Recomputes whole standings tables, e.g after a bulk load
+
+    Args:
+        conn (Connection): sqlalchemy Connection
+        competition_id (int | None, optional): The competition to rebuild. Defaults to None, every competition.
+
+    Returns:
+        int: Number of competitions rebuilt
+    """
+    if competition_id is None:
+        competition_ids = conn.scalars(
+            select(TeamCompetition.competition_id).distinct()
+        ).all()
+        conn.execute(delete(CompetitionStanding))
+    else:
+        competition_ids = [competition_id]
+
+    for competition_id in competition_ids:
+        refresh_standings(conn, competition_id)
+    return len(competition_ids)
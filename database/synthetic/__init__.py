@@ -0,0 +1,9 @@
+from .league import LeagueSpec, generate_competition, generate_organisations
+from .loader import load_league
+
+__all__ = [
+    "LeagueSpec",
+    "generate_competition",
+    "generate_organisations",
+    "load_league",
+]
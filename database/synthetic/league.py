@@ -0,0 +1,462 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from random import Random
+from typing import Iterator
+
+from database.enums.country_codes import CountryCode
+from database.models.competition import AgeCategory, CompetitionFormat, CourtSize
+from database.models.elimination_event import EliminationCause
+from database.models.match import MatchStatus
+from database.models.throw_geometry import COURT_LENGTH, COURT_WIDTH
+
+# Column order used for every generated row, matches the COPY column lists
+TABLE_COLUMNS: dict[str, tuple[str, ...]] = {
+    "organisations": (
+        "id",
+        "name",
+        "country_code",
+        "region",
+        "website",
+        "logo_url",
+        "created_at",
+        "updated_at",
+    ),
+    "competitions": (
+        "id",
+        "name",
+        "competition_format",
+        "organisation_id",
+        "age_category",
+        "court_size",
+        "created_at",
+        "updated_at",
+    ),
+    "teams": ("id", "name", "logo_url", "created_at", "updated_at"),
+    "team_competitions": (
+        "id",
+        "team_id",
+        "competition_id",
+        "joined_date",
+        "created_at",
+        "updated_at",
+    ),
+    "players": (
+        "id",
+        "first_name",
+        "last_name",
+        "nationality",
+        "created_at",
+        "updated_at",
+    ),
+    "player_team_history": (
+        "id",
+        "player_id",
+        "team_id",
+        "joined_at",
+        "left_at",
+        "created_at",
+        "updated_at",
+    ),
+    "matches": (
+        "id",
+        "competition_id",
+        "team1_id",
+        "team2_id",
+        "match_date",
+        "status",
+        "created_at",
+        "updated_at",
+    ),
+    "sets": (
+        "id",
+        "match_id",
+        "set_number",
+        "start_time",
+        "end_time",
+        "winning_team_id",
+        "created_at",
+        "updated_at",
+    ),
+    "throw_events": (
+        "id",
+        "set_id",
+        "player_id",
+        "timestamp",
+        "target_player_id",
+        "location_x",
+        "location_y",
+        "target_location_x",
+        "target_location_y",
+        "valid_attempt",
+        "target_had_ball",
+        "was_blocked",
+        "created_at",
+        "updated_at",
+    ),
+    "catch_events": (
+        "id",
+        "set_id",
+        "timestamp",
+        "player_id",
+        "location_x",
+        "location_y",
+        "throw_event_id",
+        "rebound_catch",
+        "created_at",
+        "updated_at",
+    ),
+    "eliminations": (
+        "id",
+        "set_id",
+        "eliminated_player_id",
+        "cause",
+        "throw_event_id",
+        "catch_event_id",
+        "elimination_location_x",
+        "elimination_location_y",
+        "created_at",
+        "updated_at",
+    ),
+}
+
+# Parents before children so a flush never violates a foreign key
+TABLE_ORDER = tuple(TABLE_COLUMNS)
+
+FIRST_NAMES = ("Alex", "Sam", "Jordan", "Charlie", "Robin", "Jamie", "Casey", "Riley")
+LAST_NAMES = (
+    "Smith",
+    "Jones",
+    "Taylor",
+    "Brown",
+    "Wilson",
+    "Evans",
+    "Thomas",
+    "Roberts",
+)
+
+
+@dataclass(frozen=True)
+class LeagueSpec:
+    """Shape of a synthetic dataset, every count is per parent row"""
+
+    organisations: int = 2
+    competitions_per_organisation: int = 2
+    teams_per_competition: int = 8
+    players_per_team: int = 10
+    players_on_court: int = 6
+    sets_per_match: int = 3
+    max_throws_per_set: int = 400
+    seed: int = 0
+    start_date: datetime = field(default_factory=lambda: datetime(2024, 1, 6, 10, 0))
+
+    @property
+    def competitions(self) -> int:
+        return self.organisations * self.competitions_per_organisation
+
+    @property
+    def matches_per_competition(self) -> int:
+        # Double round robin
+        return self.teams_per_competition * (self.teams_per_competition - 1)
+
+    @property
+    def total_sets(self) -> int:
+        return self.competitions * self.matches_per_competition * self.sets_per_match
+
+
+class IdSequence:
+    """Hands out primary keys that never collide between competitions.
+
+    Competition c of C uses c + 1, c + 1 + C, c + 1 + 2C, ... so that workers can
+    generate events independently without coordinating on sequence values.
+    """
+
+    def __init__(self, start: int, step: int) -> None:
+        self._next = start
+        self._step = step
+
+    def __call__(self) -> int:
+        value = self._next
+        self._next += self._step
+        return value
+
+
+@dataclass
+class _SetIds:
+    throw: IdSequence
+    catch: IdSequence
+    elimination: IdSequence
+
+
+def generate_organisations(spec: LeagueSpec) -> Iterator[tuple[str, tuple]]:
+    """Generates the organisation rows shared by every competition
+
+    Args:
+        spec (LeagueSpec): Shape of the dataset
+
+    Yields:
+        tuple[str, tuple]: The table name and a row in TABLE_COLUMNS order
+    """
+    now = spec.start_date
+    countries = list(CountryCode)
+    for org_index in range(spec.organisations):
+        yield "organisations", (
+            org_index + 1,
+            f"Synthetic Organisation {org_index + 1}",
+            countries[org_index % len(countries)],
+            None,
+            None,
+            None,
+            now,
+            now,
+        )
+
+
+def generate_competition(
+    spec: LeagueSpec, competition_index: int
+) -> Iterator[tuple[str, tuple]]:
+    """Generates every row belonging to one competition
+
+    Rows are yielded parents first: the competition, its teams and rosters, then
+    each match followed by its sets and their events.
+
+    Args:
+        spec (LeagueSpec): Shape of the dataset
+        competition_index (int): Zero based index of the competition, decides ids and seed
+
+    Yields:
+        tuple[str, tuple]: The table name and a row in TABLE_COLUMNS order
+    """
+    rng = Random(spec.seed * 1_000_003 + competition_index)
+    now = spec.start_date
+    competition_id = competition_index + 1
+    teams_per_comp = spec.teams_per_competition
+    players_per_team = spec.players_per_team
+
+    yield "competitions", (
+        competition_id,
+        f"Synthetic League {competition_id}",
+        CompetitionFormat.LEAGUE,
+        competition_index // spec.competitions_per_organisation + 1,
+        rng.choice(list(AgeCategory)),
+        rng.choice(list(CourtSize)),
+        now,
+        now,
+    )
+
+    # Reference data has fixed counts so it uses contiguous id blocks
+    team_ids = [
+        competition_index * teams_per_comp + t + 1 for t in range(teams_per_comp)
+    ]
+    rosters: dict[int, list[int]] = {}
+    season_start = spec.start_date - timedelta(days=30)
+    for t, team_id in enumerate(team_ids):
+        yield "teams", (team_id, f"Synthetic Team {team_id}", None, now, now)
+        yield "team_competitions", (
+            team_id,
+            team_id,
+            competition_id,
+            season_start,
+            now,
+            now,
+        )
+
+        first_player = team_id * players_per_team - players_per_team + 1
+        rosters[team_id] = list(range(first_player, first_player + players_per_team))
+        for player_id in rosters[team_id]:
+            yield "players", (
+                player_id,
+                rng.choice(FIRST_NAMES),
+                rng.choice(LAST_NAMES),
+                CountryCode.GB,
+                now,
+                now,
+            )
+            yield "player_team_history", (
+                player_id,
+                player_id,
+                team_id,
+                season_start,
+                None,
+                now,
+                now,
+            )
+
+    total = spec.competitions
+    set_ids = _SetIds(
+        throw=IdSequence(competition_index + 1, total),
+        catch=IdSequence(competition_index + 1, total),
+        elimination=IdSequence(competition_index + 1, total),
+    )
+    matches_per_comp = spec.matches_per_competition
+    fixtures = [(a, b) for a in team_ids for b in team_ids if a != b]
+    rng.shuffle(fixtures)
+    matches_per_round = max(teams_per_comp // 2, 1)
+
+    for m, (team1_id, team2_id) in enumerate(fixtures):
+        match_id = competition_index * matches_per_comp + m + 1
+        match_date = spec.start_date + timedelta(days=7 * (m // matches_per_round))
+        yield "matches", (
+            match_id,
+            competition_id,
+            team1_id,
+            team2_id,
+            match_date,
+            MatchStatus.COMPLETED,
+            now,
+            now,
+        )
+
+        set_start = match_date
+        for set_number in range(1, spec.sets_per_match + 1):
+            set_id = (match_id - 1) * spec.sets_per_match + set_number
+            events, set_end, winner = _play_set(
+                rng,
+                spec,
+                set_id,
+                set_start,
+                (team1_id, rng.sample(rosters[team1_id], spec.players_on_court)),
+                (team2_id, rng.sample(rosters[team2_id], spec.players_on_court)),
+                set_ids,
+            )
+            yield "sets", (
+                set_id,
+                match_id,
+                set_number,
+                set_start,
+                set_end,
+                winner,
+                now,
+                now,
+            )
+            yield from events
+            set_start = set_end + timedelta(minutes=2)
+
+
+def _play_set(
+    rng: Random,
+    spec: LeagueSpec,
+    set_id: int,
+    start: datetime,
+    side_a: tuple[int, list[int]],
+    side_b: tuple[int, list[int]],
+    ids: _SetIds,
+) -> tuple[list[tuple[str, tuple]], datetime, int]:
+    """Simulates a set until one side has no players left
+
+    Returns:
+        tuple: The event rows, the set end time and the winning team id
+    """
+    alive = {side_a[0]: list(side_a[1]), side_b[0]: list(side_b[1])}
+    team_a, team_b = side_a[0], side_b[0]
+    events: list[tuple[str, tuple]] = []
+    clock = start
+    now = spec.start_date
+
+    def court_position(team_id: int) -> tuple[float, float]:
+        x = rng.uniform(0.5, COURT_LENGTH / 2 - 0.5)
+        if team_id == team_b:
+            x = COURT_LENGTH - x
+        return round(x, 2), round(rng.uniform(0.0, COURT_WIDTH), 2)
+
+    def eliminate(team_id, player_id, cause, throw_id=None, catch_id=None):
+        alive[team_id].remove(player_id)
+        x, y = court_position(team_id)
+        events.append(
+            (
+                "eliminations",
+                (
+                    ids.elimination(),
+                    set_id,
+                    player_id,
+                    cause,
+                    throw_id,
+                    catch_id,
+                    x,
+                    y,
+                    # Eliminations without a throw or catch are timed by created_at
+                    clock,
+                    clock,
+                ),
+            )
+        )
+
+    throws = 0
+    while alive[team_a] and alive[team_b] and throws < spec.max_throws_per_set:
+        clock += timedelta(seconds=rng.uniform(1.0, 6.0))
+        attacking = team_a if rng.random() < 0.5 else team_b
+        defending = team_b if attacking == team_a else team_a
+
+        if rng.random() < 0.02:
+            eliminate(
+                attacking, rng.choice(alive[attacking]), EliminationCause.LINE_FAULT
+            )
+            continue
+
+        throws += 1
+        thrower = rng.choice(alive[attacking])
+        target = rng.choice(alive[defending])
+        throw_id = ids.throw()
+        origin = court_position(attacking)
+        aim = court_position(defending)
+        valid = rng.random() >= 0.03
+        roll = rng.random()
+        blocked = valid and 0.45 <= roll < 0.60
+        events.append(
+            (
+                "throw_events",
+                (
+                    throw_id,
+                    set_id,
+                    thrower,
+                    clock,
+                    target,
+                    *origin,
+                    *aim,
+                    valid,
+                    rng.random() < 0.3,
+                    blocked,
+                    now,
+                    now,
+                ),
+            )
+        )
+
+        if not valid:
+            eliminate(attacking, thrower, EliminationCause.INVALID_ATTEMPT, throw_id)
+        elif 0.60 <= roll < 0.82:
+            cause = (
+                EliminationCause.DEFLECTION_HIT
+                if roll >= 0.80
+                else EliminationCause.DIRECT_HIT
+            )
+            eliminate(defending, target, cause, throw_id)
+        elif roll >= 0.82:
+            rebound = rng.random() < 0.15
+            catcher = rng.choice(alive[defending]) if rebound else target
+            catch_id = ids.catch()
+            catch_time = clock + timedelta(milliseconds=rng.randint(200, 900))
+            events.append(
+                (
+                    "catch_events",
+                    (
+                        catch_id,
+                        set_id,
+                        catch_time,
+                        catcher,
+                        *aim,
+                        throw_id,
+                        rebound,
+                        now,
+                        now,
+                    ),
+                )
+            )
+            eliminate(
+                attacking, thrower, EliminationCause.THROW_CAUGHT, throw_id, catch_id
+            )
+
+    if not alive[team_b] or len(alive[team_a]) >= len(alive[team_b]):
+        winner = team_a
+    else:
+        winner = team_b
+    return events, clock + timedelta(seconds=1), winner
@@ -0,0 +1,162 @@
+import csv
+import io
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from typing import Iterable
+
+from sqlalchemy import create_engine, make_url, text
+
+from .league import (
+    TABLE_COLUMNS,
+    TABLE_ORDER,
+    LeagueSpec,
+    generate_competition,
+    generate_organisations,
+)
+
+# Rows buffered per table before every buffer is flushed with COPY
+DEFAULT_BATCH_ROWS = 50_000
+
+
+def _format_value(value):
+    """Converts a python value into the CSV text COPY expects"""
+    if isinstance(value, Enum):
+        # SQLEnum columns persist the member name, not the value
+        return value.name
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+class CopyWriter:
+    """Buffers generated rows per table and streams them into Postgres with COPY"""
+
+    def __init__(self, dbapi_connection, batch_rows: int = DEFAULT_BATCH_ROWS) -> None:
+        self.connection = dbapi_connection
+        self.batch_rows = batch_rows
+        self.counts: dict[str, int] = {table: 0 for table in TABLE_ORDER}
+        self._buffers: dict[str, io.StringIO] = {}
+        self._writers = {}
+        self._pending = 0
+        self._reset_buffers()
+
+    def _reset_buffers(self) -> None:
+        for table in TABLE_ORDER:
+            self._buffers[table] = io.StringIO()
+            self._writers[table] = csv.writer(self._buffers[table])
+        self._pending = 0
+
+    def write(self, rows: Iterable[tuple[str, tuple]]) -> None:
+        """Adds rows to the buffers, flushing whenever the batch size is reached
+
+        Args:
+            rows (Iterable[tuple[str, tuple]]): Table name and row pairs from the generator
+        """
+        for table, row in rows:
+            self._writers[table].writerow([_format_value(value) for value in row])
+            self.counts[table] += 1
+            self._pending += 1
+            if self._pending >= self.batch_rows:
+                self.flush()
+
+    def flush(self) -> None:
+        """COPYs every buffered table in foreign key order"""
+        with self.connection.cursor() as cursor:
+            for table in TABLE_ORDER:
+                buffer = self._buffers[table]
+                if not buffer.tell():
+                    continue
+                buffer.seek(0)
+                columns = ", ".join(TABLE_COLUMNS[table])
+                cursor.copy_expert(
+                    f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer
+                )
+        self._reset_buffers()
+
+
+def _copy_engine(database_url: str):
+    # CopyWriter relies on psycopg2's cursor.copy_expert
+    url = make_url(database_url).set(drivername="postgresql+psycopg2")
+    return create_engine(url)
+
+
+def _load_rows(database_url: str, rows: Iterable[tuple[str, tuple]], batch_rows: int):
+    engine = _copy_engine(database_url)
+    connection = engine.raw_connection()
+    try:
+        writer = CopyWriter(connection, batch_rows)
+        writer.write(rows)
+        writer.flush()
+        connection.commit()
+        return writer.counts
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+        engine.dispose()
+
+
+def _load_competition(args: tuple[str, LeagueSpec, int, int]) -> dict[str, int]:
+    database_url, spec, competition_index, batch_rows = args
+    return _load_rows(
+        database_url, generate_competition(spec, competition_index), batch_rows
+    )
+
+
+def _reset_sequences(database_url: str) -> None:
+    """Moves every serial sequence past the explicit ids that were loaded"""
+    engine = create_engine(database_url)
+    try:
+        with engine.begin() as connection:
+            for table in TABLE_ORDER:
+                connection.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                        f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+                    )
+                )
+    finally:
+        engine.dispose()
+
+
+def load_league(
+    database_url: str,
+    spec: LeagueSpec,
+    workers: int = 1,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+) -> dict[str, int]:
+    """Generates a synthetic league and bulk loads it into an empty schema
+
+    Organisations are loaded first, then each competition is generated and COPYed
+    by its own worker process over its own connection.
+
+    Args:
+        database_url (str): SQLAlchemy URL of the target database
+        spec (LeagueSpec): Shape of the dataset
+        workers (int, optional): Number of worker processes. Defaults to 1.
+        batch_rows (int, optional): Rows buffered per COPY flush. Defaults to DEFAULT_BATCH_ROWS.
+
+    Returns:
+        dict[str, int]: Number of rows loaded per table
+    """
+    totals = _load_rows(database_url, generate_organisations(spec), batch_rows)
+
+    jobs = [
+        (database_url, spec, competition_index, batch_rows)
+        for competition_index in range(spec.competitions)
+    ]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_load_competition, jobs))
+    else:
+        results = [_load_competition(job) for job in jobs]
+
+    for counts in results:
+        for table, count in counts.items():
+            totals[table] += count
+
+    _reset_sequences(database_url)
+    return totals
@@ -0,0 +1,339 @@
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+import numpy as np
+from sqlalchemy import (
+    Float,
+    Integer,
+    Row,
+    column,
+    event,
+    insert,
+    inspect,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy import values as values_clause
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from database.models import ARCHIVE_TABLES, ThrowEvent, ThrowGeometry, XHitModel
+from database.models.throw_event import ThrowOutcome
+from database.models.throw_geometry import COURT_LENGTH, CourtSide
+
+FEATURES = (
+    "distance",
+    "abs_angle",
+    "depth",
+    "left_side",
+    "centre_side",
+    "target_had_ball",
+    "was_blocked",
+)
+
+# Throw attributes a score depends on, changing one clears the score
+SCORED_ATTRIBUTES = (
+    "location_x",
+    "location_y",
+    "target_location_x",
+    "target_location_y",
+    "target_had_ball",
+    "was_blocked",
+    "valid_attempt",
+)
+
+MIN_TRAINING_THROWS = 100
+
+
+class XHitError(Exception):
+    """There's no model to score with, or not enough throws to fit one"""
+
+
+@dataclass(frozen=True)
+class XHitParameters:
+    """A logistic regression over standardised FEATURES"""
+
+    means: np.ndarray
+    scales: np.ndarray
+    # Intercept first, then one per feature
+    coefficients: np.ndarray
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """Hit probability of every row of a (throws, FEATURES) array"""
+        return _sigmoid(self._design(features) @ self.coefficients)
+
+    def _design(self, features: np.ndarray) -> np.ndarray:
+        standardised = (features - self.means) / self.scales
+        return np.column_stack([np.ones(len(features)), standardised])
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "features": list(FEATURES),
+            "means": self.means.tolist(),
+            "scales": self.scales.tolist(),
+            "coefficients": self.coefficients.tolist(),
+        }
+
+    @classmethod
+    def from_json(cls, parameters: dict[str, Any]) -> "XHitParameters":
+        if tuple(parameters["features"]) != FEATURES:
+            raise XHitError("The model was fitted on different features")
+        return cls(
+            means=np.array(parameters["means"]),
+            scales=np.array(parameters["scales"]),
+            coefficients=np.array(parameters["coefficients"]),
+        )
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30, 30)))
+
+
+def features(rows: list) -> np.ndarray:
+    """(throws, FEATURES) array of some throws
+
+    Args:
+        rows (list): (location_x, distance, angle, court_side, target_had_ball, was_blocked) per throw
+
+    Returns:
+        np.ndarray: One float row per throw
+    """
+    if not rows:
+        return np.empty((0, len(FEATURES)))
+    location_x, distance, angle, side, target_had_ball, was_blocked = zip(*rows)
+    return np.column_stack(
+        [
+            np.array(distance, float),
+            np.abs(np.array(angle, float)),
+            # How far back from the halfway line the throw came from
+            np.abs(np.array(location_x, float) - COURT_LENGTH / 2),
+            np.array([value == CourtSide.LEFT for value in side], float),
+            np.array([value == CourtSide.CENTRE for value in side], float),
+            np.array(target_had_ball, float),
+            np.array(was_blocked, float),
+        ]
+    )
+
+
+def _feature_columns(throws):
+    return (
+        throws.c.location_x,
+        ThrowGeometry.distance,
+        ThrowGeometry.angle,
+        ThrowGeometry.court_side,
+        throws.c.target_had_ball,
+        throws.c.was_blocked,
+    )
+
+
+def _with_geometry(sql, throws):
+    """Restricts to valid throws with derived geometry, which can be scored"""
+    return sql.join(
+        ThrowGeometry,
+        (ThrowGeometry.set_id == throws.c.set_id)
+        & (ThrowGeometry.throw_event_id == throws.c.id),
+    ).where(
+        throws.c.valid_attempt,
+        throws.c.location_x.is_not(None),
+        ThrowGeometry.distance.is_not(None),
+    )
+
+
+def _training_batches(conn: Connection, batch_size: int) -> Iterator[tuple]:
+    """Streams (features, hit) batches of every resolved hot and archived throw"""
+    for throws in (ThrowEvent.__table__, ARCHIVE_TABLES[ThrowEvent]):
+        sql = _with_geometry(
+            select(*_feature_columns(throws), throws.c.outcome), throws
+        ).where(throws.c.outcome.is_not(None))
+        result = conn.execute(sql.execution_options(yield_per=batch_size))
+        for batch in result.partitions():
+            yield (
+                features([row[:-1] for row in batch]),
+                np.array([row[-1] == ThrowOutcome.HIT for row in batch], float),
+            )
+
+
+def fit_xhit(
+    conn: Connection,
+    iterations: int = 8,
+    batch_size: int = 100_000,
+    l2: float = 1.0,
+) -> Row:
+    """Fits an xHit model on every resolved throw and stores it
+
+    A logistic regression fitted by Newton's method. Each pass streams the
+    throws in batches and only keeps the gradient and Hessian, so memory is
+    bounded by the batch size however many throws there are.
+
+    Args:
+        conn (Connection): sqlalchemy Connection
+        iterations (int, optional): Most Newton passes over the throws. Defaults to 8.
+        batch_size (int, optional): Throws read at a time. Defaults to 100_000.
+        l2 (float, optional): Ridge penalty on the feature coefficients. Defaults to 1.0.
+
+    Raises:
+        XHitError: Fewer than MIN_TRAINING_THROWS throws, or only hits or only misses
+
+    Returns:
+        Row: The stored model's id, throws, hit_rate and log_loss
+    """
+    size = len(FEATURES)
+    count, hits = 0, 0.0
+    sums, squares = np.zeros(size), np.zeros(size)
+    for batch, hit in _training_batches(conn, batch_size):
+        count += len(batch)
+        hits += hit.sum()
+        sums += batch.sum(axis=0)
+        squares += (batch**2).sum(axis=0)
+    if count < MIN_TRAINING_THROWS or hits in (0, count):
+        raise XHitError(f"Can't fit on {count} throws with {int(hits)} hits")
+
+    means = sums / count
+    scales = np.sqrt(np.maximum(squares / count - means**2, 0.0))
+    scales[scales == 0] = 1.0
+    hit_rate = hits / count
+    parameters = XHitParameters(
+        means,
+        scales,
+        np.array([np.log(hit_rate / (1 - hit_rate)), *np.zeros(size)]),
+    )
+    # The intercept isn't penalised
+    penalty = np.diag([0.0, *([l2] * size)])
+
+    for _ in range(iterations):
+        gradient = -penalty @ parameters.coefficients
+        hessian = penalty.copy()
+        for batch, hit in _training_batches(conn, batch_size):
+            design = parameters._design(batch)
+            predicted = _sigmoid(design @ parameters.coefficients)
+            gradient += design.T @ (hit - predicted)
+            hessian += (design * (predicted * (1 - predicted))[:, None]).T @ design
+        step = np.linalg.solve(hessian, gradient)
+        parameters = XHitParameters(means, scales, parameters.coefficients + step)
+        if np.abs(step).max() < 1e-6:
+            break
+
+    log_loss = 0.0
+    for batch, hit in _training_batches(conn, batch_size):
+        predicted = np.clip(parameters.predict(batch), 1e-12, 1 - 1e-12)
+        log_loss -= (hit * np.log(predicted) + (1 - hit) * np.log1p(-predicted)).sum()
+
+    return conn.execute(
+        insert(XHitModel)
+        .values(
+            throws=count,
+            hit_rate=float(hit_rate),
+            log_loss=float(log_loss / count),
+            parameters=parameters.to_json(),
+        )
+        .returning(
+            XHitModel.id, XHitModel.throws, XHitModel.hit_rate, XHitModel.log_loss
+        )
+    ).one()
+
+
+def latest_model(conn: Connection) -> tuple[int, XHitParameters]:
+    """The newest model's ID and parameters
+
+    Raises:
+        XHitError: No model has been fitted
+    """
+    row = conn.execute(
+        select(XHitModel.id, XHitModel.parameters)
+        .order_by(XHitModel.id.desc())
+        .limit(1)
+    ).one_or_none()
+    if row is None:
+        raise XHitError("No xHit model has been fitted")
+    return row.id, XHitParameters.from_json(row.parameters)
+
+
+def score_throws(engine: Engine, batch_size: int = 10_000) -> int:
+    """Scores every throw not yet scored by the newest model, a batch at a time
+
+    New throws, throws whose features changed and, after a refit, every throw
+    are picked up. Batches are read in (set_id, id) order so each starts where
+    the last one stopped. Each batch commits on its own, so ingestion's
+    updates to scored throws only ever wait for one batch.
+
+    Args:
+        engine (Engine): sqlalchemy Engine, a transaction is begun per batch
+        batch_size (int, optional): Throws scored per statement. Defaults to 10_000.
+
+    Raises:
+        XHitError: No model has been fitted
+
+    Returns:
+        int: Number of throws scored
+    """
+    with engine.connect() as conn:
+        model_id, parameters = latest_model(conn)
+    scored = 0
+    for throws in (ThrowEvent.__table__, ARCHIVE_TABLES[ThrowEvent]):
+        key = tuple_(throws.c.set_id, throws.c.id)
+        last = None
+        while True:
+            sql = _with_geometry(
+                select(throws.c.set_id, throws.c.id, *_feature_columns(throws)),
+                throws,
+            ).where(throws.c.xhit_model_id.is_distinct_from(model_id))
+            if last is not None:
+                sql = sql.where(key > tuple_(*last))
+            with engine.begin() as conn:
+                batch = conn.execute(
+                    sql.order_by(throws.c.set_id, throws.c.id).limit(batch_size)
+                ).all()
+                if not batch:
+                    break
+
+                predicted = parameters.predict(features([row[2:] for row in batch]))
+                scores = values_clause(
+                    column("set_id", Integer),
+                    column("id", Integer),
+                    column("xhit", Float),
+                    name="scores",
+                ).data(
+                    [
+                        (row.set_id, row.id, float(score))
+                        for row, score in zip(batch, predicted)
+                    ]
+                )
+                conn.execute(
+                    update(throws)
+                    .where(
+                        throws.c.set_id == scores.c.set_id, throws.c.id == scores.c.id
+                    )
+                    .values(xhit=scores.c.xhit, xhit_model_id=model_id)
+                )
+            scored += len(batch)
+            last = batch[-1][:2]
+    return scored
+
+
+def _clear_scores(session: Session, flush_context) -> None:
+    changed = [
+        (obj.set_id, obj.id)
+        for obj in session.dirty
+        if isinstance(obj, ThrowEvent)
+        and any(
+            inspect(obj).attrs[name].history.has_changes() for name in SCORED_ATTRIBUTES
+        )
+    ]
+    if changed:
+        table = ThrowEvent.__table__
+        session.connection().execute(
+            update(table)
+            .where(tuple_(table.c.set_id, table.c.id).in_(changed))
+            .values(xhit=None, xhit_model_id=None)
+        )
+
+
+def maintain_xhit(session_class: type[Session]) -> None:
+    """Clears the score of throws whose features change, so the next batch rescores them
+
+    Args:
+        session_class (type[Session]): Session class to listen on
+    """
+    if not event.contains(session_class, "after_flush", _clear_scores):
+        event.listen(session_class, "after_flush", _clear_scores)
@@ -0,0 +1,6 @@
+#!/bin/bash
+# Runs once when the primary's data directory is initialised. Lets the replica
+# service stream WAL from it. Existing volumes need this pg_hba.conf line added
+# by hand.
+set -e
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
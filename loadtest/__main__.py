@@ -0,0 +1,106 @@
+"""HTTP load test harness
+
+Usage:
+    python -m loadtest loadtest/scenarios/live_tournament.json
+    python -m loadtest loadtest/scenarios/live_tournament.json --start-app --json report.json
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from dataclasses import replace
+from urllib.parse import urlparse
+
+import httpx
+
+from .report import build_report, format_report
+from .runner import run_scenario
+from .scenario import load_scenario
+
+
+def start_app(base_url: str, workers: int, timeout_s: float = 30.0) -> subprocess.Popen:
+    """Starts the API with uvicorn and waits until it answers
+
+    Args:
+        base_url (str): URL the app should listen on
+        workers (int): Number of uvicorn worker processes
+        timeout_s (float, optional): How long to wait for the app. Defaults to 30.0.
+
+    Raises:
+        RuntimeError: The app did not start in time
+
+    Returns:
+        subprocess.Popen: The uvicorn process
+    """
+    url = urlparse(base_url)
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "api.v1.main:app",
+            "--host",
+            url.hostname or "127.0.0.1",
+            "--port",
+            str(url.port or 8000),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ]
+    )
+
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/openapi.json", timeout=1.0).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+
+    process.terminate()
+    raise RuntimeError(f"App did not start on {base_url} within {timeout_s}s")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m loadtest")
+    parser.add_argument("scenario", help="Path to a scenario JSON file")
+    parser.add_argument("--base-url", help="Override the scenario's base_url")
+    parser.add_argument("--duration", type=float, help="Override duration_s")
+    parser.add_argument(
+        "--start-app", action="store_true", help="Start the API locally with uvicorn"
+    )
+    parser.add_argument("--app-workers", type=int, default=1)
+    parser.add_argument("--json", help="Also write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    scenario = load_scenario(args.scenario)
+    if args.base_url:
+        scenario = replace(scenario, base_url=args.base_url)
+    if args.duration:
+        scenario = replace(scenario, duration_s=args.duration)
+
+    app_process = (
+        start_app(scenario.base_url, args.app_workers) if args.start_app else None
+    )
+    try:
+        stats, elapsed = asyncio.run(run_scenario(scenario))
+    finally:
+        if app_process:
+            app_process.terminate()
+            app_process.wait()
+
+    report = build_report(stats, elapsed)
+    print(f"Scenario '{scenario.name}' against {scenario.base_url} ({elapsed:.1f}s)")
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
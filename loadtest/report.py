@@ -0,0 +1,96 @@
+import math
+from dataclasses import dataclass, field
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list
+
+    Args:
+        sorted_values (list[float]): Values sorted ascending
+        pct (float): Percentile between 0 and 100
+
+    Returns:
+        float: The percentile, 0.0 for an empty list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+@dataclass
+class RouteStats:
+    """Raw measurements for one route"""
+
+    latencies_s: list[float] = field(default_factory=list)
+    errors: int = 0
+    bytes_received: int = 0
+
+    def record(self, latency_s: float, ok: bool, size: int = 0) -> None:
+        self.latencies_s.append(latency_s)
+        self.bytes_received += size
+        if not ok:
+            self.errors += 1
+
+    def summary(self, elapsed_s: float) -> dict:
+        """Summarises the route's throughput, error rate and tail latency
+
+        Args:
+            elapsed_s (float): Wall clock duration of the run
+
+        Returns:
+            dict: Summary with latencies in milliseconds
+        """
+        latencies = sorted(self.latencies_s)
+        count = len(latencies)
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": self.errors / count if count else 0.0,
+            "throughput_rps": count / elapsed_s if elapsed_s else 0.0,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+            "bytes_received": self.bytes_received,
+        }
+
+
+def build_report(stats: dict[str, RouteStats], elapsed_s: float) -> dict:
+    """Builds the per route and overall summary of a run
+
+    Args:
+        stats (dict[str, RouteStats]): Measurements keyed by route
+        elapsed_s (float): Wall clock duration of the run
+
+    Returns:
+        dict: {"elapsed_s": ..., "routes": {...}, "total": {...}}
+    """
+    total = RouteStats()
+    for route_stats in stats.values():
+        total.latencies_s.extend(route_stats.latencies_s)
+        total.errors += route_stats.errors
+        total.bytes_received += route_stats.bytes_received
+
+    return {
+        "elapsed_s": elapsed_s,
+        "routes": {
+            route: route_stats.summary(elapsed_s)
+            for route, route_stats in sorted(stats.items())
+        },
+        "total": total.summary(elapsed_s),
+    }
+
+
+def format_report(report: dict) -> str:
+    """Renders a report as a plain text table"""
+    header = f"{'route':<48} {'reqs':>8} {'rps':>9} {'err%':>7} {'p50':>9} {'p95':>9} {'p99':>9}"
+    lines = [header, "-" * len(header)]
+    rows = list(report["routes"].items()) + [("TOTAL", report["total"])]
+    for route, summary in rows:
+        lines.append(
+            f"{route:<48} {summary['requests']:>8} {summary['throughput_rps']:>9.1f} "
+            f"{summary['error_rate'] * 100:>6.2f}% {summary['p50_ms']:>7.1f}ms "
+            f"{summary['p95_ms']:>7.1f}ms {summary['p99_ms']:>7.1f}ms"
+        )
+    return "\n".join(lines)
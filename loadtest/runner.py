@@ -0,0 +1,181 @@
+import asyncio
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from random import Random
+
+import httpx
+
+from .report import RouteStats
+from .scenario import RequestSpec, Scenario, UserSpec
+
+# Throw ids remembered per set so catches and eliminations reference real throws
+RECENT_THROWS_PER_SET = 50
+
+
+class ScenarioState:
+    """Data shared between virtual users, such as the throws created so far"""
+
+    def __init__(self, scenario: Scenario) -> None:
+        self.set_ids: list[int] = scenario.data.get("set_ids", [])
+        self.player_ids: list[int] = scenario.data.get("player_ids", [])
+        self.competition_ids: list[int] = scenario.data.get("competition_ids", [])
+        self.match_ids: list[int] = scenario.data.get("match_ids", [])
+        self.recent_throws: dict[int, deque[int]] = defaultdict(
+            lambda: deque(maxlen=RECENT_THROWS_PER_SET)
+        )
+
+    def path_params(self, rng: Random) -> dict[str, int]:
+        return {
+            "set_id": rng.choice(self.set_ids) if self.set_ids else 1,
+            "player_id": rng.choice(self.player_ids) if self.player_ids else 1,
+            "competition_id": (
+                rng.choice(self.competition_ids) if self.competition_ids else 1
+            ),
+            "match_id": rng.choice(self.match_ids) if self.match_ids else 1,
+        }
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def throw_event_body(rng: Random, state: ScenarioState) -> dict | None:
+    if not state.set_ids or not state.player_ids:
+        return None
+    return {
+        "set_id": rng.choice(state.set_ids),
+        "player_id": rng.choice(state.player_ids),
+        "target_player_id": rng.choice(state.player_ids),
+        "timestamp": _now(),
+        "location_x": round(rng.uniform(0, 9), 2),
+        "location_y": round(rng.uniform(0, 9), 2),
+        "target_location_x": round(rng.uniform(9, 18), 2),
+        "target_location_y": round(rng.uniform(0, 9), 2),
+        "valid_attempt": True,
+        "target_had_ball": rng.random() < 0.3,
+        "was_blocked": rng.random() < 0.15,
+    }
+
+
+def catch_event_body(rng: Random, state: ScenarioState) -> dict | None:
+    sets_with_throws = [s for s, throws in state.recent_throws.items() if throws]
+    if not sets_with_throws or not state.player_ids:
+        return None
+    set_id = rng.choice(sets_with_throws)
+    return {
+        "set_id": set_id,
+        "player_id": rng.choice(state.player_ids),
+        "timestamp": _now(),
+        "throw_event_id": rng.choice(state.recent_throws[set_id]),
+        "rebound_catch": rng.random() < 0.15,
+    }
+
+
+def elimination_event_body(rng: Random, state: ScenarioState) -> dict | None:
+    sets_with_throws = [s for s, throws in state.recent_throws.items() if throws]
+    if not sets_with_throws or not state.player_ids:
+        return None
+    set_id = rng.choice(sets_with_throws)
+    return {
+        "set_id": set_id,
+        "eliminated_player_id": rng.choice(state.player_ids),
+        "cause": "direct_hit",
+        "throw_event_id": rng.choice(state.recent_throws[set_id]),
+    }
+
+
+BODY_BUILDERS = {
+    "throw_event": throw_event_body,
+    "catch_event": catch_event_body,
+    "elimination_event": elimination_event_body,
+}
+
+
+def _pick(rng: Random, requests: tuple[RequestSpec, ...]) -> RequestSpec:
+    return rng.choices(requests, weights=[r.weight for r in requests])[0]
+
+
+async def _virtual_user(
+    client: httpx.AsyncClient,
+    user: UserSpec,
+    state: ScenarioState,
+    stats: dict[str, RouteStats],
+    rng: Random,
+    start_delay_s: float,
+    deadline: float,
+) -> None:
+    await asyncio.sleep(start_delay_s)
+    while time.monotonic() < deadline:
+        request = _pick(rng, user.requests)
+        body = None
+        if request.body:
+            body = BODY_BUILDERS[request.body](rng, state)
+            if body is None:
+                # Nothing to reference yet, e.g a catch before any throw exists
+                await asyncio.sleep(user.think_time_s)
+                continue
+
+        path = request.path.format(**state.path_params(rng))
+        started = time.perf_counter()
+        try:
+            response = await client.request(request.method, path, json=body)
+            latency = time.perf_counter() - started
+            ok = response.status_code < 400
+            stats[request.route].record(latency, ok, len(response.content))
+        except httpx.HTTPError:
+            stats[request.route].record(time.perf_counter() - started, ok=False)
+        else:
+            if ok and request.body == "throw_event":
+                try:
+                    created = response.json()
+                    state.recent_throws[created["set_id"]].append(created["id"])
+                except (ValueError, KeyError, TypeError):
+                    # Counted as sent, it just can't be referenced by later events
+                    pass
+
+        # Jitter avoids every user of a group firing in lockstep
+        await asyncio.sleep(user.think_time_s * rng.uniform(0.5, 1.5))
+
+
+async def run_scenario(scenario: Scenario) -> tuple[dict[str, RouteStats], float]:
+    """Runs every virtual user of a scenario until its duration has passed
+
+    Args:
+        scenario (Scenario): The scenario to run
+
+    Returns:
+        tuple[dict[str, RouteStats], float]: Measurements per route and the elapsed time
+    """
+    state = ScenarioState(scenario)
+    stats: dict[str, RouteStats] = defaultdict(RouteStats)
+    limits = httpx.Limits(
+        max_connections=scenario.max_connections,
+        max_keepalive_connections=scenario.max_connections,
+    )
+    seed = Random(scenario.seed)
+
+    async with httpx.AsyncClient(
+        base_url=scenario.base_url, timeout=scenario.timeout_s, limits=limits
+    ) as client:
+        started = time.monotonic()
+        deadline = started + scenario.ramp_up_s + scenario.duration_s
+        tasks = []
+        for user in scenario.users:
+            for index in range(user.count):
+                delay = scenario.ramp_up_s * index / max(user.count, 1)
+                tasks.append(
+                    _virtual_user(
+                        client,
+                        user,
+                        state,
+                        stats,
+                        Random(seed.random()),
+                        delay,
+                        deadline,
+                    )
+                )
+        await asyncio.gather(*tasks)
+        elapsed = time.monotonic() - started
+
+    return dict(stats), elapsed
@@ -0,0 +1,95 @@
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class RequestSpec:
+    """One weighted request a virtual user can make"""
+
+    method: str
+    path: str
+    weight: float = 1.0
+    body: str | None = None
+
+    @property
+    def route(self) -> str:
+        """Route key the results are grouped by, e.g 'GET /throw-events/set/{set_id}'"""
+        return f"{self.method} {self.path}"
+
+
+@dataclass(frozen=True)
+class UserSpec:
+    """A group of identical virtual users, such as scorer tablets or dashboard viewers"""
+
+    name: str
+    count: int
+    think_time_s: float
+    requests: tuple[RequestSpec, ...]
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A complete load test definition loaded from a scenario file"""
+
+    name: str
+    base_url: str
+    duration_s: float
+    users: tuple[UserSpec, ...]
+    ramp_up_s: float = 0.0
+    timeout_s: float = 10.0
+    max_connections: int = 1000
+    seed: int = 0
+    data: dict = field(default_factory=dict)
+
+
+def load_scenario(path: str | Path) -> Scenario:
+    """Loads a scenario from a JSON file
+
+    Args:
+        path (str | Path): Path to the scenario file
+
+    Raises:
+        ValueError: The scenario has no users or a user group has no requests
+
+    Returns:
+        Scenario: The parsed scenario
+    """
+    raw = json.loads(Path(path).read_text())
+
+    users = []
+    for user in raw.get("users", []):
+        requests = tuple(
+            RequestSpec(
+                method=request["method"].upper(),
+                path=request["path"],
+                weight=float(request.get("weight", 1.0)),
+                body=request.get("body"),
+            )
+            for request in user.get("requests", [])
+        )
+        if not requests:
+            raise ValueError(f"User group '{user['name']}' has no requests")
+        users.append(
+            UserSpec(
+                name=user["name"],
+                count=int(user["count"]),
+                think_time_s=float(user.get("think_time_s", 1.0)),
+                requests=requests,
+            )
+        )
+
+    if not users:
+        raise ValueError(f"Scenario '{raw.get('name', path)}' has no users")
+
+    return Scenario(
+        name=raw.get("name", Path(path).stem),
+        base_url=raw.get("base_url", "http://127.0.0.1:8000"),
+        duration_s=float(raw.get("duration_s", 60)),
+        users=tuple(users),
+        ramp_up_s=float(raw.get("ramp_up_s", 0)),
+        timeout_s=float(raw.get("timeout_s", 10)),
+        max_connections=int(raw.get("max_connections", 1000)),
+        seed=int(raw.get("seed", 0)),
+        data=raw.get("data", {}),
+    )
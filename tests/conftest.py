@@ -1,5 +1,32 @@
 import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from database.instrumentation import instrument_engine
+from database.models import (
+    Base,
+    Competition,
+    CompetitionStanding,
+    Match,
+    Player,
+    Set,
+    Team,
+    TeamCompetition,
+)
 from database.models.organisation import Organisation
+from database.query_budget import QueryBudget
+from database.routing import RoutingSession
+
+# Tables API tests can create in sqlite, the event tables need Postgres
+SQLITE_MODELS = (
+    Organisation,
+    Competition,
+    Team,
+    TeamCompetition,
+    CompetitionStanding,
+    Match,
+    Set,
+    Player,
+)
 
 
 @pytest.fixture()
@@ -22,3 +49,62 @@ def sample_organisation_object():
         website="test.com",
         logo_url="test.com/image.png",
     )
+
+
+@pytest.fixture()
+def query_budget():
+    """Context manager that fails the test when a block exceeds its query budget
+
+    Usage: with query_budget(max_statements=1, max_repeats=3): ...
+    """
+    return QueryBudget
+
+
+@pytest.fixture()
+def sqlite_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'test.db'}"
+
+
+@pytest.fixture()
+def sqlite_models():
+    """Models whose tables session_factory creates, parametrise indirectly for others"""
+    return SQLITE_MODELS
+
+
+@pytest.fixture()
+def session_factory(sqlite_url, sqlite_models):
+    """Makes sessions on a fresh sqlite database, the ORM listeners included"""
+    from database.db import register_listeners
+
+    register_listeners()
+    engine = create_engine(sqlite_url)
+    instrument_engine(engine)
+    Base.metadata.create_all(
+        engine, tables=[model.__table__ for model in sqlite_models]
+    )
+    yield sessionmaker(class_=RoutingSession, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture()
+def client(session_factory):
+    """TestClient of the app, its database sessions made by session_factory"""
+    from fastapi.testclient import TestClient
+    from api.v1.main import app
+    from database.db import get_db_session, get_read_db_session
+
+    def override():
+        session = session_factory()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db_session] = override
+    app.dependency_overrides[get_read_db_session] = override
+    yield TestClient(app)
+    app.dependency_overrides.clear()
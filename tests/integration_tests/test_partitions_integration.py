@@ -0,0 +1,140 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import func, insert, select
+from database.db import engine
+from database.models import (
+    CatchEvent,
+    Competition,
+    EliminationEvent,
+    Match,
+    Organisation,
+    Player,
+    Set,
+    Team,
+    ThrowEvent,
+)
+from database.models.competition import AgeCategory, CompetitionFormat, CourtSize
+from database.models.elimination_event import EliminationCause
+from database.models.match import MatchStatus
+from database.partitions import (
+    PARTITION_SIZE,
+    PARTITIONED_TABLES,
+    PartitionError,
+    attach_range,
+    detach_range,
+    list_partitions,
+    move_from_default,
+    partition_name,
+    partitions_upper,
+)
+
+
+@pytest.fixture
+def conn():
+    """Connection whose changes, DDL included, are rolled back after the test"""
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            yield conn
+        finally:
+            transaction.rollback()
+
+
+def _insert_events(conn, set_id: int) -> None:
+    """One throw, its catch and the thrower's elimination in a new set"""
+    now = datetime(2025, 1, 1)
+    organisation_id = conn.execute(
+        insert(Organisation).values(name="Partition Org", country_code="GB")
+    ).inserted_primary_key[0]
+    competition_id = conn.execute(
+        insert(Competition).values(
+            name="Partition League",
+            competition_format=CompetitionFormat.LEAGUE,
+            organisation_id=organisation_id,
+            age_category=AgeCategory.ADULT,
+            court_size=CourtSize.BD,
+        )
+    ).inserted_primary_key[0]
+    team_ids = [
+        conn.execute(insert(Team).values(name=name)).inserted_primary_key[0]
+        for name in ("Partition A", "Partition B")
+    ]
+    match_id = conn.execute(
+        insert(Match).values(
+            competition_id=competition_id,
+            team1_id=team_ids[0],
+            team2_id=team_ids[1],
+            match_date=now,
+            status=MatchStatus.LIVE,
+        )
+    ).inserted_primary_key[0]
+    conn.execute(
+        insert(Set).values(id=set_id, match_id=match_id, set_number=1, start_time=now)
+    )
+    thrower, catcher = [
+        conn.execute(
+            insert(Player).values(first_name=name, last_name="Partition")
+        ).inserted_primary_key[0]
+        for name in ("Thrower", "Catcher")
+    ]
+    throw_id = conn.execute(
+        insert(ThrowEvent).values(set_id=set_id, player_id=thrower, timestamp=now)
+    ).inserted_primary_key[0]
+    catch_id = conn.execute(
+        insert(CatchEvent).values(
+            set_id=set_id, player_id=catcher, timestamp=now, throw_event_id=throw_id
+        )
+    ).inserted_primary_key[0]
+    conn.execute(
+        insert(EliminationEvent).values(
+            set_id=set_id,
+            eliminated_player_id=thrower,
+            cause=EliminationCause.THROW_CAUGHT,
+            throw_event_id=throw_id,
+            catch_event_id=catch_id,
+        )
+    )
+
+
+def _event_counts(conn, set_id: int) -> list[int]:
+    return [
+        conn.execute(
+            select(func.count()).select_from(model).where(model.set_id == set_id)
+        ).scalar()
+        for model in (ThrowEvent, CatchEvent, EliminationEvent)
+    ]
+
+
+def test_rows_move_out_of_default_then_detach_and_attach(conn):
+    # A range past every set and partition, so its only rows are this test's
+    newest_set = conn.execute(select(func.coalesce(func.max(Set.id), 0))).scalar()
+    lower = max(
+        partitions_upper(conn), (newest_set // PARTITION_SIZE + 1) * PARTITION_SIZE
+    )
+    _insert_events(conn, lower + 1)
+
+    created = move_from_default(conn, lower)
+
+    assert [partition.name for partition in created] == [
+        partition_name(table, lower) for table in PARTITIONED_TABLES
+    ]
+    for table in PARTITIONED_TABLES:
+        assert partition_name(table, lower) in {
+            partition.name for partition in list_partitions(conn, table)
+        }
+    assert _event_counts(conn, lower + 1) == [1, 1, 1]
+
+    # Referenced partitions detach after the tables pointing into them
+    detached = detach_range(conn, lower)
+    assert detached == [
+        partition_name(table, lower) for table in reversed(PARTITIONED_TABLES)
+    ]
+    assert _event_counts(conn, lower + 1) == [0, 0, 0]
+
+    attach_range(conn, lower)
+    assert _event_counts(conn, lower + 1) == [1, 1, 1]
+
+
+def test_detach_rejects_a_lower_bound_off_the_range(conn):
+    with pytest.raises(PartitionError):
+        detach_range(conn, 123)
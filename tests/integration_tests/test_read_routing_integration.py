@@ -0,0 +1,30 @@
+import pytest
+from sqlalchemy import select
+from database.db import SessionLocal, replica_engine
+from database.enums.country_codes import CountryCode
+from database.models.organisation import Organisation
+from database.routing import read_consistency
+
+pytestmark = pytest.mark.skipif(
+    replica_engine is None, reason="DATABASE_REPLICA_HOST is not set"
+)
+
+
+def test_read_session_sees_its_own_write():
+    """Tests a read straight after a write sees it, from the replica or the primary"""
+    with read_consistency() as consistency:
+        with SessionLocal() as session:
+            org = Organisation(name="Replica Org", country_code=CountryCode.GB)
+            session.add(org)
+            session.commit()
+            org_id = org.id
+
+        assert consistency.last_write_lsn is not None
+
+        with SessionLocal(info={"read_only": True}) as session:
+            found = session.scalar(select(Organisation).filter_by(id=org_id))
+            assert found is not None
+
+    with SessionLocal() as session:
+        session.delete(session.get(Organisation, org_id))
+        session.commit()
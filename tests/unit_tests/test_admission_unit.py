@@ -0,0 +1,112 @@
+import asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api.v1.admission import AdmissionController, RequestClass
+from api.v1.middleware.admission import AdmissionMiddleware
+
+
+async def _settle():
+    """Lets woken waiters run, through wait_for and shield"""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def _controller(max_concurrent=2, read_queued=1):
+    return AdmissionController(
+        classes=[
+            RequestClass("ingest", 0, 2, 5, 1.0, methods=frozenset({"POST"})),
+            RequestClass("analytics", 2, 1, 1, 1.0, paths=r"/analytics/"),
+            RequestClass("read", 1, 2, read_queued, 1.0),
+        ],
+        max_concurrent=max_concurrent,
+        exempt=r"^/metrics",
+    )
+
+
+def test_classify():
+    controller = _controller()
+    assert controller.classify("POST", "/throw-events/").name == "ingest"
+    assert controller.classify("GET", "/competitions/1/analytics/teams").name == (
+        "analytics"
+    )
+    assert controller.classify("GET", "/sets/3").name == "read"
+    assert controller.classify("GET", "/metrics") is None
+
+
+def test_app_reads_roster_lookups_posted_for_their_body():
+    from api.v1.main import admission
+
+    assert admission.classify("POST", "/rosters/resolve").name == "read"
+    assert admission.classify("POST", "/throw-events/").name == "ingest"
+    assert admission.classify("POST", "/competitions/1/fixtures").name == "ingest"
+
+
+def test_waiting_ingest_is_admitted_before_reads():
+    async def scenario():
+        controller = _controller()
+        ingest, _, read = controller.classes
+        assert await controller.acquire(read)
+        assert await controller.acquire(read)
+
+        order = []
+
+        async def request(request_class):
+            assert await controller.acquire(request_class)
+            order.append(request_class.name)
+
+        # Reads are at their limit and so is the whole app
+        queued_read = asyncio.create_task(request(read))
+        await asyncio.sleep(0)
+        queued_ingest = asyncio.create_task(request(ingest))
+        await asyncio.sleep(0)
+        assert controller.running == 2
+
+        controller.release(read)
+        await _settle()
+        assert order == ["ingest"]
+        controller.release(read)
+        await asyncio.gather(queued_read, queued_ingest)
+        assert order == ["ingest", "read"]
+        assert controller.running == 2
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_and_long_wait_are_rejected():
+    async def scenario():
+        controller = _controller(max_concurrent=1)
+        _, analytics, read = controller.classes
+        analytics.max_wait_s = 0.01
+        assert await controller.acquire(read)
+
+        assert not await controller.acquire(analytics)
+        assert not analytics.waiting
+
+        waiting = asyncio.create_task(controller.acquire(read))
+        await asyncio.sleep(0)
+        # The read queue holds one request
+        assert not await controller.acquire(read)
+        controller.release(read)
+        assert await waiting
+
+    asyncio.run(scenario())
+
+
+def test_middleware_rejects_with_retry_after():
+    controller = _controller(max_concurrent=0, read_queued=0)
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+
+    @app.get("/sets/{set_id}")
+    def get_set(set_id: int) -> dict:
+        return {"id": set_id}
+
+    @app.get("/metrics")
+    def get_metrics() -> dict:
+        return {}
+
+    client = TestClient(app)
+    response = client.get("/sets/1")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert client.get("/metrics").status_code == 200
@@ -0,0 +1,235 @@
+from datetime import datetime, timedelta
+import numpy as np
+import database.analytics as analytics
+from database.models import ArchivedCompetition, ThrowEvent
+from database.models.elimination_event import EliminationCause
+from database.models.throw_event import ThrowOutcome
+from database.models.throw_geometry import CourtSide
+
+START = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def _at(seconds: int) -> datetime:
+    return START + timedelta(seconds=seconds)
+
+
+def _throw(throw_id, player_id, team_id, target_id, outcome, distance=None, side=None):
+    """A throw of set 10 as load_frame's throw query returns it"""
+    return (
+        *(10, throw_id, _at(throw_id), player_id, team_id, target_id),
+        outcome != ThrowOutcome.INVALID,
+        outcome == ThrowOutcome.BLOCKED,
+        outcome,
+        *(1.0, 2.0, None, None),
+        distance,
+        None if distance is None else 0.0,
+        side,
+    )
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Answers load_frame's sets, throws, catches then eliminations queries"""
+
+    def __init__(self, competition_id: int = 1, archived: bool = False):
+        self.statements = []
+        self.results = [
+            [(competition_id * 10, competition_id, archived)],
+            [
+                _throw(1, 1, 100, 3, ThrowOutcome.HIT, 4.0, CourtSide.LEFT),
+                _throw(2, 1, 100, 4, ThrowOutcome.CAUGHT, 7.5, CourtSide.RIGHT),
+                _throw(3, 3, 200, 2, ThrowOutcome.BLOCKED),
+                _throw(4, 2, 100, None, ThrowOutcome.INVALID, 2.0, CourtSide.LEFT),
+            ],
+            [(10, 1, _at(2), 4, 200, True)],
+            [
+                (10, 1, _at(1), 3, 200, EliminationCause.DIRECT_HIT, 1, None),
+                (10, 2, _at(2), 1, 100, EliminationCause.THROW_CAUGHT, 1, 4),
+                (10, 3, _at(5), 2, 100, EliminationCause.LINE_FAULT, None, None),
+            ],
+        ]
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return FakeResult(self.results.pop(0))
+
+    def get(self, model, ident):
+        return None
+
+
+def test_load_frame_encodes_players_and_teams():
+    frame = analytics.load_frame(FakeSession(), 1)
+
+    assert frame.players.tolist() == [1, 2, 3, 4]
+    assert frame.teams.tolist() == [100, 200]
+    assert frame.throws["player"].tolist() == [0, 0, 2, 1]
+    assert frame.throws["target"].tolist() == [2, 3, 1, -1]
+    assert np.isnan(frame.throws["target_location_x"][1])
+    assert np.isnan(frame.throws["distance"][2])
+    assert frame.throws["court_side"].tolist() == [2, 0, -1, 2]
+    assert frame.eliminations["credited"].tolist() == [0, 3, -1]
+    assert frame.set_ids == {10} and frame.match_ids == {1}
+
+
+def test_player_summary():
+    summary = analytics.load_frame(FakeSession(), 1).player_summary()
+    by_player = {row["player_id"]: row for row in summary}
+
+    assert by_player[1]["throws"] == 2
+    assert by_player[1]["hits"] == 1
+    assert by_player[1]["hit_rate"] == 0.5
+    assert by_player[1]["eliminations"] == 1
+    assert by_player[1]["times_eliminated"] == 1
+    # Invalid throws don't count, so there's no hit rate
+    assert by_player[2]["throws"] == 0
+    assert by_player[2]["hit_rate"] is None
+    assert by_player[4]["catches"] == 1
+    assert by_player[4]["rebound_catches"] == 1
+    assert by_player[4]["eliminations"] == 1
+
+
+def test_team_summary_and_causes():
+    frame = analytics.load_frame(FakeSession(), 1)
+    teams = {row["team_id"]: row for row in frame.team_summary()}
+
+    assert teams[100]["throws"] == 2
+    assert teams[100]["hits"] == 1
+    assert teams[100]["players_eliminated"] == 2
+    assert teams[200]["catches"] == 1
+
+    assert frame.cause_counts(team_id=100) == [
+        {"cause": EliminationCause.THROW_CAUGHT, "eliminations": 1},
+        {"cause": EliminationCause.LINE_FAULT, "eliminations": 1},
+    ]
+    assert frame.cause_counts(player_id=99) == []
+    assert frame.player_summary(set_id=11) == []
+
+
+def test_absent_team_or_player_matches_nothing():
+    session = FakeSession()
+    # A throw and an elimination whose team couldn't be resolved
+    session.results[1].append(_throw(5, 2, None, 1, ThrowOutcome.HIT, 3.0))
+    session.results[3].append(
+        (10, 4, _at(6), 4, None, EliminationCause.DIRECT_HIT, 5, None)
+    )
+    frame = analytics.load_frame(session, 1)
+
+    assert frame.cause_counts(team_id=999) == []
+    assert frame.cause_counts(player_id=999) == []
+    for team_id, player_id in ((999, None), (None, 999), (100, 999)):
+        x, _, _ = frame.throw_locations(team_id, player_id)
+        assert len(x) == 0
+        assert all(
+            row["throws"] == 0 for row in frame.distance_bands(team_id, player_id)
+        )
+        assert all(row["throws"] == 0 for row in frame.court_sides(team_id, player_id))
+
+
+def test_missing_competition_raises():
+    session = FakeSession()
+    session.results[0] = []
+    try:
+        analytics.load_frame(session, 1)
+    except analytics.AnalyticsUnavailable:
+        pass
+    else:
+        raise AssertionError("expected AnalyticsUnavailable")
+
+
+def test_cache_evicts_least_recently_used():
+    cache = analytics.AnalyticsCache(max_competitions=2)
+    first = cache.frame(FakeSession(1), 1)
+    cache.frame(FakeSession(2), 2)
+    assert cache.frame(FakeSession(1), 1) is first
+    cache.frame(FakeSession(3), 3)
+
+    session = FakeSession(1)
+    cache.frame(session, 1)
+    assert session.statements == []
+    session = FakeSession(2)
+    cache.frame(session, 2)
+    assert len(session.statements) == 4
+
+
+def test_cache_invalidates_competitions_touched_by_changes():
+    cache = analytics.AnalyticsCache()
+    cache.frame(FakeSession(1), 1)
+    cache.frame(FakeSession(2), 2)
+
+    cache.invalidate_changes({20}, set(), set())
+    session = FakeSession(1)
+    cache.frame(session, 1)
+    assert session.statements == []
+    session = FakeSession(2)
+    cache.frame(session, 2)
+    assert len(session.statements) == 4
+
+
+def test_changes_include_event_sets():
+    class Session:
+        new = [ThrowEvent(id=1, set_id=10, player_id=1, timestamp=START)]
+        dirty = []
+        deleted = []
+
+    assert analytics._changes(Session()) == ({10}, set(), set())
+
+
+def test_archiving_changes_the_competition():
+    class Session:
+        new = [ArchivedCompetition(competition_id=4)]
+        dirty = []
+        deleted = []
+
+    assert analytics._changes(Session()) == (set(), set(), {4})
+    assert analytics.load_frame(FakeSession(archived=True), 1).archived
+    assert not analytics.load_frame(FakeSession(), 1).archived
+
+
+def test_hit_rate_by_distance_band_and_court_side():
+    frame = analytics.load_frame(FakeSession(), 1)
+
+    bands = frame.distance_bands()
+    assert [band["min_distance"] for band in bands] == [0.0, 3.0, 6.0, 9.0, 12.0]
+    assert bands[1] == {
+        "min_distance": 3.0,
+        "max_distance": 6.0,
+        "throws": 1,
+        "hits": 1,
+        "hit_rate": 1.0,
+    }
+    # The invalid throw from 2m isn't an attempt
+    assert bands[0]["throws"] == 0 and bands[0]["hit_rate"] is None
+    assert bands[2]["throws"] == 1 and bands[2]["hits"] == 0
+    assert bands[4]["max_distance"] is None
+
+    sides = {row["court_side"]: row for row in frame.court_sides(team_id=100)}
+    assert sides[CourtSide.LEFT]["hit_rate"] == 1.0
+    assert sides[CourtSide.RIGHT]["hits"] == 0
+    assert frame.court_sides(player_id=3)[1]["throws"] == 0
+
+
+def test_route_loads_missed_frames_from_the_primary(monkeypatch):
+    from fastapi import Response
+    import api.v1.routes.analytics as routes
+
+    loaded = []
+    monkeypatch.setattr(
+        routes.analytics_cache,
+        "frame",
+        lambda session, competition_id: loaded.append(session) or "frame",
+    )
+    monkeypatch.setattr(routes, "archived_at", lambda session, competition_id: None)
+
+    frame = routes.get_event_frame(
+        4, Response(), session="read session", primary="primary session"
+    )
+
+    assert frame == "frame"
+    assert loaded == ["primary session"]
@@ -0,0 +1,99 @@
+from sqlalchemy.dialects import postgresql
+from database.archive import archive_competition
+from database.crud.archived import ArchivedEventRepository
+from database.models import (
+    ArchivedCompetition,
+    Competition,
+    ThrowEvent,
+    throw_events_archive,
+)
+from database.models.archive import ARCHIVE_TABLES
+
+
+def _compile(repo: ArchivedEventRepository, *args, **kwargs) -> str:
+    statement = repo._archived_select(*args, **kwargs)
+    return str(
+        statement.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+def test_archive_tables_mirror_hot_columns_and_key():
+    for model, archive in ARCHIVE_TABLES.items():
+        hot = model.__table__
+        assert archive.name == f"{hot.name}_archive"
+        assert [c.name for c in archive.columns] == [c.name for c in hot.columns]
+        assert [c.name for c in archive.primary_key] == [
+            c.name for c in hot.primary_key
+        ]
+        assert not archive.foreign_keys
+
+
+def test_archived_read_filters_both_sides_of_the_union():
+    repo = ArchivedEventRepository(ThrowEvent, db_session=None)
+
+    sql = _compile(repo, set_id=7)
+
+    assert "UNION ALL" in sql
+    assert "throw_events.set_id = 7" in sql
+    assert "throw_events_archive.set_id = 7" in sql
+
+
+def test_archived_read_adapts_expression_filters_to_the_archive():
+    repo = ArchivedEventRepository(ThrowEvent, db_session=None)
+
+    sql = _compile(repo, ThrowEvent.location_x > 5, not_a_column=1)
+
+    assert "throw_events.location_x > 5" in sql
+    assert "throw_events_archive.location_x > 5" in sql
+    assert "not_a_column" not in sql
+    assert repo.archive is throw_events_archive
+
+
+class ArchiveSession:
+    """Session of a finished competition, recording the SQL of each statement"""
+
+    def __init__(self):
+        self.statements = []
+
+    def get(self, model, key):
+        return Competition(id=key) if model is Competition else None
+
+    def execute(self, statement):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+
+        class Result:
+            rowcount = 2
+
+            def scalar(self):
+                return 0
+
+        return Result()
+
+    def add(self, record):
+        self.record = record
+
+    def commit(self):
+        pass
+
+    def refresh(self, record):
+        pass
+
+
+def test_archiving_moves_each_table_in_one_statement():
+    session = ArchiveSession()
+
+    record = archive_competition(session, competition_id=4)
+
+    moves = session.statements[1:]
+    # A row committed between a copy and a separate delete would be lost
+    for statement, table in zip(
+        moves, ("eliminations", "catch_events", "throw_events")
+    ):
+        assert statement.startswith(f"WITH moved_{table} AS \n(DELETE FROM {table} ")
+        assert f"RETURNING {table}.id" in statement
+        assert f"INSERT INTO {table}_archive " in statement
+    assert len(moves) == 3
+    assert isinstance(record, ArchivedCompetition)
+    assert (record.throw_events, record.catch_events, record.eliminations) == (2, 2, 2)
@@ -0,0 +1,130 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import func, select
+from database.instrumentation import add_query_observer, remove_query_observer
+from database.models import Competition, Organisation, Team, TeamCompetition
+from database.models.competition import AgeCategory, CompetitionFormat, CourtSize
+
+
+@pytest.fixture(autouse=True)
+def seed(session_factory):
+    with session_factory() as session:
+        organisation = Organisation(name="Line Fault", country_code="GB")
+        session.add(organisation)
+        session.flush()
+        session.add(
+            Competition(
+                id=1,
+                name="League",
+                competition_format=CompetitionFormat.LEAGUE,
+                organisation_id=organisation.id,
+                age_category=AgeCategory.ADULT,
+                court_size=CourtSize.BD,
+            )
+        )
+        session.add_all([Team(id=1, name="Existing"), Team(id=2, name="Other")])
+        session.add(TeamCompetition(team_id=2, competition_id=1))
+        session.commit()
+
+
+def test_teams_batch_reports_taken_names(client, session_factory):
+    names = ["Existing", "New", "New", "Another"]
+    statements = []
+
+    def observe(conn, statement, parameters, duration_s):
+        statements.append(statement)
+
+    add_query_observer(observe)
+    try:
+        response = client.post(
+            "/teams:batch", json={"items": [{"name": name} for name in names]}
+        )
+    finally:
+        remove_query_observer(observe)
+
+    assert response.status_code == 201
+    body = response.json()
+    assert (body["created"], body["failed"]) == (2, 2)
+    assert [item["error"] is None for item in body["items"]] == [
+        False,
+        True,
+        False,
+        True,
+    ]
+    assert "already exists" in body["items"][2]["error"]
+    # One query for the names, the rest are inserts, batched where the dialect can
+    selects = [s for s in statements if s.startswith("SELECT")]
+    assert len(selects) == 1
+    assert all(s.startswith("INSERT INTO teams") for s in statements[1:])
+
+    with session_factory() as session:
+        created = session.scalars(select(Team.name).where(Team.id > 2)).all()
+    assert created == ["New", "Another"]
+
+
+def test_atomic_batch_creates_nothing_on_errors(client, session_factory):
+    response = client.post(
+        "/teams:batch",
+        json={"items": [{"name": "Existing"}, {"name": "Fresh"}], "atomic": True},
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["index"] == 0
+    with session_factory() as session:
+        assert session.scalar(select(func.count()).select_from(Team)) == 2
+
+
+def test_matches_batch_checks_competitions_and_teams(client):
+    match = {"match_date": datetime(2025, 5, 1).isoformat()}
+    items = [
+        {**match, "competition_id": 1, "team1_id": 1, "team2_id": 2},
+        {**match, "competition_id": 9, "team1_id": 1, "team2_id": 2},
+        {**match, "competition_id": 1, "team1_id": 1, "team2_id": 7},
+        {**match, "competition_id": 1, "team1_id": 2, "team2_id": 2},
+    ]
+    response = client.post("/matches:batch", json={"items": items})
+
+    errors = [item["error"] for item in response.json()["items"]]
+    assert errors == [
+        None,
+        "Competition with ID 9 not found",
+        "Team with ID 7 not found",
+        "A team cannot play against itself",
+    ]
+
+
+def test_competition_teams_batch(client, session_factory):
+    response = client.post(
+        "/competitions/1/teams:batch",
+        json={"items": [{"team_id": 1}, {"team_id": 2}, {"team_id": 5}]},
+    )
+
+    errors = [item["error"] for item in response.json()["items"]]
+    assert errors[0] is None
+    assert "already entered" in errors[1]
+    assert errors[2] == "Team with ID 5 not found"
+    with session_factory() as session:
+        entered = session.scalars(
+            select(TeamCompetition.team_id).where(TeamCompetition.competition_id == 1)
+        ).all()
+    assert sorted(entered) == [1, 2]
+
+    missing = client.post(
+        "/competitions/3/teams:batch", json={"items": [{"team_id": 1}]}
+    )
+    assert missing.status_code == 404
+
+
+def test_players_batch(client):
+    response = client.post(
+        "/players:batch",
+        json={
+            "items": [
+                {"first_name": "Ada", "last_name": "Lovelace", "nationality": "GB"},
+                {"first_name": "Alan", "last_name": "Turing"},
+            ]
+        },
+    )
+
+    assert response.status_code == 201
+    assert [item["id"] for item in response.json()["items"]] == [1, 2]
@@ -0,0 +1,151 @@
+import gzip
+import brotli
+import zstandard
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+import api.v1.middleware.compression as compression_middleware
+from api.v1.compression import (
+    COMPRESSED_BYTES,
+    PrecompressedCache,
+    compressor,
+    negotiate,
+)
+from api.v1.middleware.compression import CompressionMiddleware
+
+ROWS = [{"id": index, "name": "Line Fault Dodgeball Club"} for index in range(200)]
+
+
+def _build_app(cache=None):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, cache=cache)
+    calls = []
+    etags = ["v1"]
+
+    @app.get("/rows")
+    def get_rows() -> list[dict]:
+        return ROWS
+
+    @app.get("/small")
+    def get_small() -> dict:
+        return {"id": 1}
+
+    @app.get("/archived")
+    def get_archived(request: Request, response: Response) -> list[dict]:
+        calls.append(1)
+        response.headers["Cache-Control"] = "public, max-age=60"
+        # Stands in for per request headers such as CORS's
+        response.headers["X-Echo"] = request.headers.get("x-echo", "")
+        response.headers["ETag"] = f'W/"{etags[0]}"'
+        return ROWS
+
+    @app.get("/stream")
+    def get_stream() -> StreamingResponse:
+        chunks = (b'{"row": %d}\n' % index * 50 for index in range(5))
+        return StreamingResponse(chunks, media_type="application/x-ndjson+json")
+
+    return app, calls, etags
+
+
+def test_negotiate_prefers_zstd_then_brotli_then_gzip():
+    assert negotiate("gzip, deflate, br, zstd") == "zstd"
+    assert negotiate("gzip, br") == "br"
+    assert negotiate("gzip;q=0.5, zstd;q=0") == "gzip"
+    assert negotiate("*") == "zstd"
+    assert negotiate("*, zstd;q=0, br;q=0") == "gzip"
+    assert negotiate("identity") is None
+    assert negotiate("") is None
+
+
+def test_streaming_compressors_round_trip():
+    data = b"line fault " * 200
+    decoders = {
+        "gzip": gzip.decompress,
+        "br": brotli.decompress,
+        "zstd": lambda body: zstandard.ZstdDecompressor()
+        .decompressobj()
+        .decompress(body),
+    }
+    for encoding, decode in decoders.items():
+        codec = compressor(encoding)
+        body = (
+            codec.compress(data[:1000]) + codec.compress(data[1000:]) + codec.finish()
+        )
+        assert decode(body) == data
+
+
+def test_compresses_large_responses_only():
+    client = TestClient(_build_app()[0])
+
+    response = client.get("/rows", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == ROWS
+    assert int(response.headers["content-length"]) < len(response.content) / 5
+    assert COMPRESSED_BYTES._values[("/rows", "gzip")] > 0
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+    plain = client.get("/rows", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+
+def test_streamed_responses_are_compressed_per_chunk():
+    client = TestClient(_build_app()[0])
+
+    response = client.get("/stream", headers={"Accept-Encoding": "br"})
+    assert response.headers["content-encoding"] == "br"
+    assert "content-length" not in response.headers
+    assert response.content.count(b'{"row": 4}') == 50
+
+
+def test_etag_responses_are_served_precompressed(monkeypatch):
+    compressed = []
+
+    def counting_compressor(encoding):
+        compressed.append(encoding)
+        return compressor(encoding)
+
+    monkeypatch.setattr(compression_middleware, "compressor", counting_compressor)
+    cache = PrecompressedCache()
+    app, calls, etags = _build_app(cache)
+    client = TestClient(app)
+
+    first = client.get("/archived", headers={"Accept-Encoding": "zstd", "X-Echo": "a"})
+    second = client.get("/archived", headers={"Accept-Encoding": "zstd", "X-Echo": "b"})
+    assert second.json() == first.json() == ROWS
+    assert second.headers["content-encoding"] == "zstd"
+    assert second.headers["content-length"] == first.headers["content-length"]
+    assert second.headers["vary"] == "Accept-Encoding"
+    # Headers are the ones the app sent this time, not the cached response's
+    assert second.headers["x-echo"] == "b"
+    # The app answers every time, only the compression is skipped
+    assert len(calls) == 2
+    assert compressed == ["zstd"]
+
+    client.get("/archived", headers={"Accept-Encoding": "gzip"})
+    assert compressed == ["zstd", "gzip"]
+
+    # A new generation never matches the old body
+    etags[0] = "v2"
+    third = client.get("/archived", headers={"Accept-Encoding": "zstd"})
+    assert third.headers["etag"] == 'W/"v2"'
+    assert compressed == ["zstd", "gzip", "zstd"]
+
+    # Responses without an ETag aren't cached
+    client.get("/rows", headers={"Accept-Encoding": "zstd"})
+    assert sorted(cache._entries) == [
+        ("/archived", b"", "gzip", 'W/"v1"'),
+        ("/archived", b"", "zstd", 'W/"v1"'),
+        ("/archived", b"", "zstd", 'W/"v2"'),
+    ]
+
+
+def test_cache_evicts_past_max_bytes():
+    cache = PrecompressedCache(max_bytes=10)
+    cache.put(("/a", b"", "gzip"), [], b"123456", 60)
+    cache.put(("/b", b"", "gzip"), [], b"123456", 60)
+    assert cache.get(("/a", b"", "gzip")) is None
+    assert cache.get(("/b", b"", "gzip")) == ([], b"123456")
+    assert cache.size == 6
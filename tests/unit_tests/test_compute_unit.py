@@ -0,0 +1,50 @@
+import time
+import numpy as np
+import pytest
+from database.analytics import throw_heatmap
+from database.compute import ComputeBusy, ComputePool, ComputeTimeout, ResultTooLarge
+
+
+@pytest.fixture
+def pool():
+    pool = ComputePool(max_workers=1, max_pending=1, timeout_s=0.5)
+    yield pool
+    pool.shutdown()
+
+
+def test_runs_in_pool(pool):
+    assert pool.run(sum, [1, 2, 3]) == 6
+    assert pool.run(sorted, [3, 1, 2], reverse=True) == [3, 2, 1]
+
+
+def test_result_size_limit(pool):
+    pool.max_result_bytes = 1000
+    with pytest.raises(ResultTooLarge):
+        pool.run(bytes, 2000)
+    # The failed call frees its slot
+    assert pool.run(bytes, 10) == bytes(10)
+
+
+def test_timed_out_work_keeps_its_slot(pool):
+    with pytest.raises(ComputeTimeout):
+        pool.run(time.sleep, 2.0)
+    with pytest.raises(ComputeBusy):
+        pool.run(sum, [1])
+
+
+def test_throw_heatmap():
+    x = np.array([0.5, 1.0, 17.5, 9.0])
+    y = np.array([0.5, 8.5, 4.5, 4.5])
+    hit = np.array([True, False, True, False])
+
+    heatmap = throw_heatmap(x, y, hit, bins_x=2, bins_y=1)
+    assert heatmap["cell_length"] == 9.0
+    assert heatmap["cell_width"] == 9.0
+    # x = 9.0 falls in the second half
+    assert heatmap["throws"] == [[2], [2]]
+    assert heatmap["hits"] == [[1], [1]]
+    assert heatmap["hit_rate"] == [[0.5], [0.5]]
+
+    empty = throw_heatmap(x[:0], y[:0], hit[:0], bins_x=1, bins_y=2)
+    assert empty["throws"] == [[0, 0]]
+    assert empty["hit_rate"] == [[None, None]]
@@ -0,0 +1,126 @@
+import re
+from datetime import datetime, timezone
+from sqlalchemy.dialects import postgresql
+import database.counters as counters
+from database.models import CatchEvent, EliminationEvent, Set, ThrowEvent
+from database.models.elimination_event import EliminationCause
+
+
+class FakeSession:
+    def __init__(self, new=(), deleted=(), dirty=()):
+        self.new = list(new)
+        self.deleted = list(deleted)
+        self.dirty = list(dirty)
+
+    def connection(self):
+        return None
+
+
+def _record_calls(monkeypatch) -> list:
+    calls = []
+    monkeypatch.setattr(
+        counters,
+        "apply_event",
+        lambda conn, counter, set_id, player_id, delta, at: calls.append(
+            (counter, set_id, player_id, delta, at)
+        ),
+    )
+    monkeypatch.setattr(
+        counters, "init_counters", lambda conn, set_ids: calls.append(list(set_ids))
+    )
+    return calls
+
+
+def test_flushed_events_update_their_counters(monkeypatch):
+    calls = _record_calls(monkeypatch)
+    now = datetime(2025, 1, 1)
+    session = FakeSession(
+        new=[
+            Set(id=3, match_id=1, set_number=1, start_time=now),
+            ThrowEvent(set_id=3, player_id=7, timestamp=now),
+            CatchEvent(set_id=3, player_id=8, timestamp=now, throw_event_id=1),
+        ],
+        deleted=[
+            EliminationEvent(
+                set_id=3, eliminated_player_id=7, cause=EliminationCause.DIRECT_HIT
+            )
+        ],
+    )
+
+    counters._update_counters(session, None)
+
+    assert calls[:3] == [
+        [3],
+        ("throws", 3, 7, 1, now),
+        ("catches", 3, 8, 1, now),
+    ]
+    # An elimination happened when the throw or catch that caused it did
+    assert calls[3][:4] == ("eliminations", 3, 7, -1)
+    elimination_at = str(calls[3][4].compile(dialect=postgresql.dialect()))
+    assert elimination_at.startswith("coalesce(")
+
+
+def test_apply_event_is_a_single_upsert_on_the_counter_key():
+    statements = []
+
+    class Conn:
+        def execute(self, statement):
+            statements.append(str(statement.compile(dialect=postgresql.dialect())))
+
+    counters.apply_event(
+        Conn(), "catches", set_id=3, player_id=8, delta=-1, at=datetime(2025, 1, 1)
+    )
+
+    assert len(statements) == 1
+    assert statements[0].startswith("INSERT INTO set_team_counters")
+    assert "ON CONFLICT (set_id, team_id) DO UPDATE SET catches = " in statements[0]
+    assert "player_team_history" in statements[0]
+
+
+def test_sides_count_only_players_on_the_team_at_the_time():
+    statements = []
+
+    class Conn:
+        def execute(self, statement):
+            statements.append(str(statement.compile(dialect=postgresql.dialect())))
+
+    counters.apply_event(
+        Conn(), "throws", set_id=3, player_id=7, delta=1, at=datetime(2025, 1, 1)
+    )
+
+    # The player's tenure and the starting roster both hold at their own times
+    assert statements[0].count("player_team_history.tenure @>") == 2
+    assert "least(" in statements[0]
+    assert "starting_players" in statements[0]
+
+
+def test_events_posted_with_an_offset_compare_as_timestamps():
+    statements = []
+
+    class Conn:
+        def execute(self, statement):
+            statements.append(str(statement.compile(dialect=postgresql.dialect())))
+
+    class Session(FakeSession):
+        def connection(self):
+            return Conn()
+
+    # As the API parses "2025-01-01T10:00:00Z"
+    at = datetime(2025, 1, 1, 10, tzinfo=timezone.utc)
+    session = Session(
+        new=[
+            ThrowEvent(set_id=3, player_id=7, timestamp=at),
+            EliminationEvent(
+                set_id=3, eliminated_player_id=7, cause=EliminationCause.LINE_FAULT
+            ),
+        ]
+    )
+
+    counters._update_counters(session, None)
+
+    throw, elimination = statements
+    assert re.search(
+        r"tenure @> CAST\(%\(param_\d+\)s AS TIMESTAMP WITHOUT TIME ZONE\)", throw
+    )
+    # now() is a timestamptz, the coalesce would be one too
+    assert re.search(r"coalesce\(.*, LOCALTIMESTAMP\)", elimination, re.DOTALL)
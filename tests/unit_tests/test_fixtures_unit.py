@@ -0,0 +1,146 @@
+from collections import Counter
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+from database.fixtures import round_robin, slot_fixtures
+from database.models import Competition, Match, Organisation, Team, TeamCompetition
+from database.models.competition import AgeCategory, CompetitionFormat, CourtSize
+from database.repositories.competition import CompetitionRepository
+from database.repositories.match import MatchRepository
+
+
+@pytest.mark.parametrize("teams", [2, 5, 20])
+def test_double_round_robin_meets_every_pair_home_and_away(teams):
+    rounds = round_robin(range(1, teams + 1))
+
+    matches = [match for matches in rounds for match in matches]
+    assert len(rounds) == 2 * (teams - 1 + teams % 2)
+    assert len(matches) == teams * (teams - 1)
+    assert len(set(matches)) == len(matches)
+    for matches_in_round in rounds:
+        playing = [team for match in matches_in_round for team in match]
+        assert len(playing) == len(set(playing))
+
+
+def test_single_round_robin_balances_home_games():
+    rounds = round_robin(range(1, 11), double=False)
+
+    pairs = [frozenset(match) for matches in rounds for match in matches]
+    assert len(pairs) == len(set(pairs)) == 45
+    home_games = Counter(home for matches in rounds for home, _ in matches)
+    assert max(home_games.values()) - min(home_games.values()) <= 1
+
+
+def test_round_robin_needs_two_teams():
+    assert round_robin([1]) == []
+
+
+def test_slot_fixtures_spreads_rounds_and_courts():
+    start = datetime(2025, 9, 6, 10)
+    rounds = round_robin(range(1, 7), double=False)
+
+    fixtures = slot_fixtures(
+        rounds, start, days_between_rounds=7, courts=2, match_minutes=45
+    )
+
+    first_round = [fixture.match_date for fixture in fixtures if fixture.round == 1]
+    assert first_round == [start, start, start + timedelta(minutes=45)]
+    assert fixtures[-1].round == 5
+    assert fixtures[-1].match_date.date() == (start + timedelta(days=28)).date()
+
+
+@pytest.fixture(autouse=True)
+def seed(session_factory):
+    with session_factory() as session:
+        organisation = Organisation(name="Line Fault", country_code="GB")
+        session.add(organisation)
+        session.flush()
+        for competition_id, competition_format in (
+            (1, CompetitionFormat.LEAGUE),
+            (2, CompetitionFormat.TOURNAMENT),
+        ):
+            session.add(
+                Competition(
+                    id=competition_id,
+                    name=f"Competition {competition_id}",
+                    competition_format=competition_format,
+                    organisation_id=organisation.id,
+                    age_category=AgeCategory.ADULT,
+                    court_size=CourtSize.BD,
+                )
+            )
+        teams = range(1, 5)
+        session.add_all([Team(id=team_id, name=f"Team {team_id}") for team_id in teams])
+        session.add_all(
+            [TeamCompetition(team_id=team_id, competition_id=1) for team_id in teams]
+        )
+        session.commit()
+
+
+def test_generate_fixtures_dry_run_then_create(client, session_factory):
+    options = {"start": datetime(2025, 9, 6, 10).isoformat()}
+
+    preview = client.post("/competitions/1/fixtures", json={**options, "dry_run": True})
+    assert preview.status_code == 200
+    assert preview.json()["rounds"] == 6
+    assert len(preview.json()["fixtures"]) == 12
+    with session_factory() as session:
+        assert session.scalar(select(func.count()).select_from(Match)) == 0
+
+    created = client.post("/competitions/1/fixtures", json=options)
+    assert created.status_code == 201
+    fixtures = created.json()["fixtures"]
+    assert [
+        {key: value for key, value in fixture.items() if key != "id"}
+        for fixture in fixtures
+    ] == [
+        {key: value for key, value in fixture.items() if key != "id"}
+        for fixture in preview.json()["fixtures"]
+    ]
+    with session_factory() as session:
+        assert session.scalars(select(Match.id).order_by(Match.id)).all() == [
+            fixture["id"] for fixture in fixtures
+        ]
+
+    again = client.post("/competitions/1/fixtures", json=options)
+    assert again.status_code == 409
+
+
+def test_generate_fixtures_only_for_leagues(client):
+    response = client.post(
+        "/competitions/2/fixtures", json={"start": datetime(2025, 9, 6).isoformat()}
+    )
+    assert response.status_code == 400
+
+
+def test_generate_fixtures_locks_the_competition_before_checking(client, monkeypatch):
+    calls = []
+    lock, has_matches = CompetitionRepository.lock, MatchRepository.has_matches
+    monkeypatch.setattr(
+        CompetitionRepository,
+        "lock",
+        lambda repo, competition_id: calls.append("lock") or lock(repo, competition_id),
+    )
+    monkeypatch.setattr(
+        MatchRepository,
+        "has_matches",
+        lambda repo, competition_id: calls.append("check")
+        or has_matches(repo, competition_id),
+    )
+
+    # A double submit waits on the lock, then sees the first request's matches
+    client.post("/competitions/1/fixtures", json={"start": "2025-09-06T10:00:00"})
+    assert calls == ["lock", "check"]
+
+    class Session:
+        def execute(self, sql):
+            self.sql = str(sql.compile(dialect=postgresql.dialect()))
+            return self
+
+        def scalar_one_or_none(self):
+            return None
+
+    session = Session()
+    CompetitionRepository(session).lock(1)
+    assert session.sql.endswith("FOR UPDATE")
@@ -0,0 +1,59 @@
+import numpy as np
+import database.geometry as geometry
+from database.models.throw_geometry import CourtSide
+
+
+def test_throw_geometry_faces_each_team_towards_the_opponents():
+    # Team A throws from x < 9 towards +x, team B from x > 9 towards -x
+    x = np.array([3.0, 15.0, 3.0, 4.0])
+    y = np.array([1.0, 1.0, 8.0, np.nan])
+    target_x = np.array([7.0, 11.0, 6.0, 10.0])
+    target_y = np.array([4.0, 4.0, 8.0, 2.0])
+
+    distance, angle, sides = geometry.throw_geometry(x, y, target_x, target_y)
+
+    assert np.allclose(distance[:3], [5.0, 5.0, 3.0])
+    assert np.isnan(distance[3])
+    assert np.allclose(angle[:3], [36.869898, -36.869898, 0.0])
+    assert [geometry.COURT_SIDES[side] for side in sides[:3]] == [
+        CourtSide.RIGHT,
+        CourtSide.LEFT,
+        CourtSide.LEFT,
+    ]
+    assert sides[3] == -1
+
+
+def test_geometry_rows_store_missing_locations_as_null():
+    rows = geometry._geometry_rows(
+        [1, 1], [10, 11], [[3.0, None], [4.5, None], [7.0, 10.0], [4.5, 2.0]]
+    )
+
+    assert rows[0] == {
+        "set_id": 1,
+        "throw_event_id": 10,
+        "distance": 4.0,
+        "angle": 0.0,
+        "court_side": CourtSide.CENTRE,
+    }
+    assert rows[1]["distance"] is None
+    assert rows[1]["court_side"] is None
+
+
+class FakeConnection:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, stmt, parameters=None):
+        self.statements.append((stmt, parameters))
+
+
+def test_store_geometry_upserts_in_one_statement():
+    conn = FakeConnection()
+    geometry.store_geometry(conn, [])
+    assert conn.statements == []
+
+    rows = geometry._geometry_rows([1, 2], [10, 20], [[3.0, 3.0]] * 4)
+    geometry.store_geometry(conn, rows)
+    ((stmt, parameters),) = conn.statements
+    assert "ON CONFLICT (set_id, throw_event_id) DO UPDATE" in str(stmt)
+    assert parameters == rows
@@ -0,0 +1,156 @@
+import re
+from contextlib import contextmanager
+from types import SimpleNamespace
+from sqlalchemy.dialects import postgresql
+import database.jobs as jobs
+from database.models.job import JobKind
+
+
+class FakeConnection:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return SimpleNamespace(
+            scalar_one=lambda: 7, one_or_none=lambda: None, rowcount=0
+        )
+
+
+class FakeEngine:
+    def __init__(self):
+        self.conn = FakeConnection()
+
+    @contextmanager
+    def begin(self):
+        yield self.conn
+
+
+class FakeSession:
+    def __init__(self):
+        self.committed = False
+        self.closed = False
+
+    def commit(self):
+        self.committed = True
+
+    def close(self):
+        self.closed = True
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_dedup_key_ignores_argument_order():
+    assert jobs.dedup_key(
+        JobKind.REBUILD_THROW_GEOMETRY, {"competition_id": 3, "batch_size": 10}
+    ) == jobs.dedup_key(
+        JobKind.REBUILD_THROW_GEOMETRY, {"batch_size": 10, "competition_id": 3}
+    )
+    assert jobs.dedup_key(JobKind.REBUILD_STANDINGS, {}) != jobs.dedup_key(
+        JobKind.REBUILD_COUNTERS, {}
+    )
+
+
+def test_every_kind_has_a_handler():
+    assert set(jobs.JOB_HANDLERS) == set(JobKind)
+
+
+def test_enqueue_checks_arguments_and_merges_pending_duplicates():
+    conn = FakeConnection()
+    try:
+        jobs.enqueue(conn, JobKind.ARCHIVE_COMPETITION, {})
+    except jobs.JobError:
+        pass
+    else:
+        raise AssertionError("expected JobError")
+    assert conn.statements == []
+
+    assert jobs.enqueue(conn, JobKind.ARCHIVE_COMPETITION, {"competition_id": 3}) == 7
+    sql = _sql(conn.statements[0])
+    assert "ON CONFLICT (dedup_key) WHERE status = 'PENDING' DO UPDATE" in sql
+    assert "greatest(jobs.priority, excluded.priority)" in sql
+
+
+def test_claim_skips_locked_jobs_in_priority_order():
+    conn = FakeConnection()
+    assert jobs.claim(conn, "worker-1") is None
+
+    sql = _sql(conn.statements[0])
+    assert sql.startswith("UPDATE jobs SET")
+    assert "ORDER BY jobs.priority DESC, jobs.run_after, jobs.id" in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "RETURNING jobs.id" in sql
+
+
+def test_failed_runs_retry_with_backoff_unless_out_of_attempts():
+    conn = FakeConnection()
+    jobs.fail(conn, 3, "worker-1", "boom")
+
+    sql = _sql(conn.statements[0])
+    assert "jobs.attempts < jobs.max_attempts" in sql
+    assert "CAST(CASE" in sql and "AS jobstatus)" in sql
+    assert "make_interval" in sql
+
+
+def test_runs_are_only_recorded_by_the_lease_holder():
+    conn = FakeConnection()
+    assert jobs.succeed(conn, 3, "worker-1", {}) is False
+    assert jobs.fail(conn, 3, "worker-1", "boom") is False
+    assert jobs.renew_lease(conn, 3, "worker-1") is False
+
+    for stmt in conn.statements:
+        sql = _sql(stmt)
+        assert "jobs.locked_by = %(locked_by_1)s" in sql
+        assert re.search(r"jobs.status = %\(status_\d\)s", sql)
+    assert "locked_at=now()" in _sql(conn.statements[2])
+
+
+def test_worker_records_success_and_failure(monkeypatch):
+    engine = FakeEngine()
+    claimed = [
+        SimpleNamespace(id=1, kind=JobKind.REBUILD_STANDINGS, arguments={}),
+        SimpleNamespace(
+            id=2, kind=JobKind.REBUILD_STANDINGS, arguments={"competition_id": 4}
+        ),
+        None,
+    ]
+    outcomes = []
+    monkeypatch.setattr(jobs, "claim", lambda conn, worker_id: claimed.pop(0))
+    monkeypatch.setattr(
+        jobs,
+        "succeed",
+        lambda conn, job_id, worker_id, result: outcomes.append((job_id, result)),
+    )
+    monkeypatch.setattr(
+        jobs,
+        "fail",
+        lambda conn, job_id, worker_id, error, backoff_s: outcomes.append(
+            (job_id, error)
+        ),
+    )
+
+    def handler(session, competition_id=None):
+        if competition_id is not None:
+            raise ValueError("no such competition")
+        return {"competitions": 2}
+
+    monkeypatch.setitem(jobs.JOB_HANDLERS, JobKind.REBUILD_STANDINGS, handler)
+    sessions = []
+
+    def session_factory():
+        sessions.append(FakeSession())
+        return sessions[-1]
+
+    worker = jobs.JobWorker(engine, session_factory, worker_id="test")
+    assert worker.run_once() is True
+    assert worker.run_once() is True
+    assert worker.run_once() is False
+
+    assert outcomes == [
+        (1, {"competitions": 2}),
+        (2, "ValueError: no such competition"),
+    ]
+    assert sessions[0].committed and not sessions[1].committed
+    assert all(session.closed for session in sessions)
@@ -0,0 +1,83 @@
+import asyncio
+import time
+from collections import defaultdict
+from pathlib import Path
+from random import Random
+import httpx
+from loadtest.report import RouteStats, build_report, percentile
+from loadtest.runner import BODY_BUILDERS, ScenarioState, _virtual_user
+from loadtest.scenario import RequestSpec, Scenario, UserSpec, load_scenario
+
+SCENARIOS = Path(__file__).parents[2] / "loadtest" / "scenarios"
+
+
+def test_percentile_uses_nearest_rank():
+    values = sorted(float(v) for v in range(1, 101))
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 99) == 0.0
+
+
+def test_report_summarises_routes_and_total():
+    throws = RouteStats()
+    for latency in (0.01, 0.02, 0.03, 0.04):
+        throws.record(latency, ok=True, size=100)
+    reads = RouteStats()
+    reads.record(0.5, ok=False)
+
+    report = build_report({"POST /throw-events/": throws, "GET /sets/": reads}, 2.0)
+
+    assert report["routes"]["POST /throw-events/"]["requests"] == 4
+    assert report["routes"]["POST /throw-events/"]["throughput_rps"] == 2.0
+    assert report["routes"]["GET /sets/"]["error_rate"] == 1.0
+    assert report["total"]["requests"] == 5
+    assert report["total"]["errors"] == 1
+    assert report["total"]["p99_ms"] == 500.0
+
+
+def test_bundled_scenario_loads():
+    scenario = load_scenario(SCENARIOS / "live_tournament.json")
+
+    users = {user.name: user for user in scenario.users}
+    assert users["scorer"].count == 200
+    assert users["viewer"].count == 5000
+    assert "POST /throw-events/" in {r.route for r in users["scorer"].requests}
+
+
+def test_body_builders_wait_for_data_to_reference():
+    state = ScenarioState(Scenario("empty", "http://test", 1.0, ()))
+    state.recent_throws[1].append(1)
+
+    for builder in BODY_BUILDERS.values():
+        assert builder(Random(0), state) is None
+
+
+def test_virtual_user_survives_a_non_json_response():
+    throw = RequestSpec("POST", "/throw-events/", body="throw_event")
+    user = UserSpec("scorer", 1, 0.0, (throw,))
+    state = ScenarioState(
+        Scenario(
+            "throws",
+            "http://test",
+            1.0,
+            (user,),
+            data={"set_ids": [1], "player_ids": [1]},
+        )
+    )
+    stats = defaultdict(RouteStats)
+    transport = httpx.MockTransport(lambda request: httpx.Response(201, text="created"))
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            await _virtual_user(
+                client, user, state, stats, Random(0), 0.0, time.monotonic() + 0.05
+            )
+
+    asyncio.run(run())
+    assert stats[throw.route].latencies_s
+    assert stats[throw.route].errors == 0
+    assert not state.recent_throws
@@ -0,0 +1,59 @@
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from api.v1.metrics import REGISTRY, TimedRoute
+from api.v1.middleware.metrics import MetricsMiddleware
+from database.instrumentation import instrument_engine, track_queries
+
+
+def _build_app():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+
+    router = APIRouter(prefix="/things", route_class=TimedRoute)
+
+    @router.get("/{thing_id}")
+    def get_thing(thing_id: int) -> dict:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return {"id": thing_id}
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(router)
+    return app
+
+
+def test_track_queries_counts_statements():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+
+    with track_queries() as stats:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    assert stats.statements == 1
+    assert stats.db_time_s > 0
+
+
+def test_middleware_adds_server_timing_and_records_route_metrics():
+    client = TestClient(_build_app())
+
+    response = client.get("/things/7")
+
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert "db;dur=" in timing
+    assert "handler;dur=" in timing
+    assert "serialise;dur=" in timing
+
+    rendered = REGISTRY.render()
+    assert (
+        'db_statements_per_request_count{method="GET",route="/things/{thing_id}"}'
+        in rendered
+    )
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/things/{thing_id}",status="200"}'
+        in rendered
+    )
@@ -0,0 +1,78 @@
+from datetime import datetime
+from sqlalchemy.dialects import postgresql
+import database.outcomes as outcomes
+from database.models import CatchEvent, EliminationEvent, ThrowEvent
+from database.models.elimination_event import EliminationCause
+
+
+class FakeConnection:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+
+
+class FakeSession:
+    def __init__(self, new=(), dirty=(), deleted=()):
+        self.new = list(new)
+        self.dirty = list(dirty)
+        self.deleted = list(deleted)
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_resolve_outcomes_prefers_catches_over_hits():
+    conn = FakeConnection()
+    outcomes.resolve_outcomes(conn, [(1, 10), (2, 20)])
+
+    assert len(conn.statements) == 1
+    sql = _sql(conn.statements[0])
+    assert sql.startswith("UPDATE throw_events SET outcome=CAST(CASE")
+    assert "AS throwoutcome)" in sql
+    assert "throw_events.set_id IN" in sql
+    order = [sql.index(f"THEN %(param_{i})s") for i in range(1, 6)]
+    assert order == sorted(order)
+    params = conn.statements[0].compile(dialect=postgresql.dialect()).params
+    assert [params[f"param_{i}"] for i in range(1, 7)] == [
+        "INVALID",
+        "REBOUND_CAUGHT",
+        "CAUGHT",
+        "HIT",
+        "BLOCKED",
+        "MISS",
+    ]
+
+
+def test_resolve_outcomes_skips_empty():
+    conn = FakeConnection()
+    outcomes.resolve_outcomes(conn, [])
+    assert conn.statements == []
+
+
+def test_affected_throws_follow_catch_and_elimination_references():
+    throw = ThrowEvent(id=5, set_id=1, player_id=1, timestamp=datetime(2025, 1, 1))
+    catch = CatchEvent(
+        id=1, set_id=1, player_id=2, throw_event_id=6, timestamp=datetime(2025, 1, 1)
+    )
+    elimination = EliminationEvent(
+        id=1,
+        set_id=2,
+        eliminated_player_id=3,
+        throw_event_id=7,
+        cause=EliminationCause.DIRECT_HIT,
+    )
+    unrelated = EliminationEvent(
+        id=2, set_id=2, eliminated_player_id=4, cause=EliminationCause.LINE_FAULT
+    )
+
+    session = FakeSession(new=[throw, catch, elimination, unrelated])
+    assert outcomes._affected_throws(session) == {(1, 5), (1, 6), (2, 7)}
+
+
+def test_deleted_throws_are_not_resolved():
+    throw = ThrowEvent(id=5, set_id=1, player_id=1, timestamp=datetime(2025, 1, 1))
+    session = FakeSession(deleted=[throw])
+    assert outcomes._affected_throws(session) == set()
@@ -0,0 +1,25 @@
+import pytest
+from database.main import build_parser
+from database.partitions import PARTITION_SIZE, PartitionError, check_lower
+
+
+def test_check_lower_accepts_range_starts_only():
+    check_lower(0)
+    check_lower(3 * PARTITION_SIZE)
+    for lower in (-PARTITION_SIZE, PARTITION_SIZE + 1):
+        with pytest.raises(PartitionError):
+            check_lower(lower)
+
+
+@pytest.mark.parametrize("action", ["detach", "attach"])
+def test_detach_and_attach_need_a_valid_lower(action):
+    parser = build_parser()
+    args = parser.parse_args(["partitions", action, "--lower", str(PARTITION_SIZE)])
+    assert args.lower == PARTITION_SIZE
+
+    for argv in (
+        ["partitions", action],
+        ["partitions", action, "--lower", str(PARTITION_SIZE + 1)],
+    ):
+        with pytest.raises(SystemExit):
+            parser.parse_args(argv)
@@ -0,0 +1,106 @@
+from datetime import datetime
+from sqlalchemy.dialects import postgresql
+import database.player_stats as player_stats
+from database.models import CatchEvent, EliminationEvent, ThrowEvent
+from database.models.elimination_event import EliminationCause
+
+
+class FakeConnection:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+
+
+class FakeSession:
+    def __init__(self, new=(), deleted=(), dirty=()):
+        self.new = list(new)
+        self.deleted = list(deleted)
+        self.dirty = list(dirty)
+
+    def connection(self):
+        return None
+
+
+def test_flushed_events_credit_the_player_who_made_them(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        player_stats,
+        "apply_stats",
+        lambda conn, set_id, kind, ref, deltas: calls.append(
+            (set_id, kind, ref, deltas)
+        ),
+    )
+    now = datetime(2025, 1, 1)
+    session = FakeSession(
+        new=[
+            ThrowEvent(set_id=3, player_id=7, timestamp=now, valid_attempt=True),
+            ThrowEvent(set_id=3, player_id=7, timestamp=now, valid_attempt=True),
+            ThrowEvent(set_id=3, player_id=9, timestamp=now, valid_attempt=False),
+            CatchEvent(
+                set_id=3,
+                player_id=8,
+                timestamp=now,
+                throw_event_id=1,
+                rebound_catch=True,
+            ),
+            EliminationEvent(
+                set_id=3,
+                eliminated_player_id=8,
+                cause=EliminationCause.DIRECT_HIT,
+                throw_event_id=1,
+            ),
+            EliminationEvent(
+                set_id=3, eliminated_player_id=8, cause=EliminationCause.LINE_FAULT
+            ),
+        ],
+        deleted=[
+            EliminationEvent(
+                set_id=3,
+                eliminated_player_id=7,
+                cause=EliminationCause.THROW_CAUGHT,
+                catch_event_id=2,
+            )
+        ],
+    )
+
+    player_stats._update_stats(session, None)
+
+    assert sorted(calls) == [
+        (3, "catch", 2, {"eliminations": -1}),
+        (3, "player", 7, {"throws": 2}),
+        (3, "player", 8, {"catches": 1, "rebound_catches": 1}),
+        (3, "throw", 1, {"eliminations": 1, "hits": 1}),
+    ]
+
+
+def test_apply_stats_is_a_single_upsert_resolving_the_thrower():
+    conn = FakeConnection()
+
+    player_stats.apply_stats(conn, 3, "throw", 1, {"hits": 1, "eliminations": 1})
+
+    (stmt,) = conn.statements
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("INSERT INTO player_competition_stats")
+    assert "SELECT throw_events.player_id" in sql
+    assert "ON CONFLICT (competition_id, player_id) DO UPDATE SET" in sql
+    assert "hits = (player_competition_stats.hits + excluded.hits)" in sql
+
+
+def test_rebuild_for_a_competition_only_reads_its_sets():
+    class Result:
+        rowcount = 4
+
+    conn = FakeConnection()
+    conn.execute = lambda stmt: conn.statements.append(stmt) or Result()
+
+    assert player_stats.rebuild_player_stats(conn, competition_id=2) == 4
+
+    delete, rebuild = (
+        str(stmt.compile(dialect=postgresql.dialect())) for stmt in conn.statements
+    )
+    assert delete.startswith("DELETE FROM player_competition_stats")
+    assert "FROM eliminations_archive JOIN throw_events_archive" in rebuild
+    # Every one of the eight event branches is limited to the competition's sets
+    assert rebuild.count("matches.competition_id = %(competition_id_1)s") == 8
@@ -0,0 +1,66 @@
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from api.v1.metrics import TimedRoute
+from api.v1.middleware.query_budget import QueryBudgetMiddleware
+from database.instrumentation import instrument_engine
+from database.query_budget import QueryBudgetExceeded, declare_query_budget
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    return engine
+
+
+def _run_per_row_queries(engine, rows):
+    with engine.connect() as conn:
+        for row_id in range(rows):
+            conn.execute(text("SELECT :id"), {"id": row_id})
+
+
+def test_budget_passes_within_limits(engine, query_budget):
+    with query_budget(max_statements=3, max_repeats=3) as budget:
+        _run_per_row_queries(engine, 3)
+
+    assert budget.statements == 3
+
+
+def test_budget_fails_on_total_statements(engine, query_budget):
+    with pytest.raises(QueryBudgetExceeded, match="4 statements run, budget is 2"):
+        with query_budget(max_statements=2, max_repeats=None):
+            _run_per_row_queries(engine, 4)
+
+
+def test_budget_fails_on_repeated_statement_shape(engine, query_budget):
+    with pytest.raises(QueryBudgetExceeded, match="repeated 5 times"):
+        with query_budget(max_repeats=4):
+            _run_per_row_queries(engine, 5)
+
+
+def test_middleware_replaces_response_when_route_exceeds_declared_budget(engine):
+    router = APIRouter(route_class=TimedRoute)
+
+    @router.get("/within")
+    @declare_query_budget(max_statements=2)
+    def within() -> dict:
+        _run_per_row_queries(engine, 2)
+        return {}
+
+    @router.get("/n-plus-one")
+    @declare_query_budget(max_statements=2)
+    def n_plus_one() -> dict:
+        _run_per_row_queries(engine, 6)
+        return {}
+
+    app = FastAPI()
+    app.add_middleware(QueryBudgetMiddleware, mode="raise")
+    app.include_router(router)
+    client = TestClient(app)
+
+    assert client.get("/within").status_code == 200
+    response = client.get("/n-plus-one")
+    assert response.status_code == 500
+    assert response.json()["violations"] == ["6 statements run, budget is 2"]
@@ -0,0 +1,99 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from api.v1.middleware.read_your_writes import ReadYourWritesMiddleware
+from database.routing import (
+    RoutingSession,
+    current_read_consistency,
+    format_lsn,
+    parse_lsn,
+    read_consistency,
+)
+
+
+class FakeMonitor:
+    def __init__(self, replay_lsn: int, healthy: bool = True):
+        self.replay_lsn = replay_lsn
+        self.healthy = healthy
+
+    def can_serve(self, min_lsn=None) -> bool:
+        return self.healthy and (min_lsn is None or self.replay_lsn >= min_lsn)
+
+
+def _session_factory(monitor):
+    primary = create_engine("sqlite://")
+    replica = create_engine("sqlite://")
+    for engine, name in ((primary, "primary"), (replica, "replica")):
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE source (name TEXT)"))
+            conn.execute(text("INSERT INTO source VALUES (:name)"), {"name": name})
+    return sessionmaker(
+        class_=RoutingSession, bind=primary, replica=replica, monitor=monitor
+    )
+
+
+def _source(session) -> str:
+    return session.execute(text("SELECT name FROM source")).scalar()
+
+
+def test_lsn_round_trips():
+    assert parse_lsn("16/B374D848") == (0x16 << 32) | 0xB374D848
+    assert format_lsn(parse_lsn("16/B374D848")) == "16/B374D848"
+    assert parse_lsn("0/10") < parse_lsn("1/0")
+
+
+def test_only_read_only_sessions_use_a_healthy_replica():
+    factory = _session_factory(FakeMonitor(replay_lsn=100))
+
+    with factory() as session:
+        assert _source(session) == "primary"
+    with factory(info={"read_only": True}) as session:
+        assert _source(session) == "replica"
+
+
+def test_reads_fall_back_to_primary_when_replica_is_behind_the_client():
+    factory = _session_factory(FakeMonitor(replay_lsn=100))
+
+    with read_consistency(min_lsn=101):
+        with factory(info={"read_only": True}) as session:
+            assert _source(session) == "primary"
+    with read_consistency(min_lsn=100):
+        with factory(info={"read_only": True}) as session:
+            assert _source(session) == "replica"
+
+
+def test_reads_fall_back_to_primary_when_replica_is_unhealthy():
+    factory = _session_factory(FakeMonitor(replay_lsn=100, healthy=False))
+
+    with factory(info={"read_only": True}) as session:
+        assert _source(session) == "primary"
+
+
+def test_middleware_reads_client_lsn_and_returns_write_lsn():
+    seen = {}
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.get("/read")
+    async def read() -> dict:
+        seen["min_lsn"] = current_read_consistency.get().min_lsn
+        return {}
+
+    @app.post("/write")
+    async def write() -> dict:
+        current_read_consistency.get().last_write_lsn = parse_lsn("0/2A")
+        return {}
+
+    client = TestClient(app)
+
+    response = client.post("/write")
+    assert response.headers["x-last-write-lsn"] == "0/2A"
+    assert "last_write_lsn=0/2A" in response.headers["set-cookie"]
+
+    client.get("/read")
+    assert seen["min_lsn"] == 0x2A
+
+    client.cookies.clear()
+    client.get("/read", headers={"X-Last-Write-LSN": "1/0"})
+    assert seen["min_lsn"] == 1 << 32
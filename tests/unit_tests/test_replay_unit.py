@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+import database.replay as replay
+from database.models import SetReplayCheckpoint
+from database.scoreboard import SetScoreboard, TeamScore
+
+START = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def _board() -> SetScoreboard:
+    return SetScoreboard(
+        set_id=1,
+        match_id=1,
+        start_time=START,
+        teams={
+            10: TeamScore(10, roster={1, 2}, starting_players=2),
+            20: TeamScore(20, roster={3, 4}, starting_players=2),
+        },
+    )
+
+
+def _at(seconds: int) -> datetime:
+    return START + timedelta(seconds=seconds)
+
+
+def _events() -> list[replay.ReplayEvent]:
+    return [
+        replay.ReplayEvent(_at(1), 0, 1, player_id=1),
+        replay.ReplayEvent(_at(1), 2, 1, player_id=3, cause="direct_hit"),
+        replay.ReplayEvent(_at(2), 0, 2, player_id=4),
+        replay.ReplayEvent(_at(2), 1, 1, player_id=2),
+        replay.ReplayEvent(_at(2), 2, 2, player_id=4, cause="throw_caught"),
+    ]
+
+
+class FakeSession:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+
+
+def test_snapshot_round_trips_through_json():
+    board = _board()
+    for replay_event in _events()[:2]:
+        replay.apply_event(board, replay_event)
+
+    restored = replay.restore(replay.snapshot(board))
+
+    assert restored.teams[20].players_alive == [4]
+    assert restored.teams[10].throws == 1
+    assert restored.eliminations == board.eliminations
+    assert restored._player_teams == board._player_teams
+
+
+def test_checkpoints_are_stored_every_n_events(monkeypatch):
+    replayer = replay.SetReplayer(checkpoint_every=2)
+    monkeypatch.setattr(replayer, "_start", lambda session, set_id: _board())
+    monkeypatch.setattr(replay, "event_stream", lambda session, set_id: _events())
+    session = FakeSession()
+
+    assert replayer.build_checkpoints(session, 1) == 2
+
+    _, stored = session.statements
+    rows = stored.compile().params
+    assert [rows[f"sequence_m{i}"] for i in range(2)] == [2, 4]
+    assert rows["event_id_m1"] == 1 and rows["kind_rank_m1"] == 1
+
+
+def test_seek_applies_only_events_after_the_checkpoint(monkeypatch):
+    replayer = replay.SetReplayer(checkpoint_every=2)
+    board = _board()
+    for replay_event in _events()[:2]:
+        replay.apply_event(board, replay_event)
+    checkpoint = SetReplayCheckpoint(
+        set_id=1,
+        sequence=2,
+        at=START + timedelta(seconds=1),
+        kind_rank=2,
+        event_id=1,
+        state=replay.snapshot(board),
+    )
+    streamed = []
+
+    def event_stream(session, set_id, after=None, until=None):
+        streamed.append((after, until))
+        return [e for e in _events() if e.key > after and e.at <= until]
+
+    monkeypatch.setattr(replayer, "_checkpoint", lambda session, set_id, at: checkpoint)
+    monkeypatch.setattr(replay, "event_stream", event_stream)
+    at = START + timedelta(seconds=2)
+
+    state = replayer.seek(None, 1, at)
+
+    assert streamed == [((checkpoint.at, 2, 1), at)]
+    assert state.events_applied == 5
+    assert state.checkpoint_sequence == 2
+    assert state.board.winning_team_id == 10
+    assert state.board.teams[20].players_alive == []
+
+
+def test_route_seeks_offset_times_as_naive_utc(client, monkeypatch):
+    import api.v1.routes.set as routes
+
+    seeks = []
+
+    def seek(session, set_id, at):
+        seeks.append(at)
+        return replay.ReplayState(_board(), at, 0, 0)
+
+    monkeypatch.setattr(routes.replayer, "seek", seek)
+
+    # The set is unfinished, so its duration runs up to the moment sought
+    response = client.get("/sets/1/replay", params={"at": "2025-01-01T13:00:30+01:00"})
+
+    assert response.status_code == 200
+    assert seeks == [_at(30)]
+    assert response.json()["duration_s"] == 30.0
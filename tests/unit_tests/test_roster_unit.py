@@ -0,0 +1,59 @@
+from datetime import datetime, timezone
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+from database.models import PlayerTeamHistory
+
+
+def _compile(element) -> str:
+    return str(element.compile(dialect=postgresql.dialect()))
+
+
+def test_tenure_is_a_generated_half_open_range():
+    ddl = _compile(CreateTable(PlayerTeamHistory.__table__))
+
+    assert (
+        "tenure TSRANGE GENERATED ALWAYS AS (tsrange(joined_at, left_at, '[)')) STORED"
+        in ddl
+    )
+
+
+def test_tenure_lookups_are_gist_indexed():
+    indexes = {
+        index.name: _compile(CreateIndex(index))
+        for index in PlayerTeamHistory.__table__.indexes
+    }
+
+    assert indexes["ix_player_team_history_player_id_tenure"].endswith(
+        "USING gist (player_id, tenure)"
+    )
+    assert indexes["ix_player_team_history_team_id_tenure"].endswith(
+        "USING gist (team_id, tenure)"
+    )
+
+
+def test_active_at_uses_range_containment():
+    at = datetime(2025, 1, 1)
+
+    as_of = _compile(
+        select(PlayerTeamHistory.id).where(PlayerTeamHistory.active_at(at))
+    )
+    current = _compile(
+        select(PlayerTeamHistory.id).where(PlayerTeamHistory.active_at())
+    )
+
+    assert "player_team_history.tenure @> %(tenure_1)s" in as_of
+    assert "player_team_history.tenure @> LOCALTIMESTAMP" in current
+
+
+def test_active_at_casts_aware_times_to_timestamp():
+    at = datetime(2025, 1, 1, 10, tzinfo=timezone.utc)
+
+    as_of = _compile(
+        select(PlayerTeamHistory.id).where(PlayerTeamHistory.active_at(at))
+    )
+
+    assert (
+        "player_team_history.tenure @> CAST(%(param_1)s AS TIMESTAMP WITHOUT TIME ZONE)"
+        in as_of
+    )
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+from api.v1.schemas.scoreboard import ScoreboardEliminationResponse
+from database.scoreboard import ScoreboardEngine, SetScoreboard, TeamScore
+
+START = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def _board() -> SetScoreboard:
+    return SetScoreboard(
+        set_id=1,
+        match_id=1,
+        start_time=START,
+        teams={
+            10: TeamScore(10, roster={1, 2}, starting_players=2),
+            20: TeamScore(20, roster={3, 4}, starting_players=2),
+        },
+    )
+
+
+def test_board_tracks_alive_players_and_elimination_order():
+    board = _board()
+
+    board.apply_throw(1)
+    board.apply_catch(4)
+    board.apply_elimination(3, "direct_hit", START + timedelta(seconds=5))
+    board.apply_elimination(99, "direct_hit", START)
+
+    assert board.teams[10].throws == 1
+    assert board.teams[20].catches == 1
+    assert board.teams[20].players_alive == [4]
+    assert board.teams[20].players_remaining == 1
+    assert [(e.player_id, e.team_id) for e in board.eliminations] == [(3, 20)]
+    assert not board.finished
+
+
+def test_last_elimination_decides_the_set():
+    board = _board()
+    end = START + timedelta(seconds=90)
+
+    assert not board.apply_elimination(1, "direct_hit", START)
+    assert board.apply_elimination(2, "throw_caught", end)
+
+    assert board.winning_team_id == 20
+    assert board.end_time == end
+    assert board.duration_s() == 90.0
+    assert not board.apply_elimination(3, "direct_hit", end)
+
+
+def test_engine_applies_committed_inserts_and_drops_rewritten_sets():
+    engine = ScoreboardEngine(resync_s=60)
+    board = _board()
+    engine._boards[1] = board
+
+    at = START + timedelta(seconds=30)
+    engine.apply(
+        [
+            ("insert", "throw", 1, 1, None, None),
+            ("insert", "elimination", 1, 3, "direct_hit", at),
+            ("insert", "throw", 2, 1, None, None),
+        ]
+    )
+    assert board.teams[10].throws == 1
+    assert board.teams[20].players_alive == [4]
+    # Timed as recorded, as a reload from the database would be
+    assert board.eliminations[-1].at == at
+
+    engine.apply([("delete", "elimination", 1, 3, None, None)])
+    assert 1 not in engine._boards
+
+
+def test_engine_serves_boards_from_memory_until_resync():
+    engine = ScoreboardEngine(resync_s=60)
+    board = _board()
+    engine._boards[1] = board
+
+    assert engine.get(session=None, set_id=1) is board
+
+    engine.forget(match_id=1)
+    assert engine._boards == {}
+
+
+def test_elimination_serialises_from_the_board():
+    board = _board()
+    board.apply_elimination(3, "direct_hit", START)
+
+    response = ScoreboardEliminationResponse.model_validate(board.eliminations[0])
+
+    assert response.cause == "direct_hit"
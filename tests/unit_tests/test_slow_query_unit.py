@@ -0,0 +1,35 @@
+from sqlalchemy import create_engine
+from database.instrumentation import track_queries
+from database.slow_query import SlowQueryRecorder, normalise_sql, parameter_shape
+
+
+def test_normalise_sql_replaces_literals_and_parameters():
+    statement = """SELECT sets.id FROM sets
+        WHERE sets.match_id = %(match_id_1)s AND sets.set_number IN (%(n_1)s, %(n_2)s, %(n_3)s)
+        AND sets.winning_team_id = 5 AND name = 'O''Brien'"""
+
+    assert normalise_sql(statement) == (
+        "SELECT sets.id FROM sets WHERE sets.match_id = ? "
+        "AND sets.set_number IN (?, ...) AND sets.winning_team_id = ? AND name = ?"
+    )
+
+
+def test_parameter_shape_hides_values():
+    assert parameter_shape({"id_1": 4, "name": "x"}) == {"id_1": "int", "name": "str"}
+    assert parameter_shape([{"a": 1}, {"a": 2}]) == {"rows": 2, "row": {"a": "int"}}
+
+
+def test_recorder_keeps_only_statements_over_threshold():
+    recorder = SlowQueryRecorder(threshold_ms=50, buffer_size=2)
+    conn = create_engine("sqlite://").connect()
+
+    with track_queries(route="/sets/{set_id}"):
+        recorder(conn, "SELECT 1", {}, 0.01)
+        recorder(conn, "SELECT 2", {}, 0.06)
+        recorder(conn, "SELECT 3", {}, 0.07)
+        recorder(conn, "SELECT 4", {}, 0.08)
+
+    records = recorder.records()
+    assert [r["sql"] for r in records] == ["SELECT ?", "SELECT ?"]
+    assert [r["duration_ms"] for r in records] == [80.0, 70.0]
+    assert records[0]["route"] == "/sets/{set_id}"
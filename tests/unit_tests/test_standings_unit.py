@@ -0,0 +1,91 @@
+from datetime import datetime
+from sqlalchemy.dialects import postgresql
+import database.standings as standings
+from database.models import Match, Set, TeamCompetition
+from database.models.match import MatchStatus
+
+
+class FakeConnection:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.statements = []
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, new=(), deleted=(), dirty=(), conn=None):
+        self.new = list(new)
+        self.deleted = list(deleted)
+        self.dirty = list(dirty)
+        self.conn = conn or FakeConnection()
+
+    def connection(self):
+        return self.conn
+
+
+def _compile(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_refresh_only_recomputes_the_given_teams():
+    conn = FakeConnection()
+
+    standings.refresh_standings(conn, 4, [1, 2])
+
+    stale, upsert = (_compile(stmt) for stmt in conn.statements)
+    assert stale.startswith("DELETE FROM competition_standings")
+    assert "competition_standings.team_id IN" in stale
+    assert upsert.startswith("INSERT INTO competition_standings")
+    assert "ON CONFLICT (competition_id, team_id) DO UPDATE" in upsert
+    assert "matches.status = %(status_1)s" in upsert
+    assert "team_competitions.team_id IN" in upsert
+
+
+def test_flushed_results_mark_both_teams_affected():
+    now = datetime(2025, 1, 1)
+    match = Match(
+        id=1,
+        competition_id=4,
+        team1_id=1,
+        team2_id=2,
+        match_date=now,
+        status=MatchStatus.COMPLETED,
+    )
+    session = FakeSession(
+        new=[match, TeamCompetition(team_id=5, competition_id=4)],
+        dirty=[Set(id=9, match_id=7, set_number=1, start_time=now)],
+        conn=FakeConnection(rows=[(6, 3, 8)]),
+    )
+
+    assert standings._affected(session) == {4: {1, 2, 5}, 6: {3, 8}}
+
+
+def test_cache_expires_and_is_invalidated_per_competition(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(standings.time, "monotonic", lambda: clock[0])
+    cache = standings.StandingsCache(ttl_s=10)
+    cache.put(1, ["table 1"])
+    cache.put(2, ["table 2"])
+
+    cache.invalidate([1])
+    assert cache.get(1) is None
+    assert cache.get(2) == ["table 2"]
+
+    clock[0] += 11
+    assert cache.get(2) is None
+
+
+def test_a_read_that_raced_an_invalidation_isnt_cached():
+    cache = standings.StandingsCache(ttl_s=10)
+    generation = cache.generation(1)
+
+    # A result commits while the table is being read
+    cache.invalidate([1])
+    cache.put(1, ["stale table"], generation)
+    assert cache.get(1) is None
+
+    cache.put(1, ["table"], cache.generation(1))
+    assert cache.get(1) == ["table"]
@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from fastapi.testclient import TestClient
+import database.db as db
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# The app imports in about 1.2s, headroom for slow CI machines without hiding a heavy import
+IMPORT_TIME_BUDGET_S = float(os.getenv("IMPORT_TIME_BUDGET_S", "2.0"))
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds of every module a fresh interpreter loads"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_app_import_is_within_budget_and_doesnt_connect():
+    times = _import_times("api.v1.main")
+
+    assert times["api.v1.main"] / 1e6 < IMPORT_TIME_BUDGET_S
+    # Drivers load when the lifespan creates the engine, setup tools with their commands
+    assert "psycopg2" not in times
+    assert "sqlalchemy_utils" not in times
+
+
+def test_db_import_leaves_services_and_listeners_to_first_use():
+    times = _import_times("database.db")
+
+    # Repositories, the CLI and workers import it, analytics and numpy load when used
+    for module in ("numpy", "database.analytics", "database.compute", "database.xhit"):
+        assert module not in times
+
+
+def test_lifespan_warms_up_and_disposes_the_pool(sqlite_url, monkeypatch):
+    monkeypatch.setattr(db, "DATABASE_URL", sqlite_url)
+    monkeypatch.setenv("DATABASE_POOL_WARM_UP", "3")
+    from api.v1.main import app
+
+    client = TestClient(app)
+    not_ready = client.get("/internal/ready")
+    assert not_ready.status_code == 503
+    assert not_ready.json()["primary"] is None
+
+    with client:
+        assert db._engines["engine"].pool.checkedin() == 3
+        ready = client.get("/internal/ready")
+        assert ready.status_code == 200
+        assert ready.json()["ready"]
+        assert ready.json()["primary"]["size"] == 5
+        assert ready.json()["replica"] is None
+        assert client.get("/internal/live").status_code == 204
+
+    assert not db._engines
+    assert db.SessionLocal.kw["bind"] is None
+
+
+def test_warm_up_is_capped_at_the_pool_size(sqlite_url, monkeypatch):
+    monkeypatch.setenv("DATABASE_POOL_SIZE", "2")
+    engine = db._create_engine(sqlite_url)
+
+    assert db.warm_up_pool(engine, 5) == 2
+    assert engine.pool.checkedin() == 2
+    engine.dispose()
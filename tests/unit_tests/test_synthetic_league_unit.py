@@ -0,0 +1,69 @@
+from collections import defaultdict
+from database.synthetic.league import (
+    TABLE_COLUMNS,
+    LeagueSpec,
+    generate_competition,
+)
+
+
+def _collect(spec, competition_index):
+    tables = defaultdict(list)
+    for table, row in generate_competition(spec, competition_index):
+        tables[table].append(dict(zip(TABLE_COLUMNS[table], row)))
+    return tables
+
+
+def test_generated_competition_has_coherent_foreign_keys():
+    spec = LeagueSpec(teams_per_competition=4, players_per_team=8, sets_per_match=2)
+    tables = _collect(spec, 0)
+
+    assert len(tables["matches"]) == spec.matches_per_competition
+    assert len(tables["sets"]) == spec.matches_per_competition * spec.sets_per_match
+
+    set_ids = {row["id"] for row in tables["sets"]}
+    player_ids = {row["id"] for row in tables["players"]}
+    throw_ids = {row["id"] for row in tables["throw_events"]}
+    catch_ids = {row["id"] for row in tables["catch_events"]}
+
+    for table in ("throw_events", "catch_events", "eliminations"):
+        assert tables[table]
+        assert {row["set_id"] for row in tables[table]} <= set_ids
+    assert {row["player_id"] for row in tables["throw_events"]} <= player_ids
+    assert {row["throw_event_id"] for row in tables["catch_events"]} <= throw_ids
+    assert {
+        row["catch_event_id"]
+        for row in tables["eliminations"]
+        if row["catch_event_id"] is not None
+    } <= catch_ids
+
+
+def test_every_set_has_a_winner_from_the_match():
+    spec = LeagueSpec(teams_per_competition=4, sets_per_match=1)
+    tables = _collect(spec, 0)
+    matches = {row["id"]: row for row in tables["matches"]}
+
+    for set_row in tables["sets"]:
+        match = matches[set_row["match_id"]]
+        assert set_row["winning_team_id"] in (match["team1_id"], match["team2_id"])
+        assert set_row["end_time"] > set_row["start_time"]
+
+
+def test_eliminations_are_recorded_during_their_set():
+    spec = LeagueSpec(teams_per_competition=4, sets_per_match=1)
+    tables = _collect(spec, 0)
+    sets = {row["id"]: row for row in tables["sets"]}
+
+    for row in tables["eliminations"]:
+        set_row = sets[row["set_id"]]
+        assert set_row["start_time"] < row["created_at"] <= set_row["end_time"]
+
+
+def test_competitions_never_share_event_ids():
+    spec = LeagueSpec(organisations=1, teams_per_competition=4, sets_per_match=1)
+    first = _collect(spec, 0)
+    second = _collect(spec, 1)
+
+    for table in ("sets", "throw_events", "catch_events", "eliminations"):
+        first_ids = {row["id"] for row in first[table]}
+        second_ids = {row["id"] for row in second[table]}
+        assert not first_ids & second_ids
@@ -0,0 +1,129 @@
+from collections import namedtuple
+from contextlib import contextmanager
+import numpy as np
+import database.xhit as xhit
+from database.models.throw_geometry import CourtSide
+
+
+def _throws(count: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """Throws that hit less often from further away and when blocked"""
+    rng = np.random.default_rng(seed)
+    rows = np.column_stack(
+        [
+            rng.uniform(1.0, 15.0, count),
+            rng.uniform(0.0, 60.0, count),
+            rng.uniform(0.5, 8.5, count),
+            rng.integers(0, 2, count),
+            np.zeros(count),
+            rng.integers(0, 2, count),
+            rng.integers(0, 2, count),
+        ]
+    )
+    logit = 1.5 - 0.3 * rows[:, 0] - 1.0 * rows[:, 6]
+    hits = (rng.random(count) < 1 / (1 + np.exp(-logit))).astype(float)
+    return rows, hits
+
+
+class FakeConnection:
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+
+        class Result:
+            def one(self):
+                return stmt.compile().params
+
+        return Result()
+
+
+def test_fit_recovers_the_direction_of_each_effect(monkeypatch):
+    rows, hits = _throws(20_000)
+    batches = [
+        (rows[start : start + 5000], hits[start : start + 5000])
+        for start in range(0, 20_000, 5000)
+    ]
+    monkeypatch.setattr(xhit, "_training_batches", lambda conn, size: iter(batches))
+
+    stored = xhit.fit_xhit(FakeConnection(), batch_size=5000)
+    parameters = xhit.XHitParameters.from_json(stored["parameters"])
+
+    assert stored["throws"] == 20_000
+    assert abs(stored["hit_rate"] - hits.mean()) < 1e-9
+    distance, blocked = parameters.coefficients[1], parameters.coefficients[7]
+    assert distance < 0 and blocked < 0
+    predicted = parameters.predict(rows)
+    assert abs(predicted.mean() - hits.mean()) < 0.01
+
+
+def test_fit_needs_hits_and_misses(monkeypatch):
+    rows, _ = _throws(500)
+    monkeypatch.setattr(
+        xhit, "_training_batches", lambda conn, size: iter([(rows, np.zeros(500))])
+    )
+    try:
+        xhit.fit_xhit(FakeConnection())
+    except xhit.XHitError:
+        pass
+    else:
+        raise AssertionError("expected XHitError")
+
+
+def test_features_from_throw_rows():
+    features = xhit.features(
+        [
+            (3.0, 5.0, -30.0, CourtSide.LEFT, True, False),
+            (16.0, 2.0, 10.0, CourtSide.RIGHT, False, True),
+        ]
+    )
+
+    assert features.tolist() == [
+        [5.0, 30.0, 6.0, 1.0, 0.0, 1.0, 0.0],
+        [2.0, 10.0, 7.0, 0.0, 0.0, 0.0, 1.0],
+    ]
+    assert xhit.features([]).shape == (0, len(xhit.FEATURES))
+
+
+def test_parameters_round_trip_json():
+    parameters = xhit.XHitParameters(np.zeros(7), np.ones(7), np.arange(8.0))
+    restored = xhit.XHitParameters.from_json(parameters.to_json())
+    assert restored.coefficients.tolist() == parameters.coefficients.tolist()
+
+
+def test_scoring_commits_each_batch(monkeypatch):
+    Row = namedtuple("Row", "set_id id feature")
+    # Two batches of hot throws, then none left in either table
+    batches = [[Row(1, 1, 0.0), Row(1, 2, 0.0)], [Row(2, 3, 0.0)], [], []]
+    transactions = []
+
+    class Connection:
+        def execute(self, stmt):
+            transactions[-1].append(stmt.is_select)
+
+            class Result:
+                def all(self):
+                    return batches.pop(0)
+
+            return Result()
+
+    class Engine:
+        @contextmanager
+        def connect(self):
+            yield Connection()
+
+        @contextmanager
+        def begin(self):
+            transactions.append([])
+            yield Connection()
+
+    class Parameters:
+        def predict(self, rows):
+            return np.full(len(rows), 0.5)
+
+    monkeypatch.setattr(xhit, "latest_model", lambda conn: (7, Parameters()))
+    monkeypatch.setattr(xhit, "features", lambda rows: rows)
+
+    assert xhit.score_throws(Engine(), batch_size=2) == 3
+    # Row locks from one batch's update are released before the next is read
+    assert transactions == [[True, False], [True, False], [True], [True]]